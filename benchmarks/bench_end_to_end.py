@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark ponta a ponta do conversor contra um servidor n8n local.
+
+Sobe o FakeN8nServer com workflows de fixture (sintéticos ou de um arquivo
+JSON) e executa o caminho completo de main(): cliente N8nClient, seleção de
+workflows e linguagens, geração e gravação dos arquivos. As respostas do
+terminal são simuladas (todos os workflows listados e as linguagens pedidas)
+e a saída vai para um diretório temporário.
+
+Relata workflows convertidos por segundo, requisições feitas (listagem,
+detalhes, 429) e bytes transferidos, para medir melhorias do lado de busca
+do N8nClient sem tocar no n8n de produção.
+
+Uso:
+    python benchmarks/bench_end_to_end.py --workflows 50 --nodes 20
+    python benchmarks/bench_end_to_end.py --latency 0.02 --page-size 10 --rate-limit-every 7
+    python benchmarks/bench_end_to_end.py --fixtures workflows.json --languages php,python
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_n8n_server import FakeN8nServer
+from synthetic_workflows import SyntheticWorkflowFactory
+
+LANGUAGES = ['php', 'python', 'javascript']
+
+
+def load_fixtures(path: Path) -> List[Dict]:
+    """
+    Lê workflows de fixture de um arquivo JSON.
+
+    Aceita uma lista de workflows, a resposta da listagem do n8n ({"data": [...]})
+    ou um único workflow exportado.
+    """
+    data = json.loads(path.read_text(encoding='utf-8'))
+    if isinstance(data, dict):
+        data = data.get('data', [data])
+    return data
+
+
+def synthetic_fixtures(count: int, nodes: int, factory: Optional[SyntheticWorkflowFactory] = None) -> List[Dict]:
+    """Cria `count` workflows sintéticos de `nodes` nós com ids e nomes distintos."""
+    factory = factory or SyntheticWorkflowFactory()
+    workflows = []
+    for index in range(count):
+        factory.seed = index
+        workflow = factory.create(nodes)
+        workflow['id'] = f'wf{index + 1}'
+        workflow['name'] = f'Bench Workflow {index + 1}'
+        workflows.append(workflow)
+    return workflows
+
+
+def run_end_to_end(server: FakeN8nServer, languages: List[str], work_dir: Path, verbose: bool = False) -> Dict:
+    """
+    Executa main() contra o servidor e mede a conversão.
+
+    Args:
+        server: Servidor já iniciado
+        languages: Linguagens selecionadas
+        work_dir: Diretório de trabalho (recebe output/ e um link para templates/)
+        verbose: Mostra a saída de main()
+
+    Returns:
+        Relatório com tempos, contagens de workflows e estatísticas do servidor
+    """
+    import main as cli
+    from language_selector import LanguageSelector
+    from workflow_selector import WorkflowSelector
+
+    listed = []
+    codes = {info['code']: key for key, info in LanguageSelector.AVAILABLE_LANGUAGES.items()}
+    display_workflows = WorkflowSelector.display_workflows
+    load_config = cli.load_config
+
+    def record_listing(workflows, limit=None):
+        listed[:] = workflows
+        if verbose:
+            display_workflows(workflows, limit)
+
+    def answer(prompt=''):
+        # Primeiro a seleção de workflows (todos os listados), depois a de linguagens
+        if 'Ex: 1,3,4' in prompt:
+            return ','.join(str(i) for i in range(1, len(listed) + 1))
+        return ','.join(codes[language] for language in languages)
+
+    def config():
+        loaded = load_config()
+        loaded['n8n'] = {'url': server.url, 'api_key': server.api_key}
+        return loaded
+
+    (work_dir / 'templates').symlink_to(ROOT / 'templates', target_is_directory=True)
+    server.reset_stats()
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        with mock.patch.object(cli, 'load_config', config), \
+                mock.patch.object(WorkflowSelector, 'display_workflows', staticmethod(record_listing)), \
+                mock.patch('builtins.input', answer), \
+                open(os.devnull, 'w') as devnull, redirect_stdout(sys.stdout if verbose else devnull):
+            started = time.perf_counter()
+            cli.main([])
+            seconds = time.perf_counter() - started
+    finally:
+        os.chdir(previous_dir)
+
+    outputs = sum(
+        1 for language in languages
+        for path in (work_dir / 'output' / language).glob('*')
+        if path.is_file() and not path.stem.endswith('_server')
+    ) if (work_dir / 'output').exists() else 0
+    converted = outputs // len(languages) if languages else 0
+    stats = dict(server.stats)
+    return {
+        'seconds': seconds,
+        'workflows_available': len(server.workflows),
+        'workflows_listed': len(listed),
+        'workflows_converted': converted,
+        'outputs_written': outputs,
+        'workflows_per_second': converted / seconds if seconds else 0.0,
+        'server': stats,
+        'bytes_per_workflow': stats['bytes_sent'] / converted if converted else None
+    }
+
+
+def print_report(report: Dict) -> None:
+    """Imprime o relatório."""
+    server = report['server']
+    print(f"Workflows disponíveis:  {report['workflows_available']}")
+    print(f"Workflows listados:     {report['workflows_listed']}")
+    print(f"Workflows convertidos:  {report['workflows_converted']} ({report['outputs_written']} arquivos)")
+    print(f"Tempo total:            {report['seconds']:.2f} s")
+    print(f"Workflows por segundo:  {report['workflows_per_second']:.1f}")
+    print(f"Requisições:            {server['requests']} (listagem {server['list_requests']}, "
+          f"detalhes {server['get_requests']}, 429 {server['rate_limited']}, erros {server['errors']})")
+    print(f"Bytes transferidos:     {server['bytes_sent']} ({server['bytes_sent'] / 1024 / 1024:.2f} MiB)")
+    if report['workflows_listed'] < report['workflows_available']:
+        print("⚠ Nem todos os workflows foram listados (paginação ou 429 na listagem).")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark ponta a ponta contra um servidor n8n local')
+    parser.add_argument('--fixtures', type=Path, help='Arquivo JSON com os workflows servidos')
+    parser.add_argument('--workflows', type=int, default=20, help='Workflows sintéticos (padrão: 20)')
+    parser.add_argument('--nodes', type=int, default=20, help='Nós por workflow sintético (padrão: 20)')
+    parser.add_argument('--languages', type=lambda s: s.split(','), default=['php'],
+                        help='Linguagens separadas por vírgula (padrão: php)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Atraso por resposta em segundos (padrão: 0)')
+    parser.add_argument('--page-size', type=int, default=None,
+                        help='Tamanho das páginas da listagem (padrão: tudo em uma página)')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Responde 429 a cada N requisições')
+    parser.add_argument('--json', type=Path, help='Grava o relatório em JSON')
+    parser.add_argument('--verbose', action='store_true', help='Mostra a saída de main()')
+    args = parser.parse_args(argv)
+
+    invalid = [language for language in args.languages if language not in LANGUAGES]
+    if invalid:
+        parser.error(f"Linguagens inválidas: {', '.join(invalid)}")
+
+    workflows = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(args.workflows, args.nodes)
+    with FakeN8nServer(workflows, latency=args.latency, page_size=args.page_size,
+                       rate_limit_every=args.rate_limit_every) as server, \
+            tempfile.TemporaryDirectory() as work_dir:
+        report = run_end_to_end(server, args.languages, Path(work_dir), args.verbose)
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"Relatório gravado em {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
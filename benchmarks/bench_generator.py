@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalabilidade do conversor (Generator.generate_class).
+
+Gera workflows sintéticos de 10 a 10.000 nós e mede, para cada linguagem,
+o tempo de geração (melhor de N execuções), o pico de memória (tracemalloc,
+em uma execução separada para não distorcer o tempo), o custo por nó e o
+tamanho do código gerado. A inclinação da curva log-log tempo x nós resume
+a escalabilidade: ~1.0 é linear, ~2.0 é quadrático.
+
+Com --baseline o resultado é comparado a um baseline gravado (benchmarks/
+baseline.json) e o script termina com código 1 quando a inclinação cresce
+além da tolerância ou o custo por nó piora além do fator permitido.
+
+Uso:
+    python benchmarks/bench_generator.py
+    python benchmarks/bench_generator.py --quick --baseline benchmarks/baseline.json
+    python benchmarks/bench_generator.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from synthetic_workflows import SyntheticWorkflowFactory, parse_node_mix
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+QUICK_SIZES = [10, 100, 1000]
+LANGUAGES = ['python', 'javascript', 'php']
+
+# Aumento máximo da inclinação log-log em relação ao baseline
+SLOPE_TOLERANCE = 0.3
+# Fator máximo de piora do custo por nó no maior tamanho comum ao baseline
+COST_TOLERANCE = 3.0
+
+
+def measure(generator: Generator, workflow: Dict, repeat: int) -> Dict:
+    """
+    Mede uma geração: melhor tempo de `repeat` execuções e pico de memória.
+
+    Args:
+        generator: Gerador da linguagem
+        workflow: Workflow sintético
+        repeat: Quantidade de execuções cronometradas
+
+    Returns:
+        seconds, peak_bytes e code_bytes
+    """
+    best = math.inf
+    code = None
+    # Os templates ausentes (ex: o nó Start) são avisados no stdout a cada geração
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            code = generator.generate_class(workflow)
+            best = min(best, time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            generator.generate_class(workflow)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    if code is None:
+        raise RuntimeError(f"Falha ao gerar {workflow['name']} em {generator.language}")
+    return {'seconds': best, 'peak_bytes': peak, 'code_bytes': len(code.encode('utf-8'))}
+
+
+def loglog_slope(points: List[Dict]) -> Optional[float]:
+    """
+    Inclinação (mínimos quadrados) de log(segundos) x log(nós).
+
+    Args:
+        points: Resultados com 'nodes' e 'seconds'
+
+    Returns:
+        Inclinação ou None com menos de dois tamanhos
+    """
+    pairs = [(math.log(p['nodes']), math.log(max(p['seconds'], 1e-9))) for p in points]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    variance = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / variance
+
+
+def run_benchmark(sizes: List[int], languages: List[str], factory: SyntheticWorkflowFactory,
+                  repeat: int = 3, templates_dir: Path = ROOT / 'templates') -> Dict:
+    """
+    Executa o benchmark para todos os tamanhos e linguagens.
+
+    Returns:
+        Relatório com a configuração, os pontos por linguagem e as inclinações
+    """
+    workflows = {size: factory.create(size) for size in sizes}
+    results: Dict[str, List[Dict]] = {}
+    for language in languages:
+        generator = Generator(XMLLoader(str(templates_dir)), language)
+        results[language] = []
+        for size in sizes:
+            point = {'nodes': size, **measure(generator, workflows[size], repeat)}
+            point['us_per_node'] = point['seconds'] * 1e6 / size
+            results[language].append(point)
+
+    return {
+        'config': {
+            'sizes': sizes,
+            'branching': factory.branching,
+            'expression_density': factory.expression_density,
+            'node_mix': factory.node_mix,
+            'body_size': factory.body_size,
+            'seed': factory.seed,
+            'repeat': repeat
+        },
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'results': results,
+        'slopes': {language: loglog_slope(points) for language, points in results.items()}
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, slope_tolerance: float = SLOPE_TOLERANCE,
+                        cost_tolerance: float = COST_TOLERANCE) -> List[str]:
+    """
+    Compara um relatório ao baseline.
+
+    Uma regressão é uma inclinação maior que a do baseline + slope_tolerance
+    (ex: um laço quadrático novo) ou um custo por nó, no maior tamanho comum
+    aos dois, mais de cost_tolerance vezes o do baseline.
+
+    Returns:
+        Lista de regressões (vazia quando tudo está dentro da tolerância)
+    """
+    regressions = []
+    for language, points in report['results'].items():
+        base_points = baseline.get('results', {}).get(language)
+        if not base_points:
+            continue
+
+        base_by_size = {p['nodes']: p for p in base_points}
+        common = [p for p in points if p['nodes'] in base_by_size]
+        slope = loglog_slope(common)
+        base_slope = loglog_slope([base_by_size[p['nodes']] for p in common])
+        if slope is not None and base_slope is not None and slope > base_slope + slope_tolerance:
+            regressions.append(f"{language}: inclinação {slope:.2f} (baseline {base_slope:.2f})")
+
+        if common:
+            largest = max(common, key=lambda p: p['nodes'])
+            base_cost = base_by_size[largest['nodes']]['us_per_node']
+            if base_cost and largest['us_per_node'] > base_cost * cost_tolerance:
+                regressions.append(
+                    f"{language}: {largest['us_per_node']:.1f} µs/nó com {largest['nodes']} nós "
+                    f"(baseline {base_cost:.1f} µs/nó)"
+                )
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    """Imprime o relatório em tabela."""
+    print(f"{'linguagem':<11} {'nós':>6} {'tempo (ms)':>11} {'µs/nó':>8} {'pico (KiB)':>11} {'código (KiB)':>13}")
+    for language, points in report['results'].items():
+        for point in points:
+            print(f"{language:<11} {point['nodes']:>6} {point['seconds'] * 1000:>11.1f} "
+                  f"{point['us_per_node']:>8.1f} {point['peak_bytes'] / 1024:>11.0f} "
+                  f"{point['code_bytes'] / 1024:>13.0f}")
+        slope = report['slopes'][language]
+        if slope is not None:
+            print(f"{language:<11} inclinação log-log: {slope:.2f}")
+        print()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark de escalabilidade do Generator.generate_class')
+    parser.add_argument('--sizes', type=lambda s: [int(n) for n in s.split(',')], default=None,
+                        help='Quantidades de nós separadas por vírgula (padrão: 10,100,1000,10000)')
+    parser.add_argument('--quick', action='store_true', help='Usa somente 10, 100 e 1000 nós')
+    parser.add_argument('--languages', type=lambda s: s.split(','), default=LANGUAGES,
+                        help='Linguagens separadas por vírgula (padrão: python,javascript,php)')
+    parser.add_argument('--branching', type=int, default=2, help='Fator de ramificação (padrão: 2)')
+    parser.add_argument('--expression-density', type=float, default=0.3,
+                        help='Fração dos valores que são expressões (padrão: 0.3)')
+    parser.add_argument('--node-mix', type=parse_node_mix, default=None,
+                        help="Pesos dos tipos de nó, ex: 'httpRequest=4,set=2,aiAgent=1'")
+    parser.add_argument('--body-size', type=int, default=256, help='Tamanho dos corpos HTTP em bytes (padrão: 256)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente dos workflows (padrão: 42)')
+    parser.add_argument('--repeat', type=int, default=3, help='Execuções cronometradas por ponto (padrão: 3)')
+    parser.add_argument('--baseline', type=Path, help='Compara com um baseline e falha em regressões')
+    parser.add_argument('--save-baseline', type=Path, help='Grava o resultado como baseline')
+    parser.add_argument('--json', type=Path, help='Grava o relatório completo em JSON')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    factory = SyntheticWorkflowFactory(args.branching, args.expression_density, args.node_mix,
+                                       args.body_size, args.seed)
+    report = run_benchmark(sizes, args.languages, factory, args.repeat)
+    print_report(report)
+
+    for path in filter(None, [args.json, args.save_baseline]):
+        path.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        print(f"Relatório gravado em {path}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(report, json.loads(args.baseline.read_text(encoding='utf-8')))
+        if regressions:
+            print("Regressões em relação ao baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("Sem regressões em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
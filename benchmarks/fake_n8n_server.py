@@ -0,0 +1,175 @@
+"""
+Servidor local que imita a API REST do n8n para benchmarks.
+
+Serve GET /api/v1/workflows e GET /api/v1/workflows/{id} a partir de
+workflows de fixture, com latência configurável, paginação por cursor
+(limit/nextCursor, como na API pública do n8n) e injeção de respostas 429.
+Conta as requisições e os bytes enviados para medir o lado de busca do
+N8nClient sem tocar em uma instância real.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = '/api/v1/workflows'
+
+
+class FakeN8nServer:
+    """Servidor HTTP em thread com a API de workflows do n8n."""
+
+    def __init__(self, workflows: List[Dict], api_key: str = 'bench-key', latency: float = 0.0,
+                 page_size: Optional[int] = None, rate_limit_every: int = 0, retry_after: int = 1):
+        """
+        Inicializa o servidor (use start() ou o bloco with para iniciar).
+
+        Args:
+            workflows: Workflows completos servidos pela API
+            api_key: Valor esperado no header X-N8N-API-KEY
+            latency: Atraso (segundos) aplicado a cada resposta
+            page_size: Tamanho máximo das páginas da listagem (None: sem limite além do
+                parâmetro limit da requisição)
+            rate_limit_every: Responde 429 a cada N requisições (0 desativa)
+            retry_after: Valor do header Retry-After das respostas 429 (segundos)
+        """
+        self.set_workflows(workflows)
+        self.api_key = api_key
+        self.latency = latency
+        self.page_size = page_size
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._httpd = None
+        self.reset_stats()
+
+    def set_workflows(self, workflows: List[Dict]) -> None:
+        """Substitui os workflows servidos (ex: para simular edições e remoções no n8n)."""
+        self.workflows = [self._with_defaults(workflow) for workflow in workflows]
+        self.by_id = {str(workflow['id']): workflow for workflow in self.workflows}
+
+    @staticmethod
+    def _with_defaults(workflow: Dict) -> Dict:
+        """Completa os campos de metadados que a API do n8n sempre devolve."""
+        return {
+            'active': False,
+            'tags': [],
+            'createdAt': '2024-01-01T00:00:00.000Z',
+            'updatedAt': '2024-01-01T00:00:00.000Z',
+            'connections': {},
+            **workflow
+        }
+
+    def reset_stats(self) -> None:
+        """Zera os contadores de requisições e bytes."""
+        with self._lock:
+            self.stats = {'requests': 0, 'list_requests': 0, 'get_requests': 0,
+                          'rate_limited': 0, 'errors': 0, 'bytes_sent': 0}
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor (ex: http://127.0.0.1:54321)."""
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeN8nServer':
+        """Inicia o servidor em uma porta livre de 127.0.0.1."""
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Encerra o servidor."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> 'FakeN8nServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle(self, path: str, api_key: Optional[str]) -> tuple:
+        """
+        Resolve uma requisição GET.
+
+        Args:
+            path: Caminho com query string
+            api_key: Header X-N8N-API-KEY recebido
+
+        Returns:
+            Tupla (status, headers extras, corpo JSON)
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            count = self.stats['requests']
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            self._count('rate_limited')
+            return 429, {'Retry-After': str(self.retry_after)}, {'message': 'Too Many Requests'}
+        if api_key != self.api_key:
+            self._count('errors')
+            return 401, {}, {'message': 'unauthorized'}
+
+        parsed = urlparse(path)
+        route = parsed.path.rstrip('/')
+        if route == API_PREFIX:
+            self._count('list_requests')
+            return 200, {}, self._list_page(parse_qs(parsed.query))
+        if route.startswith(API_PREFIX + '/'):
+            self._count('get_requests')
+            workflow = self.by_id.get(route[len(API_PREFIX) + 1:])
+            if workflow is None:
+                self._count('errors')
+                return 404, {}, {'message': 'Not Found'}
+            return 200, {}, workflow
+
+        self._count('errors')
+        return 404, {}, {'message': 'Not Found'}
+
+    def _list_page(self, query: Dict[str, List[str]]) -> Dict:
+        """Página da listagem a partir de limit e cursor (deslocamento)."""
+        limit = int(query['limit'][0]) if 'limit' in query else None
+        if self.page_size:
+            limit = min(limit or self.page_size, self.page_size)
+        offset = int(query['cursor'][0]) if 'cursor' in query else 0
+        if not limit:
+            return {'data': self.workflows[offset:], 'nextCursor': None}
+        end = offset + limit
+        return {'data': self.workflows[offset:end], 'nextCursor': str(end) if end < len(self.workflows) else None}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Cabeçalhos e corpo saem em escritas separadas; sem isso o keep-alive espera o ACK atrasado
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, headers, body = server.handle(self.path, self.headers.get('X-N8N-API-KEY'))
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+                with server._lock:
+                    server.stats['bytes_sent'] += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
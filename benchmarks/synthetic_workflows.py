@@ -0,0 +1,161 @@
+"""
+Fábrica de workflows sintéticos para benchmarks do conversor.
+
+Gera workflows no formato usado pelo n8ncoding (nós com conexões por id)
+controlando o número de nós, o fator de ramificação, a densidade de
+expressões, a mistura de tipos de nó e o tamanho dos corpos. Os workflows
+são determinísticos para uma mesma semente, para que medições repetidas e o
+baseline comparem sempre o mesmo trabalho.
+"""
+import random
+from typing import Dict, List, Optional
+
+# Tipos de nó com template nas três linguagens (tipo n8n -> peso padrão)
+DEFAULT_NODE_MIX = {
+    'httpRequest': 4,
+    'set': 2,
+    'if': 1,
+    'function': 1,
+    'aiAgent': 1
+}
+
+# Tipo n8n de cada tipo de template (como nos workflows exportados)
+NODE_TYPES = {
+    'httpRequest': 'n8n-nodes-base.httpRequest',
+    'set': 'n8n-nodes-base.set',
+    'if': 'n8n-nodes-base.if',
+    'function': 'n8n-nodes-base.function',
+    'aiAgent': '@n8n/n8n-nodes-langchain.agent'
+}
+
+# Campos distintos usados nas expressões ($json.body.campo_N)
+EXPRESSION_FIELDS = 50
+
+
+def parse_node_mix(spec: str) -> Dict[str, float]:
+    """
+    Interpreta uma mistura de tipos de nó.
+
+    Args:
+        spec: Texto como 'httpRequest=4,set=2,aiAgent=1'
+
+    Returns:
+        Dicionário tipo -> peso
+    """
+    mix: Dict[str, float] = {}
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if not name:
+            continue
+        if name not in NODE_TYPES:
+            raise ValueError(f"Tipo de nó desconhecido: {name} (use {', '.join(NODE_TYPES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class SyntheticWorkflowFactory:
+    """Cria workflows sintéticos parametrizados e determinísticos."""
+
+    def __init__(self, branching: int = 2, expression_density: float = 0.3,
+                 node_mix: Optional[Dict[str, float]] = None, body_size: int = 256, seed: int = 42):
+        """
+        Inicializa a fábrica.
+
+        Args:
+            branching: Quantos nós seguintes cada nó alimenta (1 = cadeia linear)
+            expression_density: Fração (0 a 1) dos valores de texto que são expressões do n8n
+            node_mix: Pesos dos tipos de nó (padrão: DEFAULT_NODE_MIX)
+            body_size: Tamanho aproximado (bytes) do corpo JSON dos nós HTTP Request
+            seed: Semente do gerador pseudoaleatório
+        """
+        if branching < 1:
+            raise ValueError("O fator de ramificação deve ser >= 1")
+        if not 0 <= expression_density <= 1:
+            raise ValueError("A densidade de expressões deve estar entre 0 e 1")
+        self.branching = branching
+        self.expression_density = expression_density
+        self.node_mix = dict(node_mix or DEFAULT_NODE_MIX)
+        self.body_size = body_size
+        self.seed = seed
+
+    def create(self, node_count: int) -> Dict:
+        """
+        Cria um workflow com a quantidade de nós pedida.
+
+        O primeiro nó é um Start; o nó i (i >= 1) é alimentado pelo nó
+        (i - 1) // branching, formando uma árvore com o fator de ramificação.
+
+        Args:
+            node_count: Quantidade de nós (incluindo o Start)
+
+        Returns:
+            Workflow no formato do n8n
+        """
+        rng = random.Random(f'{self.seed}:{node_count}')
+        kinds = list(self.node_mix)
+        weights = [self.node_mix[kind] for kind in kinds]
+
+        nodes: List[Dict] = [{
+            'id': 'node-0',
+            'name': 'Start',
+            'type': 'n8n-nodes-base.start',
+            'parameters': {},
+            'connections': {}
+        }]
+        for index in range(1, node_count):
+            kind = rng.choices(kinds, weights)[0]
+            nodes.append({
+                'id': f'node-{index}',
+                'name': f'{kind} {index}',
+                'type': NODE_TYPES[kind],
+                'parameters': self._parameters(kind, index, rng),
+                'connections': {}
+            })
+
+        for index in range(1, node_count):
+            parent = nodes[(index - 1) // self.branching]
+            targets = parent['connections'].setdefault('main', {'0': [[]]})['0'][0]
+            targets.append({'node': f'node-{index}', 'type': 'main', 'index': 0})
+
+        return {
+            'id': f'synthetic-{node_count}',
+            'name': f'Synthetic {node_count}',
+            'nodes': nodes
+        }
+
+    def _text(self, rng: random.Random, literal: str) -> str:
+        """Valor de texto: uma expressão do n8n com a probabilidade configurada."""
+        if rng.random() < self.expression_density:
+            return f'={{{{ $json.body.campo_{rng.randrange(EXPRESSION_FIELDS)} }}}}'
+        return literal
+
+    def _body(self, rng: random.Random, index: int) -> Dict:
+        """Corpo JSON com aproximadamente body_size bytes."""
+        body: Dict = {'id': index}
+        field = 0
+        while len(str(body)) < self.body_size:
+            body[f'campo_{field}'] = self._text(rng, f'valor {index}-{field}')
+            field += 1
+        return body
+
+    def _parameters(self, kind: str, index: int, rng: random.Random) -> Dict:
+        if kind == 'httpRequest':
+            return {
+                'url': self._text(rng, f'https://api.example.com/recursos/{index}'),
+                'method': rng.choice(['GET', 'POST']),
+                'body': self._body(rng, index) if self.body_size else {},
+                'options': {'headers': {'X-Request-Id': self._text(rng, f'req-{index}')}}
+            }
+        if kind == 'set':
+            return {'values': {'string': [{'name': f'campo_{index}', 'value': self._text(rng, f'valor {index}')}]}}
+        if kind == 'if':
+            return {'conditions': {'string': [{'value1': self._text(rng, f'a{index}'), 'value2': f'b{index}'}]}}
+        if kind == 'function':
+            return {'functionCode': f'return items.map(item => ({{ json: {{ ...item.json, passo: {index} }} }}));'}
+        return {
+            'prompt': self._text(rng, f'Resuma o registro {index} em uma frase.'),
+            'systemMessage': 'Você é um assistente objetivo.',
+            'model': 'gpt-4o-mini',
+            'maxTokens': 200
+        }
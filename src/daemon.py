@@ -0,0 +1,314 @@
+"""
+Daemon de geração do n8ncoding com caches aquecidos.
+
+Mantém em um processo de longa duração tudo o que a CLI refaz a cada
+invocação: configurações de config/settings.json, templates XML lidos
+(XMLLoader), instâncias de Generator/NodeMapper por linguagem e opções, e a
+sessão HTTP com o n8n (pool de conexões do N8nClient). Recebe jobs por HTTP
+em 127.0.0.1 ou por um socket Unix:
+
+    POST /generate  {"workflow": {...}} ou {"workflow_id": "..."},
+                    "language": "python", "options": {...}, "save": false
+    GET  /health    estado e estatísticas do daemon
+
+Uso:
+    python src/daemon.py --port 8765
+    python src/daemon.py --socket /tmp/n8ncoding.sock
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Adiciona o diretório src ao path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from main import create_render_cache, generator_options, load_config, load_environment
+from language_selector import LanguageSelector
+from xml_loader import XMLLoader
+from generator import Generator
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+
+# Opções de geração aceitas por job (padrões vindos de output.* em settings.json)
+GENERATION_OPTIONS = ('instrument', 'trace', 'checkpoint', 'resource_threshold', 'shared_runtime')
+
+
+class JobError(Exception):
+    """Erro em um job de geração (vira uma resposta HTTP com o status indicado)."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class GenerationService:
+    """Serviço de geração com estado aquecido entre os jobs."""
+
+    def __init__(self, config: Optional[Dict] = None, templates_dir: Path = TEMPLATES_DIR):
+        """
+        Inicializa o serviço.
+
+        Args:
+            config: Configurações (padrão: config/settings.json com variáveis do .env)
+            templates_dir: Diretório dos templates
+        """
+        if config is None:
+            load_environment()
+            config = load_config()
+        self.config = config
+        self.xml_loader = XMLLoader(str(templates_dir))
+        # Métodos renderizados, compartilhados por todos os geradores (nós repetidos entre jobs)
+        self.render_cache = create_render_cache(config.get('output', {}))
+        # (linguagem, opções) -> (Generator, lock); o Generator guarda estado durante generate_class()
+        self._generators: Dict[Tuple, Tuple[Generator, threading.Lock]] = {}
+        self._generators_lock = threading.Lock()
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.started_at = time.time()
+        self.stats = {'jobs': 0, 'errors': 0, 'fetches': 0}
+        self._stats_lock = threading.Lock()
+
+    def default_options(self) -> Dict:
+        """Opções de geração de output.* em settings.json."""
+        output = self.config.get('output', {})
+        return {**generator_options(output), 'server': bool(output.get('server', False))}
+
+    def generator(self, language: str, options: Dict) -> Tuple[Generator, threading.Lock]:
+        """
+        Obtém (criando na primeira vez) o Generator de uma linguagem e conjunto de opções.
+
+        Returns:
+            Tupla (Generator, lock que serializa o uso do Generator)
+        """
+        key = (language,) + tuple(options.get(name) for name in GENERATION_OPTIONS)
+        with self._generators_lock:
+            if key not in self._generators:
+                generator = Generator(self.xml_loader, language, render_cache=self.render_cache,
+                                      **{name: options.get(name) for name in GENERATION_OPTIONS})
+                self._generators[key] = (generator, threading.Lock())
+            return self._generators[key]
+
+    def client(self):
+        """Cliente do n8n (criado no primeiro job por id e reaproveitado, com a sessão HTTP)."""
+        with self._client_lock:
+            if self._client is None:
+                from n8n_client import N8nClient
+
+                n8n_config = self.config.get('n8n', {})
+                if not n8n_config.get('api_key'):
+                    raise JobError("API Key do n8n não configurada", 503)
+                self._client = N8nClient(n8n_config.get('url') or 'http://localhost:5678', n8n_config['api_key'])
+            return self._client
+
+    def generate(self, job: Dict) -> Dict:
+        """
+        Executa um job de geração.
+
+        Args:
+            job: workflow (JSON do workflow) ou workflow_id, language (padrão:
+                output.language), options (instrument, trace, checkpoint,
+                resource_threshold, shared_runtime, server) e save (grava em output/ como a CLI)
+
+        Returns:
+            Dicionário com language, code, resources, server_code (se pedido),
+            runtime_code (se a classe usa o runtime compartilhado), saved e elapsed_ms
+        """
+        started = time.perf_counter()
+        self._count('jobs')
+        try:
+            result = self._generate(job)
+        except Exception:
+            self._count('errors')
+            raise
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def _generate(self, job: Dict) -> Dict:
+        if not isinstance(job, dict):
+            raise JobError("O job deve ser um objeto JSON")
+
+        language = job.get('language') or self.config.get('output', {}).get('language', 'php')
+        languages = [info['code'] for info in LanguageSelector.AVAILABLE_LANGUAGES.values()]
+        if language not in languages:
+            raise JobError(f"Linguagem inválida: {language} (use {', '.join(languages)})")
+
+        job_options = job.get('options') or {}
+        if not isinstance(job_options, dict):
+            raise JobError("options deve ser um objeto JSON")
+        options = {**self.default_options(), **job_options}
+        unknown = set(options) - set(GENERATION_OPTIONS) - {'server'}
+        if unknown:
+            raise JobError(f"Opções desconhecidas: {', '.join(sorted(unknown))}")
+        # Os valores compõem a chave do cache de geradores: só tipos escalares
+        for name, value in job_options.items():
+            if name == 'resource_threshold':
+                if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+                    raise JobError(f"Opção {name} deve ser um inteiro ou null")
+            elif not isinstance(value, bool):
+                raise JobError(f"Opção {name} deve ser true ou false")
+
+        workflow = job.get('workflow')
+        if workflow is None:
+            if not job.get('workflow_id'):
+                raise JobError("Informe workflow ou workflow_id")
+            self._count('fetches')
+            workflow = self.client().get_workflow(str(job['workflow_id']))
+            if not workflow:
+                raise JobError(f"Workflow não encontrado: {job['workflow_id']}", 404)
+        if not isinstance(workflow, dict):
+            raise JobError("workflow deve ser um objeto JSON")
+        if not isinstance(workflow.get('nodes', []), list):
+            raise JobError("workflow.nodes deve ser uma lista")
+
+        generator, lock = self.generator(language, options)
+        with lock:
+            code = generator.generate_class(workflow)
+            if not code:
+                raise JobError("Falha ao gerar o código do workflow", 422)
+            server_code = generator.generate_server(workflow) if options.get('server') else None
+            resources = dict(generator.resources)
+            runtime_code = generator.shared_runtime_code() if generator.node_mapper.uses_shared_runtime else None
+            saved = None
+            if job.get('save'):
+                if not generator.save_generated_code(workflow, code):
+                    raise JobError("Falha ao gravar o código gerado", 500)
+                saved = str(generator.folder_structure.get_output_file_path(workflow, language))
+                if server_code:
+                    generator.save_generated_server(workflow, server_code)
+
+        return {
+            'language': language,
+            'workflow': workflow.get('name'),
+            'code': code,
+            'resources': resources,
+            'server_code': server_code,
+            'runtime_code': runtime_code,
+            'saved': saved
+        }
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def health(self) -> Dict:
+        """Estado do daemon e dos caches."""
+        return {
+            'status': 'ok',
+            'uptime_s': round(time.time() - self.started_at, 3),
+            'generators': len(self._generators),
+            'template_loads': self.xml_loader.template_loads,
+            'render_cache': self.render_cache.report(),
+            **self.stats
+        }
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Handler HTTP dos jobs (o serviço fica em self.server.service)."""
+
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalhos e corpo saem em escritas separadas; sem isso o keep-alive espera o ACK atrasado
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'error': 'Rota não encontrada'})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/generate':
+            self._send_json(404, {'error': 'Rota não encontrada'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            self._send_json(200, self.server.service.generate(job))
+        except json.JSONDecodeError as e:
+            self._send_json(400, {'error': f'JSON inválido: {e}'})
+        except JobError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': f'Erro inesperado: {e}'})
+
+    def _send_json(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UnixDaemonRequestHandler(DaemonRequestHandler):
+    """Handler dos jobs recebidos pelo socket Unix (sem opções de TCP)."""
+
+    disable_nagle_algorithm = False
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor HTTP em um socket Unix (uma thread por conexão)."""
+
+    daemon_threads = True
+
+
+def create_server(service: GenerationService, host: str = '127.0.0.1', port: int = 8765,
+                  socket_path: Optional[str] = None):
+    """
+    Cria o servidor do daemon (HTTP em host:port ou em um socket Unix).
+
+    Args:
+        service: Serviço de geração
+        host: Endereço HTTP (somente local por padrão)
+        port: Porta HTTP (0 escolhe uma porta livre)
+        socket_path: Caminho do socket Unix (tem prioridade sobre host/port)
+
+    Returns:
+        Servidor pronto para serve_forever()
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, UnixDaemonRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), DaemonRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv=None) -> None:
+    """Inicia o daemon."""
+    parser = argparse.ArgumentParser(description='Daemon de geração do n8ncoding')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço HTTP (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Porta HTTP (padrão: 8765)')
+    parser.add_argument('--socket', help='Caminho de um socket Unix (em vez de HTTP)')
+    args = parser.parse_args(argv)
+
+    service = GenerationService()
+    server = create_server(service, args.host, args.port, args.socket)
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"n8ncoding daemon ouvindo em {address}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.render_cache.save()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nDaemon encerrado.")
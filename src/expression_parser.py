@@ -8,6 +8,17 @@ from typing import Dict, List, Optional, Set
 class ExpressionParser:
     """Classe para fazer parsing de expressões do n8n."""
     
+    # Padrões para $json.body.xxx, $json.query.xxx ou $json.headers.xxx, compilados uma vez
+    # por processo (com e sem escape, e sem $)
+    SOURCE_PATTERNS = [
+        re.compile(r'\$json\.(body|query|headers)\.(.+)'),  # Padrão normal
+        re.compile(r'\\\$json\.(body|query|headers)\.(.+)'),  # Com escape
+        re.compile(r'json\.(body|query|headers)\.(.+)'),  # Sem $
+    ]
+    
+    # Padrão para $json.xxx (acesso direto)
+    DIRECT_PATTERN = re.compile(r'\$json\.(.+)')
+    
     def __init__(self, constructor_params: Dict[str, str] = None):
         """
         Inicializa o parser de expressões.
@@ -49,15 +60,9 @@ class ExpressionParser:
         
         # Padrão para $json.body.xxx ou $json.query.xxx ou $json.headers.xxx
         # Tenta diferentes variações do padrão (com e sem escape)
-        patterns = [
-            r'\$json\.(body|query|headers)\.(.+)',  # Padrão normal
-            r'\\\$json\.(body|query|headers)\.(.+)',  # Com escape
-            r'json\.(body|query|headers)\.(.+)',  # Sem $
-        ]
-        
         match = None
-        for pattern in patterns:
-            match = re.search(pattern, inner)
+        for pattern in self.SOURCE_PATTERNS:
+            match = pattern.search(inner)
             if match:
                 break
         
@@ -101,8 +106,7 @@ class ExpressionParser:
                 return php_path
         
         # Padrão para $json.xxx (acesso direto)
-        pattern = r'\$json\.(.+)'
-        match = re.match(pattern, inner)
+        match = self.DIRECT_PATTERN.match(inner)
         if match:
             path = match.group(1)
             parts = path.split('.')
@@ -3,12 +3,15 @@ Módulo para replicar a estrutura de pastas do n8n.
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 
 class FolderStructure:
     """Classe para gerenciar a estrutura de pastas de saída."""
     
+    # Arquivos de credenciais desatualizados já avisados neste processo
+    _outdated_credentials = set()
+    
     def __init__(self, output_base: str = "output"):
         """
         Inicializa o gerenciador de estrutura de pastas.
@@ -22,6 +25,13 @@ class FolderStructure:
         # Cria pasta para credenciais
         self.credentials_dir = self.output_base / "credentials"
         self.credentials_dir.mkdir(exist_ok=True)
+        
+        # Pasta para módulos de runtime compartilhados pelas classes geradas
+        self.runtime_dir = self.output_base / "runtime"
+        
+        # Nome dos arquivos por id de workflow, no lugar do nome do workflow
+        # (ex: o modo watch separa workflows com o mesmo nome)
+        self.file_names: Dict[str, str] = {}
     
     def get_workflow_folder_path(self, workflow: dict, language: str = "php") -> Path:
         """
@@ -55,8 +65,8 @@ class FolderStructure:
         """
         folder_path = self.get_workflow_folder_path(workflow, language)
         
-        # Gera nome do arquivo baseado no nome do workflow
-        workflow_name = workflow.get('name', 'workflow')
+        # Gera nome do arquivo baseado no nome do workflow (ou no definido para o id)
+        workflow_name = self.file_names.get(str(workflow.get('id')), workflow.get('name', 'workflow'))
         safe_name = self._sanitize_filename(workflow_name)
         
         # Extensão baseada na linguagem
@@ -69,6 +79,38 @@ class FolderStructure:
         
         return folder_path / f"{safe_name}{extension}"
     
+    def get_server_file_path(self, workflow: dict, language: str = "php") -> Path:
+        """
+        Obtém o caminho do servidor HTTP gerado para um workflow.
+        
+        O servidor fica ao lado da classe, com o sufixo '_server'.
+        
+        Args:
+            workflow: Dados do workflow
+            language: Linguagem de destino (ex: 'php')
+            
+        Returns:
+            Caminho completo do arquivo do servidor
+        """
+        output_path = self.get_output_file_path(workflow, language)
+        return output_path.with_name(f"{output_path.stem}_server{output_path.suffix}")
+    
+    def get_resources_dir(self, workflow: dict, language: str = "php") -> Path:
+        """
+        Obtém a pasta dos arquivos de recurso (literais grandes) de um workflow.
+        
+        A pasta fica ao lado da classe, com o sufixo '_resources'.
+        
+        Args:
+            workflow: Dados do workflow
+            language: Linguagem de destino (ex: 'php')
+            
+        Returns:
+            Caminho da pasta de recursos
+        """
+        output_path = self.get_output_file_path(workflow, language)
+        return output_path.with_name(f"{output_path.stem}_resources")
+    
     def _sanitize_filename(self, filename: str) -> str:
         """
         Sanitiza um nome de arquivo removendo caracteres inválidos.
@@ -115,42 +157,64 @@ class FolderStructure:
         Garante que o arquivo de credenciais existe na pasta de output.
         Copia do template se necessário.
         
+        Um arquivo existente sem o CredentialsRegistry (usado pelo código
+        gerado) não é alterado: o template atual é gravado ao lado dele, em
+        Credentials.*.new, e um aviso explica a migração.
+        
         Args:
             language: Linguagem de destino (ex: 'php')
         
         Returns:
-            True se o arquivo existe ou foi criado com sucesso
+            True se o arquivo existe ou foi criado com sucesso; False se não há
+            template ou se o arquivo existente precisa ser migrado
         """
+        import shutil
         credentials_path = self.get_credentials_path(language)
+        template_path = self._get_credentials_template(language)
         
-        # Se já existe, não precisa fazer nada
         if credentials_path.exists():
+            if 'CredentialsRegistry' in credentials_path.read_text(encoding='utf-8', errors='replace'):
+                return True
+            new_path = credentials_path.with_name(credentials_path.name + '.new')
+            if template_path and (not new_path.exists() or new_path.read_bytes() != template_path.read_bytes()):
+                shutil.copy2(template_path, new_path)
+            # Um aviso por arquivo, não um por workflow gerado
+            if credentials_path not in FolderStructure._outdated_credentials:
+                FolderStructure._outdated_credentials.add(credentials_path)
+                print(f"⚠ Aviso: {credentials_path} não tem o CredentialsRegistry usado pelo código gerado "
+                      f"e não foi alterado; as classes geradas não vão carregar até ele ser migrado.")
+                print(f"  O template atual foi gravado em {new_path}: copie para ele as credenciais "
+                      f"personalizadas e renomeie-o para {credentials_path.name}.")
+            return False
+        
+        if template_path:
+            # Copia o arquivo de credenciais para a pasta de output
+            shutil.copy2(template_path, credentials_path)
             return True
         
-        # Tenta copiar do template
+        return False
+    
+    def _get_credentials_template(self, language: str = "php") -> Optional[Path]:
+        """
+        Obtém o template do arquivo de credenciais de uma linguagem.
+        
+        Args:
+            language: Linguagem de destino (ex: 'php')
+        
+        Returns:
+            Caminho do template (o de PHP como fallback) ou None se não existe
+        """
         extensions = {
             'php': '.php',
             'python': '.py',
             'javascript': '.js'
         }
         extension = extensions.get(language, '.php')
-        template_path = Path(f"templates/credentials/Credentials{extension}")
-        
-        if template_path.exists():
-            import shutil
-            # Copia o arquivo de credenciais para a pasta de output
-            shutil.copy2(template_path, credentials_path)
-            return True
-        
-        # Se não encontrou template específico, tenta copiar o PHP como fallback
-        if language != 'php':
-            php_template = Path("templates/credentials/Credentials.php")
-            if php_template.exists():
-                import shutil
-                shutil.copy2(php_template, credentials_path)
-                return True
-        
-        return False
+        for template_path in (Path(f"templates/credentials/Credentials{extension}"),
+                              Path("templates/credentials/Credentials.php")):
+            if template_path.exists():
+                return template_path
+        return None
     
     def get_relative_path_from_workflow_to_credentials(self, workflow: dict, language: str = "php") -> str:
         """
@@ -176,3 +240,68 @@ class FolderStructure:
         
         # Workflow está em output/{language}/, então precisa subir 1 nível para chegar em output/
         return f'../credentials/{credentials_file}'
+    
+    def ensure_runtime_files(self, language: str = "php") -> bool:
+        """
+        Garante que os módulos de runtime (templates/runtime) da linguagem
+        existem na pasta de output. Copia do template se necessário.
+        
+        Args:
+            language: Linguagem de destino (ex: 'php')
+        
+        Returns:
+            True se os arquivos existem ou foram criados com sucesso
+        """
+        extensions = {
+            'php': '.php',
+            'python': '.py',
+            'javascript': '.js'
+        }
+        extension = extensions.get(language, '.php')
+        templates_dir = Path("templates/runtime")
+        
+        if not templates_dir.exists():
+            return False
+        
+        import shutil
+        self.runtime_dir.mkdir(exist_ok=True)
+        for template_path in templates_dir.glob(f"*{extension}"):
+            runtime_path = self.runtime_dir / template_path.name
+            # Atualiza cópias antigas: o código gerado depende da versão do runtime
+            if not runtime_path.exists() or runtime_path.stat().st_mtime < template_path.stat().st_mtime:
+                shutil.copy2(template_path, runtime_path)
+        
+        return True
+    
+    def get_shared_runtime_path(self, language: str = "php") -> Path:
+        """
+        Obtém o caminho do runtime compartilhado dos nós (NodeRuntime) de uma linguagem.
+        
+        Args:
+            language: Linguagem de destino (ex: 'php')
+            
+        Returns:
+            Caminho do arquivo (ex: output/runtime/NodeRuntime.php)
+        """
+        extensions = {
+            'php': '.php',
+            'python': '.py',
+            'javascript': '.js'
+        }
+        extension = extensions.get(language, '.php')
+        return self.runtime_dir / f'NodeRuntime{extension}'
+    
+    def get_relative_path_from_workflow_to_runtime(self, workflow: dict, language: str = "php") -> str:
+        """
+        Calcula o caminho relativo de um workflow para a pasta de runtime.
+        
+        Os workflows ficam em output/{language}/ e os módulos de runtime em output/runtime/
+        
+        Args:
+            workflow: Dados do workflow
+            language: Linguagem de destino (ex: 'php')
+            
+        Returns:
+            Caminho relativo (ex: '../runtime')
+        """
+        return '../runtime'
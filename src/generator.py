@@ -1,9 +1,14 @@
 """
 Módulo para gerar classes de código a partir de workflows do n8n.
 """
+import json
+import re
+import shutil
+from collections import deque
 from typing import List, Dict, Optional
 from xml_loader import XMLLoader
 from node_mapper import NodeMapper
+from symbol_table import SymbolTable
 from folder_structure import FolderStructure
 from parameter_extractor import ParameterExtractor
 from expression_parser import ExpressionParser
@@ -12,18 +17,50 @@ from expression_parser import ExpressionParser
 class Generator:
     """Classe para gerar código a partir de workflows."""
     
-    def __init__(self, xml_loader: XMLLoader, language: str = "php"):
+    # Tipos de nó cujo código pode ler qualquer saída do contexto
+    CONTEXT_READING_NODE_TYPES = {'function', 'functionItem', 'code'}
+    
+    def __init__(self, xml_loader: XMLLoader, language: str = "php", instrument: bool = False,
+                 trace: bool = False, checkpoint: bool = False, resource_threshold: Optional[int] = 4096,
+                 shared_runtime: bool = False, render_cache=None):
         """
         Inicializa o gerador.
         
         Args:
             xml_loader: Instância do XMLLoader
             language: Linguagem de destino
+            instrument: Se True, gera classes que medem latência, tamanho da saída
+                e erros de cada nó (sem custo nenhum quando False)
+            trace: Se True, gera classes que gravam um span por nó em um
+                arquivo de traces (JSON lines compatível com OTLP)
+            checkpoint: Se True, gera classes que gravam o contexto depois de
+                cada nó e podem retomar uma execução que falhou (resume)
+            resource_threshold: Tamanho (bytes) a partir do qual corpos JSON e
+                prompts estáticos vão para arquivos de recurso ao lado da
+                classe, carregados no primeiro uso (None desativa)
+            shared_runtime: Se True, a lógica dos nós HTTP Request e AI Agent
+                fica em um módulo de runtime compartilhado por todas as classes
+                da linguagem (NodeRuntime) e cada classe guarda só a
+                configuração dos seus nós
+            render_cache: RenderCache compartilhado que guarda os métodos já
+                renderizados; nós idênticos em workflows diferentes não são
+                renderizados de novo (None desativa)
         """
         self.xml_loader = xml_loader
         self.node_mapper = NodeMapper(xml_loader, language)
         self.folder_structure = FolderStructure()
         self.language = language
+        self.instrument = instrument
+        self.trace = trace
+        self.checkpoint = checkpoint
+        self.node_mapper.resource_threshold = resource_threshold
+        self.node_mapper.shared_runtime = shared_runtime
+        self.node_mapper.render_cache = render_cache
+        # Código do runtime compartilhado (renderizado uma vez por Generator) e se já foi gravado
+        self._shared_runtime_code: Optional[str] = None
+        self._shared_runtime_saved = set()
+        # Recursos da última classe gerada (nome do arquivo -> conteúdo), gravados por save_generated_code()
+        self.resources: Dict[str, str] = {}
         self.parameter_extractor = ParameterExtractor()
     
     def generate_class(self, workflow: Dict) -> Optional[str]:
@@ -70,16 +107,51 @@ class Generator:
         # Determina a ordem de execução dos nós
         ordered_nodes = self._determine_execution_order(nodes)
         
+        # Nomes dos métodos e chaves de saída de todos os nós, calculados uma vez para todas as etapas
+        symbols = self._build_symbol_table(nodes)
+        self.node_mapper.symbols = symbols
+        
         # Gera métodos para cada nó (agora com parsing de expressões)
+        self.node_mapper.resources = {}
+        self.node_mapper.uses_shared_runtime = False
         methods = []
         method_calls = []
+        upstream = self._determine_upstream_nodes(ordered_nodes, symbols)
+        self.node_mapper.upstream = upstream
+        releases = self._determine_output_releases(ordered_nodes, symbols)
         
         for node in ordered_nodes:
             method_code = self.node_mapper.map_node_to_method(node)
             if method_code:
                 methods.append(method_code)
-                method_name = self.node_mapper.generate_method_name(node)
-                method_calls.append(f"$this->{method_name}();")
+                method_calls.append(self._generate_step_call(node, upstream.get(node.get('id'), []), symbols))
+                # Libera as saídas que nenhum nó seguinte lê
+                if releases.get(node.get('id')):
+                    method_calls.append(self._generate_release_call(releases[node.get('id')]))
+        self.resources = dict(self.node_mapper.resources)
+        if self.node_mapper.uses_shared_runtime and self.language == "php":
+            # Os métodos do runtime compartilhado entram na classe pelo trait
+            methods.insert(0, 'use NodeRuntime;')
+        
+        # Adiciona helpers exigidos pelos tipos de nó presentes
+        run_setup = []
+        run_teardown = []
+        run_error = []
+        shared_setup = []
+        for helper_name in self._collect_helpers(ordered_nodes, bool(releases)):
+            helper = self.xml_loader.load_helper_template(helper_name, self.language)
+            if not helper:
+                continue
+            if helper['method']:
+                methods.append(helper['method'])
+            if helper['setup']:
+                run_setup.append(helper['setup'])
+            if helper['teardown']:
+                run_teardown.append(helper['teardown'])
+            if helper['error']:
+                run_error.append(helper['error'])
+            if helper['shared']:
+                shared_setup.append(helper['shared'])
         
         # Atualiza parâmetros do construtor com os usados pelo parser
         final_params = expression_parser.get_constructor_params()
@@ -92,8 +164,9 @@ class Generator:
         # Gera código de use statements para credenciais
         credentials_use = self._generate_credentials_use(workflow)
         
-        # Calcula caminho relativo para credenciais
+        # Calcula caminho relativo para credenciais e módulos de runtime
         credentials_relative_path = self.folder_structure.get_relative_path_from_workflow_to_credentials(workflow, self.language)
+        runtime_relative_path = self.folder_structure.get_relative_path_from_workflow_to_runtime(workflow, self.language)
         
         # Substitui placeholders no template
         class_name = self._generate_class_name(workflow)
@@ -102,17 +175,32 @@ class Generator:
         indented_calls = '\n            '.join(method_calls)
         
         generated_code = class_template.replace('{{class_name}}', class_name)
-        generated_code = generated_code.replace('{{workflow_name}}', workflow_name)
         generated_code = generated_code.replace('{{steps_methods}}', steps_methods)
         generated_code = generated_code.replace('{{steps_calls}}', indented_calls)
         generated_code = generated_code.replace('{{constructor}}', constructor_code)
-        
-        # Gera código de credenciais
-        credentials_code = self._generate_credentials_code(workflow)
+        generated_code = self._replace_block(generated_code, '{{run_setup}}', run_setup, before=False)
+        generated_code = self._replace_block(generated_code, '{{run_teardown}}', run_teardown, before=True)
+        generated_code = self._replace_block(generated_code, '{{run_error}}', run_error, before=True)
+        generated_code = self._replace_block(generated_code, '{{shared_setup}}', shared_setup, before=False,
+                                             indent='\n        ')
+        # Depois dos blocos dos helpers, que também usam o nome: no código ele vai como literal escapado
+        generated_code = generated_code.replace(
+            '{{workflow_name_literal}}', self.node_mapper._format_literal(workflow_name)
+        )
+        generated_code = generated_code.replace('{{workflow_name}}', workflow_name)
+
+        # Gera código de credenciais (e a importação do runtime compartilhado, se usado)
+        credentials_code = '\n'.join(
+            code for code in (self._generate_credentials_code(workflow), self._generate_shared_runtime_import()) if code
+        )
         generated_code = generated_code.replace('{{credentials_use}}', credentials_code)
         generated_code = generated_code.replace('{{credentials_import}}', credentials_code)
         generated_code = generated_code.replace('{{credentials_require}}', credentials_code)
         generated_code = generated_code.replace('{{credentials_path}}', credentials_relative_path)
+        generated_code = generated_code.replace('{{runtime_path_base}}', runtime_relative_path)
+        generated_code = generated_code.replace(
+            '{{resources_dir}}', self.folder_structure.get_resources_dir(workflow, self.language).name
+        )
         generated_code = generated_code.replace('{{version}}', '1.0.0')
         
         # Placeholders específicos por linguagem
@@ -125,11 +213,439 @@ class Generator:
         
         return generated_code
     
+    def _replace_block(self, code: str, placeholder: str, blocks: List[str], before: bool,
+                       indent: str = '\n            ') -> str:
+        """
+        Substitui um placeholder de bloco dentro de um método da classe.
+        
+        Os blocos são separados por uma linha em branco (antes ou depois do
+        conjunto, conforme a posição) e a linha do placeholder é removida
+        quando não há blocos.
+        
+        Args:
+            code: Código com o placeholder
+            placeholder: Placeholder (ex: '{{run_setup}}')
+            blocks: Trechos de código a inserir
+            before: Se True, separa os blocos do código anterior; senão, do seguinte
+            indent: Quebra de linha e indentação do placeholder (padrão: corpo de run())
+            
+        Returns:
+            Código com o placeholder substituído
+        """
+        if not blocks:
+            return re.sub(r'\n[ \t]*' + re.escape(placeholder) + r'[ \t]*(?=\n)', '', code)
+        
+        value = (indent + indent).join(blocks)
+        value = indent + value if before else value + indent
+        return code.replace(placeholder, value)
+    
+    def _build_symbol_table(self, nodes: List[Dict]) -> SymbolTable:
+        """
+        Monta a tabela de símbolos (nomes de métodos e chaves de saída) de um workflow.
+        
+        Os nomes evitam as palavras reservadas da linguagem e os membros da
+        classe gerada, e nós cujos nomes viram o mesmo identificador recebem
+        sufixos numéricos.
+        
+        Args:
+            nodes: Nós do workflow (na ordem do workflow, que decide os sufixos)
+            
+        Returns:
+            Tabela de símbolos do workflow
+        """
+        return SymbolTable(nodes, self.language, self.node_mapper.generate_method_name,
+                           self.xml_loader.load_class_member_names(self.language))
+    
+    def _generate_step_call(self, node: Dict, parents: List[str], symbols: SymbolTable) -> str:
+        """
+        Gera a chamada de um método de nó dentro de run() para a linguagem.
+        
+        Com instrumentação, tracing e/ou checkpoints ativados, a chamada é
+        envolvida pelos helpers 'instrumentation', 'tracing' e 'checkpoint'
+        (o tracing fica por fora da medição, para que o span inclua o tempo
+        de medição, e o checkpoint por fora de todos, para que nós pulados em
+        resume() não gerem métricas nem spans); caso contrário é uma chamada direta.
+        
+        Args:
+            node: Dados do nó
+            parents: Nomes dos métodos dos nós imediatamente anteriores no DAG
+            symbols: Tabela de símbolos do workflow
+            
+        Returns:
+            Código da chamada
+        """
+        method_name = symbols.method_name(node)
+        output_key = symbols.output_key(node)
+        
+        if self.language == "python":
+            prefix, reference, call_format = "self._", f"self.{method_name}", "{}"
+            deferred_format = "lambda: {}"
+        elif self.language == "javascript":
+            prefix, reference, call_format = "this._", f"() => this.{method_name}()", "await {};"
+            deferred_format = "() => {}"
+        else:  # PHP (padrão)
+            prefix, reference, call_format = "$this->", f"fn() => $this->{method_name}()", "{};"
+            deferred_format = "fn() => {}"
+        
+        wrappers = []
+        if self.instrument:
+            wrappers.append(('instrumented', f"'{method_name}', '{output_key}'"))
+        if self.trace:
+            node_type = self.node_mapper.get_template_type(node)
+            parents_list = '[' + ', '.join(f"'{parent}'" for parent in parents) + ']'
+            wrappers.append(('traced', f"'{method_name}', '{output_key}', '{node_type}', {parents_list}"))
+        if self.checkpoint:
+            wrappers.append(('checkpointed', f"'{method_name}'"))
+        
+        if not wrappers:
+            if self.language == "python":
+                return f"self.{method_name}()"
+            elif self.language == "javascript":
+                return f"await this.{method_name}();"
+            else:  # PHP (padrão)
+                return f"$this->{method_name}();"
+        
+        step = reference
+        for index, (wrapper, arguments) in enumerate(wrappers):
+            call = f"{prefix}{wrapper}({arguments}, {step})"
+            if index < len(wrappers) - 1:
+                step = deferred_format.format(call)
+        
+        return call_format.format(call)
+    
+    def _generate_release_call(self, output_keys: List[str]) -> str:
+        """
+        Gera a chamada que remove do contexto saídas que não serão mais lidas.
+        
+        Args:
+            output_keys: Chaves das saídas a liberar
+            
+        Returns:
+            Código da chamada
+        """
+        keys = ', '.join(f"'{key}'" for key in output_keys)
+        if self.language == "python":
+            return f"self._release_outputs({keys})"
+        elif self.language == "javascript":
+            return f"this._releaseOutputs({keys});"
+        else:  # PHP (padrão)
+            return f"$this->releaseOutputs({keys});"
+    
+    def _determine_output_releases(self, nodes: List[Dict],
+                                   symbols: Optional[SymbolTable] = None) -> Dict[str, List[str]]:
+        """
+        Determina, a partir do DAG, depois de qual nó cada saída deixa de ser lida.
+        
+        Consomem a saída de um nó: os nós conectados a ele, os nós cujos
+        parâmetros o referenciam ($node["Nome"], $('Nome')) e os nós de código
+        (function/code) executados depois dele, que podem ler o contexto
+        inteiro. Saídas sem consumidores (nós finais) são o resultado do
+        workflow e nunca são liberadas.
+        
+        Args:
+            nodes: Nós do workflow na ordem de execução
+            symbols: Tabela de símbolos do workflow (padrão: montada a partir dos nós)
+            
+        Returns:
+            Dicionário id do nó => chaves das saídas liberadas após sua execução
+        """
+        symbols = symbols or self._build_symbol_table(nodes)
+        position = {node.get('id'): index for index, node in enumerate(nodes)}
+        last_opaque = max((
+            index for index, node in enumerate(nodes)
+            if self.node_mapper.get_template_type(node) in self.CONTEXT_READING_NODE_TYPES
+        ), default=-1)
+        references = self._determine_name_references(nodes)
+        
+        releases = {}
+        for index, node in enumerate(nodes):
+            consumers = [position[target] for target in self._get_connected_node_ids(node) if target in position]
+            consumers.extend(other for other in references.get(node.get('name'), ()) if other != index)
+            
+            # Sem consumidores: saída final do workflow
+            if not consumers:
+                continue
+            
+            if last_opaque > index:
+                consumers.append(last_opaque)
+            last_use = max(consumers)
+            
+            # Conexões para trás (ciclos) mantêm a saída
+            if last_use <= index:
+                continue
+            
+            last_node_id = nodes[last_use].get('id')
+            output_key = symbols.output_key(node)
+            releases.setdefault(last_node_id, []).append(output_key)
+        
+        return releases
+    
+    # Referências a outro nó nos parâmetros: $node["Nome"], $("Nome"), $items("Nome") e $node.Nome
+    # (as aspas aparecem escapadas (\") nos parâmetros serializados)
+    _QUOTED_REFERENCE = re.compile(
+        r'\$node\[\s*\\?["\'](.*?)\\?["\']\s*\]'
+        r'|\$(?:items)?\(\s*\\?["\'](.*?)\\?["\']\s*\)'
+    )
+    _DOT_REFERENCE = re.compile(r'\$node\.([^.\[\]()"\'\\]+)')
+    _WORD_END = re.compile(r'\w\b')
+    
+    def _determine_name_references(self, nodes: List[Dict]) -> Dict[str, set]:
+        """
+        Mapeia o nome de cada nó para as posições dos nós que o referenciam nos parâmetros.
+        
+        Percorre os parâmetros de cada nó uma única vez (custo linear no
+        tamanho do workflow), em vez de procurar o nome de cada nó nos
+        parâmetros de todos os outros.
+        
+        Args:
+            nodes: Nós do workflow na ordem de execução
+            
+        Returns:
+            Dicionário nome do nó => posições dos nós que o referenciam
+        """
+        names = {node.get('name') for node in nodes if node.get('name')}
+        references: Dict[str, set] = {}
+        for index, node in enumerate(nodes):
+            text = json.dumps(node.get('parameters', {}), ensure_ascii=False)
+            if '$' not in text:
+                continue
+            for match in self._QUOTED_REFERENCE.finditer(text):
+                name = match.group(1) if match.group(1) is not None else match.group(2)
+                if name in names:
+                    references.setdefault(name, set()).add(index)
+            # $node.Nome termina em um limite de palavra: testa cada prefixo que termina em um
+            for match in self._DOT_REFERENCE.finditer(text):
+                candidate = match.group(1)
+                for end in self._WORD_END.finditer(candidate):
+                    if candidate[:end.end()] in names:
+                        references.setdefault(candidate[:end.end()], set()).add(index)
+        return references
+    
+    def _determine_upstream_nodes(self, nodes: List[Dict], symbols: SymbolTable) -> Dict[str, List[str]]:
+        """
+        Determina, para cada nó, os métodos dos nós que apontam para ele.
+        
+        Args:
+            nodes: Nós do workflow (na ordem de execução)
+            symbols: Tabela de símbolos do workflow
+            
+        Returns:
+            Dicionário id do nó => nomes dos métodos dos nós anteriores
+        """
+        nodes_by_id = {node.get('id'): node for node in nodes}
+        upstream = {}
+        
+        for node in nodes:
+            method_name = symbols.method_name(node)
+            for target_id in self._get_connected_node_ids(node):
+                if target_id in nodes_by_id:
+                    parents = upstream.setdefault(target_id, [])
+                    if method_name not in parents:
+                        parents.append(method_name)
+        
+        return upstream
+    
+    def _get_connected_node_ids(self, node: Dict) -> List[str]:
+        """
+        Obtém os ids dos nós conectados às saídas de um nó.
+        
+        Args:
+            node: Dados do nó
+            
+        Returns:
+            Lista de ids, na ordem das conexões
+        """
+        target_ids = []
+        connections = node.get('connections', {})
+        for output_key, output_connections in connections.items():
+            # output_connections pode ser dict ou list
+            if isinstance(output_connections, dict):
+                connection_lists = output_connections.values()
+            elif isinstance(output_connections, list):
+                connection_lists = output_connections
+            else:
+                continue
+            
+            for connection_list in connection_lists:
+                # n8n agrupa as conexões em listas aninhadas ([[{...}]])
+                pending = [connection_list]
+                while pending:
+                    connection = pending.pop(0)
+                    if isinstance(connection, list):
+                        pending[0:0] = connection
+                        continue
+                    # connection pode ser dict ou string (node_id direto)
+                    if isinstance(connection, dict):
+                        target_id = connection.get('node')
+                    elif isinstance(connection, str):
+                        target_id = connection
+                    else:
+                        continue
+                    if target_id and target_id not in target_ids:
+                        target_ids.append(target_id)
+        
+        return target_ids
+    
+    def _collect_helpers(self, nodes: List[Dict], releases_outputs: bool = False) -> List[str]:
+        """
+        Determina quais métodos auxiliares (templates/helpers) a classe precisa.
+        
+        Args:
+            nodes: Nós do workflow
+            releases_outputs: Se run() libera saídas de nós durante a execução
+            
+        Returns:
+            Lista com os nomes dos helpers, sem repetição
+        """
+        helpers = []
+        node_types = {self.node_mapper.get_template_type(node) for node in nodes}
+        
+        # Primeiro: o setup restaura o contexto em resume() antes dos demais helpers
+        if self.checkpoint:
+            helpers.append('checkpoint')
+        
+        if 'aiAgent' in node_types:
+            helpers.append('aiStreaming')
+        
+        if 'if' in node_types:
+            # Avaliação das condições convertidas dos nós IF
+            helpers.append('conditions')
+        
+        if 'aiAgent' in node_types or 'httpRequest' in node_types:
+            # Cliente HTTP compartilhado: pool de conexões e record/replay (setCassette)
+            helpers.append('httpClient')
+            helpers.append('responseCache')
+        
+        if self.instrument:
+            helpers.append('instrumentation')
+        
+        if self.trace:
+            helpers.append('tracing')
+        
+        if releases_outputs:
+            helpers.append('outputLiveness')
+        
+        if self.node_mapper.resources:
+            # Literais grandes em arquivos ao lado da classe, carregados sob demanda
+            helpers.append('resources')
+        
+        return helpers
+    
+    def generate_server(self, workflow: Dict) -> Optional[str]:
+        """
+        Gera o servidor HTTP (ponto de entrada) de um workflow acionado por webhook.
+        
+        O servidor roteia o caminho e o método de cada nó Webhook para a
+        classe gerada: aplicação ASGI em Python, módulo http em JavaScript e
+        front controller para PHP-FPM.
+        
+        Args:
+            workflow: Dados completos do workflow
+            
+        Returns:
+            Código do servidor ou None se o workflow não tem nós Webhook
+        """
+        nodes = workflow.get('nodes', [])
+        symbols = self._build_symbol_table(nodes)
+        routes = self._determine_webhook_routes(nodes, symbols)
+        if not routes:
+            return None
+        
+        server_template = self.xml_loader.load_server_template(self.language)
+        if not server_template:
+            print(f"Erro: Template de servidor '{self.language}' não encontrado.")
+            return None
+        
+        # A resposta dos webhooks síncronos é a saída do último nó executado
+        last_node = self._determine_execution_order(nodes)[-1]
+        response_key = symbols.output_key(last_node)
+        
+        class_file = self.folder_structure.get_output_file_path(workflow, self.language)
+        runtime_relative_path = self.folder_structure.get_relative_path_from_workflow_to_runtime(workflow, self.language)
+        
+        if self.language == "php":
+            entries = []
+            for route in routes:
+                items = ', '.join(f"'{key}' => {self._php_string(value)}" for key, value in route.items())
+                entries.append(f"    [{items}]")
+            routes_literal = '[\n' + ',\n'.join(entries) + '\n]'
+            response_literal = self._php_string(response_key)
+            module_literal = self._php_string(f'/{class_file.name}')
+        else:
+            if self.language == "javascript":
+                routes = [{('responseMode' if key == 'response_mode' else key): value for key, value in route.items()}
+                          for route in routes]
+            # Somente strings: o JSON também é um literal Python válido
+            routes_literal = json.dumps(routes, ensure_ascii=False, indent=4)
+            response_literal = repr(response_key) if self.language == "python" else json.dumps(response_key)
+            module_literal = (repr(class_file.stem) if self.language == "python"
+                              else json.dumps(f'./{class_file.name}', ensure_ascii=False))
+        
+        generated_code = server_template.replace('{{class_name}}', self._generate_class_name(workflow))
+        generated_code = generated_code.replace('{{class_module_literal}}', module_literal)
+        generated_code = generated_code.replace('{{class_module}}', class_file.stem)
+        generated_code = generated_code.replace('{{workflow_name}}', workflow.get('name', 'Workflow sem nome'))
+        generated_code = generated_code.replace('{{routes}}', routes_literal)
+        generated_code = generated_code.replace('{{response_key}}', response_literal)
+        generated_code = generated_code.replace('{{runtime_path_base}}', runtime_relative_path)
+        generated_code = generated_code.replace('{{version}}', '1.0.0')
+        
+        return generated_code
+    
+    def _determine_webhook_routes(self, nodes: List[Dict],
+                                  symbols: Optional[SymbolTable] = None) -> List[Dict[str, str]]:
+        """
+        Extrai as rotas HTTP dos nós Webhook.
+        
+        Args:
+            nodes: Nós do workflow
+            symbols: Tabela de símbolos do workflow (padrão: montada a partir dos nós)
+            
+        Returns:
+            Lista de rotas com 'method', 'path', 'node' e 'response_mode'
+        """
+        symbols = symbols or self._build_symbol_table(nodes)
+        routes = []
+        for node in nodes:
+            if self.node_mapper.get_template_type(node).lower() != 'webhook':
+                continue
+            
+            parameters = node.get('parameters', {})
+            methods = parameters.get('httpMethod') or 'GET'
+            if not isinstance(methods, list):
+                methods = [methods]
+            path = parameters.get('path') or node.get('webhookId') or symbols.method_name(node)
+            
+            for method in methods:
+                routes.append({
+                    'method': str(method).upper(),
+                    'path': str(path).strip('/'),
+                    'node': node.get('name', ''),
+                    'response_mode': parameters.get('responseMode') or 'onReceived'
+                })
+        return routes
+    
+    def _php_string(self, value: str) -> str:
+        """
+        Gera um literal de string PHP (aspas simples).
+        
+        Args:
+            value: Texto
+            
+        Returns:
+            Literal PHP
+        """
+        return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+    
     def _determine_execution_order(self, nodes: List[Dict]) -> List[Dict]:
         """
         Determina a ordem de execução dos nós baseado nas conexões.
-        Usa ordenação topológica para garantir que os nós sejam executados
-        na ordem correta (dependências primeiro).
+        Usa ordenação topológica (algoritmo de Kahn) para garantir que cada
+        nó seja executado depois de todos os nós que apontam para ele.
+        Entre nós prontos ao mesmo tempo, mantém a ordem do workflow, com
+        os nós Start primeiro. Em um ciclo, entra primeiro o nó alcançado a
+        partir de um nó já executado (como na ordem de conexão das versões
+        anteriores) e a ordenação continua a partir dele.
         
         Args:
             nodes: Lista de nós do workflow
@@ -143,103 +659,54 @@ class Generator:
         # Mapeia nós por ID para acesso rápido
         nodes_by_id = {node.get('id'): node for node in nodes}
         
-        # Encontra o nó inicial (Start node ou nó sem conexões de entrada)
-        start_nodes = []
+        # Conta as conexões de entrada de cada nó
+        targets = {}
+        in_degree = {node.get('id'): 0 for node in nodes}
         for node in nodes:
-            node_id = node.get('id')
-            has_input_connections = False
-            
-            # Verifica se algum outro nó aponta para este
-            for other_node in nodes:
-                connections = other_node.get('connections', {})
-                for output_key, output_connections in connections.items():
-                    # output_connections pode ser dict ou list
-                    if isinstance(output_connections, dict):
-                        connection_lists = output_connections.values()
-                    elif isinstance(output_connections, list):
-                        connection_lists = output_connections
-                    else:
-                        continue
-                    
-                    for connection_list in connection_lists:
-                        if not isinstance(connection_list, list):
-                            connection_list = [connection_list]
-                        for connection in connection_list:
-                            if isinstance(connection, dict):
-                                if connection.get('node') == node_id:
-                                    has_input_connections = True
-                                    break
-                            elif isinstance(connection, str) and connection == node_id:
-                                has_input_connections = True
-                                break
-                        if has_input_connections:
-                            break
-                    if has_input_connections:
-                        break
-                if has_input_connections:
-                    break
-            
-            # Se é um nó Start ou não tem entradas, é um nó inicial
+            node_targets = [target for target in self._get_connected_node_ids(node) if target in nodes_by_id]
+            targets[node.get('id')] = node_targets
+            for target_id in node_targets:
+                in_degree[target_id] += 1
+        
+        # Nós iniciais: Start primeiro, depois os nós sem conexões de entrada
+        def is_start(node: Dict) -> bool:
             node_type = node.get('type', '')
-            if node_type.endswith('.start') or node_type == 'n8n-nodes-start' or not has_input_connections:
-                start_nodes.append(node)
+            return node_type.endswith('.start') or node_type == 'n8n-nodes-start'
         
-        # Se não encontrou nó inicial, usa o primeiro
-        if not start_nodes:
-            start_nodes = [nodes[0]] if nodes else []
+        ready = deque(sorted((node for node in nodes if in_degree[node.get('id')] == 0),
+                             key=lambda node: not is_start(node)))
         
-        # Ordenação topológica: visita nós na ordem correta
+        # Ordenação topológica: um nó fica pronto quando todos os anteriores executaram
         ordered = []
         visited = set()
-        
-        def visit_node(node_id: str):
-            """Visita um nó e seus dependentes em ordem topológica."""
-            if node_id in visited:
-                return
-            
-            node = nodes_by_id.get(node_id)
-            if not node:
-                return
-            
-            # Marca como visitado antes de processar dependências
-            visited.add(node_id)
-            
-            # Primeiro adiciona o nó atual
-            ordered.append(node)
-            
-            # Depois visita os nós conectados (próximos na sequência)
-            connections = node.get('connections', {})
-            for output_key, output_connections in connections.items():
-                # output_connections pode ser dict ou list
-                if isinstance(output_connections, dict):
-                    connection_lists = output_connections.values()
-                elif isinstance(output_connections, list):
-                    connection_lists = output_connections
-                else:
+        reached = set()
+        while True:
+            while ready:
+                node = ready.popleft()
+                node_id = node.get('id')
+                if node_id in visited:
                     continue
+                visited.add(node_id)
+                ordered.append(node)
                 
-                for connection_list in connection_lists:
-                    if not isinstance(connection_list, list):
-                        connection_list = [connection_list]
-                    for connection in connection_list:
-                        # connection pode ser dict ou string (node_id direto)
-                        if isinstance(connection, dict):
-                            target_node_id = connection.get('node')
-                            if target_node_id and target_node_id not in visited:
-                                visit_node(target_node_id)
-                        elif isinstance(connection, str) and connection not in visited:
-                            visit_node(connection)
-        
-        # Visita todos os nós iniciais
-        for start_node in start_nodes:
-            node_id = start_node.get('id')
-            if node_id not in visited:
-                visit_node(node_id)
-        
-        # Adiciona nós não visitados (caso haja desconexões)
+                for target_id in targets.get(node_id, []):
+                    reached.add(target_id)
+                    in_degree[target_id] -= 1
+                    if in_degree[target_id] == 0:
+                        ready.append(nodes_by_id[target_id])
+            
+            # Ciclo: libera o primeiro nó (na ordem do workflow) alcançado por um nó já executado
+            cycle_entry = next((node for node in nodes
+                                if node.get('id') in reached and node.get('id') not in visited), None)
+            if cycle_entry is None:
+                break
+            ready.append(cycle_entry)
+        
+        # Adiciona nós não visitados (ciclos sem entrada ou IDs duplicados, comparados pelo objeto)
+        ordered_nodes = {id(node) for node in ordered}
         for node in nodes:
-            node_id = node.get('id')
-            if node_id not in visited:
+            if id(node) not in ordered_nodes:
+                ordered_nodes.add(id(node))
                 ordered.append(node)
         
         return ordered
@@ -353,7 +820,8 @@ class Generator:
             for param_name in params.keys():
                 constructor_body.append(f"        self.params['{param_name}'] = kwargs.get('{param_name}')")
         
-        return '\n'.join(constructor_body)
+        # O template já indenta a primeira linha
+        return '\n'.join(constructor_body).lstrip()
     
     def _generate_constructor_javascript(self, params: Dict[str, str]) -> str:
         """Gera construtor JavaScript"""
@@ -423,25 +891,75 @@ class Generator:
             return ''
         
         if self.language == "python":
-            # Python imports
+            # Python imports (o registro resolve as credenciais, o limitador controla a taxa dos nós AI Agent
+            # e o AiStream monta as respostas em streaming)
             imports = []
-            for cred_class in sorted(list(credentials_needed)):
-                imports.append(f"from {cred_class} import {cred_class}")
+            imports.append(f"from Credentials import {', '.join(sorted(credentials_needed))}, credentials_registry")
+            imports.append("from RateLimiter import estimate_tokens, get_rate_limiter")
+            imports.append("from AiStream import consume_stream")
             return '\n'.join(imports)
         elif self.language == "javascript":
             # JavaScript requires - o caminho será ajustado no template
-            requires = []
-            for cred_class in sorted(list(credentials_needed)):
-                # Usa placeholder que será substituído com o caminho relativo correto
-                requires.append(f"const {{ {cred_class} }} = require('{{credentials_path_base}}/{cred_class}.js');")
-            return '\n'.join(requires)
+            # Usa placeholder que será substituído com o caminho relativo correto
+            cred_classes = ', '.join(sorted(credentials_needed) + ['credentialsRegistry'])
+            return (
+                f"const {{ {cred_classes} }} = require('{{{{credentials_path_base}}}}/Credentials.js');\n"
+                "const { estimateTokens, getRateLimiter } = require('{{runtime_path_base}}/RateLimiter.js');\n"
+                "const { consumeStream } = require('{{runtime_path_base}}/AiStream.js');"
+            )
         else:  # PHP
             # PHP use statements
-            use_statements = []
-            for cred_class in sorted(list(credentials_needed)):
+            use_statements = ["require_once __DIR__ . '/{{runtime_path_base}}/RateLimiter.php';",
+                              "require_once __DIR__ . '/{{runtime_path_base}}/AiStream.php';"]
+            for cred_class in sorted(list(credentials_needed)) + ['CredentialsRegistry']:
                 use_statements.append(f"use {cred_class};")
             return '\n'.join(use_statements)
     
+    def _generate_shared_runtime_import(self) -> str:
+        """
+        Gera a importação do runtime compartilhado quando algum nó da classe o usa.
+        
+        Returns:
+            Código de import/require ou string vazia
+        """
+        if not self.node_mapper.uses_shared_runtime:
+            return ''
+        if self.language == "python":
+            return "import NodeRuntime"
+        if self.language == "javascript":
+            return "const NodeRuntime = require('{{runtime_path_base}}/NodeRuntime.js');"
+        return "require_once __DIR__ . '/{{runtime_path_base}}/NodeRuntime.php';"
+    
+    def shared_runtime_code(self) -> Optional[str]:
+        """
+        Código do runtime compartilhado da linguagem (renderizado na primeira chamada).
+        
+        Returns:
+            Código do módulo NodeRuntime ou None se o template não existir
+        """
+        if self._shared_runtime_code is None:
+            self._shared_runtime_code = self.node_mapper.render_shared_runtime()
+        return self._shared_runtime_code
+    
+    def _save_shared_runtime(self) -> None:
+        """
+        Grava o runtime compartilhado na pasta de runtime.
+        
+        O arquivo só é reescrito quando o conteúdo muda, e cada Generator
+        compara o conteúdo em disco uma única vez.
+        """
+        runtime_path = self.folder_structure.get_shared_runtime_path(self.language)
+        if runtime_path in self._shared_runtime_saved and runtime_path.exists():
+            return
+        code = self.shared_runtime_code()
+        if code is None:
+            return
+        if not runtime_path.exists() or runtime_path.read_text(encoding='utf-8') != code:
+            runtime_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(runtime_path, 'w', encoding='utf-8') as f:
+                f.write(code)
+        self._shared_runtime_saved.add(runtime_path)
+    
     def _generate_credentials_use(self, workflow: Dict) -> str:
         """Alias para compatibilidade"""
         return self._generate_credentials_code(workflow) + '\n'
@@ -458,13 +976,17 @@ class Generator:
             True se salvou com sucesso, False caso contrário
         """
         try:
-            # Garante que o arquivo de credenciais existe para a linguagem específica
+            # Garante que os arquivos de credenciais e runtime existem para a linguagem específica
             self.folder_structure.ensure_credentials_file(self.language)
+            self.folder_structure.ensure_runtime_files(self.language)
+            if self.node_mapper.shared_runtime:
+                self._save_shared_runtime()
             
             output_path = self.folder_structure.get_output_file_path(workflow, self.language)
             
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(code)
+            self._save_resources(workflow)
             
             print(f"✓ Arquivo gerado: {output_path}")
             return True
@@ -473,4 +995,50 @@ class Generator:
             import traceback
             traceback.print_exc()
             return False
+    
+    def _save_resources(self, workflow: Dict) -> None:
+        """
+        Grava os arquivos de recurso da última classe gerada.
+        
+        A pasta é recriada a cada geração para não deixar recursos antigos
+        e removida quando a classe não tem recursos.
+        
+        Args:
+            workflow: Dados do workflow
+        """
+        resources_dir = self.folder_structure.get_resources_dir(workflow, self.language)
+        if resources_dir.exists():
+            shutil.rmtree(resources_dir)
+        if not self.resources:
+            return
+        
+        resources_dir.mkdir()
+        for name, content in self.resources.items():
+            with open(resources_dir / name, 'w', encoding='utf-8') as f:
+                f.write(content)
+    
+    def save_generated_server(self, workflow: Dict, code: str) -> bool:
+        """
+        Salva o servidor HTTP gerado ao lado da classe do workflow.
+        
+        Args:
+            workflow: Dados do workflow
+            code: Código gerado por generate_server()
+            
+        Returns:
+            True se salvou com sucesso, False caso contrário
+        """
+        try:
+            self.folder_structure.ensure_runtime_files(self.language)
+            
+            output_path = self.folder_structure.get_server_file_path(workflow, self.language)
+            
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            
+            print(f"✓ Servidor gerado: {output_path}")
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar servidor: {e}")
+            return False
 
@@ -1,23 +1,32 @@
 """
 Ponto de entrada principal do n8ncoding.
+
+Os módulos pesados são importados somente quando o subsistema que os usa
+entra em ação: o cliente HTTP (requests) ao buscar workflows no n8n e o
+gerador (templates XML) ao gerar código. O arquivo .env é carregado por
+main(), não na importação. Assim invocações curtas (ex: em contêineres)
+não pagam pela importação do que não usam.
 """
 import json
 import os
 import sys
+import time
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Carrega variáveis de ambiente do arquivo .env
-load_dotenv()
 
 # Adiciona o diretório src ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from n8n_client import N8nClient
 from workflow_selector import WorkflowSelector
 from language_selector import LanguageSelector
-from xml_loader import XMLLoader
-from generator import Generator
+
+
+def load_environment() -> None:
+    """
+    Carrega as variáveis de ambiente do arquivo .env (python-dotenv).
+    """
+    from dotenv import load_dotenv
+    
+    load_dotenv()
 
 
 def resolve_env_variables(value: str) -> str:
@@ -96,12 +105,66 @@ def load_config() -> dict:
         return {}
 
 
-def main():
-    """Função principal do programa."""
+def generator_options(output_config: dict) -> dict:
+    """
+    Opções do Generator a partir da seção output de settings.json.
+    
+    Args:
+        output_config: Seção output das configurações
+        
+    Returns:
+        Dicionário com instrument, trace, checkpoint, resource_threshold e shared_runtime
+    """
+    return {
+        'instrument': bool(output_config.get('instrument', False)),
+        'trace': bool(output_config.get('trace', False)),
+        'checkpoint': bool(output_config.get('checkpoint', False)),
+        # Corpos e prompts maiores que o limite (bytes) vão para arquivos de recurso; 0 desativa
+        'resource_threshold': int(output_config.get('resource_threshold', 4096)) or None,
+        # Corpo dos nós HTTP Request/AI Agent em runtime/NodeRuntime.* em vez de em cada classe
+        'shared_runtime': bool(output_config.get('shared_runtime', False))
+    }
+
+
+def create_render_cache(output_config: dict):
+    """
+    Cache dos métodos renderizados compartilhado pelos geradores de uma execução.
+    
+    Args:
+        output_config: Seção output das configurações (render_cache_persist, render_cache_size)
+        
+    Returns:
+        RenderCache em memória ou persistido em output/.n8ncoding_render_cache.json
+    """
+    from render_cache import RenderCache
+    
+    path = RenderCache.DEFAULT_PATH if output_config.get('render_cache_persist', False) else None
+    return RenderCache(path, int(output_config.get('render_cache_size', RenderCache.DEFAULT_SIZE)))
+
+
+def main(argv=None):
+    """
+    Função principal do programa.
+    
+    Uso: python src/main.py [--where "node_type=aiAgent AND tag=billing"]
+    
+    Args:
+        argv: Argumentos da linha de comando
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Converte workflows do n8n em código')
+    parser.add_argument('--where', help='Seleciona os workflows por uma consulta ao catálogo local '
+                                        '(Ex: "node_type=aiAgent AND tag=billing") em vez do menu')
+    args = parser.parse_args(argv)
+    
     print("=" * 60)
     print("n8ncoding - Conversor de Workflows n8n para Código")
     print("=" * 60)
     
+    # Carrega variáveis de ambiente do arquivo .env
+    load_environment()
+    
     # Carrega configurações
     config = load_config()
     
@@ -111,6 +174,8 @@ def main():
     n8n_url = n8n_config.get('url', 'http://localhost:5678')
     n8n_api_key = n8n_config.get('api_key', '')
     language = output_config.get('language', 'php')
+    options = generator_options(output_config)
+    server = bool(output_config.get('server', False))
     
     # Valida configurações
     if not n8n_api_key:
@@ -122,6 +187,8 @@ def main():
             return
     
     # Inicializa cliente n8n
+    from n8n_client import N8nClient
+    
     print(f"\nConectando ao n8n em: {n8n_url}")
     client = N8nClient(n8n_url, n8n_api_key)
     
@@ -143,9 +210,26 @@ def main():
     
     print(f"✓ {len(workflows)} workflow(s) encontrado(s).")
     
-    # Permite seleção de workflows
-    selector = WorkflowSelector()
-    selected_workflows = selector.select_workflows(workflows)
+    # O catálogo local só é atualizado com a listagem na primeira consulta (--where ou no menu);
+    # só os workflows alterados são reindexados
+    from workflow_catalog import CatalogQueryError, WorkflowCatalog
+    
+    with WorkflowCatalog() as workflow_catalog:
+        workflow_catalog.sync_on_query(client, workflows)
+        
+        # Permite seleção de workflows
+        if args.where:
+            try:
+                ids = {match['id'] for match in workflow_catalog.query(args.where)}
+            except CatalogQueryError as e:
+                print(f"❌ {e}")
+                return
+            selected_workflows = [workflow for workflow in workflows if str(workflow.get('id')) in ids]
+            WorkflowSelector.display_workflows(selected_workflows)
+            print(f"✓ {len(selected_workflows)} workflow(s) selecionado(s) por: {args.where}")
+        else:
+            selector = WorkflowSelector()
+            selected_workflows = selector.select_workflows(workflows, workflow_catalog)
     
     if not selected_workflows:
         print("Nenhum workflow selecionado. Encerrando.")
@@ -160,7 +244,11 @@ def main():
         return
     
     # Inicializa componentes de geração
+    from xml_loader import XMLLoader
+    from generator import Generator
+    
     xml_loader = XMLLoader()
+    render_cache = create_render_cache(output_config)
     
     # Processa cada workflow selecionado para cada linguagem selecionada
     print("\n" + "=" * 60)
@@ -194,7 +282,7 @@ def main():
             print(f"\n  → Gerando código em {lang_name}...")
             
             # Cria gerador para a linguagem específica
-            generator = Generator(xml_loader, lang)
+            generator = Generator(xml_loader, lang, render_cache=render_cache, **options)
             
             # Gera a classe
             generated_code = generator.generate_class(full_workflow)
@@ -208,15 +296,137 @@ def main():
                 print(f"  ✓ {workflow_name} convertido para {lang_name} com sucesso!")
             else:
                 print(f"  ❌ Erro ao salvar arquivo {lang_name} para {workflow_name}")
+                continue
+            
+            # Gera o servidor HTTP para workflows acionados por webhook
+            if server:
+                server_code = generator.generate_server(full_workflow)
+                if server_code:
+                    generator.save_generated_server(full_workflow, server_code)
+    
+    render_cache.save()
+    report = render_cache.report()
+    if report['hits']:
+        print(f"\n✓ {report['hits']} método(s) reaproveitado(s) do cache de renderização "
+              f"({report['hit_rate']:.0%} dos nós)")
     
     print("\n" + "=" * 60)
     print("Conversão concluída!")
     print("=" * 60)
 
 
+def watch(argv=None):
+    """
+    Modo watch: consulta o n8n periodicamente e regenera somente os workflows alterados.
+    
+    Uso: python src/main.py watch [--interval 30] [--languages php,python] [--once]
+    
+    Args:
+        argv: Argumentos da linha de comando (sem o 'watch')
+    """
+    import argparse
+    
+    load_environment()
+    config = load_config()
+    n8n_config = config.get('n8n', {})
+    output_config = config.get('output', {})
+    codes = [info['code'] for info in LanguageSelector.AVAILABLE_LANGUAGES.values()]
+    
+    parser = argparse.ArgumentParser(prog='n8ncoding watch',
+                                     description='Mantém o código gerado sincronizado com o n8n')
+    parser.add_argument('--interval', type=float, default=30.0, help='Intervalo entre consultas em segundos (padrão: 30)')
+    parser.add_argument('--languages', type=lambda value: value.split(','),
+                        default=[output_config.get('language', 'php')],
+                        help=f"Linguagens separadas por vírgula ({', '.join(codes)}; padrão: output.language)")
+    parser.add_argument('--once', action='store_true', help='Sincroniza uma única vez e encerra')
+    args = parser.parse_args(argv)
+    
+    invalid = [language for language in args.languages if language not in codes]
+    if invalid:
+        parser.error(f"Linguagens inválidas: {', '.join(invalid)}")
+    if not n8n_config.get('api_key'):
+        print("⚠ Aviso: API Key do n8n não configurada (config/settings.json ou .env).")
+        return
+    
+    from n8n_client import N8nClient
+    from workflow_watcher import WorkflowWatcher
+    
+    client = N8nClient(n8n_config.get('url') or 'http://localhost:5678', n8n_config['api_key'])
+    watcher = WorkflowWatcher(
+        client, args.languages,
+        generator_options=generator_options(output_config),
+        render_cache=create_render_cache(output_config),
+        server=bool(output_config.get('server', False))
+    )
+    
+    def report(changes):
+        summary = ', '.join(f"{len(ids)} {kind}" for kind, ids in changes.items() if ids)
+        print(f"[{time.strftime('%H:%M:%S')}] {summary}")
+    
+    print(f"Observando {n8n_config.get('url')} a cada {args.interval:g}s ({', '.join(args.languages)})...")
+    watcher.run(args.interval, iterations=1 if args.once else None, on_change=report)
+
+
+def catalog(argv=None):
+    """
+    Consulta o catálogo local de workflows (sem acessar o n8n, exceto com --sync).
+    
+    Uso: python src/main.py catalog [--sync] [--where "node_type=aiAgent AND tag=billing"]
+    
+    Args:
+        argv: Argumentos da linha de comando (sem o 'catalog')
+    """
+    import argparse
+    from workflow_catalog import CatalogQueryError, WorkflowCatalog
+    
+    parser = argparse.ArgumentParser(prog='n8ncoding catalog',
+                                     description='Consulta o catálogo local de workflows')
+    parser.add_argument('--where', default='',
+                        help=f"Consulta (campos: {', '.join(WorkflowCatalog.FIELDS)}; condições unidas com AND)")
+    parser.add_argument('--sync', action='store_true', help='Atualiza o catálogo a partir do n8n antes da consulta')
+    parser.add_argument('--db', default=WorkflowCatalog.DEFAULT_PATH,
+                        help=f'Arquivo do catálogo (padrão: {WorkflowCatalog.DEFAULT_PATH})')
+    args = parser.parse_args(argv)
+    
+    with WorkflowCatalog(args.db) as workflow_catalog:
+        if args.sync:
+            load_environment()
+            n8n_config = load_config().get('n8n', {})
+            if not n8n_config.get('api_key'):
+                print("⚠ Aviso: API Key do n8n não configurada (config/settings.json ou .env).")
+                return
+            from n8n_client import N8nClient
+            
+            client = N8nClient(n8n_config.get('url') or 'http://localhost:5678', n8n_config['api_key'])
+            counts = workflow_catalog.sync(client)
+            print(', '.join(f"{count} {kind}" for kind, count in counts.items()))
+        elif not len(workflow_catalog):
+            print("Catálogo vazio. Use --sync para indexar os workflows do n8n.")
+            return
+        
+        started = time.perf_counter()
+        try:
+            matches = workflow_catalog.query(args.where)
+        except CatalogQueryError as e:
+            parser.error(str(e))
+        elapsed = (time.perf_counter() - started) * 1000
+    
+    for match in matches:
+        tags = f" [{', '.join(match['tags'])}]" if match['tags'] else ''
+        print(f"{match['id']}\t{match['name']}{tags}")
+    print(f"{len(matches)} workflow(s) em {elapsed:.1f} ms")
+
+
+# Subcomandos da CLI (python src/main.py <subcomando> ...)
+COMMANDS = {'watch': watch, 'catalog': catalog}
+
+
 if __name__ == "__main__":
     try:
-        main()
+        if sys.argv[1:2] and sys.argv[1] in COMMANDS:
+            COMMANDS[sys.argv[1]](sys.argv[2:])
+        else:
+            main(sys.argv[1:])
     except KeyboardInterrupt:
         print("\n\nOperação cancelada pelo usuário.")
     except Exception as e:
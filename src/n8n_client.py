@@ -23,6 +23,12 @@ class N8nClient:
             'X-N8N-API-KEY': api_key,
             'Content-Type': 'application/json'
         }
+        # Sessão com pool de conexões (keep-alive) reaproveitada entre as chamadas
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+    
+    # Maior tamanho de página aceito pela API pública do n8n
+    PAGE_SIZE = 250
     
     def get_workflows(self) -> List[Dict]:
         """
@@ -32,14 +38,39 @@ class N8nClient:
             Lista de workflows com informações básicas
         """
         try:
-            url = f"{self.base_url}/api/v1/workflows"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json().get('data', [])
+            return self.list_workflows()
         except requests.exceptions.RequestException as e:
             print(f"Erro ao buscar workflows: {e}")
             return []
     
+    def list_workflows(self) -> List[Dict]:
+        """
+        Busca todos os workflows, seguindo a paginação da API (limit/nextCursor).
+        
+        Diferente de get_workflows(), propaga os erros: uma listagem que falhou
+        no meio não é confundida com uma lista vazia ou incompleta.
+        
+        Returns:
+            Lista de workflows de todas as páginas
+            
+        Raises:
+            requests.exceptions.RequestException: Se alguma página falhar
+        """
+        url = f"{self.base_url}/api/v1/workflows"
+        workflows = []
+        cursor = None
+        while True:
+            params = {'limit': self.PAGE_SIZE}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            page = response.json()
+            workflows.extend(page.get('data', []))
+            cursor = page.get('nextCursor')
+            if not cursor:
+                return workflows
+    
     def get_workflow(self, workflow_id: str) -> Optional[Dict]:
         """
         Busca um workflow específico pelo ID.
@@ -52,7 +83,7 @@ class N8nClient:
         """
         try:
             url = f"{self.base_url}/api/v1/workflows/{workflow_id}"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -68,7 +99,7 @@ class N8nClient:
         """
         try:
             url = f"{self.base_url}/api/v1/workflows"
-            response = requests.get(url, headers=self.headers, timeout=5)
+            response = self.session.get(url, timeout=5)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -1,14 +1,60 @@
 """
 Módulo para mapear nós do n8n em métodos de código.
 """
+import hashlib
 import json
-from typing import Dict, Optional
+import pprint
+import re
+import textwrap
+from pathlib import Path
+from typing import Dict, List, Optional
 from xml_loader import XMLLoader
 
+# Versão deste módulo na chave do cache de renderização: entradas gravadas por outra versão não são reaproveitadas
+_MAPPER_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
 
 class NodeMapper:
     """Classe para mapear nós do workflow em métodos de código."""
     
+    # Partes de um caminho em uma expressão ($response.body..., $json...): .campo, [0] ou ["campo"]
+    _PATH_PART = re.compile(r'\.([A-Za-z_$][\w$]*)|\[\s*(\d+)\s*\]|\[\s*["\']([^"\']*)["\']\s*\]')
+    # Valor de parâmetro de página: $pageCount, $pageCount + 1, ($pageCount + 1) * 100
+    _PAGE_COUNT = re.compile(r'^\(?\s*\$pageCount\s*(?:\+\s*(\d+))?\s*\)?\s*(?:\*\s*(\d+))?$')
+    # Início de uma referência a dados em uma expressão: $json, $input.item.json,
+    # $node["Nome"].json, $('Nome').item.json e $items("Nome")[0].json
+    _DATA_REFERENCE = re.compile(
+        r'\$json'
+        r'|\$input\.(?:item|first\(\)|last\(\))\.json'
+        r'|\$node\[\s*(["\'])(?P<node>.+?)\1\s*\]\.json'
+        r'|\$\(\s*(["\'])(?P<selected>.+?)\3\s*\)\.(?:item|first\(\)|last\(\))\.json'
+        r'|\$items\(\s*(["\'])(?P<items>.+?)\5\s*\)\[\s*0\s*\]\.json'
+    )
+    # Placeholders {{nome}} dos templates de nó
+    _PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+    
+    # Tipos de nó cuja lógica pode ir para o runtime compartilhado (tipo -> função do runtime)
+    SHARED_NODE_TYPES = {'httpRequest': 'http_request', 'aiAgent': 'ai_agent'}
+    # Placeholders de código (e não de valor): nós que os preenchem continuam inline
+    _CODE_PLACEHOLDERS = ('tools_code', 'additional_code')
+    
+    # Operações do nó IF (formato v2) avaliadas pelo helper 'conditions', por tipo de valor
+    IF_OPERATIONS = {
+        'string': {'equals', 'notEquals', 'contains', 'notContains', 'startsWith', 'notStartsWith',
+                   'endsWith', 'notEndsWith', 'regex', 'notRegex', 'empty', 'notEmpty', 'exists', 'notExists'},
+        'number': {'equals', 'notEquals', 'gt', 'gte', 'lt', 'lte', 'empty', 'notEmpty', 'exists', 'notExists'},
+        'boolean': {'true', 'false', 'equals', 'notEquals', 'empty', 'notEmpty', 'exists', 'notExists'},
+        'array': {'contains', 'notContains', 'lengthEquals', 'lengthNotEquals', 'lengthGt', 'lengthGte',
+                  'lengthLt', 'lengthLte', 'empty', 'notEmpty', 'exists', 'notExists'},
+        'object': {'empty', 'notEmpty', 'exists', 'notExists'}
+    }
+    # Operações sem o segundo operando (rightValue)
+    _IF_UNARY_OPERATIONS = {'empty', 'notEmpty', 'exists', 'notExists', 'true', 'false'}
+    # IF v1 (conditions.string/number/boolean): operação padrão de cada tipo e nomes que mudaram na v2
+    _IF_V1_DEFAULTS = {'string': 'equal', 'number': 'smaller', 'boolean': 'equal'}
+    _IF_V1_OPERATIONS = {'equal': 'equals', 'notEqual': 'notEquals', 'smaller': 'lt', 'smallerEqual': 'lte',
+                         'larger': 'gt', 'largerEqual': 'gte', 'isEmpty': 'empty', 'isNotEmpty': 'notEmpty'}
+    
     def __init__(self, xml_loader: XMLLoader, language: str = "php"):
         """
         Inicializa o mapeador de nós.
@@ -20,6 +66,22 @@ class NodeMapper:
         self.xml_loader = xml_loader
         self.language = language
         self.expression_parser = None
+        # Literais maiores que o limite (bytes) viram arquivos de recurso; None desativa
+        self.resource_threshold: Optional[int] = None
+        # Recursos do workflow em geração: nome do arquivo -> conteúdo
+        self.resources: Dict[str, str] = {}
+        # Se True, nós HTTP Request e AI Agent chamam o runtime compartilhado (NodeRuntime)
+        self.shared_runtime = False
+        # Se algum nó do workflow em geração chamou o runtime compartilhado
+        self.uses_shared_runtime = False
+        # Cache de métodos renderizados (RenderCache), compartilhável entre mapeadores; None desativa
+        self.render_cache = None
+        # Hash do template de cada tipo de nó (parte da chave do cache)
+        self._template_hashes: Dict[str, str] = {}
+        # Tabela de símbolos (SymbolTable) do workflow em geração; sem ela os nomes vêm de generate_method_name()
+        self.symbols = None
+        # Métodos dos nós que apontam para cada nó (id -> nomes): entrada do $json nas condições do IF
+        self.upstream: Dict[str, List[str]] = {}
     
     def set_expression_parser(self, parser):
         """
@@ -78,6 +140,21 @@ class NodeMapper:
         
         return method_name
     
+    def method_name(self, node: Dict) -> str:
+        """
+        Nome do método de um nó: o da tabela de símbolos do workflow em geração
+        (único na classe) ou, fora dela, o de generate_method_name().
+        
+        Args:
+            node: Dados do nó do workflow
+            
+        Returns:
+            Nome do método
+        """
+        if self.symbols is not None and node in self.symbols:
+            return self.symbols.method_name(node)
+        return self.generate_method_name(node)
+    
     def _to_camel_case(self, text: str) -> str:
         """
         Converte um texto para camelCase válido em PHP.
@@ -131,50 +208,120 @@ class NodeMapper:
         
         return result if result else 'node'
     
-    def map_node_to_method(self, node: Dict) -> Optional[str]:
+    @staticmethod
+    def get_template_type(node: Dict) -> str:
         """
-        Mapeia um nó do workflow em um método de código.
+        Normaliza o tipo do nó para o nome do template correspondente.
         
         Args:
             node: Dados do nó do workflow
             
         Returns:
-            Código do método gerado ou None em caso de erro
+            Nome do template (ex: 'aiAgent', 'httpRequest', 'webhook')
         """
         node_type = node.get('type', '')
-        original_type = node_type
         
         # Normaliza tipos de AI Agent
         if 'langchain' in node_type.lower() and 'agent' in node_type.lower():
             # Tipo LangChain Agent: @n8n/n8n-nodes-langchain.agent
             node_type = 'aiAgent'
-        elif node_type.startswith('n8n-nodes-'):
-            node_type = node_type.replace('n8n-nodes-', '')
-        elif node_type.startswith('@n8n/'):
-            # Remove prefixo @n8n/ e pega apenas o nome do nó
-            parts = node_type.split('.')
-            if len(parts) > 1:
-                node_type = parts[-1]  # Pega a última parte após o ponto
+        elif node_type.startswith('n8n-nodes-') or node_type.startswith('@n8n/'):
+            # Remove o pacote (n8n-nodes-base., @n8n/n8n-nodes-langchain.) e
+            # fica apenas com o nome do nó: n8n-nodes-base.httpRequest -> httpRequest
+            node_type = node_type.replace('n8n-nodes-', '', 1).split('.')[-1]
+        
+        return node_type
+    
+    def map_node_to_method(self, node: Dict) -> Optional[str]:
+        """
+        Mapeia um nó do workflow em um método de código.
+        
+        Args:
+            node: Dados do nó do workflow
+            
+        Returns:
+            Código do método gerado ou None em caso de erro
+        """
+        node_type = self.get_template_type(node)
+        method_name = self.method_name(node)
         
         # Carrega o template do nó para a linguagem específica
         template = self.xml_loader.load_node_template(node_type, self.language)
         
         if not template:
             # Template padrão se não encontrar específico
-            return self._generate_default_method(node)
+            return self._generate_default_method(node, method_name)
+        
+        if self.render_cache is None:
+            return self._render_method(node, node_type, template['method'], method_name)
+        
+        # Nós idênticos (mesmo template, parâmetros e nome) reaproveitam o método já renderizado
+        key = self._render_cache_key(node, node_type, template['method'], method_name)
+        cached = self.render_cache.get(key)
+        if cached is None:
+            resources_before = set(self.resources)
+            uses_shared_runtime, self.uses_shared_runtime = self.uses_shared_runtime, False
+            code = self._render_method(node, node_type, template['method'], method_name)
+            cached = {
+                'code': code,
+                'resources': {name: content for name, content in self.resources.items() if name not in resources_before},
+                'shared_runtime': self.uses_shared_runtime
+            }
+            self.uses_shared_runtime = uses_shared_runtime
+            self.render_cache.put(key, cached)
+        
+        self.resources.update(cached['resources'])
+        if cached['shared_runtime']:
+            self.uses_shared_runtime = True
+        return cached['code']
+    
+    def _render_cache_key(self, node: Dict, node_type: str, method_template: str, method_name: str) -> str:
+        """
+        Chave do método de um nó no cache de renderização.
         
-        method_name = self.generate_method_name(node)
-        method_template = template['method']
+        Inclui tudo o que muda o código gerado: linguagem, template, nome, tipo
+        e parâmetros do nó, nome do método, opções do mapeador e a versão do
+        próprio NodeMapper.
+        """
+        if node_type not in self._template_hashes:
+            self._template_hashes[node_type] = hashlib.sha256(method_template.encode('utf-8')).hexdigest()
+        return self.render_cache.key(
+            _MAPPER_FINGERPRINT, self.language, self._template_hashes[node_type],
+            node.get('type'), node.get('name'), node.get('parameters', {}), method_name,
+            self.shared_runtime, self.resource_threshold,
+            # As condições do IF dependem das saídas dos nós de entrada e dos nós citados
+            self._parse_conditions(node) if node_type == 'if' else None
+        )
+    
+    def _render_method(self, node: Dict, node_type: str, method_template: str, method_name: str) -> str:
+        """
+        Renderiza o método de um nó a partir do template.
+        
+        Args:
+            node: Dados do nó
+            node_type: Tipo do template (ex: 'httpRequest')
+            method_template: Template do método do nó
+            method_name: Nome do método do nó
+            
+        Returns:
+            Código do método
+        """
+        # Runtime compartilhado: o método guarda só a configuração do nó
+        if self.shared_runtime and node_type in self.SHARED_NODE_TYPES:
+            shared_code = self._generate_shared_call(node, node_type, method_template, method_name)
+            if shared_code:
+                self.uses_shared_runtime = True
+                return shared_code
         
         # Substitui placeholders básicos
         method_code = method_template.replace('{{method_name}}', method_name)
         
         # Gera código específico baseado no tipo de nó
-        generated_code = self._generate_node_code(node, node_type)
+        generated_code = self._generate_node_code(node, node_type, method_name)
         method_code = method_code.replace('{{generated_code}}', generated_code)
         
         # Substitui outros placeholders comuns
-        method_code = self._replace_common_placeholders(method_code, node)
+        method_code = self._replace_common_placeholders(method_code, node, method_name)
         
         # Se o template não tinha {{generated_code}}, adiciona o código gerado
         if '{{generated_code}}' in method_code:
@@ -182,97 +329,160 @@ class NodeMapper:
         
         return method_code
     
-    def _generate_default_method(self, node: Dict) -> str:
+    def _generate_default_method(self, node: Dict, method_name: str) -> str:
         """
         Gera um método padrão quando não há template específico.
         
         Args:
             node: Dados do nó
+            method_name: Nome do método do nó
             
         Returns:
             Código do método padrão
         """
-        method_name = self.generate_method_name(node)
         node_name = node.get('name', 'Node')
+        node_type = node.get('type', 'unknown')
+        
+        if self.language == "python":
+            return f"""def {method_name}(self) -> None:
+        \"\"\"
+        Nó: {node_name}
+        Tipo: {node_type}
+        \"\"\"
+        # TODO: Implementar lógica específica deste nó
+        self.context['{method_name}_output'] = {{}}"""
+        elif self.language == "javascript":
+            return f"""{method_name}() {{
+        // Nó: {node_name}
+        // Tipo: {node_type}
+        // TODO: Implementar lógica específica deste nó
+        this.context['{method_name}_output'] = {{}};
+    }}"""
         
         return f"""private function {method_name}(): void
 {{
     // Nó: {node_name}
-    // Tipo: {node.get('type', 'unknown')}
+    // Tipo: {node_type}
     // TODO: Implementar lógica específica deste nó
     $this->context['{method_name}_output'] = [];
 }}"""
     
-    def _generate_node_code(self, node: Dict, node_type: str) -> str:
+    def _generate_node_code(self, node: Dict, node_type: str, method_name: str) -> str:
         """
         Gera código específico para um tipo de nó.
         
         Args:
             node: Dados do nó
             node_type: Tipo do nó
+            method_name: Nome do método do nó
             
         Returns:
             Código gerado para o nó
         """
         parameters = node.get('parameters', {})
-        method_name = self.generate_method_name(node)
         output_key = f"{method_name}_output"
         
+        # Comentário, indentação e saída vazia na sintaxe da linguagem de destino
+        comment = '#' if self.language == "python" else '//'
+        indent = '\n    ' if self.language == "php" else '\n        '
+        empty_output = {
+            'python': f"self.context['{output_key}'] = {{}}",
+            'javascript': f"this.context['{output_key}'] = {{}};"
+        }.get(self.language, f"$this->context['{output_key}'] = [];")
+        
         if node_type == 'function':
-            # Para nós function, tenta pegar o código JavaScript
+            # Para nós function, mantém o código JavaScript do n8n como referência
+            # TODO: Implementar conversão do código para a linguagem de destino
             code = parameters.get('functionCode', '')
             if code:
-                # Converte código JavaScript básico para PHP (simplificado)
-                # TODO: Implementar conversão mais completa de JS para PHP
-                php_code = code.replace('$input', '$this->context')
-                php_code = php_code.replace('items', '$this->context')
-                return f"// Código convertido do n8n\n    // {code[:100]}...\n    $this->context['{output_key}'] = [];"
-            return f"// Função vazia\n    $this->context['{output_key}'] = [];"
+                snippet = ' '.join(code[:100].split())
+                return f"{comment} Código convertido do n8n{indent}{comment} {snippet}...{indent}{empty_output}"
+            return f"{comment} Função vazia{indent}{empty_output}"
+        
+        elif node_type == 'if':
+            # Condições do n8n convertidas na configuração avaliada pelo helper 'conditions'
+            conditions = self._parse_conditions(node)
+            if 'error' in conditions:
+                print(f"Aviso: {conditions['error']} no nó '{node.get('name', 'Node')}'; o nó vai falhar ao executar")
+            assignment = {'python': 'conditions = {}', 'javascript': 'const conditions = {};'}.get(
+                self.language, '$conditions = {};')
+            return assignment.format(self._format_literal(conditions))
         
         elif node_type == 'httpRequest':
             # Para HTTP Request - o template já tem a lógica completa
             # Aqui apenas retornamos um placeholder que será substituído
-            return f"// HTTP Request processado pelo template"
+            return f"{comment} HTTP Request processado pelo template"
         
         # Código genérico para outros tipos
         node_name = node.get('name', 'Node')
-        return f"// Processamento do nó {node_type}: {node_name}\n    $this->context['{output_key}'] = [];"
+        return f"{comment} Processamento do nó {node_type}: {node_name}{indent}{empty_output}"
     
-    def _replace_common_placeholders(self, code: str, node: Dict) -> str:
+    def _replace_common_placeholders(self, code: str, node: Dict, method_name: str) -> str:
         """
         Substitui placeholders comuns no código.
         
         Args:
             code: Código com placeholders
             node: Dados do nó
+            method_name: Nome do método do nó
             
         Returns:
             Código com placeholders substituídos
         """
-        method_name = self.generate_method_name(node)
+        for placeholder, value in self._placeholder_values(node, method_name).items():
+            code = code.replace(placeholder, str(value))
+        
+        return code
+    
+    def _placeholder_values(self, node: Dict, method_name: str) -> Dict[str, str]:
+        """
+        Calcula o valor (código da linguagem de destino) de cada placeholder comum.
+        
+        Args:
+            node: Dados do nó
+            method_name: Nome do método do nó
+            
+        Returns:
+            Dicionário placeholder ('{{url}}') -> código
+        """
         output_key = f"{method_name}_output"
         parameters = node.get('parameters', {})
         
         # Processa headers se existirem
         headers = parameters.get('options', {}).get('headers', {})
-        headers_array = []
+        headers_map = {}
         if isinstance(headers, dict):
             for key, value in headers.items():
                 if isinstance(value, dict) and 'value' in value:
-                    headers_array.append(f"'{key}: {value['value']}'")
+                    headers_map[key] = value['value']
                 else:
-                    headers_array.append(f"'{key}: {value}'")
-        headers_str = '[' + ', '.join(headers_array) + ']' if headers_array else '[]'
+                    headers_map[key] = value
+        if self.language == "php":
+            # cURL espera uma lista de strings "Nome: valor"
+            headers_array = [self._format_literal(f"{key}: {value}") for key, value in headers_map.items()]
+            headers_str = '[' + ', '.join(headers_array) + ']' if headers_array else '[]'
+        elif self.language == "python":
+            headers_str = repr(headers_map)
+        else:
+            headers_str = json.dumps(headers_map, ensure_ascii=False)
         
         # Processa body
         body = parameters.get('body', {})
-        body_str = 'null'
+        null_literal = 'None' if self.language == "python" else 'null'
+        body_str = null_literal
         if body:
             try:
                 body_str = json.dumps(body, ensure_ascii=False, indent=8)
+                if self.language == "python":
+                    # Literais JSON true/false/null não são válidos em Python
+                    body_str = pprint.pformat(body, indent=4)
+                elif self.language == "php":
+                    # Objetos JSON não são literais PHP: vira array associativo
+                    body_str = self._format_literal(body)
                 body_str = body_str.replace('\n', '\n    ')
             except:
-                body_str = 'null'
+                body_str = null_literal
+        body_str = self._externalize(method_name, 'body', body, body_str)
         
         # Processa parâmetros específicos do AI Agent
         prompt = parameters.get('prompt', '') or parameters.get('text', '')
@@ -281,12 +491,13 @@ class NodeMapper:
                 prompt = prompt['value']
             elif 'text' in prompt:
                 prompt = prompt['text']
-        prompt_str = f'"{prompt}"' if prompt else '""'
+        prompt_str = self._format_literal(str(prompt or ''))
+        prompt_str = self._externalize(method_name, 'prompt', prompt, prompt_str)
         
         model = parameters.get('model', '') or parameters.get('modelName', 'gpt-3.5-turbo')
         if isinstance(model, dict) and 'value' in model:
             model = model['value']
-        model_str = f'"{model}"'
+        model_str = self._format_literal(str(model))
         
         temperature = parameters.get('temperature', 0.7)
         if isinstance(temperature, dict) and 'value' in temperature:
@@ -302,51 +513,69 @@ class NodeMapper:
         system_message = parameters.get('systemMessage', '') or parameters.get('system_message', '')
         if isinstance(system_message, dict) and 'value' in system_message:
             system_message = system_message['value']
-        system_message_str = f'"{system_message}"' if system_message else '""'
+        system_message_str = self._format_literal(str(system_message or ''))
+        system_message_str = self._externalize(method_name, 'system_message', system_message, system_message_str)
         
         # API Provider (OpenAI, Anthropic, OpenRouter, etc.)
         api_provider = parameters.get('provider', 'openai')
         if isinstance(api_provider, dict) and 'value' in api_provider:
             api_provider = api_provider['value']
-        api_provider_str = f'"{api_provider}"'
+        api_provider_str = self._format_literal(str(api_provider))
         
         # API Key e URL baseado no provider
         api_key_env = 'OPENAI_API_KEY'
-        api_url_default = 'https://api.openai.com/v1/chat/completions'
+        api_base_url = 'https://api.openai.com/v1'
+        api_endpoint = '/chat/completions'
         
         if 'anthropic' in api_provider.lower() or 'claude' in api_provider.lower():
             api_key_env = 'ANTHROPIC_API_KEY'
-            api_url_default = 'https://api.anthropic.com/v1/messages'
+            api_base_url = 'https://api.anthropic.com/v1'
+            api_endpoint = '/messages'
         elif 'openrouter' in api_provider.lower():
             api_key_env = 'OPENROUTER_API_KEY'
-            api_url_default = 'https://openrouter.ai/api/v1/chat/completions'
+            api_base_url = 'https://openrouter.ai/api/v1'
+        
+        # Base URL customizada (opção baseURL do n8n, ex: proxies ou servidores compatíveis)
+        options = parameters.get('options', {})
+        if isinstance(options, dict) and options.get('baseURL'):
+            api_base_url = str(options['baseURL']).rstrip('/')
         
         api_key_str = f"getenv('{api_key_env}') ?: ''"
-        api_url_str = f"'{api_url_default}'"
+        api_url_str = self._format_literal(f"{api_base_url}{api_endpoint}")
         
         # Código para tools (se houver)
         tools_code = ''
+        comment = '#' if self.language == "python" else '//'
         tools = parameters.get('tools', []) or parameters.get('availableTools', [])
         if tools and isinstance(tools, list) and len(tools) > 0:
-            tools_code = "\n            // Tools disponíveis para o agente\n"
-            tools_code += "            $tools = [];\n"
-            for i, tool in enumerate(tools):
-                tool_name = tool.get('name', f'tool_{i}')
-                tool_desc = tool.get('description', '')
-                tools_code += f"            $tools[] = ['name' => '{tool_name}', 'description' => '{tool_desc}'];\n"
-            tools_code += "            $body['tools'] = $tools;\n"
+            tool_list = [{'name': tool.get('name', f'tool_{i}'), 'description': tool.get('description', '')}
+                         for i, tool in enumerate(tools)]
+            assignment = {'python': "body['tools'] = {}", 'javascript': "body.tools = {};"}.get(
+                self.language, "$body['tools'] = {};")
+            tools_code = (f"\n            {comment} Tools disponíveis para o agente\n"
+                          f"            {assignment.format(self._format_literal(tool_list))}\n")
         
         # Código adicional para ações/tools do agente (se houver)
         additional_code = ''
         if tools and isinstance(tools, list) and len(tools) > 0:
-            additional_code = "\n        // Tools configuradas e disponíveis para uso"
+            additional_code = f"\n        {comment} Tools configuradas e disponíveis para uso"
+        
+        # Paginação do HTTP Request (None quando desativada)
+        pagination = self._parse_pagination(node)
+        pagination_str = self._format_literal(pagination) if pagination else null_literal
+        
+        # Formato da resposta do HTTP Request ('file' grava o corpo em arquivo)
+        response_format_str = self._format_literal(self._parse_response_format(parameters))
         
         replacements = {
             '{{output_key}}': output_key,
-            '{{url}}': f'"{parameters.get("url", "")}"',
-            '{{method}}': f'"{parameters.get("method", "GET")}"',
+            # Strings sempre como literais da linguagem: aspas, '$' e quebras de linha não escapam
+            '{{url}}': self._format_literal(str(parameters.get("url", ""))),
+            '{{method}}': self._format_literal(str(parameters.get("method", "GET"))),
             '{{headers}}': headers_str,
             '{{body}}': body_str,
+            '{{pagination}}': pagination_str,
+            '{{response_format}}': response_format_str,
             '{{prompt}}': prompt_str,
             '{{model}}': model_str,
             '{{temperature}}': temperature_str,
@@ -356,11 +585,435 @@ class NodeMapper:
             '{{api_key}}': api_key_str,
             '{{api_url}}': api_url_str,
             '{{tools_code}}': tools_code,
-            '{{additional_code}}': additional_code
+            '{{additional_code}}': additional_code,
+            # IF: avalia a configuração gerada por _parse_conditions()
+            '{{condition}}': {'python': 'self._if_conditions(conditions)',
+                              'javascript': 'this._ifConditions(conditions)'}.get(
+                self.language, '$this->ifConditions($conditions)'),
+            '{{true_branch}}': 'pass' if self.language == "python" else '',
+            '{{false_branch}}': 'pass' if self.language == "python" else ''
         }
         
-        for placeholder, value in replacements.items():
-            code = code.replace(placeholder, str(value))
+        return replacements
+    
+    def _generate_shared_call(self, node: Dict, node_type: str, template: str, method_name: str) -> Optional[str]:
+        """
+        Gera o método de um nó que delega a lógica ao runtime compartilhado.
+        
+        O método guarda só a configuração do nó (os mesmos valores que o
+        template inline receberia) e chama a função do runtime.
+        
+        Args:
+            node: Dados do nó
+            node_type: Tipo do template (ex: 'httpRequest')
+            template: Template do método do nó
+            method_name: Nome do método do nó
+            
+        Returns:
+            Código do método ou None se o nó precisa de código próprio (ex: tools)
+        """
+        values = self._placeholder_values(node, method_name)
+        names = list(dict.fromkeys(self._PLACEHOLDER.findall(template)))
+        if any(values.get(f'{{{{{name}}}}}') for name in self._CODE_PLACEHOLDERS if name in names):
+            return None
+        
+        config_names = [name for name in names
+                        if f'{{{{{name}}}}}' in values and name not in self._CODE_PLACEHOLDERS + ('output_key',)]
+        function = self.SHARED_NODE_TYPES[node_type]
+        output_key = f"{method_name}_output"
+        node_label = f"{node.get('name', 'Node')} ({node_type})"
+        
+        if self.language == "python":
+            config = ''.join(f"\n            '{name}': {values[f'{{{{{name}}}}}']}," for name in config_names)
+            return f"""def {method_name}(self) -> None:
+        \"\"\"Nó {node_label}: lógica em NodeRuntime.{function}\"\"\"
+        NodeRuntime.{function}(self, '{method_name}', '{output_key}', {{{config}
+        }})"""
+        if self.language == "javascript":
+            function = self._to_camel_case(function)
+            config = ''.join(f"\n            {name}: {values[f'{{{{{name}}}}}']}," for name in config_names)
+            return f"""/**
+     * Nó {node_label}: lógica em NodeRuntime.{function}
+     */
+    async {method_name}() {{
+        await NodeRuntime.{function}.call(this, '{method_name}', '{output_key}', {{{config}
+        }});
+    }}"""
+        config = ''.join(f"\n        '{name}' => {values[f'{{{{{name}}}}}']}," for name in config_names)
+        return f"""/**
+ * Nó {node_label}: lógica em NodeRuntime::{function}
+ */
+private function {method_name}(): void
+{{
+    $this->{function}('{method_name}', '{output_key}', [{config}
+    ]);
+}}"""
+    
+    def render_shared_runtime(self) -> Optional[str]:
+        """
+        Renderiza o módulo de runtime compartilhado da linguagem.
+        
+        Cada função é o template do nó com os placeholders de valor trocados
+        por leituras da configuração recebida, então o runtime segue os
+        templates sem código duplicado.
+        
+        Returns:
+            Código do módulo (NodeRuntime) ou None se o template não existir
+        """
+        module = self.xml_loader.load_shared_runtime_template(self.language)
+        if not module:
+            return None
+        
+        functions = []
+        exports = []
+        for node_type, function in self.SHARED_NODE_TYPES.items():
+            template = self.xml_loader.load_node_template(node_type, self.language)
+            if not template:
+                continue
+            if self.language == "javascript":
+                function = self._to_camel_case(function)
+            functions.append(self._render_shared_function(template['method'], function))
+            exports.append(function)
+        
+        separator = '\n\n' if self.language == "php" else '\n\n\n'
+        module = module.replace('{{functions}}', separator.join(functions))
+        return module.replace('{{exports}}', ', '.join(exports)) + '\n'
+    
+    def _render_shared_function(self, template: str, function: str) -> str:
+        """
+        Converte o template do método de um nó em uma função do runtime compartilhado.
         
+        Args:
+            template: Template do método do nó
+            function: Nome da função no runtime
+            
+        Returns:
+            Código da função
+        """
+        if self.language == "python":
+            code = template.replace('{{method_name}}(self)',
+                                    f'{function}(self, node: str, output_key: str, config: Dict[str, Any])')
+            node_ref, output_ref, config_ref = 'node', 'output_key', "config['{}']"
+        elif self.language == "javascript":
+            code = template.replace('async {{method_name}}()', f'async function {function}(node, outputKey, config)')
+            node_ref, output_ref, config_ref = 'node', 'outputKey', "config.{}"
+        else:
+            code = template.replace('private function {{method_name}}(): void',
+                                    f'protected function {function}(string $node, string $outputKey, array $config): void')
+            node_ref, output_ref, config_ref = '$node', '$outputKey', "$config['{}']"
+        
+        code = code.replace("'{{method_name}}'", node_ref).replace("'{{output_key}}'", output_ref)
+        # Os módulos de runtime ficam na mesma pasta do NodeRuntime
+        code = code.replace('{{runtime_path_base}}', '.')
+        code = self._PLACEHOLDER.sub(
+            lambda match: '' if match.group(1) in self._CODE_PLACEHOLDERS else config_ref.format(match.group(1)), code
+        )
+        
+        # O template chega sem o recuo da primeira linha: remove o recuo de método das demais
+        first_line, _, rest = code.partition('\n')
+        rest = textwrap.dedent(rest)
+        if self.language == "python":
+            # Corpo da função de módulo (a primeira linha é o def)
+            rest = textwrap.indent(rest, '    ')
+        code = f"{first_line}\n{rest}".rstrip()
+        if self.language == "php":
+            # Métodos do trait
+            code = textwrap.indent(code, '    ')
         return code
+    
+    def _externalize(self, method_name: str, field: str, value, literal: str) -> str:
+        """
+        Move um literal grande (corpo JSON, prompt) para um arquivo de recurso.
+        
+        O arquivo é gravado ao lado da classe gerada (ver Generator.save_generated_code)
+        e carregado no primeiro uso pelo helper 'resources'. Valores com
+        expressões do n8n continuam no código.
+        
+        Args:
+            method_name: Nome do método do nó
+            field: Campo do nó (ex: 'body', 'prompt')
+            value: Valor original do parâmetro
+            literal: Literal já gerado para a linguagem de destino
+            
+        Returns:
+            Expressão que carrega o recurso ou o próprio literal
+        """
+        if not self.resource_threshold or not value or len(literal.encode('utf-8')) <= self.resource_threshold:
+            return literal
+        
+        if isinstance(value, str):
+            if '{{' in value or value.startswith('='):
+                return literal
+            name, content = f"{method_name}.{field}.txt", value
+        else:
+            content = json.dumps(value, ensure_ascii=False, indent=2)
+            if '{{' in content:
+                return literal
+            name = f"{method_name}.{field}.json"
+        
+        self.resources[name] = content
+        if self.language == "python":
+            return f"self._resource('{name}')"
+        if self.language == "javascript":
+            return f"this._resource('{name}')"
+        return f"$this->resource('{name}')"
+    
+    def _parse_pagination(self, node: Dict) -> Optional[Dict]:
+        """
+        Lê a opção Pagination de um nó HTTP Request.
+        
+        Suporta os modos "Response Contains Next URL" (com a URL em
+        $response.body...) e "Update a Parameter in Each Request" (parâmetro
+        de query com $pageCount), o limite de páginas, os status de conclusão
+        e o intervalo entre requisições.
+        
+        Args:
+            node: Dados do nó
+            
+        Returns:
+            Configuração da paginação usada pelo runtime Pagination ou None
+        """
+        options = node.get('parameters', {}).get('options', {})
+        pagination = options.get('pagination', {}) if isinstance(options, dict) else {}
+        # O n8n guarda a configuração em options.pagination.pagination
+        if isinstance(pagination, dict) and isinstance(pagination.get('pagination'), dict):
+            pagination = pagination['pagination']
+        if not isinstance(pagination, dict):
+            return None
+        
+        mode = pagination.get('paginationMode', 'off')
+        node_name = node.get('name', 'Node')
+        if mode == 'responseContainsNextURL':
+            path = self._parse_response_path(pagination.get('nextURL', ''))
+            if path is None:
+                print(f"Aviso: URL da próxima página não suportada no nó '{node_name}': {pagination.get('nextURL')}")
+                return None
+            config = {'mode': 'next_url', 'next_url': path}
+        elif mode == 'updateAParameterInEachRequest':
+            parameters = pagination.get('parameters', {})
+            if isinstance(parameters, dict):
+                parameters = parameters.get('parameters', [])
+            query = [p for p in parameters or [] if isinstance(p, dict) and p.get('type', 'qs') == 'qs']
+            match = self._PAGE_COUNT.match(self._strip_expression(query[0].get('value', ''))) if query else None
+            if not match or not query[0].get('name'):
+                print(f"Aviso: parâmetro de paginação não suportado no nó '{node_name}' "
+                      f"(use um parâmetro de query com $pageCount)")
+                return None
+            offset = int(match.group(1) or 0)
+            step = int(match.group(2) or 1)
+            config = {'mode': 'page_param', 'param': query[0]['name'], 'start': offset * step, 'step': step}
+        else:
+            return None
+        
+        complete_when = pagination.get('paginationCompleteWhen', 'responseIsEmpty')
+        if complete_when == 'receiveSpecificStatusCodes':
+            codes = re.findall(r'\d+', str(pagination.get('statusCodesWhenComplete', '')))
+            config['complete_status'] = [int(code) for code in codes]
+        elif complete_when == 'other':
+            print(f"Aviso: condição de conclusão da paginação não suportada no nó '{node_name}'; "
+                  f"usando resposta vazia")
+        
+        if pagination.get('limitPagesFetched'):
+            config['max_pages'] = int(pagination.get('maxRequests', 100))
+        if pagination.get('requestInterval'):
+            config['interval'] = float(pagination['requestInterval']) / 1000
+        return config
+    
+    def _parse_response_format(self, parameters: Dict) -> str:
+        """
+        Lê o formato de resposta de um nó HTTP Request.
+        
+        Args:
+            parameters: Parâmetros do nó (options.response.response.responseFormat
+                nas versões 4+, responseFormat nas anteriores)
+            
+        Returns:
+            'file', 'json', 'text' ou 'autodetect' (padrão)
+        """
+        options = parameters.get('options', {})
+        response = options.get('response', {}) if isinstance(options, dict) else {}
+        if isinstance(response, dict) and isinstance(response.get('response'), dict):
+            response = response['response']
+        response_format = response.get('responseFormat') if isinstance(response, dict) else None
+        return str(response_format or parameters.get('responseFormat') or 'autodetect')
+    
+    def _strip_expression(self, value) -> str:
+        """Remove o prefixo '=' e as chaves {{ }} de uma expressão do n8n."""
+        text = str(value).strip()
+        if text.startswith('='):
+            text = text[1:].strip()
+        if text.startswith('{{') and text.endswith('}}'):
+            text = text[2:-2].strip()
+        return text
+    
+    def _parse_response_path(self, expression) -> Optional[list]:
+        """
+        Converte uma expressão $response.body... em uma lista de chaves.
+        
+        Args:
+            expression: Expressão do n8n (ex: "={{ $response.body.links.next }}")
+            
+        Returns:
+            Chaves e índices (ex: ['links', 'next']) ou None se não suportada
+        """
+        text = self._strip_expression(expression)
+        if not text.startswith('$response.body'):
+            return None
+        path = self._parse_path(text[len('$response.body'):])
+        return path or None
+    
+    def _parse_path(self, text: str) -> Optional[list]:
+        """
+        Converte os acessos após uma referência (.campo, [0], ["campo"]) em uma lista de chaves.
+        
+        Args:
+            text: Acessos (ex: '.links.next', '["itens"][0]')
+            
+        Returns:
+            Chaves e índices (vazia se não houver acessos) ou None se não suportados
+        """
+        path = []
+        position = 0
+        for match in self._PATH_PART.finditer(text):
+            if match.start() != position:
+                return None
+            name, index, quoted = match.groups()
+            path.append(int(index) if index is not None else (name if name is not None else quoted))
+            position = match.end()
+        return path if position == len(text.rstrip()) else None
+    
+    def _parse_conditions(self, node: Dict) -> Dict:
+        """
+        Converte as condições de um nó IF (formatos v1 e v2 do n8n) na configuração do helper 'conditions'.
+        
+        Os operandos viram valores literais ou caminhos no contexto: $json
+        procura na saída dos nós de entrada e depois nos dados de entrada do
+        workflow (com body/query/headers opcionais, como no ExpressionParser);
+        $node["Nome"].json e $('Nome').item.json leem a saída do nó citado.
+        
+        Args:
+            node: Dados do nó IF
+            
+        Returns:
+            Configuração (combinator, case_sensitive, conditions) ou {'error': motivo}
+            quando alguma condição não pode ser convertida
+        """
+        parameters = node.get('parameters', {})
+        conditions = parameters.get('conditions') or {}
+        inputs = [f"{method}_output" for method in self.upstream.get(node.get('id'), [])]
+        try:
+            if not isinstance(conditions, dict):
+                raise ValueError(f"condições em formato desconhecido ({type(conditions).__name__})")
+            if isinstance(conditions.get('conditions'), list):
+                # v2: conditions.conditions com operator {type, operation} e o combinador and/or
+                options = conditions.get('options') or {}
+                node_options = parameters.get('options') or {}
+                case_sensitive = options.get('caseSensitive', True) is not False and not node_options.get('ignoreCase')
+                combinator = str(conditions.get('combinator', 'and')).lower()
+                items = []
+                for condition in conditions['conditions']:
+                    operator = condition.get('operator') or {}
+                    items.append((operator.get('type', 'string'), operator.get('operation', 'equals'),
+                                  condition.get('leftValue'), condition.get('rightValue')))
+            else:
+                # v1: conditions.string/number/boolean com value1, operation e value2
+                combinator = 'or' if parameters.get('combineOperation') == 'any' else 'and'
+                case_sensitive = True
+                items = []
+                for kind, entries in conditions.items():
+                    if kind not in self._IF_V1_DEFAULTS:
+                        raise ValueError(f"condições do tipo '{kind}'")
+                    for entry in entries or []:
+                        operation = entry.get('operation', self._IF_V1_DEFAULTS[kind])
+                        items.append((kind, self._IF_V1_OPERATIONS.get(operation, operation),
+                                      entry.get('value1'), entry.get('value2')))
+            if combinator not in ('and', 'or'):
+                raise ValueError(f"combinador '{combinator}'")
+            
+            parsed = []
+            for kind, operation, left, right in items:
+                if operation not in self.IF_OPERATIONS.get(kind, ()):
+                    raise ValueError(f"operação '{operation}' para o tipo '{kind}'")
+                condition = {'type': kind, 'operation': operation, 'left': self._parse_operand(left, inputs)}
+                if operation not in self._IF_UNARY_OPERATIONS:
+                    condition['right'] = self._parse_operand(right, inputs)
+                parsed.append(condition)
+        except ValueError as error:
+            return {'error': f"condição do IF não suportada: {error}"}
+        
+        return {'combinator': combinator, 'case_sensitive': case_sensitive, 'conditions': parsed}
+    
+    def _parse_operand(self, value, inputs: List[str]) -> Dict:
+        """
+        Converte um operando de uma condição do IF.
+        
+        Args:
+            value: Valor do n8n (literal ou expressão "={{ ... }}")
+            inputs: Chaves das saídas dos nós de entrada do IF
+            
+        Returns:
+            {'value': literal} ou {'paths': caminhos no contexto, tentados em ordem}
+            
+        Raises:
+            ValueError: Se a expressão não for um literal ou uma referência a dados
+        """
+        if not isinstance(value, str) or not value.startswith('='):
+            return {'value': value}
+        text = value[1:].strip()
+        if '{{' not in text:
+            return {'value': value[1:]}
+        
+        expression = self._strip_expression(value)
+        if not (text.startswith('{{') and text.endswith('}}')) or '{{' in expression:
+            raise ValueError(f"expressão {text}")
+        try:
+            # Literais dentro da expressão: {{ 10 }}, {{ "texto" }}, {{ true }}
+            return {'value': json.loads(expression)}
+        except json.JSONDecodeError:
+            pass
+        
+        match = self._DATA_REFERENCE.match(expression)
+        path = self._parse_path(expression[match.end():]) if match else None
+        if path is None:
+            raise ValueError(f"expressão {text}")
+        
+        name = match.group('node') or match.group('selected') or match.group('items')
+        if name is not None:
+            output_key = (self.symbols.output_key_of(name) if self.symbols is not None
+                          else f"{self.generate_method_name({'name': name})}_output")
+            if output_key is None:
+                raise ValueError(f"o nó '{name}' citado em {text} não existe")
+            return {'paths': [[output_key] + path]}
+        
+        paths = [[key] + path for key in inputs] + [path]
+        if len(path) > 1 and path[0] in ('body', 'query', 'headers'):
+            paths.append(path[1:])
+        return {'paths': paths}
+    
+    def _format_literal(self, value) -> str:
+        """
+        Converte um valor (dict, lista, texto, número) em literal da linguagem de destino.
+        
+        Args:
+            value: Valor a converter
+            
+        Returns:
+            Literal Python (repr), JavaScript (JSON) ou PHP (array curto)
+        """
+        if self.language == "python":
+            return repr(value)
+        if self.language == "javascript":
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, dict):
+            items = ', '.join(f"{self._format_literal(key)} => {self._format_literal(item)}" for key, item in value.items())
+            return f"[{items}]"
+        if isinstance(value, list):
+            return '[' + ', '.join(self._format_literal(item) for item in value) + ']'
+        if isinstance(value, str):
+            return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+        if value is None:
+            return 'null'
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        return repr(value)
 
@@ -0,0 +1,123 @@
+"""
+Cache dos métodos renderizados pelo NodeMapper.
+
+Workflows costumam repetir nós idênticos (a mesma chamada HTTP a uma API
+interna, o mesmo agente), e cada um era renderizado do zero. O cache guarda
+o código de cada método pela chave (linguagem, hash do template, parâmetros
+normalizados do nó, nome do método e opções que mudam a saída), com
+descarte LRU. Fica em memória durante um lote e pode ser gravado em um
+arquivo JSON para ser reaproveitado na próxima execução.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class RenderCache:
+    """Cache LRU de métodos renderizados, opcionalmente persistido em disco."""
+
+    DEFAULT_PATH = 'output/.n8ncoding_render_cache.json'
+    DEFAULT_SIZE = 4096
+    # Muda quando o formato do arquivo muda (arquivos de outra versão são ignorados)
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_SIZE):
+        """
+        Inicializa o cache.
+
+        Args:
+            path: Arquivo JSON onde o cache é persistido (None mantém só em memória)
+            max_entries: Quantidade máxima de métodos guardados (os usados há mais tempo saem primeiro)
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max(1, int(max_entries))
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        # Geradores de threads diferentes (daemon) podem compartilhar o cache
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if self.path:
+            self._load()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Monta a chave de um método a partir das partes que definem o código gerado.
+
+        Dicionários são serializados com as chaves ordenadas, então parâmetros
+        iguais em ordens diferentes geram a mesma chave.
+        """
+        normalized = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Devolve a entrada da chave (e a marca como usada) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, key: str, entry: Dict) -> None:
+        """Guarda uma entrada, descartando as menos usadas acima do limite."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+            self._dirty = True
+
+    @property
+    def hit_rate(self) -> float:
+        """Fração das consultas atendidas pelo cache (0.0 sem consultas)."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def report(self) -> Dict:
+        """Estatísticas do cache: hits, misses, evictions, entries e hit_rate."""
+        with self._lock:
+            return {**self.stats, 'entries': len(self._entries), 'hit_rate': round(self.hit_rate, 4)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Cache de renderização ignorado ({self.path}): {e}")
+            return
+        if data.get('version') != self.FORMAT_VERSION:
+            return
+        # O arquivo guarda as entradas da menos para a mais usada
+        for key, entry in data.get('entries', [])[-self.max_entries:]:
+            self._entries[key] = entry
+
+    def save(self) -> bool:
+        """
+        Grava o cache no arquivo (somente se houver entradas novas).
+
+        Returns:
+            True se o arquivo foi gravado
+        """
+        if not self.path or not self._dirty:
+            return False
+        with self._lock:
+            data = {'version': self.FORMAT_VERSION, 'entries': list(self._entries.items())}
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        temporary.replace(self.path)
+        return True
@@ -0,0 +1,98 @@
+"""
+Tabela de símbolos de um workflow: nome do método e chave de saída de cada nó.
+
+Os nomes são calculados uma única vez por workflow, em um só passo, e
+reaproveitados por todas as etapas da geração (métodos, chamadas em run(),
+liberação de saídas, tracing, rotas do servidor). A tabela garante nomes
+válidos na linguagem de destino (fora das palavras reservadas e dos membros
+da classe gerada) e únicos: nós cujos nomes viram o mesmo identificador
+("Send Email" e "send-email") recebem sufixos numéricos (sendEmail,
+sendEmail2). Nós com id repetido (workflows editados à mão ou colados)
+são identificados pelo objeto do nó, para que cada um tenha o próprio nome.
+"""
+import keyword
+from typing import Callable, Dict, Iterable, Optional
+
+# Palavras reservadas de cada linguagem, além das que generate_method_name() já evita
+RESERVED_WORDS = {
+    'php': frozenset({
+        'and', 'or', 'xor', 'echo', 'print', 'list', 'isset', 'unset', 'empty', 'eval', 'exit',
+        'die', 'include', 'require', 'goto', 'global', 'declare', 'do', 'fn', 'match', 'yield',
+        'insteadof', 'readonly', 'enum', 'endif', 'endfor', 'endforeach', 'endwhile', 'endswitch',
+        'enddeclare', 'never', 'iterable'
+    }),
+    'python': frozenset(keyword.kwlist),
+    'javascript': frozenset({
+        'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete',
+        'do', 'else', 'enum', 'export', 'extends', 'false', 'finally', 'for', 'function', 'if',
+        'import', 'in', 'instanceof', 'new', 'null', 'return', 'super', 'switch', 'this', 'throw',
+        'true', 'try', 'typeof', 'var', 'void', 'while', 'with', 'yield', 'let', 'static', 'await',
+        'implements', 'package', 'protected', 'interface', 'private', 'public', 'arguments', 'eval',
+        'constructor', 'prototype'
+    })
+}
+
+
+class SymbolTable:
+    """Nomes de métodos e chaves de saída únicos dos nós de um workflow."""
+
+    def __init__(self, nodes: Iterable[Dict], language: str, naming: Callable[[Dict], str],
+                 reserved: Iterable[str] = ()):
+        """
+        Atribui um nome a cada nó, na ordem do workflow.
+
+        Args:
+            nodes: Nós do workflow
+            language: Linguagem de destino (define as palavras reservadas)
+            naming: Função que gera o nome base de um nó (NodeMapper.generate_method_name)
+            reserved: Nomes já usados pela classe gerada (métodos e atributos dos templates)
+        """
+        self.language = language
+        self.reserved = RESERVED_WORDS.get(language, frozenset()) | frozenset(reserved)
+        self._method_names: Dict[object, str] = {}
+        # Mantém os nós vivos: os de id repetido são identificados por id(node)
+        self._nodes = list(nodes)
+        seen_ids = set()
+        self._duplicate_ids = set()
+        for node in self._nodes:
+            node_id = node.get('id')
+            if node_id in seen_ids:
+                self._duplicate_ids.add(node_id)
+            seen_ids.add(node_id)
+        # Nome do nó no n8n -> chave (referências $node["Nome"] nas expressões)
+        self._keys_by_name: Dict[str, object] = {}
+        taken = set()
+        for node in self._nodes:
+            self._keys_by_name.setdefault(node.get('name'), self._key(node))
+            name = naming(node)
+            if name in self.reserved:
+                name += 'Node'
+            # Nomes que colidem recebem o primeiro sufixo livre
+            unique, suffix = name, 2
+            while unique in taken or unique in self.reserved:
+                unique, suffix = f"{name}{suffix}", suffix + 1
+            taken.add(unique)
+            self._method_names[self._key(node)] = unique
+
+    def _key(self, node: Dict) -> object:
+        """Identifica o nó pelo id (ou pelo objeto, em nós sem id ou com id repetido)."""
+        node_id = node.get('id')
+        if node_id is None or node_id in self._duplicate_ids:
+            return ('object', id(node))
+        return ('id', node_id)
+
+    def __contains__(self, node: Dict) -> bool:
+        return self._key(node) in self._method_names
+
+    def method_name(self, node: Dict) -> str:
+        """Nome do método do nó (ex: 'sendEmail')."""
+        return self._method_names[self._key(node)]
+
+    def output_key(self, node: Dict) -> str:
+        """Chave da saída do nó no contexto (ex: 'sendEmail_output')."""
+        return f"{self._method_names[self._key(node)]}_output"
+
+    def output_key_of(self, name: str) -> Optional[str]:
+        """Chave da saída do nó com o nome dado no n8n (ex: 'Send Email') ou None se não existir."""
+        key = self._keys_by_name.get(name)
+        return f"{self._method_names[key]}_output" if key is not None else None
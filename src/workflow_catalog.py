@@ -0,0 +1,333 @@
+"""
+Catálogo local (SQLite) dos workflows do n8n.
+
+Guarda, para cada workflow da listagem, id, nome, tags, active, updatedAt,
+contagem de nós por tipo e os parâmetros usados pelos nós, com índices e
+busca textual (FTS5) nos nomes. A seleção por consultas como
+
+    node_type=aiAgent AND tag=billing
+
+é resolvida localmente em milissegundos, sem buscar os workflows de novo.
+A sincronização é incremental: só workflows novos ou com updatedAt diferente
+são reindexados, e os que sumiram do n8n são removidos. Com sync_on_query(),
+ela só acontece na primeira consulta.
+"""
+import json
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from node_mapper import NodeMapper
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflows (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    updated_at TEXT,
+    node_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workflows_name ON workflows (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS workflows_updated_at ON workflows (updated_at);
+CREATE TABLE IF NOT EXISTS workflow_tags (
+    workflow_id TEXT NOT NULL REFERENCES workflows (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (workflow_id, tag)
+);
+CREATE INDEX IF NOT EXISTS workflow_tags_tag ON workflow_tags (tag);
+CREATE TABLE IF NOT EXISTS workflow_nodes (
+    workflow_id TEXT NOT NULL REFERENCES workflows (id) ON DELETE CASCADE,
+    node_type TEXT NOT NULL COLLATE NOCASE,
+    template_type TEXT NOT NULL COLLATE NOCASE,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (workflow_id, node_type)
+);
+CREATE INDEX IF NOT EXISTS workflow_nodes_type ON workflow_nodes (node_type);
+CREATE INDEX IF NOT EXISTS workflow_nodes_template ON workflow_nodes (template_type);
+CREATE TABLE IF NOT EXISTS workflow_parameters (
+    workflow_id TEXT NOT NULL REFERENCES workflows (id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (workflow_id, name)
+);
+CREATE INDEX IF NOT EXISTS workflow_parameters_name ON workflow_parameters (name);
+"""
+
+
+class CatalogQueryError(ValueError):
+    """Consulta --where inválida."""
+
+
+class WorkflowCatalog:
+    """Índice local dos workflows para seleção e consultas rápidas."""
+
+    DEFAULT_PATH = 'output/.n8ncoding_catalog.db'
+
+    # Campo=valor, com o valor opcionalmente entre aspas (ex: name="Faturas 2024")
+    _CONDITION = re.compile(r'\s*([A-Za-z_]+)\s*(!=|>=|<=|=|>|<)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\']+))\s*')
+    _AND = re.compile(r'AND\b\s*', re.IGNORECASE)
+    # Campos com várias linhas por workflow: (tabela, colunas comparadas)
+    _SET_FIELDS = {
+        'tag': ('workflow_tags', ('tag',)),
+        'node_type': ('workflow_nodes', ('node_type', 'template_type')),
+        'param': ('workflow_parameters', ('name',))
+    }
+    # Campos escalares de workflows (os de ordem aceitam >, <, >= e <=)
+    _SCALAR_FIELDS = {'id': 'id', 'active': 'active', 'updated': 'updated_at', 'nodes': 'node_count'}
+    _ORDERED_FIELDS = {'updated', 'nodes'}
+    FIELDS = ('name', 'id', 'tag', 'node_type', 'param', 'active', 'updated', 'nodes')
+    # Versão das colunas derivadas (template_type); incremente ao mudar o mapeamento de tipos
+    DATA_VERSION = 1
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Abre (criando se preciso) o catálogo.
+
+        Args:
+            path: Arquivo SQLite (':memory:' para um catálogo temporário)
+        """
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+        self.fts = self._create_fts()
+        self._pending_sync = None
+
+    def _migrate(self) -> None:
+        """Recalcula o template_type de catálogos gravados com um mapeamento de tipos antigo."""
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] >= self.DATA_VERSION:
+            return
+        with self.connection:
+            node_types = [row[0] for row in self.connection.execute('SELECT DISTINCT node_type FROM workflow_nodes')]
+            self.connection.executemany(
+                'UPDATE workflow_nodes SET template_type = ? WHERE node_type = ?',
+                [(NodeMapper.get_template_type({'type': node_type}), node_type) for node_type in node_types])
+            self.connection.execute(f'PRAGMA user_version = {self.DATA_VERSION}')
+
+    def _create_fts(self) -> bool:
+        """Cria a tabela FTS5 dos nomes; sem FTS5 no SQLite, name= usa LIKE."""
+        try:
+            self.connection.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS workflow_names USING fts5(name)')
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        self.connection.close()
+
+    def __enter__(self) -> 'WorkflowCatalog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM workflows').fetchone()[0]
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """Mapa id -> updatedAt dos workflows indexados."""
+        return {row['id']: row['updated_at'] for row in self.connection.execute('SELECT id, updated_at FROM workflows')}
+
+    def sync(self, client, workflows: Optional[List[Dict]] = None) -> Dict[str, int]:
+        """
+        Atualiza o catálogo a partir da listagem do n8n.
+
+        Args:
+            client: N8nClient (list_workflows() e, para listagens sem nós, get_workflow())
+            workflows: Listagem já obtida (evita listar de novo)
+
+        Returns:
+            Contagens 'added', 'updated', 'deleted' e 'unchanged'
+        """
+        if workflows is None:
+            workflows = client.list_workflows()
+        known = self.versions()
+        counts = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        listed = set()
+
+        with self.connection:
+            for summary in workflows:
+                workflow_id = str(summary.get('id'))
+                listed.add(workflow_id)
+                if workflow_id in known and known[workflow_id] == summary.get('updatedAt'):
+                    counts['unchanged'] += 1
+                    continue
+                workflow = summary
+                if 'nodes' not in summary:
+                    workflow = client.get_workflow(workflow_id) or summary
+                self._index(workflow)
+                counts['updated' if workflow_id in known else 'added'] += 1
+
+            for workflow_id in set(known) - listed:
+                self._remove(workflow_id)
+                counts['deleted'] += 1
+        return counts
+
+    def sync_on_query(self, client, workflows: Optional[List[Dict]] = None) -> None:
+        """
+        Adia a sincronização até a primeira consulta (query()).
+
+        Em listagens sem nós, sincronizar busca cada workflow alterado com
+        get_workflow(); uma seleção pelo menu sem consultas não paga esse custo.
+
+        Args:
+            client: N8nClient (ver sync())
+            workflows: Listagem já obtida (evita listar de novo)
+        """
+        self._pending_sync = (client, workflows)
+
+    def add(self, workflow: Dict) -> None:
+        """Indexa (ou reindexa) um único workflow."""
+        with self.connection:
+            self._index(workflow)
+
+    def _index(self, workflow: Dict) -> None:
+        workflow_id = str(workflow.get('id'))
+        nodes = workflow.get('nodes') or []
+        self._remove(workflow_id)
+        rowid = self.connection.execute(
+            'INSERT INTO workflows (id, name, active, updated_at, node_count) VALUES (?, ?, ?, ?, ?)',
+            (workflow_id, workflow.get('name') or '', int(bool(workflow.get('active'))),
+             workflow.get('updatedAt'), len(nodes))).lastrowid
+        if self.fts:
+            # A linha FTS usa o rowid do workflow (remoção e junção pelo rowid, sem varrer a tabela)
+            self.connection.execute('INSERT INTO workflow_names (rowid, name) VALUES (?, ?)',
+                                    (rowid, workflow.get('name') or ''))
+
+        tags = {tag.get('name') if isinstance(tag, dict) else str(tag) for tag in workflow.get('tags') or []}
+        self.connection.executemany('INSERT OR IGNORE INTO workflow_tags VALUES (?, ?)',
+                                    [(workflow_id, tag) for tag in tags if tag])
+
+        types = Counter(node.get('type', 'unknown') for node in nodes)
+        self.connection.executemany(
+            'INSERT INTO workflow_nodes VALUES (?, ?, ?, ?)',
+            [(workflow_id, node_type, NodeMapper.get_template_type({'type': node_type}), count)
+             for node_type, count in types.items()])
+
+        parameters = {name for node in nodes for name in (node.get('parameters') or {})}
+        self.connection.executemany('INSERT OR IGNORE INTO workflow_parameters VALUES (?, ?)',
+                                    [(workflow_id, name) for name in parameters])
+
+    def _remove(self, workflow_id: str) -> None:
+        if self.fts:
+            self.connection.execute(
+                'DELETE FROM workflow_names WHERE rowid = (SELECT rowid FROM workflows WHERE id = ?)', (workflow_id,))
+        self.connection.execute('DELETE FROM workflows WHERE id = ?', (workflow_id,))
+
+    def query(self, where: str = '') -> List[Dict]:
+        """
+        Seleciona workflows por uma consulta como 'node_type=aiAgent AND tag=billing'.
+
+        Campos: name (busca textual por palavras), id, tag, node_type (tipo do n8n
+        ou do template, ex: aiAgent), param (nome de parâmetro de algum nó), active
+        (true/false), updated (updatedAt) e nodes (quantidade de nós). Todos aceitam
+        = e !=; updated e nodes também >, <, >= e <=. Condições são unidas com AND.
+
+        Args:
+            where: Consulta (vazia seleciona todos)
+
+        Returns:
+            Workflows (id, name, active, updatedAt, nodes, tags) ordenados por nome
+
+        Raises:
+            CatalogQueryError: Se a consulta for inválida
+        """
+        conditions = self.parse(where)
+        if self._pending_sync is not None:
+            client, workflows = self._pending_sync
+            self._pending_sync = None
+            self.sync(client, workflows)
+
+        clauses, arguments = [], []
+        for field, operator, value in conditions:
+            clause, values = self._clause(field, operator, value)
+            clauses.append(clause)
+            arguments.extend(values)
+
+        sql = ('SELECT w.id, w.name, w.active, w.updated_at, w.node_count, '
+               "(SELECT json_group_array(tag) FROM workflow_tags t WHERE t.workflow_id = w.id) AS tags "
+               'FROM workflows w')
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY w.name COLLATE NOCASE, w.id'
+        return [{
+            'id': row['id'],
+            'name': row['name'],
+            'active': bool(row['active']),
+            'updatedAt': row['updated_at'],
+            'nodes': row['node_count'],
+            'tags': sorted(json.loads(row['tags']))
+        } for row in self._execute(sql, arguments)]
+
+    def _execute(self, sql: str, arguments: list) -> List[sqlite3.Row]:
+        try:
+            return self.connection.execute(sql, arguments).fetchall()
+        except sqlite3.OperationalError as e:
+            # Ex: termo de busca textual sem nenhuma palavra
+            raise CatalogQueryError(f"Consulta inválida: {e}") from e
+
+    @classmethod
+    def parse(cls, where: str) -> List[Tuple[str, str, str]]:
+        """
+        Divide uma consulta em condições (campo, operador, valor).
+
+        Raises:
+            CatalogQueryError: Se a consulta for inválida
+        """
+        conditions = []
+        position = 0
+        where = where.strip()
+        while position < len(where):
+            if conditions:
+                separator = cls._AND.match(where, position)
+                if not separator:
+                    raise CatalogQueryError(f"Esperado AND em: {where[position:]!r}")
+                position = separator.end()
+            match = cls._CONDITION.match(where, position)
+            if not match:
+                raise CatalogQueryError(f"Condição inválida em: {where[position:]!r} (use campo=valor)")
+            field = match.group(1).lower()
+            if field not in cls.FIELDS:
+                raise CatalogQueryError(f"Campo desconhecido: {field} (use {', '.join(cls.FIELDS)})")
+            value = next(group for group in match.group(3, 4, 5) if group is not None)
+            conditions.append((field, match.group(2), value))
+            position = match.end()
+        return conditions
+
+    def _clause(self, field: str, operator: str, value: str) -> Tuple[str, list]:
+        """Condição SQL (sobre o alias w) de um campo da consulta."""
+        if operator not in ('=', '!=') and field not in self._ORDERED_FIELDS:
+            raise CatalogQueryError(f"O campo {field} aceita apenas = e !=")
+        negate = 'NOT ' if operator == '!=' else ''
+
+        if field == 'name':
+            if not self.fts:
+                return f"w.name {negate}LIKE ?", [f'%{value}%']
+            # Cada palavra vira um prefixo: "fat" encontra "Faturas"
+            terms = ' '.join('"' + word.replace('"', '""') + '"*' for word in value.split())
+            return f"w.rowid {negate}IN (SELECT rowid FROM workflow_names WHERE workflow_names MATCH ?)", [terms]
+
+        if field in self._SET_FIELDS:
+            table, columns = self._SET_FIELDS[field]
+            matches = ' OR '.join(f'x.{column} = ?' for column in columns)
+            return (f"{negate}EXISTS (SELECT 1 FROM {table} x WHERE x.workflow_id = w.id AND ({matches}))",
+                    [value] * len(columns))
+
+        column = self._SCALAR_FIELDS[field]
+        if field == 'active':
+            if value.lower() not in ('true', 'false', '1', '0'):
+                raise CatalogQueryError(f"Valor inválido para active: {value} (use true ou false)")
+            value = int(value.lower() in ('true', '1'))
+        elif field == 'nodes':
+            if not value.isdigit():
+                raise CatalogQueryError(f"Valor inválido para nodes: {value}")
+            value = int(value)
+        sql_operator = '<>' if operator == '!=' else operator
+        return f"w.{column} {sql_operator} ?", [value]
@@ -1,19 +1,23 @@
 """
 Módulo para seleção interativa de workflows no terminal.
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 class WorkflowSelector:
     """Classe para exibir e selecionar workflows no terminal."""
     
+    # Listas maiores que isso são truncadas na tela (filtre com uma consulta do catálogo)
+    DISPLAY_LIMIT = 50
+    
     @staticmethod
-    def display_workflows(workflows: List[Dict]) -> None:
+    def display_workflows(workflows: List[Dict], limit: Optional[int] = None) -> None:
         """
         Exibe a lista de workflows numerada no terminal.
         
         Args:
             workflows: Lista de workflows para exibir
+            limit: Quantidade máxima de linhas exibidas (None: todas)
         """
         if not workflows:
             print("Nenhum workflow encontrado.")
@@ -23,20 +27,29 @@ class WorkflowSelector:
         print("Escolha os workflows que deseja converter:")
         print("=" * 60)
         
-        for index, workflow in enumerate(workflows, start=1):
+        shown = workflows[:limit] if limit else workflows
+        for index, workflow in enumerate(shown, start=1):
             name = workflow.get('name', 'Workflow sem nome')
             workflow_id = workflow.get('id', 'N/A')
             print(f"[{index}] {name} (ID: {workflow_id})")
         
+        if len(shown) < len(workflows):
+            print(f"... e mais {len(workflows) - len(shown)} workflow(s). "
+                  f"Filtre com uma consulta (Ex: node_type=aiAgent AND tag=billing)")
         print("=" * 60)
     
     @staticmethod
-    def select_workflows(workflows: List[Dict]) -> List[Dict]:
+    def select_workflows(workflows: List[Dict], catalog=None) -> List[Dict]:
         """
         Permite que o usuário selecione workflows por índice.
         
+        Com um catálogo (WorkflowCatalog), a entrada também aceita uma consulta
+        (Ex: node_type=aiAgent AND tag=billing) que filtra a lista exibida, e
+        'todos' seleciona a lista filtrada inteira.
+        
         Args:
             workflows: Lista completa de workflows
+            catalog: Catálogo local para filtrar a lista por consultas
             
         Returns:
             Lista com apenas os workflows selecionados
@@ -44,16 +57,42 @@ class WorkflowSelector:
         if not workflows:
             return []
         
-        WorkflowSelector.display_workflows(workflows)
+        all_workflows = workflows
+        limit = WorkflowSelector.DISPLAY_LIMIT if catalog is not None else None
+        WorkflowSelector.display_workflows(workflows, limit)
+        prompt = "\nDigite os números separados por vírgula (Ex: 1,3,4)"
+        if catalog is not None:
+            prompt += ", uma consulta (Ex: tag=billing) ou 'todos'"
         
         while True:
             try:
-                selection = input("\nDigite os números separados por vírgula (Ex: 1,3,4): ").strip()
+                selection = input(prompt + ": ").strip()
                 
                 if not selection:
                     print("Nenhuma seleção feita. Tente novamente.")
                     continue
                 
+                if catalog is not None and selection.lower() == 'todos':
+                    print(f"\n✓ {len(workflows)} workflow(s) selecionado(s).")
+                    return workflows
+                
+                # Consulta ao catálogo: filtra a lista e exibe de novo
+                if catalog is not None and any(operator in selection for operator in '=<>'):
+                    from workflow_catalog import CatalogQueryError
+                    
+                    try:
+                        ids = {match['id'] for match in catalog.query(selection)}
+                    except CatalogQueryError as e:
+                        print(e)
+                        continue
+                    filtered = [workflow for workflow in all_workflows if str(workflow.get('id')) in ids]
+                    if not filtered:
+                        print("Nenhum workflow corresponde à consulta.")
+                        continue
+                    workflows = filtered
+                    WorkflowSelector.display_workflows(workflows, limit)
+                    continue
+                
                 # Processa a entrada
                 indices = [int(x.strip()) for x in selection.split(',')]
                 
@@ -0,0 +1,200 @@
+"""
+Modo watch: mantém o código gerado sincronizado com o n8n.
+
+A cada intervalo a listagem de workflows é comparada com o último estado
+conhecido usando somente o campo updatedAt (ou versionId) de cada workflow.
+Apenas os workflows adicionados ou alterados são buscados por completo e
+regenerados, nas linguagens configuradas; as saídas de workflows removidos
+(classe, servidor e pasta de recursos) são apagadas. Workflows com o mesmo
+nome recebem o id no nome dos arquivos, a partir do segundo.
+
+O estado (id -> updatedAt, nome e arquivos gerados) é gravado em um arquivo
+JSON na pasta de saída, para que reiniciar o watch não regenere tudo.
+"""
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from folder_structure import FolderStructure
+from generator import Generator
+from render_cache import RenderCache
+from xml_loader import XMLLoader
+
+
+class WorkflowWatcher:
+    """Sincroniza as saídas geradas com os workflows do n8n por polling."""
+
+    STATE_FILE = '.n8ncoding_watch.json'
+
+    def __init__(self, client, languages: List[str], output_dir: str = "output",
+                 xml_loader: Optional[XMLLoader] = None, generator_options: Optional[Dict] = None,
+                 server: bool = False, state_path: Optional[str] = None, render_cache=None):
+        """
+        Inicializa o watcher.
+
+        Args:
+            client: N8nClient (usa list_workflows() e get_workflow())
+            languages: Linguagens geradas para cada workflow
+            output_dir: Pasta de saída
+            xml_loader: Carregador de templates compartilhado pelos geradores
+            generator_options: Opções do Generator (instrument, trace, checkpoint, resource_threshold, shared_runtime)
+            server: Se True, gera também o servidor HTTP dos workflows com Webhook
+            state_path: Arquivo de estado (padrão: <output_dir>/.n8ncoding_watch.json)
+            render_cache: RenderCache dos geradores (padrão: um cache em memória que
+                dura enquanto o watcher roda)
+        """
+        self.client = client
+        self.languages = languages
+        self.server = server
+        self.folder_structure = FolderStructure(output_dir)
+        self.state_path = Path(state_path) if state_path else Path(output_dir) / self.STATE_FILE
+        xml_loader = xml_loader or XMLLoader()
+        self.render_cache = render_cache if render_cache is not None else RenderCache()
+        # Um Generator por linguagem, reaproveitado entre os ciclos (templates em cache)
+        self.generators: Dict[str, Generator] = {}
+        for language in languages:
+            generator = Generator(xml_loader, language, render_cache=self.render_cache, **(generator_options or {}))
+            generator.folder_structure = self.folder_structure
+            self.generators[language] = generator
+        self.state: Dict[str, Dict] = self._load_state()
+
+    @staticmethod
+    def version_of(workflow: Dict) -> Optional[str]:
+        """Marca de versão de um workflow da listagem (updatedAt ou versionId)."""
+        return workflow.get('updatedAt') or workflow.get('versionId')
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('workflows', {})
+        except (OSError, ValueError) as e:
+            print(f"Estado do watch ignorado ({self.state_path}): {e}")
+            return {}
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.state_path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'languages': self.languages, 'workflows': self.state}, f, indent=2, ensure_ascii=False)
+        temporary.replace(self.state_path)
+
+    def poll_once(self) -> Dict[str, List[str]]:
+        """
+        Executa um ciclo: lista, compara e sincroniza as saídas.
+
+        Uma listagem que falha não altera nada (em especial, não apaga saídas).
+
+        Returns:
+            Dicionário com os ids 'added', 'changed', 'deleted' e 'failed'
+        """
+        listed = {str(workflow.get('id')): workflow for workflow in self.client.list_workflows()}
+        changes = {'added': [], 'changed': [], 'deleted': [], 'failed': []}
+
+        for workflow_id, summary in listed.items():
+            known = self.state.get(workflow_id)
+            if known is None:
+                kind = 'added'
+            elif known.get('version') != self.version_of(summary) or not self._outputs_present(known):
+                kind = 'changed'
+            else:
+                continue
+            if self._regenerate(workflow_id, summary):
+                changes[kind].append(workflow_id)
+            else:
+                changes['failed'].append(workflow_id)
+
+        for workflow_id in [known for known in self.state if known not in listed]:
+            self._delete_outputs(self.state.pop(workflow_id).get('outputs', []))
+            changes['deleted'].append(workflow_id)
+
+        if any(changes[kind] for kind in ('added', 'changed', 'deleted')):
+            self._save_state()
+            self.render_cache.save()
+        return changes
+
+    def _outputs_present(self, known: Dict) -> bool:
+        """Confere se as linguagens atuais foram geradas e se os arquivos ainda existem."""
+        return (set(known.get('languages', [])) == set(self.languages)
+                and all(Path(path).exists() for path in known.get('outputs', [])))
+
+    def _regenerate(self, workflow_id: str, summary: Dict) -> bool:
+        """Busca o workflow completo e regenera suas saídas em todas as linguagens."""
+        workflow = self.client.get_workflow(workflow_id)
+        if not workflow:
+            return False
+
+        self._assign_file_name(workflow_id, workflow)
+        outputs = []
+        for language, generator in self.generators.items():
+            code = generator.generate_class(workflow)
+            if not code or not generator.save_generated_code(workflow, code):
+                return False
+            outputs.append(str(self.folder_structure.get_output_file_path(workflow, language)))
+            if generator.resources:
+                outputs.append(str(self.folder_structure.get_resources_dir(workflow, language)))
+            if self.server:
+                server_code = generator.generate_server(workflow)
+                if server_code and generator.save_generated_server(workflow, server_code):
+                    outputs.append(str(self.folder_structure.get_server_file_path(workflow, language)))
+
+        # Renomeações e recursos que deixaram de existir: apaga o que não foi regravado
+        previous = self.state.get(workflow_id, {}).get('outputs', [])
+        self._delete_outputs([path for path in previous if path not in outputs])
+
+        self.state[workflow_id] = {
+            'name': workflow.get('name'),
+            'version': self.version_of(summary) or self.version_of(workflow),
+            'languages': list(self.languages),
+            'outputs': outputs
+        }
+        return True
+
+    def _assign_file_name(self, workflow_id: str, workflow: Dict) -> None:
+        """
+        Evita que workflows com o mesmo nome gravem (e apaguem) os mesmos arquivos.
+
+        Os arquivos com o nome do workflow ficam com quem já os gerou; os
+        demais workflows com esse nome recebem o id no nome dos arquivos.
+        """
+        self.folder_structure.file_names.pop(workflow_id, None)
+        claimed = {path for known_id, known in self.state.items() if known_id != workflow_id
+                   for path in known.get('outputs', [])}
+        if any(str(self.folder_structure.get_output_file_path(workflow, language)) in claimed
+               for language in self.languages):
+            self.folder_structure.file_names[workflow_id] = f"{workflow.get('name', 'workflow')} {workflow_id}"
+
+    @staticmethod
+    def _delete_outputs(paths: List[str]) -> None:
+        for path in map(Path, paths):
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+                print(f"✓ Removido: {path}")
+
+    def run(self, interval: float = 30.0, iterations: Optional[int] = None,
+            on_change: Optional[Callable[[Dict[str, List[str]]], None]] = None) -> None:
+        """
+        Executa ciclos de poll_once() até ser interrompido.
+
+        Args:
+            interval: Intervalo entre ciclos (segundos)
+            iterations: Quantidade de ciclos (None: sem limite)
+            on_change: Chamado com o resumo de cada ciclo que alterou alguma saída
+        """
+        count = 0
+        while iterations is None or count < iterations:
+            if count:
+                time.sleep(interval)
+            count += 1
+            try:
+                changes = self.poll_once()
+            except Exception as e:
+                print(f"Erro ao sincronizar workflows: {e}")
+                continue
+            if on_change and any(changes.values()):
+                on_change(changes)
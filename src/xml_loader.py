@@ -2,8 +2,8 @@
 Módulo para carregar e processar templates XML.
 """
 import os
-import xml.etree.ElementTree as ET
-from typing import Optional, Dict
+import re
+from typing import FrozenSet, Optional, Dict
 from pathlib import Path
 
 
@@ -18,6 +18,25 @@ class XMLLoader:
             templates_dir: Diretório base dos templates
         """
         self.templates_dir = Path(templates_dir)
+        # Templates já lidos ((tipo, linguagem) -> template ou None)
+        self._node_templates: Dict[tuple, Optional[Dict[str, str]]] = {}
+        self._helper_templates: Dict[tuple, Optional[Dict[str, str]]] = {}
+        self._class_templates: Dict[tuple, Optional[str]] = {}
+        self._member_names: Dict[str, FrozenSet[str]] = {}
+        # Quantidade de templates lidos do disco
+        self.template_loads = 0
+    
+    @staticmethod
+    def _parse_xml(template_path: Path):
+        """
+        Lê um arquivo XML e devolve o elemento raiz.
+        
+        O xml.etree só é importado na primeira leitura de template, para que
+        importar o conversor (ex: a CLI) não pague pelo parser.
+        """
+        import xml.etree.ElementTree as ET
+        
+        return ET.parse(template_path).getroot()
     
     def load_language_template(self, language: str) -> Optional[str]:
         """
@@ -29,6 +48,18 @@ class XMLLoader:
         Returns:
             Conteúdo do template da classe ou None se não encontrado
         """
+        return self._cached_class_template('languages', language, self._read_language_template)
+    
+    def _cached_class_template(self, folder: str, language: str, reader) -> Optional[str]:
+        """Lê um template de classe ou de servidor uma única vez por instância."""
+        key = (folder, language)
+        if key not in self._class_templates:
+            self.template_loads += 1
+            self._class_templates[key] = reader(language)
+        return self._class_templates[key]
+    
+    def _read_language_template(self, language: str) -> Optional[str]:
+        """Lê e interpreta o template XML de uma linguagem."""
         template_path = self.templates_dir / "languages" / f"{language}.xml"
         
         if not template_path.exists():
@@ -36,8 +67,7 @@ class XMLLoader:
             return None
         
         try:
-            tree = ET.parse(template_path)
-            root = tree.getroot()
+            root = self._parse_xml(template_path)
             
             class_elem = root.find('class')
             if class_elem is not None:
@@ -48,10 +78,112 @@ class XMLLoader:
             print(f"Erro ao carregar template de linguagem: {e}")
             return None
     
+    def load_server_template(self, language: str) -> Optional[str]:
+        """
+        Carrega o template XML do servidor HTTP (workflows com nós Webhook).
+        
+        Args:
+            language: Nome da linguagem (ex: 'php')
+            
+        Returns:
+            Conteúdo do template do ponto de entrada ou None se não encontrado
+        """
+        return self._cached_class_template('servers', language, self._read_server_template)
+    
+    def _read_server_template(self, language: str) -> Optional[str]:
+        """Lê e interpreta o template XML do servidor HTTP de uma linguagem."""
+        template_path = self.templates_dir / "servers" / f"{language}.xml"
+        
+        if not template_path.exists():
+            print(f"Template de servidor não encontrado: {template_path}")
+            return None
+        
+        try:
+            root = self._parse_xml(template_path)
+            
+            entrypoint_elem = root.find('entrypoint')
+            if entrypoint_elem is not None:
+                return entrypoint_elem.text.strip()
+            
+            return None
+        except Exception as e:
+            print(f"Erro ao carregar template de servidor: {e}")
+            return None
+    
+    def load_shared_runtime_template(self, language: str) -> Optional[str]:
+        """
+        Carrega o template XML do módulo de runtime compartilhado dos nós.
+        
+        Args:
+            language: Nome da linguagem (ex: 'php')
+            
+        Returns:
+            Conteúdo do módulo (com {{functions}} e {{exports}}) ou None se não encontrado
+        """
+        return self._cached_class_template('shared', language, self._read_shared_runtime_template)
+    
+    def _read_shared_runtime_template(self, language: str) -> Optional[str]:
+        """Lê e interpreta o template XML do runtime compartilhado de uma linguagem."""
+        template_path = self.templates_dir / "shared" / f"{language}.xml"
+        
+        if not template_path.exists():
+            print(f"Template de runtime compartilhado não encontrado: {template_path}")
+            return None
+        
+        try:
+            root = self._parse_xml(template_path)
+            
+            module_elem = root.find('module')
+            if module_elem is not None:
+                return module_elem.text.strip()
+            
+            return None
+        except Exception as e:
+            print(f"Erro ao carregar template de runtime compartilhado: {e}")
+            return None
+    
+    # Membros declarados nos templates: def/function nome, métodos de classe JS e atributos self./this./$this->
+    _MEMBER_PATTERNS = {
+        'python': re.compile(r'\bdef\s+([A-Za-z_]\w*)|\bself\.([A-Za-z_]\w*)'),
+        'javascript': re.compile(r'^[ \t]*(?:static\s+)?(?:async\s+)?\*?([A-Za-z_$][\w$]*)\s*\([^)\n]*\)\s*\{'
+                                 r'|\bthis\.([A-Za-z_$][\w$]*)', re.MULTILINE),
+        'php': re.compile(r'\bfunction\s+([A-Za-z_]\w*)|\$this->([A-Za-z_]\w*)')
+    }
+    
+    def load_class_member_names(self, language: str) -> FrozenSet[str]:
+        """
+        Nomes de métodos e atributos da classe gerada (template da linguagem e helpers).
+        
+        Métodos de nós não podem usar esses nomes: um nó "Run" sobrescreveria
+        run(). Os arquivos são lidos uma única vez por instância.
+        
+        Args:
+            language: Nome da linguagem (ex: 'php')
+            
+        Returns:
+            Conjunto de nomes (vazio se a linguagem não tiver templates)
+        """
+        if language not in self._member_names:
+            self.template_loads += 1
+            pattern = self._MEMBER_PATTERNS.get(language)
+            paths = [self.templates_dir / "languages" / f"{language}.xml"]
+            paths.extend(sorted((self.templates_dir / "helpers" / language).glob("*.xml")))
+            names = set()
+            for path in paths:
+                if pattern is None or not path.exists():
+                    continue
+                for match in pattern.finditer(path.read_text(encoding='utf-8')):
+                    names.add(match.group(1) or match.group(2))
+            self._member_names[language] = frozenset(names)
+        return self._member_names[language]
+    
     def load_node_template(self, node_type: str, language: str = "php") -> Optional[Dict[str, str]]:
         """
         Carrega o template XML de um tipo de nó para uma linguagem específica.
         
+        Cada template é lido do disco uma única vez por instância; as chamadas
+        seguintes (um nó do mesmo tipo, outro workflow) usam a cópia em memória.
+        
         Args:
             node_type: Tipo do nó (ex: 'function', 'httpRequest')
             language: Linguagem de destino (ex: 'php', 'python', 'javascript')
@@ -59,6 +191,15 @@ class XMLLoader:
         Returns:
             Dicionário com 'name' e 'method' ou None se não encontrado
         """
+        key = (node_type, language)
+        if key not in self._node_templates:
+            self.template_loads += 1
+            self._node_templates[key] = self._read_node_template(node_type, language)
+        template = self._node_templates[key]
+        return dict(template) if template is not None else None
+    
+    def _read_node_template(self, node_type: str, language: str) -> Optional[Dict[str, str]]:
+        """Lê e interpreta o template XML de um tipo de nó."""
         # Tenta primeiro na pasta específica da linguagem
         template_path = self.templates_dir / "nodes" / language / f"{node_type}.xml"
         
@@ -71,8 +212,7 @@ class XMLLoader:
             return None
         
         try:
-            tree = ET.parse(template_path)
-            root = tree.getroot()
+            root = self._parse_xml(template_path)
             
             name_elem = root.find('name')
             method_elem = root.find('method')
@@ -88,6 +228,51 @@ class XMLLoader:
             print(f"Erro ao carregar template de nó: {e}")
             return None
     
+    def load_helper_template(self, helper_name: str, language: str = "php") -> Optional[Dict[str, str]]:
+        """
+        Carrega o template XML de um helper da classe gerada.
+        
+        Helpers adicionam métodos à classe conforme os nós presentes no
+        workflow (ex: suporte a streaming dos nós AI Agent) e, opcionalmente,
+        código executado no início (setup) e no fim (teardown) de run(), no
+        tratamento de erros de run() (error) e antes de run_many() criar as
+        cópias de trabalho (shared).
+        
+        Args:
+            helper_name: Nome do helper (ex: 'aiStreaming')
+            language: Linguagem de destino (ex: 'php', 'python', 'javascript')
+            
+        Returns:
+            Dicionário com 'method', 'setup', 'teardown', 'error' e 'shared' ou None se não encontrado
+        """
+        key = (helper_name, language)
+        if key not in self._helper_templates:
+            self.template_loads += 1
+            self._helper_templates[key] = self._read_helper_template(helper_name, language)
+        helper = self._helper_templates[key]
+        return dict(helper) if helper is not None else None
+    
+    def _read_helper_template(self, helper_name: str, language: str) -> Optional[Dict[str, str]]:
+        """Lê e interpreta o template XML de um helper."""
+        template_path = self.templates_dir / "helpers" / language / f"{helper_name}.xml"
+        
+        if not template_path.exists():
+            print(f"Template de helper não encontrado: {template_path}")
+            return None
+        
+        try:
+            root = self._parse_xml(template_path)
+            
+            helper = {}
+            for section in ('method', 'setup', 'teardown', 'error', 'shared'):
+                elem = root.find(section)
+                helper[section] = elem.text.strip() if elem is not None and elem.text else ''
+            
+            return helper
+        except Exception as e:
+            print(f"Erro ao carregar template de helper: {e}")
+            return None
+    
     def list_available_node_templates(self) -> list:
         """
         Lista todos os templates de nós disponíveis.
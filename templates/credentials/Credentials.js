@@ -100,10 +100,114 @@ class OpenRouterCredentials extends Credentials {
     }
 }
 
+/**
+ * Registro das credenciais de cada provedor de IA
+ * 
+ * Resolve as credenciais de cada provedor uma vez por processo (a variável
+ * de ambiente é lida somente na primeira chamada) e permite injetar ou
+ * trocar (rotacionar) credenciais em tempo de execução.
+ */
+class CredentialsRegistry {
+    /**
+     * Construtor
+     */
+    constructor() {
+        this._credentials = new Map();
+    }
+    
+    /**
+     * Normaliza o nome de um provedor de IA
+     * 
+     * @param {string} apiProvider - Provedor configurado no nó (ex: 'openai', 'Claude')
+     * @returns {string} 'anthropic', 'openrouter' ou 'openai'
+     */
+    static providerName(apiProvider) {
+        const provider = String(apiProvider || '').toLowerCase();
+        if (provider.includes('anthropic') || provider.includes('claude')) {
+            return 'anthropic';
+        }
+        if (provider.includes('openrouter')) {
+            return 'openrouter';
+        }
+        return 'openai';
+    }
+    
+    /**
+     * Obtém as credenciais de um provedor, resolvendo-as no primeiro uso
+     * 
+     * Uma chave ainda não configurada não é guardada: a variável de
+     * ambiente é consultada novamente na próxima chamada.
+     * 
+     * @param {string} apiProvider - Provedor configurado no nó
+     * @returns {Credentials} Credenciais do provedor
+     */
+    get(apiProvider) {
+        const name = CredentialsRegistry.providerName(apiProvider);
+        let credentials = this._credentials.get(name);
+        if (credentials) {
+            return credentials;
+        }
+        const CredentialsClass = PROVIDERS[name];
+        const apiKey = new CredentialsClass().getApiKey();
+        if (!apiKey) {
+            return new CredentialsClass();
+        }
+        credentials = new CredentialsClass(apiKey);
+        this._credentials.set(name, credentials);
+        return credentials;
+    }
+    
+    /**
+     * Injeta as credenciais de um provedor
+     * 
+     * @param {string} apiProvider - Provedor (ex: 'openai')
+     * @param {Credentials|string} credentials - Instância de Credentials ou a própria chave da API
+     */
+    register(apiProvider, credentials) {
+        const name = CredentialsRegistry.providerName(apiProvider);
+        if (typeof credentials === 'string') {
+            credentials = new PROVIDERS[name](credentials);
+        }
+        this._credentials.set(name, credentials);
+    }
+    
+    /**
+     * Troca a chave de um provedor
+     * 
+     * @param {string} apiProvider - Provedor (ex: 'openai')
+     * @param {string|null} apiKey - Nova chave ou null para ler a variável de ambiente novamente
+     */
+    rotate(apiProvider, apiKey = null) {
+        if (apiKey) {
+            this.register(apiProvider, apiKey);
+            return;
+        }
+        this._credentials.delete(CredentialsRegistry.providerName(apiProvider));
+    }
+    
+    /**
+     * Esquece todas as credenciais resolvidas ou injetadas
+     */
+    clear() {
+        this._credentials.clear();
+    }
+}
+
+const PROVIDERS = {
+    openai: OpenAICredentials,
+    anthropic: AnthropicCredentials,
+    openrouter: OpenRouterCredentials
+};
+
+// Registro compartilhado pelas classes geradas
+const credentialsRegistry = new CredentialsRegistry();
+
 module.exports = {
     Credentials,
     OpenAICredentials,
     AnthropicCredentials,
-    OpenRouterCredentials
+    OpenRouterCredentials,
+    CredentialsRegistry,
+    credentialsRegistry
 };
 
@@ -113,3 +113,101 @@ class OpenRouterCredentials extends Credentials {
     }
 }
 
+/**
+ * Registro das credenciais de cada provedor de IA
+ * 
+ * Resolve as credenciais de cada provedor uma vez por processo (a variável
+ * de ambiente é lida somente na primeira chamada) e permite injetar ou
+ * trocar (rotacionar) credenciais em tempo de execução.
+ * 
+ * @package Generated\Credentials
+ */
+final class CredentialsRegistry {
+    
+    private const PROVIDERS = [
+        'openai' => OpenAICredentials::class,
+        'anthropic' => AnthropicCredentials::class,
+        'openrouter' => OpenRouterCredentials::class
+    ];
+    
+    /** @var array<string, Credentials> Credenciais resolvidas ou injetadas por provedor */
+    private static array $credentials = [];
+    
+    /**
+     * Normaliza o nome de um provedor de IA
+     * 
+     * @param string $apiProvider Provedor configurado no nó (ex: 'openai', 'Claude')
+     * @return string 'anthropic', 'openrouter' ou 'openai'
+     */
+    public static function providerName(string $apiProvider): string
+    {
+        $provider = strtolower($apiProvider);
+        if (str_contains($provider, 'anthropic') || str_contains($provider, 'claude')) {
+            return 'anthropic';
+        }
+        if (str_contains($provider, 'openrouter')) {
+            return 'openrouter';
+        }
+        return 'openai';
+    }
+    
+    /**
+     * Obtém as credenciais de um provedor, resolvendo-as no primeiro uso
+     * 
+     * @param string $apiProvider Provedor configurado no nó
+     * @return Credentials Credenciais do provedor
+     * @throws \RuntimeException Se a credencial não estiver configurada
+     */
+    public static function get(string $apiProvider): Credentials
+    {
+        $name = self::providerName($apiProvider);
+        if (!isset(self::$credentials[$name])) {
+            $class = self::PROVIDERS[$name];
+            self::$credentials[$name] = new $class();
+        }
+        return self::$credentials[$name];
+    }
+    
+    /**
+     * Injeta as credenciais de um provedor
+     * 
+     * @param string $apiProvider Provedor (ex: 'openai')
+     * @param Credentials|string $credentials Instância de Credentials ou a própria chave da API
+     * @return void
+     */
+    public static function register(string $apiProvider, Credentials|string $credentials): void
+    {
+        $name = self::providerName($apiProvider);
+        if (is_string($credentials)) {
+            $class = self::PROVIDERS[$name];
+            $credentials = new $class($credentials);
+        }
+        self::$credentials[$name] = $credentials;
+    }
+    
+    /**
+     * Troca a chave de um provedor
+     * 
+     * @param string $apiProvider Provedor (ex: 'openai')
+     * @param string|null $apiKey Nova chave ou null para ler a variável de ambiente novamente
+     * @return void
+     */
+    public static function rotate(string $apiProvider, ?string $apiKey = null): void
+    {
+        if ($apiKey !== null && $apiKey !== '') {
+            self::register($apiProvider, $apiKey);
+            return;
+        }
+        unset(self::$credentials[self::providerName($apiProvider)]);
+    }
+    
+    /**
+     * Esquece todas as credenciais resolvidas ou injetadas
+     * 
+     * @return void
+     */
+    public static function clear(): void
+    {
+        self::$credentials = [];
+    }
+}
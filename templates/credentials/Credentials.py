@@ -5,8 +5,9 @@ Este módulo fornece classes para gerenciar credenciais de diferentes
 provedores de IA (OpenAI, Anthropic, OpenRouter, etc.)
 """
 import os
+import threading
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Optional, Union
 
 
 class Credentials(ABC):
@@ -94,3 +95,104 @@ class OpenRouterCredentials(Credentials):
             return self._api_key
         return os.getenv('OPENROUTER_API_KEY', '')
 
+
+
+class CredentialsRegistry:
+    """
+    Registro das credenciais de cada provedor de IA
+
+    Resolve as credenciais de cada provedor uma vez por processo (a variável
+    de ambiente é lida somente na primeira chamada) e permite injetar ou
+    trocar (rotacionar) credenciais em tempo de execução.
+    """
+
+    PROVIDERS = {
+        'openai': OpenAICredentials,
+        'anthropic': AnthropicCredentials,
+        'openrouter': OpenRouterCredentials
+    }
+
+    def __init__(self):
+        """Inicializa o registro vazio."""
+        self._lock = threading.Lock()
+        self._credentials: Dict[str, Credentials] = {}
+
+    @staticmethod
+    def provider_name(api_provider: str) -> str:
+        """
+        Normaliza o nome de um provedor de IA
+
+        Args:
+            api_provider: Provedor configurado no nó (ex: 'openai', 'Claude')
+
+        Returns:
+            'anthropic', 'openrouter' ou 'openai'
+        """
+        provider = (api_provider or '').lower()
+        if 'anthropic' in provider or 'claude' in provider:
+            return 'anthropic'
+        if 'openrouter' in provider:
+            return 'openrouter'
+        return 'openai'
+
+    def get(self, api_provider: str) -> Credentials:
+        """
+        Obtém as credenciais de um provedor, resolvendo-as no primeiro uso
+
+        Uma chave ainda não configurada não é guardada: a variável de
+        ambiente é consultada novamente na próxima chamada.
+
+        Args:
+            api_provider: Provedor configurado no nó
+
+        Returns:
+            Credenciais do provedor
+        """
+        name = self.provider_name(api_provider)
+        credentials = self._credentials.get(name)
+        if credentials is not None:
+            return credentials
+
+        credentials_class = self.PROVIDERS[name]
+        api_key = credentials_class().get_api_key()
+        if not api_key:
+            return credentials_class()
+        with self._lock:
+            return self._credentials.setdefault(name, credentials_class(api_key))
+
+    def register(self, api_provider: str, credentials: Union[Credentials, str]) -> None:
+        """
+        Injeta as credenciais de um provedor
+
+        Args:
+            api_provider: Provedor (ex: 'openai')
+            credentials: Instância de Credentials ou a própria chave da API
+        """
+        name = self.provider_name(api_provider)
+        if isinstance(credentials, str):
+            credentials = self.PROVIDERS[name](credentials)
+        with self._lock:
+            self._credentials[name] = credentials
+
+    def rotate(self, api_provider: str, api_key: Optional[str] = None) -> None:
+        """
+        Troca a chave de um provedor
+
+        Args:
+            api_provider: Provedor (ex: 'openai')
+            api_key: Nova chave ou None para ler a variável de ambiente novamente
+        """
+        if api_key:
+            self.register(api_provider, api_key)
+            return
+        with self._lock:
+            self._credentials.pop(self.provider_name(api_provider), None)
+
+    def clear(self) -> None:
+        """Esquece todas as credenciais resolvidas ou injetadas."""
+        with self._lock:
+            self._credentials.clear()
+
+
+# Registro compartilhado pelas classes geradas
+credentials_registry = CredentialsRegistry()
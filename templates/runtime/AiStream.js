@@ -0,0 +1,192 @@
+/**
+ * Streaming (server-sent events) das APIs de IA
+ *
+ * Este módulo interpreta as respostas em streaming dos provedores de IA
+ * (OpenAI, OpenRouter e APIs compatíveis com chat.completion.chunk, além da
+ * API de mensagens da Anthropic) e monta a resposta final incrementalmente,
+ * no mesmo formato da resposta sem streaming.
+ */
+
+/**
+ * Monta a resposta final a partir dos eventos de streaming
+ */
+class StreamAccumulator {
+    /**
+     * Construtor
+     *
+     * @param {string} provider - Provedor da API (ex: 'openai', 'anthropic', 'openrouter')
+     */
+    constructor(provider) {
+        const normalized = provider.toLowerCase();
+        this.anthropic = normalized.includes('anthropic') || normalized.includes('claude');
+        this.parts = [];
+        this.id = null;
+        this.model = null;
+        this.finishReason = null;
+        this.usage = {};
+        this.done = false;
+    }
+
+    /**
+     * Processa o campo data de um evento SSE
+     *
+     * @param {string} data - Conteúdo do campo data
+     * @returns {string|null} Token recebido ou null se o evento não contém texto
+     * @throws {Error} Se a API enviar um evento de erro
+     */
+    feed(data) {
+        if (data === '[DONE]') {
+            this.done = true;
+            return null;
+        }
+
+        let payload;
+        try {
+            payload = JSON.parse(data);
+        } catch (e) {
+            return null;
+        }
+
+        if (payload.error) {
+            const message = typeof payload.error === 'object' ? payload.error.message : String(payload.error);
+            throw new Error(`Erro no streaming da API de IA: ${message}`);
+        }
+
+        return this.anthropic ? this._feedAnthropic(payload) : this._feedOpenAI(payload);
+    }
+
+    _feedOpenAI(payload) {
+        this.id = payload.id || this.id;
+        this.model = payload.model || this.model;
+        if (payload.usage) {
+            this.usage = payload.usage;
+        }
+
+        let token = null;
+        for (const choice of payload.choices || []) {
+            const delta = choice.delta || {};
+            if (delta.content) {
+                token = delta.content;
+                this.parts.push(token);
+            }
+            if (choice.finish_reason) {
+                this.finishReason = choice.finish_reason;
+            }
+        }
+        return token;
+    }
+
+    _feedAnthropic(payload) {
+        switch (payload.type) {
+            case 'message_start':
+                this.id = payload.message?.id || null;
+                this.model = payload.message?.model || null;
+                Object.assign(this.usage, payload.message?.usage || {});
+                break;
+            case 'content_block_delta':
+                if (payload.delta?.text) {
+                    this.parts.push(payload.delta.text);
+                    return payload.delta.text;
+                }
+                break;
+            case 'message_delta':
+                this.finishReason = payload.delta?.stop_reason || this.finishReason;
+                Object.assign(this.usage, payload.usage || {});
+                break;
+            case 'message_stop':
+                this.done = true;
+                break;
+        }
+        return null;
+    }
+
+    /**
+     * Retorna a resposta completa no formato da API sem streaming
+     *
+     * @returns {Object} Resposta no formato OpenAI (choices) ou Anthropic (content)
+     */
+    result() {
+        const text = this.parts.join('');
+
+        if (this.anthropic) {
+            return {
+                id: this.id,
+                model: this.model,
+                type: 'message',
+                role: 'assistant',
+                content: [{ type: 'text', text: text }],
+                stop_reason: this.finishReason,
+                usage: this.usage
+            };
+        }
+
+        return {
+            id: this.id,
+            model: this.model,
+            object: 'chat.completion',
+            choices: [{
+                index: 0,
+                message: { role: 'assistant', content: text },
+                finish_reason: this.finishReason
+            }],
+            usage: this.usage
+        };
+    }
+}
+
+/**
+ * Consome um stream SSE de uma API de IA e monta a resposta final
+ *
+ * @param {AsyncIterable<Buffer|Uint8Array|string>} body - Corpo da resposta (ex: response.body)
+ * @param {string} provider - Provedor da API (ex: 'openai', 'anthropic', 'openrouter')
+ * @param {Function|null} onToken - Callback chamado com cada token recebido (opcional)
+ * @returns {Promise<Object>} Resposta completa no mesmo formato da resposta sem streaming
+ */
+async function consumeStream(body, provider, onToken = null) {
+    const accumulator = new StreamAccumulator(provider);
+    const decoder = new TextDecoder('utf-8');
+    let buffer = '';
+
+    const processBlock = (block) => {
+        const dataLines = [];
+        for (const line of block.split('\n')) {
+            // Comentários (ex: ": OPENROUTER PROCESSING") são apenas keep-alive
+            if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).replace(/^ /, ''));
+            }
+        }
+        if (dataLines.length === 0) {
+            return;
+        }
+        const token = accumulator.feed(dataLines.join('\n'));
+        if (token && onToken) {
+            onToken(token);
+        }
+    };
+
+    for await (const chunk of body) {
+        buffer += typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });
+        buffer = buffer.replace(/\r\n/g, '\n');
+
+        // Eventos SSE são separados por uma linha em branco
+        let position;
+        while (!accumulator.done && (position = buffer.indexOf('\n\n')) !== -1) {
+            processBlock(buffer.slice(0, position));
+            buffer = buffer.slice(position + 2);
+        }
+        if (accumulator.done) {
+            break;
+        }
+    }
+
+    if (!accumulator.done && buffer.trim() !== '') {
+        processBlock(buffer);
+    }
+
+    return accumulator.result();
+}
+
+module.exports = {
+    StreamAccumulator,
+    consumeStream
+};
@@ -0,0 +1,226 @@
+<?php
+
+/**
+ * Streaming (server-sent events) das APIs de IA
+ * 
+ * Interpreta as respostas em streaming dos provedores de IA (OpenAI,
+ * OpenRouter e APIs compatíveis com chat.completion.chunk, além da API de
+ * mensagens da Anthropic) e monta a resposta final incrementalmente, no
+ * mesmo formato da resposta sem streaming.
+ * 
+ * Uso com cURL: curl_setopt($ch, CURLOPT_WRITEFUNCTION, [$stream, 'write']);
+ * 
+ * @package Generated\Runtime
+ */
+class AiStream {
+
+    private bool $anthropic;
+    
+    /** @var callable|null */
+    private $onToken;
+    
+    private string $buffer = '';
+    private string $rawBody = '';
+    private array $parts = [];
+    private ?string $id = null;
+    private ?string $model = null;
+    private ?string $finishReason = null;
+    private array $usage = [];
+    private bool $done = false;
+
+    /**
+     * @param string $provider Provedor da API (ex: 'openai', 'anthropic', 'openrouter')
+     * @param callable|null $onToken Callback chamado com cada token recebido
+     */
+    public function __construct(string $provider, ?callable $onToken = null)
+    {
+        $provider = strtolower($provider);
+        $this->anthropic = strpos($provider, 'anthropic') !== false || strpos($provider, 'claude') !== false;
+        $this->onToken = $onToken;
+    }
+
+    /**
+     * Callback de escrita do cURL (CURLOPT_WRITEFUNCTION)
+     * 
+     * @param resource|\CurlHandle|null $ch Handle do cURL (null em respostas reproduzidas de um cassete)
+     * @param string $data Chunk recebido
+     * @param int|null $status Status HTTP quando não há handle do cURL
+     * @return int Quantidade de bytes processados
+     */
+    public function write($ch, string $data, ?int $status = null): int
+    {
+        // Respostas de erro não são SSE: guarda o corpo para a mensagem de erro
+        if (($status ?? curl_getinfo($ch, CURLINFO_HTTP_CODE)) !== 200) {
+            $this->rawBody .= $data;
+            return strlen($data);
+        }
+        
+        $this->buffer .= str_replace("\r\n", "\n", $data);
+        
+        // Eventos SSE são separados por uma linha em branco
+        while (($position = strpos($this->buffer, "\n\n")) !== false) {
+            $block = substr($this->buffer, 0, $position);
+            $this->buffer = substr($this->buffer, $position + 2);
+            $this->processBlock($block);
+        }
+        
+        return strlen($data);
+    }
+
+    /**
+     * Processa um bloco de linhas de um evento SSE
+     * 
+     * @param string $block Linhas do evento
+     * @return void
+     * @throws \Exception Se a API enviar um evento de erro
+     */
+    private function processBlock(string $block): void
+    {
+        $dataLines = [];
+        foreach (explode("\n", $block) as $line) {
+            // Comentários (ex: ": OPENROUTER PROCESSING") são apenas keep-alive
+            if ($line === '' || $line[0] === ':') {
+                continue;
+            }
+            if (strncmp($line, 'data:', 5) === 0) {
+                $dataLines[] = ltrim(substr($line, 5), ' ');
+            }
+        }
+        
+        if (empty($dataLines) || $this->done) {
+            return;
+        }
+        
+        $data = implode("\n", $dataLines);
+        if ($data === '[DONE]') {
+            $this->done = true;
+            return;
+        }
+        
+        $payload = json_decode($data, true);
+        if (!is_array($payload)) {
+            return;
+        }
+        
+        if (isset($payload['error'])) {
+            $message = is_array($payload['error']) ? ($payload['error']['message'] ?? '') : (string)$payload['error'];
+            throw new \Exception('Erro no streaming da API de IA: ' . $message);
+        }
+        
+        $token = $this->anthropic ? $this->feedAnthropic($payload) : $this->feedOpenAI($payload);
+        
+        if ($token !== null && $token !== '' && $this->onToken !== null) {
+            ($this->onToken)($token);
+        }
+    }
+
+    /**
+     * Processa um chunk no formato chat.completion.chunk
+     * 
+     * @param array $payload Chunk decodificado
+     * @return string|null Token recebido
+     */
+    private function feedOpenAI(array $payload): ?string
+    {
+        $this->id = $payload['id'] ?? $this->id;
+        $this->model = $payload['model'] ?? $this->model;
+        if (!empty($payload['usage'])) {
+            $this->usage = $payload['usage'];
+        }
+        
+        $token = null;
+        foreach ($payload['choices'] ?? [] as $choice) {
+            if (isset($choice['delta']['content']) && $choice['delta']['content'] !== '') {
+                $token = $choice['delta']['content'];
+                $this->parts[] = $token;
+            }
+            if (!empty($choice['finish_reason'])) {
+                $this->finishReason = $choice['finish_reason'];
+            }
+        }
+        
+        return $token;
+    }
+
+    /**
+     * Processa um evento da API de mensagens da Anthropic
+     * 
+     * @param array $payload Evento decodificado
+     * @return string|null Token recebido
+     */
+    private function feedAnthropic(array $payload): ?string
+    {
+        switch ($payload['type'] ?? '') {
+            case 'message_start':
+                $this->id = $payload['message']['id'] ?? null;
+                $this->model = $payload['message']['model'] ?? null;
+                $this->usage = array_merge($this->usage, $payload['message']['usage'] ?? []);
+                break;
+            case 'content_block_delta':
+                if (isset($payload['delta']['text'])) {
+                    $this->parts[] = $payload['delta']['text'];
+                    return $payload['delta']['text'];
+                }
+                break;
+            case 'message_delta':
+                $this->finishReason = $payload['delta']['stop_reason'] ?? $this->finishReason;
+                $this->usage = array_merge($this->usage, $payload['usage'] ?? []);
+                break;
+            case 'message_stop':
+                $this->done = true;
+                break;
+        }
+        
+        return null;
+    }
+
+    /**
+     * Retorna a resposta completa no formato da API sem streaming
+     * 
+     * @return array Resposta no formato OpenAI (choices) ou Anthropic (content)
+     */
+    public function result(): array
+    {
+        // Processa um eventual evento final sem linha em branco
+        if (trim($this->buffer) !== '') {
+            $this->processBlock($this->buffer);
+            $this->buffer = '';
+        }
+        
+        $text = implode('', $this->parts);
+        
+        if ($this->anthropic) {
+            return [
+                'id' => $this->id,
+                'model' => $this->model,
+                'type' => 'message',
+                'role' => 'assistant',
+                'content' => [['type' => 'text', 'text' => $text]],
+                'stop_reason' => $this->finishReason,
+                'usage' => $this->usage
+            ];
+        }
+        
+        return [
+            'id' => $this->id,
+            'model' => $this->model,
+            'object' => 'chat.completion',
+            'choices' => [[
+                'index' => 0,
+                'message' => ['role' => 'assistant', 'content' => $text],
+                'finish_reason' => $this->finishReason
+            ]],
+            'usage' => $this->usage
+        ];
+    }
+
+    /**
+     * Retorna o corpo bruto recebido em respostas de erro
+     * 
+     * @return string Corpo da resposta
+     */
+    public function rawBody(): string
+    {
+        return $this->rawBody;
+    }
+}
@@ -0,0 +1,202 @@
+"""
+Streaming (server-sent events) das APIs de IA
+
+Este módulo interpreta as respostas em streaming dos provedores de IA
+(OpenAI, OpenRouter e demais APIs compatíveis com chat.completion.chunk,
+além da API de mensagens da Anthropic) e monta a resposta final
+incrementalmente, no mesmo formato da resposta sem streaming.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+
+def iter_sse_events(lines: Iterable[Union[bytes, str]]) -> Iterator[Tuple[Optional[str], str]]:
+    """
+    Agrupa linhas de um stream SSE em eventos.
+
+    Args:
+        lines: Linhas do corpo da resposta (sem os terminadores de linha)
+
+    Yields:
+        Tuplas (event, data) para cada evento recebido
+    """
+    event = None
+    data_lines = []
+
+    for raw_line in lines:
+        line = raw_line.decode('utf-8') if isinstance(raw_line, bytes) else raw_line
+        line = line.rstrip('\r\n')
+
+        # Linha em branco encerra o evento atual
+        if not line:
+            if data_lines:
+                yield event, '\n'.join(data_lines)
+            event = None
+            data_lines = []
+            continue
+
+        # Comentários (ex: ": OPENROUTER PROCESSING") são apenas keep-alive
+        if line.startswith(':'):
+            continue
+
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+
+        if field == 'event':
+            event = value
+        elif field == 'data':
+            data_lines.append(value)
+
+    if data_lines:
+        yield event, '\n'.join(data_lines)
+
+
+class StreamAccumulator:
+    """Monta a resposta final a partir dos eventos de streaming."""
+
+    def __init__(self, provider: str):
+        """
+        Inicializa o acumulador.
+
+        Args:
+            provider: Provedor da API (ex: 'openai', 'anthropic', 'openrouter')
+        """
+        self.anthropic = 'anthropic' in provider.lower() or 'claude' in provider.lower()
+        self.parts = []
+        self.id = None
+        self.model = None
+        self.finish_reason = None
+        self.usage: Dict[str, Any] = {}
+        self.done = False
+
+    def feed(self, event: Optional[str], data: str) -> Optional[str]:
+        """
+        Processa um evento SSE.
+
+        Args:
+            event: Nome do evento (Anthropic) ou None
+            data: Conteúdo do campo data
+
+        Returns:
+            Texto do token recebido ou None se o evento não contém texto
+
+        Raises:
+            Exception: Se a API enviar um evento de erro
+        """
+        if data == '[DONE]':
+            self.done = True
+            return None
+
+        try:
+            payload = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+
+        if 'error' in payload:
+            error = payload['error']
+            message = error.get('message') if isinstance(error, dict) else str(error)
+            raise Exception(f'Erro no streaming da API de IA: {message}')
+
+        if self.anthropic:
+            return self._feed_anthropic(payload)
+        return self._feed_openai(payload)
+
+    def _feed_openai(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Processa um chunk no formato chat.completion.chunk."""
+        self.id = payload.get('id', self.id)
+        self.model = payload.get('model', self.model)
+        if payload.get('usage'):
+            self.usage = payload['usage']
+
+        token = None
+        for choice in payload.get('choices') or []:
+            delta = choice.get('delta') or {}
+            if delta.get('content'):
+                token = delta['content']
+                self.parts.append(token)
+            if choice.get('finish_reason'):
+                self.finish_reason = choice['finish_reason']
+        return token
+
+    def _feed_anthropic(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Processa um evento da API de mensagens da Anthropic."""
+        event_type = payload.get('type')
+
+        if event_type == 'message_start':
+            message = payload.get('message', {})
+            self.id = message.get('id')
+            self.model = message.get('model')
+            self.usage.update(message.get('usage') or {})
+        elif event_type == 'content_block_delta':
+            delta = payload.get('delta', {})
+            if delta.get('text'):
+                self.parts.append(delta['text'])
+                return delta['text']
+        elif event_type == 'message_delta':
+            self.finish_reason = payload.get('delta', {}).get('stop_reason', self.finish_reason)
+            self.usage.update(payload.get('usage') or {})
+        elif event_type == 'message_stop':
+            self.done = True
+        return None
+
+    def text(self) -> str:
+        """Retorna o texto acumulado até o momento."""
+        return ''.join(self.parts)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Retorna a resposta completa no formato da API sem streaming.
+
+        Returns:
+            Resposta no formato OpenAI (choices) ou Anthropic (content)
+        """
+        if self.anthropic:
+            return {
+                'id': self.id,
+                'model': self.model,
+                'type': 'message',
+                'role': 'assistant',
+                'content': [{'type': 'text', 'text': self.text()}],
+                'stop_reason': self.finish_reason,
+                'usage': self.usage
+            }
+        return {
+            'id': self.id,
+            'model': self.model,
+            'object': 'chat.completion',
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': self.text()},
+                'finish_reason': self.finish_reason
+            }],
+            'usage': self.usage
+        }
+
+
+def consume_stream(
+    lines: Iterable[Union[bytes, str]],
+    provider: str,
+    on_token: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Consome um stream SSE de uma API de IA e monta a resposta final.
+
+    Args:
+        lines: Linhas do corpo da resposta (ex: response.iter_lines())
+        provider: Provedor da API (ex: 'openai', 'anthropic', 'openrouter')
+        on_token: Callback chamado com cada token recebido (opcional)
+
+    Returns:
+        Resposta completa no mesmo formato da resposta sem streaming
+    """
+    accumulator = StreamAccumulator(provider)
+
+    for event, data in iter_sse_events(lines):
+        token = accumulator.feed(event, data)
+        if token and on_token:
+            on_token(token)
+        if accumulator.done:
+            break
+
+    return accumulator.result()
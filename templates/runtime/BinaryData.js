@@ -0,0 +1,156 @@
+/**
+ * Dados binários em arquivo dos nós HTTP Request das classes geradas
+ *
+ * Quando o nó HTTP Request usa o formato de resposta "File", o corpo é gravado
+ * em blocos em um arquivo temporário (sem passar inteiro pela memória) e o
+ * contexto recebe apenas uma referência leve: caminho, tamanho, tipo MIME e
+ * hash SHA-256. Os nós seguintes leem o conteúdo sob demanda com
+ * createReadStream() (o Node.js não tem mmap nativo).
+ *
+ * Os arquivos ficam em N8NCODING_BINARY_DIR (ou no diretório temporário do
+ * sistema) até serem removidos com BinaryFile.delete().
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { pipeline } = require('stream/promises');
+
+// Extensões dos tipos MIME mais comuns (usadas no nome do arquivo temporário)
+const EXTENSIONS = {
+    'application/json': '.json',
+    'application/pdf': '.pdf',
+    'application/zip': '.zip',
+    'image/gif': '.gif',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/svg+xml': '.svg',
+    'image/webp': '.webp',
+    'text/csv': '.csv',
+    'text/html': '.html',
+    'text/plain': '.txt'
+};
+
+/**
+ * Referência a um arquivo binário baixado (caminho, tamanho, tipo MIME e hash)
+ */
+class BinaryFile {
+    /**
+     * @param {Object} data - Metadados do arquivo
+     * @param {string} data.path - Caminho do arquivo
+     * @param {number} data.size - Tamanho em bytes
+     * @param {string|null} data.mimeType - Tipo MIME (ex: 'application/pdf')
+     * @param {string} data.sha256 - Hash SHA-256 do conteúdo (hexadecimal)
+     * @param {string|null} data.fileName - Nome original do arquivo (Content-Disposition ou URL)
+     */
+    constructor({ path: filePath, size, mimeType = null, sha256, fileName = null }) {
+        this.path = filePath;
+        this.size = size;
+        this.mimeType = mimeType;
+        this.sha256 = sha256;
+        this.fileName = fileName;
+    }
+
+    toJSON() {
+        return {
+            path: this.path,
+            size: this.size,
+            mimeType: this.mimeType,
+            sha256: this.sha256,
+            fileName: this.fileName
+        };
+    }
+
+    /**
+     * Abre o arquivo para leitura em blocos
+     *
+     * @param {Object} options - Opções de fs.createReadStream (start, end, highWaterMark)
+     * @returns {fs.ReadStream} Stream de leitura
+     */
+    createReadStream(options = {}) {
+        return fs.createReadStream(this.path, options);
+    }
+
+    /**
+     * Lê o conteúdo inteiro (somente para arquivos pequenos)
+     *
+     * @returns {Promise<Buffer>} Conteúdo
+     */
+    read() {
+        return fs.promises.readFile(this.path);
+    }
+
+    /**
+     * Remove o arquivo
+     */
+    async delete() {
+        await fs.promises.rm(this.path, { force: true });
+    }
+}
+
+/**
+ * Obtém o nome original do arquivo
+ *
+ * @param {string} url - URL da requisição
+ * @param {string|null} contentDisposition - Header Content-Disposition da resposta
+ * @returns {string|null} Nome do header (filename* ou filename), o último segmento da URL ou null
+ */
+function fileNameFrom(url, contentDisposition = null) {
+    if (contentDisposition) {
+        let match = /filename\*\s*=\s*[^']*'[^']*'([^;]+)/i.exec(contentDisposition);
+        if (match) {
+            return path.basename(decodeURIComponent(match[1].trim()));
+        }
+        match = /filename\s*=\s*"?([^";]+)"?/i.exec(contentDisposition);
+        if (match) {
+            return path.basename(match[1].trim());
+        }
+    }
+    try {
+        return path.posix.basename(decodeURIComponent(new URL(url).pathname)) || null;
+    } catch (e) {
+        return null;
+    }
+}
+
+/**
+ * Grava um stream em um arquivo temporário calculando tamanho e hash
+ *
+ * @param {AsyncIterable|null} body - Corpo da resposta (response.body do fetch)
+ * @param {Object} options - Opções
+ * @param {string|null} options.mimeType - Tipo MIME (header Content-Type; parâmetros como charset são removidos)
+ * @param {string|null} options.fileName - Nome original do arquivo
+ * @param {string|null} options.directory - Diretório dos arquivos (padrão: N8NCODING_BINARY_DIR ou o temporário do sistema)
+ * @returns {Promise<BinaryFile>} Referência ao arquivo gravado
+ */
+async function saveStream(body, { mimeType = null, fileName = null, directory = null } = {}) {
+    mimeType = String(mimeType || '').split(';')[0].trim() || null;
+    const suffix = path.extname(fileName || '') || EXTENSIONS[mimeType] || '';
+    directory = directory || process.env.N8NCODING_BINARY_DIR || os.tmpdir();
+    await fs.promises.mkdir(directory, { recursive: true });
+
+    const filePath = path.join(directory, `n8ncoding-${crypto.randomUUID()}${suffix}`);
+    const hash = crypto.createHash('sha256');
+    let size = 0;
+    async function* measure(source) {
+        for await (const chunk of source) {
+            hash.update(chunk);
+            size += chunk.length;
+            yield chunk;
+        }
+    }
+    try {
+        await pipeline(body || [], measure, fs.createWriteStream(filePath, { flags: 'wx' }));
+    } catch (error) {
+        await fs.promises.rm(filePath, { force: true });
+        throw error;
+    }
+    return new BinaryFile({ path: filePath, size, mimeType, sha256: hash.digest('hex'), fileName });
+}
+
+module.exports = {
+    BinaryFile,
+    fileNameFrom,
+    saveStream
+};
@@ -0,0 +1,188 @@
+<?php
+
+/**
+ * Dados binários em arquivo dos nós HTTP Request das classes geradas
+ *
+ * Quando o nó HTTP Request usa o formato de resposta "File", o corpo é gravado
+ * em blocos (CURLOPT_WRITEFUNCTION) em um arquivo temporário, sem passar
+ * inteiro pela memória, e o contexto recebe apenas uma referência leve:
+ * caminho, tamanho, tipo MIME e hash SHA-256. Os nós seguintes leem o
+ * conteúdo sob demanda com open() (o PHP não tem mmap nativo).
+ *
+ * Os arquivos ficam em N8NCODING_BINARY_DIR (ou no diretório temporário do
+ * sistema) até serem removidos com BinaryFile::delete().
+ *
+ * @package Generated\Runtime
+ */
+
+/**
+ * Referência a um arquivo binário baixado (caminho, tamanho, tipo MIME e hash)
+ *
+ * @package Generated\Runtime
+ */
+class BinaryFile implements JsonSerializable {
+
+    /**
+     * @param string $path Caminho do arquivo
+     * @param int $size Tamanho em bytes
+     * @param string|null $mimeType Tipo MIME (ex: 'application/pdf')
+     * @param string $sha256 Hash SHA-256 do conteúdo (hexadecimal)
+     * @param string|null $fileName Nome original do arquivo (URL)
+     */
+    public function __construct(
+        public readonly string $path,
+        public readonly int $size,
+        public readonly ?string $mimeType,
+        public readonly string $sha256,
+        public readonly ?string $fileName = null
+    ) {
+    }
+
+    /**
+     * Metadados do arquivo
+     *
+     * @return array path, size, mime_type, sha256 e file_name
+     */
+    public function toArray(): array
+    {
+        return [
+            'path' => $this->path,
+            'size' => $this->size,
+            'mime_type' => $this->mimeType,
+            'sha256' => $this->sha256,
+            'file_name' => $this->fileName
+        ];
+    }
+
+    public function jsonSerialize(): array
+    {
+        return $this->toArray();
+    }
+
+    /**
+     * Abre o arquivo para leitura em blocos (fread)
+     *
+     * @return resource Handle do arquivo (modo 'rb')
+     */
+    public function open()
+    {
+        return fopen($this->path, 'rb');
+    }
+
+    /**
+     * Lê o conteúdo inteiro (somente para arquivos pequenos)
+     *
+     * @return string Conteúdo
+     */
+    public function read(): string
+    {
+        return (string)file_get_contents($this->path);
+    }
+
+    /**
+     * Remove o arquivo
+     *
+     * @return void
+     */
+    public function delete(): void
+    {
+        if (is_file($this->path)) {
+            unlink($this->path);
+        }
+    }
+}
+
+/**
+ * Grava o corpo de uma resposta em um arquivo temporário, em blocos
+ *
+ * Use [$writer, 'write'] como $writeFunction de httpSend() e, ao fim,
+ * finish() (resposta de sucesso) ou discard() (resposta de erro).
+ *
+ * @package Generated\Runtime
+ */
+class BinaryWriter {
+
+    public readonly string $path;
+
+    private $handle;
+
+    private \HashContext $hash;
+
+    private int $size = 0;
+
+    private ?string $mimeType = null;
+
+    /**
+     * @param string|null $directory Diretório dos arquivos (padrão: N8NCODING_BINARY_DIR ou o temporário do sistema)
+     */
+    public function __construct(?string $directory = null)
+    {
+        $directory = $directory ?: (getenv('N8NCODING_BINARY_DIR') ?: sys_get_temp_dir());
+        if (!is_dir($directory)) {
+            mkdir($directory, 0777, true);
+        }
+        $this->path = tempnam($directory, 'n8ncoding-');
+        $this->handle = fopen($this->path, 'wb');
+        $this->hash = hash_init('sha256');
+    }
+
+    /**
+     * Grava um bloco (assinatura de CURLOPT_WRITEFUNCTION)
+     *
+     * @param \CurlHandle|null $ch Handle do cURL (null no replay do cassete)
+     * @param string $data Bloco recebido
+     * @param int|null $status Status HTTP (somente no replay do cassete)
+     * @return int Bytes consumidos
+     */
+    public function write($ch, string $data, ?int $status = null): int
+    {
+        if ($this->mimeType === null && $ch !== null) {
+            $this->mimeType = curl_getinfo($ch, CURLINFO_CONTENT_TYPE) ?: null;
+        }
+        fwrite($this->handle, $data);
+        hash_update($this->hash, $data);
+        $this->size += strlen($data);
+        return strlen($data);
+    }
+
+    /**
+     * Fecha o arquivo e devolve a referência
+     *
+     * @param string|null $fileName Nome original do arquivo
+     * @return BinaryFile Referência ao arquivo gravado
+     */
+    public function finish(?string $fileName = null): BinaryFile
+    {
+        fclose($this->handle);
+        $mimeType = $this->mimeType !== null ? trim(explode(';', $this->mimeType)[0]) : null;
+        if ($mimeType === null && $this->size > 0 && function_exists('mime_content_type')) {
+            $mimeType = mime_content_type($this->path) ?: null;
+        }
+        return new BinaryFile($this->path, $this->size, $mimeType, hash_final($this->hash), $fileName);
+    }
+
+    /**
+     * Fecha e remove o arquivo, devolvendo o conteúdo (ex: corpo de uma resposta de erro)
+     *
+     * @return string Conteúdo gravado
+     */
+    public function discard(): string
+    {
+        fclose($this->handle);
+        $content = (string)file_get_contents($this->path);
+        unlink($this->path);
+        return $content;
+    }
+
+    /**
+     * Obtém o nome original do arquivo a partir da URL
+     *
+     * @param string $url URL da requisição
+     * @return string|null Último segmento do caminho ou null
+     */
+    public static function fileNameFromUrl(string $url): ?string
+    {
+        $name = basename(rawurldecode((string)parse_url($url, PHP_URL_PATH)));
+        return $name !== '' ? $name : null;
+    }
+}
@@ -0,0 +1,150 @@
+"""
+Dados binários em arquivo dos nós HTTP Request das classes geradas
+
+Quando o nó HTTP Request usa o formato de resposta "File", o corpo é gravado
+em blocos em um arquivo temporário (sem passar inteiro pela memória) e o
+contexto recebe apenas uma referência leve: caminho, tamanho, tipo MIME e
+hash SHA-256. Os nós seguintes leem o conteúdo sob demanda, por exemplo com
+uma visão mapeada em memória (mmap).
+
+Os arquivos ficam em N8NCODING_BINARY_DIR (ou no diretório temporário do
+sistema) até serem removidos com BinaryFile.delete().
+"""
+import hashlib
+import mimetypes
+import mmap
+import os
+import re
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import unquote, urlsplit
+
+# Tamanho dos blocos lidos da resposta e gravados no arquivo
+CHUNK_SIZE = 64 * 1024
+
+
+class BinaryFile:
+    """Referência a um arquivo binário baixado (caminho, tamanho, tipo MIME e hash)."""
+
+    def __init__(self, path: str, size: int, mime_type: Optional[str], sha256: str,
+                 file_name: Optional[str] = None):
+        """
+        Inicializa a referência.
+
+        Args:
+            path: Caminho do arquivo
+            size: Tamanho em bytes
+            mime_type: Tipo MIME (ex: 'application/pdf')
+            sha256: Hash SHA-256 do conteúdo (hexadecimal)
+            file_name: Nome original do arquivo (Content-Disposition ou URL)
+        """
+        self.path = path
+        self.size = size
+        self.mime_type = mime_type
+        self.sha256 = sha256
+        self.file_name = file_name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metadados do arquivo (serializáveis em JSON)."""
+        return {
+            'path': self.path,
+            'size': self.size,
+            'mime_type': self.mime_type,
+            'sha256': self.sha256,
+            'file_name': self.file_name
+        }
+
+    def open(self):
+        """Abre o arquivo para leitura em blocos (modo 'rb')."""
+        return open(self.path, 'rb')
+
+    def mmap(self) -> mmap.mmap:
+        """
+        Mapeia o arquivo em memória, somente leitura.
+
+        O mapa aceita fatias (view[0:4]), busca (view.find(b'...')) e
+        memoryview(view); feche-o com close() ou use-o em um bloco with.
+
+        Returns:
+            Mapa do arquivo
+
+        Raises:
+            ValueError: Se o arquivo estiver vazio
+        """
+        with open(self.path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self) -> bytes:
+        """Lê o conteúdo inteiro (somente para arquivos pequenos)."""
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def delete(self) -> None:
+        """Remove o arquivo."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self) -> str:
+        return f'<BinaryFile {self.file_name or os.path.basename(self.path)} {self.mime_type} {self.size} bytes>'
+
+
+def file_name_from(url: str, content_disposition: Optional[str] = None) -> Optional[str]:
+    """
+    Obtém o nome original do arquivo.
+
+    Args:
+        url: URL da requisição
+        content_disposition: Header Content-Disposition da resposta
+
+    Returns:
+        Nome do header (filename* ou filename), o último segmento da URL ou None
+    """
+    if content_disposition:
+        match = re.search(r"filename\*\s*=\s*[^']*'[^']*'([^;]+)", content_disposition, re.IGNORECASE)
+        if match:
+            return os.path.basename(unquote(match.group(1).strip()))
+        match = re.search(r'filename\s*=\s*"?([^";]+)"?', content_disposition, re.IGNORECASE)
+        if match:
+            return os.path.basename(match.group(1).strip())
+    name = os.path.basename(unquote(urlsplit(url).path))
+    return name or None
+
+
+def save_chunks(chunks: Iterable[bytes], mime_type: Optional[str] = None, file_name: Optional[str] = None,
+                directory: Optional[str] = None) -> BinaryFile:
+    """
+    Grava blocos em um arquivo temporário calculando tamanho e hash.
+
+    Args:
+        chunks: Blocos do conteúdo (ex: response.iter_content(CHUNK_SIZE))
+        mime_type: Tipo MIME (header Content-Type; parâmetros como charset são removidos)
+        file_name: Nome original do arquivo (o tipo MIME é deduzido dele se ausente)
+        directory: Diretório dos arquivos (padrão: N8NCODING_BINARY_DIR ou o temporário do sistema)
+
+    Returns:
+        Referência ao arquivo gravado
+    """
+    mime_type = (mime_type or '').split(';')[0].strip() or None
+    if mime_type is None and file_name:
+        mime_type = mimetypes.guess_type(file_name)[0]
+    suffix = os.path.splitext(file_name or '')[1] or mimetypes.guess_extension(mime_type or '') or ''
+    directory = directory or os.getenv('N8NCODING_BINARY_DIR') or None
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    fd, path = tempfile.mkstemp(prefix='n8ncoding-', suffix=suffix, dir=directory)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                if chunk:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return BinaryFile(path, size, mime_type, digest.hexdigest(), file_name)
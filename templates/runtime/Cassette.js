@@ -0,0 +1,218 @@
+/**
+ * Gravação e reprodução (record/replay) das chamadas HTTP das classes geradas
+ *
+ * Grava cada requisição HTTP dos nós HTTP Request e AI Agent e a sua resposta
+ * em um arquivo de cassete (JSON lines, uma interação por linha) e, no modo
+ * replay, devolve as respostas gravadas a partir da memória, sem rede, com
+ * latência simulada opcional. O formato é o mesmo nas três linguagens.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+
+/**
+ * Erro de requisição sem resposta gravada no cassete (modo replay)
+ */
+class CassetteMissError extends Error {
+    constructor(message) {
+        super(message);
+        this.name = 'CassetteMissError';
+    }
+}
+
+/**
+ * Serializa um valor em JSON com as chaves dos objetos ordenadas
+ *
+ * @param {*} value - Valor a serializar
+ * @returns {string} JSON canônico
+ */
+function canonicalJson(value) {
+    if (Array.isArray(value)) {
+        return '[' + value.map(canonicalJson).join(',') + ']';
+    }
+    if (value && typeof value === 'object') {
+        const keys = Object.keys(value).sort();
+        return '{' + keys.map((key) => JSON.stringify(key) + ':' + canonicalJson(value[key])).join(',') + '}';
+    }
+    return JSON.stringify(value === undefined ? null : value);
+}
+
+/**
+ * Normaliza o corpo de uma requisição para compor a chave do cassete
+ *
+ * @param {string|Buffer|null} body - Corpo da requisição
+ * @returns {string} Corpo normalizado (JSON com as chaves ordenadas)
+ */
+function canonicalBody(body) {
+    if (body === null || body === undefined) {
+        return '';
+    }
+    const text = Buffer.isBuffer(body) ? body.toString('utf8') : String(body);
+    try {
+        return canonicalJson(JSON.parse(text));
+    } catch (e) {
+        return text;
+    }
+}
+
+/**
+ * Gera a chave de uma requisição no cassete
+ *
+ * @param {string} method - Método HTTP
+ * @param {string} url - URL da requisição
+ * @param {string|null} body - Corpo da requisição
+ * @returns {string} Hash SHA-256 de método, URL e corpo normalizado
+ */
+function interactionKey(method, url, body) {
+    const text = [String(method || 'GET').toUpperCase(), url, canonicalBody(body)].join('\n');
+    return crypto.createHash('sha256').update(text, 'utf8').digest('hex');
+}
+
+/**
+ * Cassete de interações HTTP em JSON lines
+ */
+class Cassette {
+    /**
+     * Construtor
+     *
+     * @param {string} path - Arquivo do cassete
+     * @param {string} mode - 'record' (executa e grava) ou 'replay' (responde do cassete)
+     * @param {number|string|null} latency - Latência simulada no replay: null, segundos ou 'recorded'
+     */
+    constructor(path, mode = 'replay', latency = null) {
+        if (mode !== 'record' && mode !== 'replay') {
+            throw new Error(`Modo de cassete desconhecido: ${mode}`);
+        }
+        this.path = path;
+        this.mode = mode;
+        this.latency = latency;
+        this._interactions = new Map();
+        this._positions = new Map();
+        if (mode === 'replay') {
+            this.load();
+        }
+    }
+
+    /**
+     * Carrega as interações do arquivo para a memória
+     */
+    load() {
+        this._interactions = new Map();
+        this._positions = new Map();
+        for (const line of fs.readFileSync(this.path, 'utf-8').split('\n')) {
+            if (!line.trim()) {
+                continue;
+            }
+            const interaction = JSON.parse(line);
+            const request = interaction.request;
+            const key = interactionKey(request.method, request.url, request.body);
+            if (!this._interactions.has(key)) {
+                this._interactions.set(key, []);
+            }
+            this._interactions.get(key).push(interaction.response);
+        }
+    }
+
+    /**
+     * Grava uma interação no fim do arquivo
+     *
+     * Os headers da requisição não são gravados (podem conter credenciais).
+     *
+     * @param {string} method - Método HTTP
+     * @param {string} url - URL da requisição
+     * @param {string|null} body - Corpo da requisição
+     * @param {number} status - Status HTTP da resposta
+     * @param {Object} headers - Headers da resposta
+     * @param {Buffer} content - Corpo da resposta
+     * @param {number} elapsed - Duração da requisição em segundos
+     */
+    record(method, url, body, status, headers, content, elapsed) {
+        const response = { status, headers, elapsed: Math.round(elapsed * 1e6) / 1e6 };
+        const text = content.toString('utf8');
+        if (Buffer.from(text, 'utf8').equals(content)) {
+            response.body = text;
+        } else {
+            response.body_base64 = content.toString('base64');
+        }
+        const request = { method: String(method || 'GET').toUpperCase(), url, body: body === undefined ? null : body };
+        fs.appendFileSync(this.path, JSON.stringify({ request, response }) + '\n');
+    }
+
+    /**
+     * Obtém a resposta gravada de uma requisição, aplicando a latência simulada
+     *
+     * Requisições repetidas recebem as respostas na ordem em que foram
+     * gravadas, recomeçando do início quando acabam.
+     *
+     * @param {string} method - Método HTTP
+     * @param {string} url - URL da requisição
+     * @param {string|null} body - Corpo da requisição
+     * @returns {Promise<Object>} Resposta gravada
+     * @throws {CassetteMissError} Se a requisição não foi gravada
+     */
+    async replay(method, url, body) {
+        const key = interactionKey(method, url, body);
+        const responses = this._interactions.get(key);
+        if (!responses || responses.length === 0) {
+            throw new CassetteMissError(`Requisição não gravada no cassete: ${String(method || 'GET').toUpperCase()} ${url}`);
+        }
+        const position = this._positions.get(key) || 0;
+        this._positions.set(key, position + 1);
+        const response = responses[position % responses.length];
+
+        const delay = this.latency === 'recorded' ? response.elapsed || 0 : this.latency;
+        if (delay) {
+            await new Promise(resolve => setTimeout(resolve, Number(delay) * 1000));
+        }
+        return response;
+    }
+
+    /**
+     * Executa (record) ou reproduz (replay) uma chamada com a interface do fetch
+     *
+     * @param {string} url - URL da requisição
+     * @param {Object} options - Opções do fetch (method, headers, body)
+     * @param {Function} fetchImpl - Implementação do fetch usada na gravação
+     * @returns {Promise<Response>} Resposta
+     */
+    async fetch(url, options, fetchImpl) {
+        const method = (options && options.method) || 'GET';
+        const body = options && options.body !== undefined ? options.body : null;
+        const ResponseClass = typeof Response === 'function' ? Response : require('node-fetch').Response;
+
+        if (this.mode === 'replay') {
+            const recorded = await this.replay(method, url, body);
+            const content = recorded.body_base64 !== undefined
+                ? Buffer.from(recorded.body_base64, 'base64')
+                : Buffer.from(recorded.body || '', 'utf8');
+            const headers = { ...(recorded.headers || {}) };
+            // Corpo já decodificado na gravação: evita decodificar gzip novamente
+            for (const name of Object.keys(headers)) {
+                if (name.toLowerCase() === 'content-encoding') {
+                    delete headers[name];
+                }
+            }
+            const nullBody = [204, 205, 304].includes(recorded.status);
+            return new ResponseClass(nullBody ? null : content, { status: recorded.status, headers });
+        }
+
+        const started = process.hrtime.bigint();
+        const response = await fetchImpl(url, options);
+        const content = Buffer.from(await response.arrayBuffer());
+        const headers = Object.fromEntries(response.headers.entries());
+        this.record(method, url, body, response.status, headers,
+            content, Number(process.hrtime.bigint() - started) / 1e9);
+        delete headers['content-encoding'];
+        return new ResponseClass([204, 205, 304].includes(response.status) ? null : content, {
+            status: response.status,
+            headers
+        });
+    }
+}
+
+module.exports = {
+    Cassette,
+    CassetteMissError,
+    canonicalBody,
+    interactionKey
+};
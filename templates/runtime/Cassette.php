@@ -0,0 +1,179 @@
+<?php
+
+/**
+ * Gravação e reprodução (record/replay) das chamadas HTTP das classes geradas
+ *
+ * Grava cada requisição HTTP dos nós HTTP Request e AI Agent e a sua resposta
+ * em um arquivo de cassete (JSON lines, uma interação por linha) e, no modo
+ * replay, devolve as respostas gravadas a partir da memória, sem rede, com
+ * latência simulada opcional. O formato é o mesmo nas três linguagens.
+ *
+ * @package Generated\Runtime
+ */
+
+/**
+ * Requisição sem resposta gravada no cassete (modo replay)
+ *
+ * @package Generated\Runtime
+ */
+class CassetteMissException extends \RuntimeException {
+}
+
+/**
+ * Cassete de interações HTTP em JSON lines
+ *
+ * @package Generated\Runtime
+ */
+class Cassette {
+
+    private array $interactions = [];
+
+    private array $positions = [];
+
+    /**
+     * @param string $path Arquivo do cassete
+     * @param string $mode 'record' (executa e grava) ou 'replay' (responde do cassete)
+     * @param float|string|null $latency Latência simulada no replay: null, segundos ou 'recorded'
+     */
+    public function __construct(
+        public readonly string $path,
+        public readonly string $mode = 'replay',
+        public readonly float|string|null $latency = null
+    ) {
+        if ($mode !== 'record' && $mode !== 'replay') {
+            throw new \InvalidArgumentException("Modo de cassete desconhecido: {$mode}");
+        }
+        if ($mode === 'replay') {
+            $this->load();
+        }
+    }
+
+    /**
+     * Normaliza o corpo de uma requisição para compor a chave do cassete
+     *
+     * @param string|null $body Corpo da requisição
+     * @return string Corpo normalizado (JSON com as chaves ordenadas)
+     */
+    public static function canonicalBody(?string $body): string
+    {
+        if ($body === null || $body === '') {
+            return '';
+        }
+        $decoded = json_decode($body, true);
+        if (json_last_error() !== JSON_ERROR_NONE) {
+            return $body;
+        }
+        return json_encode(self::sortKeys($decoded), JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES);
+    }
+
+    /**
+     * Gera a chave de uma requisição no cassete
+     *
+     * @param string $method Método HTTP
+     * @param string $url URL da requisição
+     * @param string|null $body Corpo da requisição
+     * @return string Hash SHA-256 de método, URL e corpo normalizado
+     */
+    public static function interactionKey(string $method, string $url, ?string $body): string
+    {
+        return hash('sha256', implode("\n", [strtoupper($method), $url, self::canonicalBody($body)]));
+    }
+
+    private static function sortKeys(mixed $value): mixed
+    {
+        if (!is_array($value)) {
+            return $value;
+        }
+        $sorted = array_map([self::class, 'sortKeys'], $value);
+        if (!array_is_list($sorted)) {
+            ksort($sorted, SORT_STRING);
+        }
+        return $sorted;
+    }
+
+    /**
+     * Carrega as interações do arquivo para a memória
+     *
+     * @return void
+     */
+    public function load(): void
+    {
+        $this->interactions = [];
+        $this->positions = [];
+        foreach (file($this->path, FILE_IGNORE_NEW_LINES | FILE_SKIP_EMPTY_LINES) as $line) {
+            $interaction = json_decode($line, true);
+            $request = $interaction['request'];
+            $key = self::interactionKey($request['method'], $request['url'], $request['body'] ?? null);
+            $this->interactions[$key][] = $interaction['response'];
+        }
+    }
+
+    /**
+     * Grava uma interação no fim do arquivo
+     *
+     * Os headers da requisição não são gravados (podem conter credenciais).
+     *
+     * @param string $method Método HTTP
+     * @param string $url URL da requisição
+     * @param string|null $body Corpo da requisição
+     * @param int $status Status HTTP da resposta
+     * @param array $headers Headers da resposta (nome => valor)
+     * @param string $content Corpo da resposta
+     * @param float $elapsed Duração da requisição em segundos
+     * @return void
+     */
+    public function record(
+        string $method,
+        string $url,
+        ?string $body,
+        int $status,
+        array $headers,
+        string $content,
+        float $elapsed
+    ): void {
+        $response = ['status' => $status, 'headers' => (object)$headers, 'elapsed' => round($elapsed, 6)];
+        if (mb_check_encoding($content, 'UTF-8')) {
+            $response['body'] = $content;
+        } else {
+            $response['body_base64'] = base64_encode($content);
+        }
+        $line = json_encode([
+            'request' => ['method' => strtoupper($method), 'url' => $url, 'body' => $body],
+            'response' => $response
+        ], JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES);
+        file_put_contents($this->path, $line . "\n", FILE_APPEND | LOCK_EX);
+    }
+
+    /**
+     * Obtém a resposta gravada de uma requisição, aplicando a latência simulada
+     *
+     * Requisições repetidas recebem as respostas na ordem em que foram
+     * gravadas, recomeçando do início quando acabam.
+     *
+     * @param string $method Método HTTP
+     * @param string $url URL da requisição
+     * @param string|null $body Corpo da requisição
+     * @return array Resposta gravada ('status', 'headers', 'content', 'elapsed')
+     * @throws CassetteMissException Se a requisição não foi gravada
+     */
+    public function replay(string $method, string $url, ?string $body): array
+    {
+        $key = self::interactionKey($method, $url, $body);
+        if (empty($this->interactions[$key])) {
+            throw new CassetteMissException('Requisição não gravada no cassete: ' . strtoupper($method) . ' ' . $url);
+        }
+        $position = $this->positions[$key] ?? 0;
+        $this->positions[$key] = $position + 1;
+        $response = $this->interactions[$key][$position % count($this->interactions[$key])];
+
+        $delay = $this->latency === 'recorded' ? ($response['elapsed'] ?? 0) : $this->latency;
+        if ($delay) {
+            usleep((int)round((float)$delay * 1e6));
+        }
+
+        $response['content'] = isset($response['body_base64'])
+            ? base64_decode($response['body_base64'])
+            : (string)($response['body'] ?? '');
+        return $response;
+    }
+}
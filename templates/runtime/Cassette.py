@@ -0,0 +1,221 @@
+"""
+Gravação e reprodução (record/replay) das chamadas HTTP das classes geradas
+
+Este módulo grava cada requisição HTTP dos nós HTTP Request e AI Agent e a
+sua resposta em um arquivo de cassete (JSON lines, uma interação por linha)
+e, no modo replay, devolve as respostas gravadas a partir da memória, sem
+rede, com latência simulada opcional. O formato é o mesmo nas três
+linguagens: um cassete gravado em Python pode ser reproduzido em PHP ou
+JavaScript.
+"""
+import base64
+import hashlib
+import io
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class CassetteMissError(LookupError):
+    """Requisição sem resposta gravada no cassete (modo replay)."""
+
+
+def canonical_body(body: Any) -> str:
+    """
+    Normaliza o corpo de uma requisição para compor a chave do cassete.
+
+    Corpos JSON são reserializados com as chaves ordenadas, para que a chave
+    não dependa da formatação de cada linguagem.
+
+    Args:
+        body: Corpo da requisição (texto, bytes ou None)
+
+    Returns:
+        Corpo normalizado
+    """
+    if body is None:
+        return ''
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    except ValueError:
+        return body
+
+
+def interaction_key(method: str, url: str, body: Any) -> str:
+    """
+    Gera a chave de uma requisição no cassete.
+
+    Args:
+        method: Método HTTP
+        url: URL da requisição
+        body: Corpo da requisição
+
+    Returns:
+        Hash SHA-256 de método, URL e corpo normalizado
+    """
+    text = '\n'.join([method.upper(), url, canonical_body(body)])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """Cassete de interações HTTP em JSON lines."""
+
+    def __init__(self, path: str, mode: str = 'replay', latency: Union[None, float, str] = None):
+        """
+        Inicializa o cassete.
+
+        Args:
+            path: Arquivo do cassete
+            mode: 'record' (executa e grava) ou 'replay' (responde do cassete)
+            latency: Latência simulada no replay: None (nenhuma), segundos fixos
+                ou 'recorded' (a duração gravada de cada resposta)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Modo de cassete desconhecido: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        if mode == 'replay':
+            self.load()
+
+    def load(self) -> None:
+        """Carrega as interações do arquivo para a memória."""
+        interactions: Dict[str, List[Dict[str, Any]]] = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                request = interaction['request']
+                key = interaction_key(request['method'], request['url'], request.get('body'))
+                interactions.setdefault(key, []).append(interaction['response'])
+        with self._lock:
+            self._interactions = interactions
+            self._positions = {}
+
+    def record(self, method: str, url: str, body: Any, status: int, headers: Dict[str, str],
+               content: bytes, elapsed: float) -> None:
+        """
+        Grava uma interação no fim do arquivo.
+
+        Os headers da requisição não são gravados (podem conter credenciais).
+
+        Args:
+            method: Método HTTP
+            url: URL da requisição
+            body: Corpo da requisição
+            status: Status HTTP da resposta
+            headers: Headers da resposta
+            content: Corpo da resposta
+            elapsed: Duração da requisição em segundos
+        """
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        response = {'status': status, 'headers': dict(headers), 'elapsed': round(elapsed, 6)}
+        try:
+            response['body'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            response['body_base64'] = base64.b64encode(content).decode('ascii')
+
+        line = json.dumps({'request': {'method': method.upper(), 'url': url, 'body': body}, 'response': response},
+                          ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def replay(self, method: str, url: str, body: Any) -> Dict[str, Any]:
+        """
+        Obtém a resposta gravada de uma requisição, aplicando a latência simulada.
+
+        Requisições repetidas recebem as respostas na ordem em que foram
+        gravadas, recomeçando do início quando acabam.
+
+        Args:
+            method: Método HTTP
+            url: URL da requisição
+            body: Corpo da requisição
+
+        Returns:
+            Resposta gravada ('status', 'headers', 'body' ou 'body_base64', 'elapsed')
+
+        Raises:
+            CassetteMissError: Se a requisição não foi gravada
+        """
+        key = interaction_key(method, url, body)
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                raise CassetteMissError(f"Requisição não gravada no cassete: {method.upper()} {url}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            response = responses[position % len(responses)]
+
+        delay = response.get('elapsed', 0) if self.latency == 'recorded' else self.latency
+        if delay:
+            time.sleep(float(delay))
+        return response
+
+
+def response_content(response: Dict[str, Any]) -> bytes:
+    """
+    Decodifica o corpo de uma resposta gravada.
+
+    Args:
+        response: Resposta gravada
+
+    Returns:
+        Corpo em bytes
+    """
+    if 'body_base64' in response:
+        return base64.b64decode(response['body_base64'])
+    return (response.get('body') or '').encode('utf-8')
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Adaptador do requests que grava ou reproduz as requisições com um cassete."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        """
+        Inicializa o adaptador.
+
+        Args:
+            cassette: Cassete usado para gravar ou reproduzir
+            kwargs: Argumentos de HTTPAdapter (tamanho do pool, etc.)
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        if self.cassette.mode == 'replay':
+            return self._build_response(request, self.cassette.replay(request.method, request.url, request.body))
+
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        self.cassette.record(request.method, request.url, request.body, response.status_code,
+                             response.headers, content, time.perf_counter() - started)
+        return response
+
+    def _build_response(self, request: PreparedRequest, recorded: Dict[str, Any]) -> Response:
+        response = Response()
+        response.status_code = recorded['status']
+        response.headers = CaseInsensitiveDict(recorded.get('headers') or {})
+        # Corpo já decodificado na gravação: evita decodificar gzip novamente
+        response.headers.pop('Content-Encoding', None)
+        response.raw = io.BytesIO(response_content(recorded))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = ''
+        return response
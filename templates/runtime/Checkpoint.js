@@ -0,0 +1,99 @@
+/**
+ * Checkpoints das execuções das classes geradas
+ *
+ * Grava o contexto de uma execução depois de cada nó, identificado pelo run
+ * id, para que uma execução que falhou possa ser retomada a partir do nó que
+ * falhou (resume). O backend em arquivos expõe a interface
+ * load(runId) / save(runId, checkpoint) / delete(runId) e armazena o
+ * checkpoint em JSON.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+const SAFE_RUN_ID = /^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}$/;
+
+/**
+ * Checkpoints em um arquivo JSON por execução
+ */
+class FileCheckpointStore {
+    /**
+     * Construtor
+     *
+     * @param {string} directory - Diretório onde os checkpoints são gravados
+     */
+    constructor(directory = '.n8ncoding_checkpoints') {
+        this.directory = directory;
+        fs.mkdirSync(directory, { recursive: true });
+    }
+
+    _path(runId) {
+        const name = SAFE_RUN_ID.test(runId) ? runId : crypto.createHash('sha256').update(runId).digest('hex');
+        return path.join(this.directory, `${name}.json`);
+    }
+
+    /**
+     * Carrega o checkpoint de uma execução
+     *
+     * @param {string} runId - Id da execução
+     * @returns {Object|null} Checkpoint ou null se não existir
+     */
+    load(runId) {
+        try {
+            return JSON.parse(fs.readFileSync(this._path(runId), 'utf-8'));
+        } catch (e) {
+            return null;
+        }
+    }
+
+    /**
+     * Grava (substitui) o checkpoint de uma execução
+     *
+     * @param {string} runId - Id da execução
+     * @param {Object} checkpoint - Nós concluídos e contexto da execução
+     */
+    save(runId, checkpoint) {
+        // Grava em arquivo temporário e renomeia para evitar checkpoints parciais
+        const tempPath = `${this._path(runId)}.${process.pid}.tmp`;
+        fs.writeFileSync(tempPath, JSON.stringify({ ...checkpoint, updatedAt: Date.now() }));
+        fs.renameSync(tempPath, this._path(runId));
+    }
+
+    /**
+     * Remove o checkpoint de uma execução
+     *
+     * @param {string} runId - Id da execução
+     */
+    delete(runId) {
+        fs.rmSync(this._path(runId), { force: true });
+    }
+}
+
+/**
+ * Cria um armazenamento de checkpoints a partir de uma especificação textual
+ *
+ * Exemplos: 'file', 'file:/tmp/checkpoints'
+ *
+ * @param {string|null} spec - Tipo do backend e argumento opcional separados por ':'
+ *     (padrão: N8NCODING_CHECKPOINTS ou 'file')
+ * @returns {FileCheckpointStore} Armazenamento de checkpoints
+ * @throws {Error} Se o backend for desconhecido
+ */
+function createCheckpointStore(spec = null) {
+    spec = spec || process.env.N8NCODING_CHECKPOINTS || 'file';
+    const separator = spec.indexOf(':');
+    const backend = separator === -1 ? spec : spec.slice(0, separator);
+    const argument = separator === -1 ? '' : spec.slice(separator + 1);
+
+    if (backend === 'file') {
+        return new FileCheckpointStore(argument || '.n8ncoding_checkpoints');
+    }
+
+    throw new Error(`Backend de checkpoint desconhecido: ${backend}`);
+}
+
+module.exports = {
+    FileCheckpointStore,
+    createCheckpointStore
+};
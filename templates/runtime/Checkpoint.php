@@ -0,0 +1,186 @@
+<?php
+
+/**
+ * Checkpoints das execuções das classes geradas
+ *
+ * Grava o contexto de uma execução depois de cada nó, identificado pelo run
+ * id, para que uma execução que falhou possa ser retomada a partir do nó que
+ * falhou (resume). Há backends em arquivos e em SQLite (PDO); ambos
+ * implementam CheckpointStore e armazenam o checkpoint em JSON.
+ *
+ * @package Generated\Runtime
+ */
+
+/**
+ * Interface comum dos armazenamentos de checkpoints
+ *
+ * @package Generated\Runtime
+ */
+interface CheckpointStore {
+
+    /**
+     * Carrega o checkpoint de uma execução
+     *
+     * @param string $runId Id da execução
+     * @return array|null Checkpoint ou null se não existir
+     */
+    public function load(string $runId): ?array;
+
+    /**
+     * Grava (substitui) o checkpoint de uma execução
+     *
+     * @param string $runId Id da execução
+     * @param array $checkpoint Nós concluídos e contexto da execução
+     * @return void
+     */
+    public function save(string $runId, array $checkpoint): void;
+
+    /**
+     * Remove o checkpoint de uma execução
+     *
+     * @param string $runId Id da execução
+     * @return void
+     */
+    public function delete(string $runId): void;
+}
+
+/**
+ * Funções auxiliares dos checkpoints
+ *
+ * @package Generated\Runtime
+ */
+final class Checkpoint {
+
+    /**
+     * Serializa um checkpoint em JSON
+     *
+     * @param array $checkpoint Checkpoint
+     * @return string Texto JSON
+     */
+    public static function serialize(array $checkpoint): string
+    {
+        $checkpoint['updated_at'] = microtime(true);
+        return json_encode($checkpoint, JSON_UNESCAPED_UNICODE | JSON_PARTIAL_OUTPUT_ON_ERROR);
+    }
+
+    /**
+     * Cria um armazenamento de checkpoints a partir de uma especificação textual
+     *
+     * Exemplos: 'file', 'file:/tmp/checkpoints', 'sqlite:checkpoints.db'
+     *
+     * @param string|null $spec Tipo do backend e argumento opcional separados por ':'
+     *     (padrão: N8NCODING_CHECKPOINTS ou 'file')
+     * @return CheckpointStore Armazenamento de checkpoints
+     * @throws \InvalidArgumentException Se o backend for desconhecido
+     */
+    public static function createStore(?string $spec = null): CheckpointStore
+    {
+        $spec = $spec ?: (getenv('N8NCODING_CHECKPOINTS') ?: 'file');
+        [$backend, $argument] = array_pad(explode(':', $spec, 2), 2, '');
+
+        switch ($backend) {
+            case 'file':
+                return new FileCheckpointStore($argument !== '' ? $argument : '.n8ncoding_checkpoints');
+            case 'sqlite':
+                return new SqliteCheckpointStore($argument !== '' ? $argument : 'n8ncoding_checkpoints.sqlite');
+        }
+
+        throw new \InvalidArgumentException("Backend de checkpoint desconhecido: {$backend}");
+    }
+}
+
+/**
+ * Checkpoints em um arquivo JSON por execução
+ *
+ * @package Generated\Runtime
+ */
+class FileCheckpointStore implements CheckpointStore {
+
+    /**
+     * @param string $directory Diretório onde os checkpoints são gravados
+     */
+    public function __construct(private string $directory = '.n8ncoding_checkpoints')
+    {
+        if (!is_dir($directory)) {
+            mkdir($directory, 0777, true);
+        }
+    }
+
+    private function path(string $runId): string
+    {
+        if (!preg_match('/^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}$/', $runId)) {
+            $runId = hash('sha256', $runId);
+        }
+        return $this->directory . DIRECTORY_SEPARATOR . $runId . '.json';
+    }
+
+    public function load(string $runId): ?array
+    {
+        $path = $this->path($runId);
+        if (!is_file($path)) {
+            return null;
+        }
+        $checkpoint = json_decode((string)file_get_contents($path), true);
+        return is_array($checkpoint) ? $checkpoint : null;
+    }
+
+    public function save(string $runId, array $checkpoint): void
+    {
+        // Grava em arquivo temporário e renomeia para evitar checkpoints parciais
+        $path = $this->path($runId);
+        $tempPath = $path . '.' . getmypid() . '.tmp';
+        file_put_contents($tempPath, Checkpoint::serialize($checkpoint));
+        rename($tempPath, $path);
+    }
+
+    public function delete(string $runId): void
+    {
+        $path = $this->path($runId);
+        if (is_file($path)) {
+            unlink($path);
+        }
+    }
+}
+
+/**
+ * Checkpoints em um banco SQLite local (PDO)
+ *
+ * @package Generated\Runtime
+ */
+class SqliteCheckpointStore implements CheckpointStore {
+
+    private \PDO $pdo;
+
+    /**
+     * @param string $path Caminho do arquivo do banco
+     */
+    public function __construct(string $path = 'n8ncoding_checkpoints.sqlite')
+    {
+        $this->pdo = new \PDO('sqlite:' . $path);
+        $this->pdo->setAttribute(\PDO::ATTR_ERRMODE, \PDO::ERRMODE_EXCEPTION);
+        $this->pdo->exec(
+            'CREATE TABLE IF NOT EXISTS workflow_checkpoints (' .
+            'run_id TEXT PRIMARY KEY, checkpoint TEXT NOT NULL, updated_at REAL NOT NULL)'
+        );
+    }
+
+    public function load(string $runId): ?array
+    {
+        $statement = $this->pdo->prepare('SELECT checkpoint FROM workflow_checkpoints WHERE run_id = ?');
+        $statement->execute([$runId]);
+        $row = $statement->fetch(\PDO::FETCH_ASSOC);
+        return $row === false ? null : json_decode($row['checkpoint'], true);
+    }
+
+    public function save(string $runId, array $checkpoint): void
+    {
+        $this->pdo->prepare(
+            'INSERT OR REPLACE INTO workflow_checkpoints (run_id, checkpoint, updated_at) VALUES (?, ?, ?)'
+        )->execute([$runId, Checkpoint::serialize($checkpoint), microtime(true)]);
+    }
+
+    public function delete(string $runId): void
+    {
+        $this->pdo->prepare('DELETE FROM workflow_checkpoints WHERE run_id = ?')->execute([$runId]);
+    }
+}
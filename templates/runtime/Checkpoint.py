@@ -0,0 +1,180 @@
+"""
+Checkpoints das execuções das classes geradas
+
+Este módulo grava o contexto de uma execução depois de cada nó, identificado
+pelo run id, para que uma execução que falhou possa ser retomada a partir do
+nó que falhou (resume). Há backends em arquivos e em SQLite; ambos expõem a
+mesma interface load(run_id) / save(run_id, checkpoint) / delete(run_id) e
+armazenam o checkpoint em JSON (valores não serializáveis viram texto).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_SAFE_RUN_ID = re.compile(r'^[A-Za-z0-9_.-]{1,128}$')
+
+
+def serialize_checkpoint(checkpoint: Dict[str, Any]) -> str:
+    """
+    Serializa um checkpoint em JSON.
+
+    Args:
+        checkpoint: Dicionário com 'run_id', 'completed', 'context', ...
+
+    Returns:
+        Texto JSON
+    """
+    return json.dumps({**checkpoint, 'updated_at': time.time()}, ensure_ascii=False, default=str)
+
+
+class FileCheckpointStore:
+    """Checkpoints em um arquivo JSON por execução."""
+
+    def __init__(self, directory: str = '.n8ncoding_checkpoints'):
+        """
+        Inicializa o armazenamento em arquivos.
+
+        Args:
+            directory: Diretório onde os checkpoints são gravados
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, run_id: str) -> Path:
+        if not _SAFE_RUN_ID.match(run_id) or run_id.startswith('.'):
+            run_id = hashlib.sha256(run_id.encode('utf-8')).hexdigest()
+        return self.directory / f'{run_id}.json'
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+
+        Returns:
+            Checkpoint ou None se não existir
+        """
+        try:
+            with open(self._path(run_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Grava (substitui) o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+            checkpoint: Nós concluídos e contexto da execução
+        """
+        path = self._path(run_id)
+        # Grava em arquivo temporário e renomeia para evitar checkpoints parciais
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(serialize_checkpoint(checkpoint))
+        os.replace(temp_path, path)
+
+    def delete(self, run_id: str) -> None:
+        """
+        Remove o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+        """
+        try:
+            self._path(run_id).unlink()
+        except OSError:
+            pass
+
+
+class SqliteCheckpointStore:
+    """Checkpoints em um banco SQLite local."""
+
+    def __init__(self, path: str = 'n8ncoding_checkpoints.sqlite'):
+        """
+        Inicializa o armazenamento SQLite.
+
+        Args:
+            path: Caminho do arquivo do banco
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS workflow_checkpoints ('
+            'run_id TEXT PRIMARY KEY, checkpoint TEXT NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self._connection.commit()
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+
+        Returns:
+            Checkpoint ou None se não existir
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT checkpoint FROM workflow_checkpoints WHERE run_id = ?', (run_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, run_id: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Grava (substitui) o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+            checkpoint: Nós concluídos e contexto da execução
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO workflow_checkpoints (run_id, checkpoint, updated_at) VALUES (?, ?, ?)',
+                (run_id, serialize_checkpoint(checkpoint), time.time())
+            )
+            self._connection.commit()
+
+    def delete(self, run_id: str) -> None:
+        """
+        Remove o checkpoint de uma execução.
+
+        Args:
+            run_id: Id da execução
+        """
+        with self._lock:
+            self._connection.execute('DELETE FROM workflow_checkpoints WHERE run_id = ?', (run_id,))
+            self._connection.commit()
+
+
+def create_checkpoint_store(spec: Optional[str] = None):
+    """
+    Cria um armazenamento de checkpoints a partir de uma especificação textual.
+
+    Exemplos: 'file', 'file:/tmp/checkpoints', 'sqlite:checkpoints.db'
+
+    Args:
+        spec: Tipo do backend e argumento opcional separados por ':'
+            (padrão: N8NCODING_CHECKPOINTS ou 'file')
+
+    Returns:
+        Instância do armazenamento
+    """
+    spec = spec or os.getenv('N8NCODING_CHECKPOINTS', 'file')
+    backend, _, argument = spec.partition(':')
+
+    if backend == 'file':
+        return FileCheckpointStore(argument or '.n8ncoding_checkpoints')
+    if backend == 'sqlite':
+        return SqliteCheckpointStore(argument or 'n8ncoding_checkpoints.sqlite')
+
+    raise ValueError(f"Backend de checkpoint desconhecido: {backend}")
@@ -0,0 +1,143 @@
+/**
+ * Métricas de execução por nó para as classes geradas
+ *
+ * Agrega latência, tamanho da saída e erros de cada nó e exporta os valores
+ * como objeto ou no formato texto do Prometheus. Usado pelas classes geradas
+ * com instrumentação ativada.
+ */
+
+/**
+ * Calcula o tamanho aproximado de uma saída de nó serializada em JSON
+ *
+ * @param {*} value - Saída do nó
+ * @returns {number} Tamanho em bytes (0 se o valor não for serializável)
+ */
+function payloadSize(value) {
+    if (value === undefined || value === null) {
+        return 0;
+    }
+    try {
+        return Buffer.byteLength(JSON.stringify(value) || '', 'utf-8');
+    } catch (e) {
+        return 0;
+    }
+}
+
+function escapeLabel(value) {
+    return String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+/**
+ * Agregador de métricas por nó (acumulado entre execuções)
+ */
+class NodeMetrics {
+    /**
+     * Construtor
+     *
+     * @param {string} workflow - Nome do workflow (usado como label no Prometheus)
+     */
+    constructor(workflow = '') {
+        this.workflow = workflow;
+        this._nodes = new Map();
+    }
+
+    /**
+     * Registra uma execução de nó
+     *
+     * @param {string} node - Nome do método do nó
+     * @param {number} seconds - Duração da execução em segundos
+     * @param {number} payloadBytes - Tamanho da saída do nó em bytes
+     * @param {boolean} error - Se a execução terminou com exceção
+     */
+    record(node, seconds, payloadBytes = 0, error = false) {
+        let stats = this._nodes.get(node);
+        if (!stats) {
+            stats = {
+                calls: 0,
+                errors: 0,
+                total_seconds: 0,
+                min_seconds: seconds,
+                max_seconds: seconds,
+                last_seconds: seconds,
+                payload_bytes: 0,
+                last_payload_bytes: 0
+            };
+            this._nodes.set(node, stats);
+        }
+
+        stats.calls++;
+        stats.errors += error ? 1 : 0;
+        stats.total_seconds += seconds;
+        stats.min_seconds = Math.min(stats.min_seconds, seconds);
+        stats.max_seconds = Math.max(stats.max_seconds, seconds);
+        stats.last_seconds = seconds;
+        stats.payload_bytes += payloadBytes;
+        stats.last_payload_bytes = payloadBytes;
+    }
+
+    /**
+     * Descarta todas as métricas acumuladas
+     */
+    reset() {
+        this._nodes.clear();
+    }
+
+    /**
+     * Exporta as métricas como objeto
+     *
+     * @returns {Object} Objeto {nó: estatísticas}, na ordem da primeira execução
+     */
+    toObject() {
+        const result = {};
+        for (const [node, stats] of this._nodes) {
+            result[node] = { ...stats, avg_seconds: stats.total_seconds / stats.calls };
+        }
+        return result;
+    }
+
+    /**
+     * Exporta as métricas no formato texto do Prometheus (versão 0.0.4)
+     *
+     * @param {string} prefix - Prefixo dos nomes das métricas
+     * @returns {string} Texto com as métricas
+     */
+    toPrometheus(prefix = 'n8ncoding') {
+        const metrics = Object.entries(this.toObject());
+        const workflow = escapeLabel(this.workflow);
+        const labels = (node) => `workflow="${workflow}",node="${escapeLabel(node)}"`;
+        const lines = [];
+
+        lines.push(`# HELP ${prefix}_node_duration_seconds Duração da execução dos nós.`);
+        lines.push(`# TYPE ${prefix}_node_duration_seconds summary`);
+        for (const [node, stats] of metrics) {
+            lines.push(`${prefix}_node_duration_seconds_sum{${labels(node)}} ${stats.total_seconds.toFixed(9)}`);
+            lines.push(`${prefix}_node_duration_seconds_count{${labels(node)}} ${stats.calls}`);
+        }
+
+        lines.push(`# HELP ${prefix}_node_duration_max_seconds Maior duração observada por nó.`);
+        lines.push(`# TYPE ${prefix}_node_duration_max_seconds gauge`);
+        for (const [node, stats] of metrics) {
+            lines.push(`${prefix}_node_duration_max_seconds{${labels(node)}} ${stats.max_seconds.toFixed(9)}`);
+        }
+
+        lines.push(`# HELP ${prefix}_node_payload_bytes Tamanho da saída dos nós serializada em JSON.`);
+        lines.push(`# TYPE ${prefix}_node_payload_bytes summary`);
+        for (const [node, stats] of metrics) {
+            lines.push(`${prefix}_node_payload_bytes_sum{${labels(node)}} ${stats.payload_bytes}`);
+            lines.push(`${prefix}_node_payload_bytes_count{${labels(node)}} ${stats.calls}`);
+        }
+
+        lines.push(`# HELP ${prefix}_node_errors_total Execuções de nós que terminaram com erro.`);
+        lines.push(`# TYPE ${prefix}_node_errors_total counter`);
+        for (const [node, stats] of metrics) {
+            lines.push(`${prefix}_node_errors_total{${labels(node)}} ${stats.errors}`);
+        }
+
+        return lines.join('\n') + '\n';
+    }
+}
+
+module.exports = {
+    payloadSize,
+    NodeMetrics
+};
@@ -0,0 +1,149 @@
+<?php
+
+/**
+ * Métricas de execução por nó para as classes geradas
+ *
+ * Agrega latência, tamanho da saída e erros de cada nó e exporta os valores
+ * como array ou no formato texto do Prometheus. Usado pelas classes geradas
+ * com instrumentação ativada.
+ *
+ * @package Generated\Runtime
+ */
+class NodeMetrics {
+
+    /**
+     * Estatísticas por nó, na ordem da primeira execução
+     *
+     * @var array
+     */
+    private array $nodes = [];
+
+    /**
+     * @param string $workflow Nome do workflow (usado como label no Prometheus)
+     */
+    public function __construct(private string $workflow = '')
+    {
+    }
+
+    /**
+     * Calcula o tamanho aproximado de uma saída de nó serializada em JSON
+     *
+     * @param mixed $value Saída do nó
+     * @return int Tamanho em bytes (0 se o valor não for serializável)
+     */
+    public static function payloadSize(mixed $value): int
+    {
+        if ($value === null) {
+            return 0;
+        }
+        $json = json_encode($value, JSON_UNESCAPED_UNICODE | JSON_PARTIAL_OUTPUT_ON_ERROR);
+        return $json === false ? 0 : strlen($json);
+    }
+
+    /**
+     * Registra uma execução de nó
+     *
+     * @param string $node Nome do método do nó
+     * @param float $seconds Duração da execução em segundos
+     * @param int $payloadBytes Tamanho da saída do nó em bytes
+     * @param bool $error Se a execução terminou com exceção
+     * @return void
+     */
+    public function record(string $node, float $seconds, int $payloadBytes = 0, bool $error = false): void
+    {
+        if (!isset($this->nodes[$node])) {
+            $this->nodes[$node] = [
+                'calls' => 0,
+                'errors' => 0,
+                'total_seconds' => 0.0,
+                'min_seconds' => $seconds,
+                'max_seconds' => $seconds,
+                'last_seconds' => $seconds,
+                'payload_bytes' => 0,
+                'last_payload_bytes' => 0
+            ];
+        }
+
+        $stats = &$this->nodes[$node];
+        $stats['calls']++;
+        $stats['errors'] += $error ? 1 : 0;
+        $stats['total_seconds'] += $seconds;
+        $stats['min_seconds'] = min($stats['min_seconds'], $seconds);
+        $stats['max_seconds'] = max($stats['max_seconds'], $seconds);
+        $stats['last_seconds'] = $seconds;
+        $stats['payload_bytes'] += $payloadBytes;
+        $stats['last_payload_bytes'] = $payloadBytes;
+    }
+
+    /**
+     * Descarta todas as métricas acumuladas
+     *
+     * @return void
+     */
+    public function reset(): void
+    {
+        $this->nodes = [];
+    }
+
+    /**
+     * Exporta as métricas como array
+     *
+     * @return array Array [nó => estatísticas]
+     */
+    public function toArray(): array
+    {
+        $result = [];
+        foreach ($this->nodes as $node => $stats) {
+            $stats['avg_seconds'] = $stats['total_seconds'] / $stats['calls'];
+            $result[$node] = $stats;
+        }
+        return $result;
+    }
+
+    /**
+     * Exporta as métricas no formato texto do Prometheus (versão 0.0.4)
+     *
+     * @param string $prefix Prefixo dos nomes das métricas
+     * @return string Texto com as métricas
+     */
+    public function toPrometheus(string $prefix = 'n8ncoding'): string
+    {
+        $metrics = $this->toArray();
+        $workflow = self::escapeLabel($this->workflow);
+        $labels = fn(string $node) => 'workflow="' . $workflow . '",node="' . self::escapeLabel($node) . '"';
+        $lines = [];
+
+        $lines[] = "# HELP {$prefix}_node_duration_seconds Duração da execução dos nós.";
+        $lines[] = "# TYPE {$prefix}_node_duration_seconds summary";
+        foreach ($metrics as $node => $stats) {
+            $lines[] = "{$prefix}_node_duration_seconds_sum{" . $labels($node) . '} ' . sprintf('%.9f', $stats['total_seconds']);
+            $lines[] = "{$prefix}_node_duration_seconds_count{" . $labels($node) . '} ' . $stats['calls'];
+        }
+
+        $lines[] = "# HELP {$prefix}_node_duration_max_seconds Maior duração observada por nó.";
+        $lines[] = "# TYPE {$prefix}_node_duration_max_seconds gauge";
+        foreach ($metrics as $node => $stats) {
+            $lines[] = "{$prefix}_node_duration_max_seconds{" . $labels($node) . '} ' . sprintf('%.9f', $stats['max_seconds']);
+        }
+
+        $lines[] = "# HELP {$prefix}_node_payload_bytes Tamanho da saída dos nós serializada em JSON.";
+        $lines[] = "# TYPE {$prefix}_node_payload_bytes summary";
+        foreach ($metrics as $node => $stats) {
+            $lines[] = "{$prefix}_node_payload_bytes_sum{" . $labels($node) . '} ' . $stats['payload_bytes'];
+            $lines[] = "{$prefix}_node_payload_bytes_count{" . $labels($node) . '} ' . $stats['calls'];
+        }
+
+        $lines[] = "# HELP {$prefix}_node_errors_total Execuções de nós que terminaram com erro.";
+        $lines[] = "# TYPE {$prefix}_node_errors_total counter";
+        foreach ($metrics as $node => $stats) {
+            $lines[] = "{$prefix}_node_errors_total{" . $labels($node) . '} ' . $stats['errors'];
+        }
+
+        return implode("\n", $lines) . "\n";
+    }
+
+    private static function escapeLabel(string $value): string
+    {
+        return str_replace(['\\', '"', "\n"], ['\\\\', '\\"', '\\n'], $value);
+    }
+}
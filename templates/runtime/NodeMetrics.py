@@ -0,0 +1,140 @@
+"""
+Métricas de execução por nó para as classes geradas
+
+Este módulo agrega latência, tamanho da saída e erros de cada nó e exporta
+os valores como dicionário ou no formato texto do Prometheus. É usado pelas
+classes geradas com instrumentação ativada (Generator(..., instrument=True)).
+"""
+import json
+import threading
+from typing import Any, Dict
+
+
+def payload_size(value: Any) -> int:
+    """
+    Calcula o tamanho aproximado de uma saída de nó serializada em JSON.
+
+    Args:
+        value: Saída do nó
+
+    Returns:
+        Tamanho em bytes (0 se o valor não for serializável)
+    """
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class NodeMetrics:
+    """Agregador de métricas por nó (acumulado entre execuções)."""
+
+    def __init__(self, workflow: str = ''):
+        """
+        Inicializa o agregador.
+
+        Args:
+            workflow: Nome do workflow (usado como label no Prometheus)
+        """
+        self.workflow = workflow
+        self._nodes: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, seconds: float, payload_bytes: int = 0, error: bool = False) -> None:
+        """
+        Registra uma execução de nó.
+
+        Args:
+            node: Nome do método do nó
+            seconds: Duração da execução em segundos
+            payload_bytes: Tamanho da saída do nó em bytes
+            error: Se a execução terminou com exceção
+        """
+        with self._lock:
+            stats = self._nodes.get(node)
+            if stats is None:
+                stats = self._nodes[node] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'total_seconds': 0.0,
+                    'min_seconds': seconds,
+                    'max_seconds': seconds,
+                    'last_seconds': seconds,
+                    'payload_bytes': 0,
+                    'last_payload_bytes': 0
+                }
+
+            stats['calls'] += 1
+            stats['errors'] += 1 if error else 0
+            stats['total_seconds'] += seconds
+            stats['min_seconds'] = min(stats['min_seconds'], seconds)
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['last_seconds'] = seconds
+            stats['payload_bytes'] += payload_bytes
+            stats['last_payload_bytes'] = payload_bytes
+
+    def reset(self) -> None:
+        """Descarta todas as métricas acumuladas."""
+        with self._lock:
+            self._nodes.clear()
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        Exporta as métricas como dicionário.
+
+        Returns:
+            Dicionário {nó: estatísticas}, na ordem da primeira execução
+        """
+        with self._lock:
+            result = {}
+            for node, stats in self._nodes.items():
+                result[node] = dict(stats)
+                result[node]['avg_seconds'] = stats['total_seconds'] / stats['calls']
+            return result
+
+    def to_prometheus(self, prefix: str = 'n8ncoding') -> str:
+        """
+        Exporta as métricas no formato texto do Prometheus (versão 0.0.4).
+
+        Args:
+            prefix: Prefixo dos nomes das métricas
+
+        Returns:
+            Texto com as métricas
+        """
+        metrics = self.to_dict()
+        workflow = _escape_label(self.workflow)
+        lines = []
+
+        def labels(node: str) -> str:
+            return f'workflow="{workflow}",node="{_escape_label(node)}"'
+
+        lines.append(f'# HELP {prefix}_node_duration_seconds Duração da execução dos nós.')
+        lines.append(f'# TYPE {prefix}_node_duration_seconds summary')
+        for node, stats in metrics.items():
+            lines.append(f'{prefix}_node_duration_seconds_sum{{{labels(node)}}} {stats["total_seconds"]:.9f}')
+            lines.append(f'{prefix}_node_duration_seconds_count{{{labels(node)}}} {stats["calls"]}')
+
+        lines.append(f'# HELP {prefix}_node_duration_max_seconds Maior duração observada por nó.')
+        lines.append(f'# TYPE {prefix}_node_duration_max_seconds gauge')
+        for node, stats in metrics.items():
+            lines.append(f'{prefix}_node_duration_max_seconds{{{labels(node)}}} {stats["max_seconds"]:.9f}')
+
+        lines.append(f'# HELP {prefix}_node_payload_bytes Tamanho da saída dos nós serializada em JSON.')
+        lines.append(f'# TYPE {prefix}_node_payload_bytes summary')
+        for node, stats in metrics.items():
+            lines.append(f'{prefix}_node_payload_bytes_sum{{{labels(node)}}} {stats["payload_bytes"]}')
+            lines.append(f'{prefix}_node_payload_bytes_count{{{labels(node)}}} {stats["calls"]}')
+
+        lines.append(f'# HELP {prefix}_node_errors_total Execuções de nós que terminaram com erro.')
+        lines.append(f'# TYPE {prefix}_node_errors_total counter')
+        for node, stats in metrics.items():
+            lines.append(f'{prefix}_node_errors_total{{{labels(node)}}} {stats["errors"]}')
+
+        return '\n'.join(lines) + '\n'
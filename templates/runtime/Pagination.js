@@ -0,0 +1,234 @@
+/**
+ * Paginação sob demanda dos nós HTTP Request das classes geradas
+ *
+ * Busca as páginas de uma requisição paginada (opção Pagination do nó HTTP
+ * Request do n8n) de forma preguiçosa: os itens ficam disponíveis para os
+ * nós seguintes (for await) assim que cada página chega, sem esperar o
+ * conjunto completo. Até `prefetch` páginas são buscadas à frente do consumo.
+ *
+ * Modos suportados (configuração gerada a partir do workflow):
+ * - 'next_url': a próxima URL vem da resposta (ex: $response.body.next)
+ * - 'page_param': um parâmetro de query é incrementado a cada página
+ *   (ex: page = $pageCount + 1)
+ */
+
+// Campos que costumam conter a lista de itens de uma página
+const ITEM_FIELDS = ['data', 'items', 'results', 'records'];
+
+/**
+ * Obtém os itens de uma página
+ *
+ * @param {*} body - Corpo JSON da resposta
+ * @returns {Array} O próprio corpo se for uma lista, a primeira lista em ITEM_FIELDS,
+ *                  o corpo como item único ou [] se a resposta estiver vazia
+ */
+function pageItems(body) {
+    if (Array.isArray(body)) {
+        return body;
+    }
+    if (body && typeof body === 'object') {
+        for (const field of ITEM_FIELDS) {
+            if (Array.isArray(body[field])) {
+                return body[field];
+            }
+        }
+        return Object.keys(body).length > 0 ? [body] : [];
+    }
+    return body === null || body === undefined || body === '' ? [] : [body];
+}
+
+/**
+ * Obtém um valor aninhado da resposta
+ *
+ * @param {*} body - Corpo JSON da resposta
+ * @param {Array} path - Chaves e índices até o valor (ex: ['links', 'next'])
+ * @returns {*} Valor encontrado ou null
+ */
+function dig(body, path) {
+    for (const key of path) {
+        if (body === null || typeof body !== 'object') {
+            return null;
+        }
+        body = body[key];
+    }
+    return body === undefined ? null : body;
+}
+
+/**
+ * Define (ou substitui) um parâmetro de query na URL
+ *
+ * @param {string} url - URL original
+ * @param {string} name - Nome do parâmetro
+ * @param {*} value - Valor do parâmetro
+ * @returns {string} URL com o parâmetro
+ */
+function withQueryParam(url, name, value) {
+    const parsed = new URL(url);
+    parsed.searchParams.set(name, String(value));
+    return parsed.toString();
+}
+
+/**
+ * Busca as páginas uma a uma, sob demanda
+ *
+ * @param {Function} fetchPage - async (url) => ({ status, body }) com o corpo JSON
+ * @param {string} url - URL da primeira página
+ * @param {Object} pagination - Configuração gerada (mode, next_url, param, start,
+ *                              step, max_pages, complete_status, interval)
+ * @yields {Array} Itens de cada página
+ */
+async function* iterPages(fetchPage, url, pagination) {
+    const maxPages = pagination.max_pages ?? null;
+    const completeStatus = pagination.complete_status || [];
+    const interval = pagination.interval || 0;
+    let value = pagination.start ?? 1;
+    let pageUrl = url;
+    let fetched = 0;
+
+    while (maxPages === null || fetched < maxPages) {
+        if (fetched && interval) {
+            await new Promise(resolve => setTimeout(resolve, interval * 1000));
+        }
+        if (pagination.mode === 'page_param') {
+            pageUrl = withQueryParam(url, pagination.param, value);
+        }
+
+        const { status, body } = await fetchPage(pageUrl);
+        fetched++;
+        if (completeStatus.includes(status)) {
+            return;
+        }
+        if (status >= 400) {
+            throw new Error(`HTTP ${status} ao buscar a página ${fetched}: ${pageUrl}`);
+        }
+
+        const items = pageItems(body);
+        if (items.length > 0) {
+            yield items;
+        } else if (completeStatus.length === 0) {
+            // Paginação completa quando a resposta vem vazia (padrão do n8n)
+            return;
+        }
+
+        if (pagination.mode === 'next_url') {
+            const nextUrl = dig(body, pagination.next_url || []);
+            if (!nextUrl) {
+                return;
+            }
+            pageUrl = new URL(String(nextUrl), pageUrl).toString();
+        } else {
+            value += pagination.step ?? 1;
+        }
+    }
+}
+
+/**
+ * Itens de uma requisição paginada, buscados à medida que são consumidos (for await)
+ */
+class PageStream {
+    /**
+     * Construtor; com prefetch > 0 a primeira página já começa a ser buscada
+     *
+     * @param {Function} fetchPage - async (url) => ({ status, body }) com o corpo JSON
+     * @param {string} url - URL da primeira página
+     * @param {Object} pagination - Configuração da paginação (ver iterPages())
+     * @param {number} prefetch - Páginas buscadas à frente do consumo (0 = somente sob demanda)
+     */
+    constructor(fetchPage, url, pagination, prefetch = 1) {
+        this.pages = 0;
+        this._source = iterPages(fetchPage, url, pagination);
+        this._prefetch = Math.max(Number(prefetch) || 0, 0);
+        this._buffer = [];
+        this._done = false;
+        this._error = null;
+        this._closed = false;
+        this._wake = null;
+        this._space = null;
+        if (this._prefetch > 0) {
+            this._produce();
+        }
+    }
+
+    async _produce() {
+        try {
+            for await (const page of this._source) {
+                this._buffer.push(page);
+                this._signal('_wake');
+                while (this._buffer.length >= this._prefetch && !this._closed) {
+                    await new Promise(resolve => { this._space = resolve; });
+                }
+                if (this._closed) {
+                    return;
+                }
+            }
+        } catch (error) {
+            this._error = error;
+        }
+        this._done = true;
+        this._signal('_wake');
+    }
+
+    _signal(name) {
+        const resolve = this[name];
+        if (resolve) {
+            this[name] = null;
+            resolve();
+        }
+    }
+
+    async _nextPage() {
+        if (this._prefetch === 0) {
+            const { value, done } = await this._source.next();
+            return done ? null : value;
+        }
+        while (this._buffer.length === 0 && !this._done) {
+            await new Promise(resolve => { this._wake = resolve; });
+        }
+        if (this._buffer.length > 0) {
+            const page = this._buffer.shift();
+            this._signal('_space');
+            return page;
+        }
+        if (this._error) {
+            const error = this._error;
+            this._error = null;
+            throw error;
+        }
+        return null;
+    }
+
+    async *[Symbol.asyncIterator]() {
+        try {
+            let page;
+            while (!this._closed && (page = await this._nextPage()) !== null) {
+                this.pages++;
+                yield* page;
+            }
+        } finally {
+            this.close();
+        }
+    }
+
+    /**
+     * Interrompe a busca das páginas restantes
+     */
+    close() {
+        if (this._closed) {
+            return;
+        }
+        this._closed = true;
+        this._signal('_space');
+        if (this._prefetch === 0) {
+            this._source.return();
+        }
+    }
+}
+
+module.exports = {
+    ITEM_FIELDS,
+    PageStream,
+    dig,
+    iterPages,
+    pageItems,
+    withQueryParam
+};
@@ -0,0 +1,184 @@
+<?php
+
+/**
+ * Paginação sob demanda dos nós HTTP Request das classes geradas
+ *
+ * Busca as páginas de uma requisição paginada (opção Pagination do nó HTTP
+ * Request do n8n) de forma preguiçosa com um Generator: os itens ficam
+ * disponíveis para os nós seguintes (foreach) assim que cada página chega,
+ * sem esperar o conjunto completo. O PHP executa uma requisição por vez, então
+ * a próxima página só é buscada quando os itens da anterior foram consumidos.
+ *
+ * Modos suportados (configuração gerada a partir do workflow):
+ * - 'next_url': a próxima URL vem da resposta (ex: $response.body.next)
+ * - 'page_param': um parâmetro de query é incrementado a cada página
+ *   (ex: page = $pageCount + 1)
+ *
+ * @package Generated\Runtime
+ */
+class Pagination {
+
+    /**
+     * Campos que costumam conter a lista de itens de uma página
+     */
+    public const ITEM_FIELDS = ['data', 'items', 'results', 'records'];
+
+    /**
+     * Obtém os itens de uma página
+     *
+     * @param mixed $body Corpo JSON decodificado (arrays associativos)
+     * @return array O próprio corpo se for uma lista, a primeira lista em ITEM_FIELDS,
+     *               o corpo como item único ou [] se a resposta estiver vazia
+     */
+    public static function pageItems(mixed $body): array
+    {
+        if (is_array($body) && array_is_list($body)) {
+            return $body;
+        }
+        if (is_array($body)) {
+            foreach (self::ITEM_FIELDS as $field) {
+                if (isset($body[$field]) && is_array($body[$field]) && array_is_list($body[$field])) {
+                    return $body[$field];
+                }
+            }
+        }
+        return $body === null || $body === '' ? [] : [$body];
+    }
+
+    /**
+     * Obtém um valor aninhado da resposta
+     *
+     * @param mixed $body Corpo JSON decodificado
+     * @param array $path Chaves e índices até o valor (ex: ['links', 'next'])
+     * @return mixed Valor encontrado ou null
+     */
+    public static function dig(mixed $body, array $path): mixed
+    {
+        foreach ($path as $key) {
+            if (!is_array($body) || !array_key_exists($key, $body)) {
+                return null;
+            }
+            $body = $body[$key];
+        }
+        return $body;
+    }
+
+    /**
+     * Define (ou substitui) um parâmetro de query na URL
+     *
+     * @param string $url URL original
+     * @param string $name Nome do parâmetro
+     * @param mixed $value Valor do parâmetro
+     * @return string URL com o parâmetro
+     */
+    public static function withQueryParam(string $url, string $name, mixed $value): string
+    {
+        $fragment = '';
+        if (($position = strpos($url, '#')) !== false) {
+            $fragment = substr($url, $position);
+            $url = substr($url, 0, $position);
+        }
+        [$base, $query] = array_pad(explode('?', $url, 2), 2, '');
+        parse_str($query, $params);
+        $params[$name] = (string)$value;
+        return $base . '?' . http_build_query($params) . $fragment;
+    }
+
+    /**
+     * Resolve uma URL relativa (próxima página) a partir da URL atual
+     *
+     * @param string $next URL da próxima página (absoluta, /caminho ou ?query)
+     * @param string $current URL da página atual
+     * @return string URL absoluta
+     */
+    public static function resolveUrl(string $next, string $current): string
+    {
+        if (preg_match('#^[a-z][a-z0-9+.-]*://#i', $next)) {
+            return $next;
+        }
+        $parts = parse_url($current);
+        $origin = $parts['scheme'] . '://' . $parts['host'] . (isset($parts['port']) ? ':' . $parts['port'] : '');
+        $path = $parts['path'] ?? '/';
+        if (str_starts_with($next, '/')) {
+            return $origin . $next;
+        }
+        if (str_starts_with($next, '?')) {
+            return $origin . $path . $next;
+        }
+        return $origin . substr($path, 0, strrpos($path, '/') + 1) . $next;
+    }
+
+    /**
+     * Busca as páginas uma a uma, sob demanda
+     *
+     * @param callable $fetch Função (url) => [status HTTP, corpo JSON decodificado]
+     * @param string $url URL da primeira página
+     * @param array $pagination Configuração gerada (mode, next_url, param, start,
+     *                          step, max_pages, complete_status, interval)
+     * @return \Generator Itens de cada página
+     * @throws RuntimeException Se uma página responder com erro HTTP
+     */
+    public static function pages(callable $fetch, string $url, array $pagination): \Generator
+    {
+        $maxPages = $pagination['max_pages'] ?? null;
+        $completeStatus = $pagination['complete_status'] ?? [];
+        $interval = $pagination['interval'] ?? 0;
+        $value = $pagination['start'] ?? 1;
+        $pageUrl = $url;
+        $fetched = 0;
+
+        while ($maxPages === null || $fetched < $maxPages) {
+            if ($fetched > 0 && $interval > 0) {
+                usleep((int)($interval * 1e6));
+            }
+            if (($pagination['mode'] ?? null) === 'page_param') {
+                $pageUrl = self::withQueryParam($url, $pagination['param'], $value);
+            }
+
+            [$status, $body] = $fetch($pageUrl);
+            $fetched++;
+            if (in_array($status, $completeStatus, true)) {
+                return;
+            }
+            if ($status >= 400) {
+                throw new RuntimeException("HTTP {$status} ao buscar a página {$fetched}: {$pageUrl}");
+            }
+
+            $items = self::pageItems($body);
+            if (count($items) > 0) {
+                yield $items;
+            } elseif (count($completeStatus) === 0) {
+                // Paginação completa quando a resposta vem vazia (padrão do n8n)
+                return;
+            }
+
+            if (($pagination['mode'] ?? null) === 'next_url') {
+                $nextUrl = self::dig($body, $pagination['next_url'] ?? []);
+                if (!$nextUrl) {
+                    return;
+                }
+                $pageUrl = self::resolveUrl((string)$nextUrl, $pageUrl);
+            } else {
+                $value += $pagination['step'] ?? 1;
+            }
+        }
+    }
+
+    /**
+     * Itens de uma requisição paginada, buscados à medida que são consumidos
+     *
+     * @param callable $fetch Função (url) => [status HTTP, corpo JSON decodificado]
+     * @param string $url URL da primeira página
+     * @param array $pagination Configuração da paginação (ver pages())
+     * @return \Generator Itens de todas as páginas, na ordem
+     */
+    public static function items(callable $fetch, string $url, array $pagination): \Generator
+    {
+        foreach (self::pages($fetch, $url, $pagination) as $items) {
+            // yield item a item: yield from repetiria as chaves 0..n de cada página
+            foreach ($items as $item) {
+                yield $item;
+            }
+        }
+    }
+}
@@ -0,0 +1,212 @@
+"""
+Paginação sob demanda dos nós HTTP Request das classes geradas
+
+Este módulo busca as páginas de uma requisição paginada (opção Pagination
+do nó HTTP Request do n8n) de forma preguiçosa: os itens ficam disponíveis
+para os nós seguintes assim que cada página chega, sem esperar o conjunto
+completo. Uma thread busca até `prefetch` páginas à frente do consumo.
+
+Modos suportados (configuração gerada a partir do workflow):
+- 'next_url': a próxima URL vem da resposta (ex: $response.body.next)
+- 'page_param': um parâmetro de query é incrementado a cada página
+  (ex: page = $pageCount + 1)
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Campos que costumam conter a lista de itens de uma página
+ITEM_FIELDS = ('data', 'items', 'results', 'records')
+
+
+def page_items(body: Any) -> List[Any]:
+    """
+    Obtém os itens de uma página.
+
+    Args:
+        body: Corpo JSON da resposta
+
+    Returns:
+        O próprio corpo se for uma lista, a primeira lista em ITEM_FIELDS,
+        o corpo como item único ou [] se a resposta estiver vazia
+    """
+    if isinstance(body, list):
+        return body
+    if isinstance(body, dict):
+        for field in ITEM_FIELDS:
+            if isinstance(body.get(field), list):
+                return body[field]
+    return [] if body in (None, '', {}) else [body]
+
+
+def dig(body: Any, path: List[Any]) -> Any:
+    """
+    Obtém um valor aninhado da resposta.
+
+    Args:
+        body: Corpo JSON da resposta
+        path: Chaves e índices até o valor (ex: ['links', 'next'])
+
+    Returns:
+        Valor encontrado ou None
+    """
+    for key in path:
+        if isinstance(body, dict):
+            body = body.get(key)
+        elif isinstance(body, list) and isinstance(key, int) and -len(body) <= key < len(body):
+            body = body[key]
+        else:
+            return None
+    return body
+
+
+def with_query_param(url: str, name: str, value: Any) -> str:
+    """
+    Define (ou substitui) um parâmetro de query na URL.
+
+    Args:
+        url: URL original
+        name: Nome do parâmetro
+        value: Valor do parâmetro
+
+    Returns:
+        URL com o parâmetro
+    """
+    parts = urlsplit(url)
+    query = [(key, item) for key, item in parse_qsl(parts.query, keep_blank_values=True) if key != name]
+    query.append((name, str(value)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def iter_pages(fetch: Callable[[str], Tuple[int, Any]], url: str,
+               pagination: Dict[str, Any]) -> Iterator[List[Any]]:
+    """
+    Busca as páginas uma a uma, sob demanda.
+
+    Args:
+        fetch: Função que busca uma URL e devolve (status HTTP, corpo JSON)
+        url: URL da primeira página
+        pagination: Configuração gerada ('mode', 'next_url', 'param', 'start',
+            'step', 'max_pages', 'complete_status', 'interval')
+
+    Yields:
+        Itens de cada página
+    """
+    mode = pagination.get('mode')
+    max_pages = pagination.get('max_pages')
+    complete_status = pagination.get('complete_status') or []
+    interval = pagination.get('interval') or 0
+    value = pagination.get('start', 1)
+    page_url = url
+    fetched = 0
+
+    while max_pages is None or fetched < max_pages:
+        if fetched and interval:
+            time.sleep(interval)
+        if mode == 'page_param':
+            page_url = with_query_param(url, pagination['param'], value)
+
+        status, body = fetch(page_url)
+        fetched += 1
+        if status in complete_status:
+            return
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status} ao buscar a página {fetched}: {page_url}")
+
+        items = page_items(body)
+        if items:
+            yield items
+        elif not complete_status:
+            # Paginação completa quando a resposta vem vazia (padrão do n8n)
+            return
+
+        if mode == 'next_url':
+            next_url = dig(body, pagination.get('next_url') or [])
+            if not next_url:
+                return
+            page_url = urljoin(page_url, str(next_url))
+        else:
+            value += pagination.get('step', 1)
+
+
+class PageStream:
+    """Itens de uma requisição paginada, buscados à medida que são consumidos."""
+
+    def __init__(self, fetch: Callable[[str], Tuple[int, Any]], url: str,
+                 pagination: Dict[str, Any], prefetch: int = 1):
+        """
+        Inicializa o fluxo; com prefetch > 0 a primeira página já começa a ser buscada.
+
+        Args:
+            fetch: Função que busca uma URL e devolve (status HTTP, corpo JSON)
+            url: URL da primeira página
+            pagination: Configuração da paginação (ver iter_pages())
+            prefetch: Páginas buscadas à frente do consumo (0 = somente sob demanda)
+        """
+        self.pages = 0
+        self._source = iter_pages(fetch, url, pagination)
+        self._items: Iterator[Any] = iter(())
+        self._finished = False
+        self._closed = threading.Event()
+        self._buffer: Optional[queue.Queue] = None
+        if prefetch > 0:
+            self._buffer = queue.Queue(maxsize=prefetch)
+            threading.Thread(target=self._produce, daemon=True).start()
+
+    def _produce(self) -> None:
+        try:
+            for page in self._source:
+                if not self._put(('page', page)):
+                    return
+            self._put(('end', None))
+        except BaseException as error:
+            self._put(('end', error))
+
+    def _put(self, entry: Tuple[str, Any]) -> bool:
+        # Aguarda espaço no buffer sem bloquear para sempre se o fluxo for fechado
+        while not self._closed.is_set():
+            try:
+                self._buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _next_page(self) -> List[Any]:
+        if self._buffer is None:
+            try:
+                return next(self._source)
+            except BaseException:
+                self._finished = True
+                raise
+        kind, value = self._buffer.get()
+        if kind == 'page':
+            return value
+        self._finished = True
+        if value is not None:
+            raise value
+        raise StopIteration
+
+    def __iter__(self) -> 'PageStream':
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            for item in self._items:
+                return item
+            if self._finished:
+                raise StopIteration
+            self._items = iter(self._next_page())
+            self.pages += 1
+
+    def close(self) -> None:
+        """Interrompe a busca das páginas restantes."""
+        self._finished = True
+        self._closed.set()
+        if self._buffer is None:
+            self._source.close()
+
+    def __repr__(self) -> str:
+        return f'<PageStream pages={self.pages}>'
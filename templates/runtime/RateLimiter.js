@@ -0,0 +1,309 @@
+/**
+ * Limite de taxa das chamadas de IA das classes geradas
+ *
+ * Este módulo mantém, por processo, um limitador por provedor de IA com três
+ * limites opcionais: requisições por minuto (RPM), tokens por minuto (TPM,
+ * estimados a partir do prompt e de maxTokens) e chamadas simultâneas.
+ * Chamadas acima do limite aguardam a vez em uma fila FIFO em vez de falhar
+ * com HTTP 429; o tempo de espera de cada chamada é devolvido ao chamador.
+ *
+ * Os limites vêm de configureRateLimit() ou da variável de ambiente
+ * N8NCODING_RATE_LIMIT_<PROVEDOR> (ex: N8NCODING_RATE_LIMIT_OPENAI="rpm=500,tpm=90000,in_flight=8").
+ */
+
+/**
+ * Estima os tokens de uma chamada de IA (4 caracteres por token + maxTokens)
+ *
+ * @param {Array} texts - Textos enviados (prompt, mensagem do sistema, ...)
+ * @param {number} maxTokens - Máximo de tokens da resposta
+ * @returns {number} Tokens estimados
+ */
+function estimateTokens(texts, maxTokens = 0) {
+    const characters = texts.filter(Boolean).reduce((total, text) => total + String(text).length, 0);
+    return Math.ceil(characters / 4) + Math.max(Number(maxTokens) || 0, 0);
+}
+
+/**
+ * Obtém o total de tokens consumidos a partir do campo 'usage' da resposta
+ *
+ * @param {Object|null} usage - Campo 'usage' (formatos OpenAI e Anthropic)
+ * @returns {number|null} Total de tokens ou null se desconhecido
+ */
+function usageTokens(usage) {
+    if (!usage || typeof usage !== 'object') {
+        return null;
+    }
+    if (usage.total_tokens !== undefined && usage.total_tokens !== null) {
+        return Number(usage.total_tokens);
+    }
+    const parts = ['prompt_tokens', 'completion_tokens', 'input_tokens', 'output_tokens']
+        .map(key => usage[key])
+        .filter(part => part !== undefined && part !== null);
+    return parts.length > 0 ? parts.reduce((total, part) => total + Number(part), 0) : null;
+}
+
+/**
+ * Balde de tokens reabastecido continuamente a uma taxa por minuto
+ */
+class TokenBucket {
+    /**
+     * @param {number} perMinute - Capacidade e taxa de reabastecimento por minuto
+     */
+    constructor(perMinute) {
+        this.capacity = Number(perMinute);
+        this.rate = this.capacity / 60000;
+        this.available = this.capacity;
+        this._updated = performance.now();
+    }
+
+    _refill(now) {
+        this.available = Math.min(this.capacity, this.available + (now - this._updated) * this.rate);
+        this._updated = now;
+    }
+
+    /**
+     * Calcula quanto falta para o balde ter a quantidade pedida
+     *
+     * @param {number} amount - Quantidade pedida (limitada à capacidade)
+     * @param {number} now - Instante atual (performance.now())
+     * @returns {number} Milissegundos até a quantidade estar disponível (0 se já está)
+     */
+    waitTime(amount, now) {
+        this._refill(now);
+        const missing = Math.min(amount, this.capacity) - this.available;
+        return missing > 0 ? missing / this.rate : 0;
+    }
+
+    /**
+     * Retira uma quantidade do balde (o saldo pode ficar negativo)
+     *
+     * @param {number} amount - Quantidade
+     */
+    take(amount) {
+        this.available -= Math.min(amount, this.capacity);
+    }
+
+    /**
+     * Devolve uma quantidade ao balde (sem passar da capacidade)
+     *
+     * @param {number} amount - Quantidade
+     */
+    give(amount) {
+        this.available = Math.min(this.capacity, this.available + amount);
+    }
+}
+
+/**
+ * Limitador de RPM, TPM e chamadas simultâneas com fila FIFO
+ */
+class RateLimiter {
+    /**
+     * @param {Object} limits - Limites (ausentes = sem limite)
+     * @param {number} limits.rpm - Requisições por minuto
+     * @param {number} limits.tpm - Tokens por minuto
+     * @param {number} limits.maxInFlight - Chamadas simultâneas
+     */
+    constructor({ rpm = null, tpm = null, maxInFlight = null } = {}) {
+        this.rpm = rpm ? new TokenBucket(rpm) : null;
+        this.tpm = tpm ? new TokenBucket(tpm) : null;
+        this.maxInFlight = maxInFlight;
+        this.inFlight = 0;
+        this.calls = 0;
+        this.totalWait = 0;
+        this._queue = [];
+        this._timer = null;
+    }
+
+    /**
+     * Aguarda a vez de uma chamada, na ordem de chegada
+     *
+     * @param {number} tokens - Tokens estimados da chamada (ver estimateTokens())
+     * @param {number|null} timeout - Espera máxima em milissegundos, ex: o prazo restante da execução
+     *     (null = sem limite)
+     * @returns {Promise<Object>} Permissão ({ wait, release(usage) }); chame release ao fim da chamada
+     * @throws {Error} TimeoutError se a vez da chamada não chegou dentro do timeout
+     */
+    acquire(tokens = 0, timeout = null) {
+        return new Promise((resolve, reject) => {
+            const entry = { tokens, resolve, started: performance.now() };
+            if (timeout !== null && timeout !== undefined) {
+                const timer = setTimeout(() => {
+                    // Sai da fila: as chamadas seguintes não aguardam mais por esta
+                    this._queue.splice(this._queue.indexOf(entry), 1);
+                    const error = new Error(`Tempo limite de ${Math.round(timeout)} ms esgotado aguardando o limite de taxa`);
+                    error.name = 'TimeoutError';
+                    reject(error);
+                    this._drain();
+                }, timeout);
+                entry.resolve = permit => {
+                    clearTimeout(timer);
+                    resolve(permit);
+                };
+            }
+            this._queue.push(entry);
+            this._drain();
+        });
+    }
+
+    /**
+     * Obtém uma permissão somente se a chamada puder sair agora, sem fila
+     *
+     * Usado pelas requisições de reserva (hedging), que não devem aguardar
+     * atrás das chamadas na fila.
+     *
+     * @param {number} tokens - Tokens estimados da chamada (ver estimateTokens())
+     * @returns {Object|null} Permissão ou null se a chamada teria que aguardar
+     */
+    tryAcquire(tokens = 0) {
+        if (this._queue.length > 0 || (this.maxInFlight && this.inFlight >= this.maxInFlight)
+            || this._waitTime(tokens, performance.now()) > 0) {
+            return null;
+        }
+        return this._take(tokens, 0);
+    }
+
+    _waitTime(tokens, now) {
+        return Math.max(
+            this.rpm ? this.rpm.waitTime(1, now) : 0,
+            this.tpm ? this.tpm.waitTime(tokens, now) : 0
+        );
+    }
+
+    _drain() {
+        while (this._queue.length > 0) {
+            if (this.maxInFlight && this.inFlight >= this.maxInFlight) {
+                return;
+            }
+            const head = this._queue[0];
+            const wait = this._waitTime(head.tokens, performance.now());
+            if (wait > 0) {
+                if (!this._timer) {
+                    this._timer = setTimeout(() => {
+                        this._timer = null;
+                        this._drain();
+                    }, Math.ceil(wait));
+                }
+                return;
+            }
+
+            this._queue.shift();
+            head.resolve(this._take(head.tokens, (performance.now() - head.started) / 1000));
+        }
+    }
+
+    _take(tokens, waited) {
+        if (this.rpm) {
+            this.rpm.take(1);
+        }
+        if (this.tpm) {
+            this.tpm.take(tokens);
+        }
+        this.inFlight++;
+        this.calls++;
+        this.totalWait += waited;
+
+        let released = false;
+        return {
+            tokens,
+            wait: waited,
+            release: (usage = null) => {
+                if (!released) {
+                    released = true;
+                    this._release(tokens, usageTokens(usage));
+                }
+            }
+        };
+    }
+
+    _release(estimated, used) {
+        this.inFlight--;
+        if (this.tpm && used !== null && used < estimated) {
+            // Estimativa maior que o consumo real: devolve a diferença
+            this.tpm.give(estimated - used);
+        } else if (this.tpm && used !== null) {
+            this.tpm.take(used - estimated);
+        }
+        this._drain();
+    }
+
+    /**
+     * Estatísticas do limitador
+     *
+     * @returns {Object} Chamadas, chamadas em andamento, na fila e espera total (segundos)
+     */
+    stats() {
+        return {
+            calls: this.calls,
+            inFlight: this.inFlight,
+            queued: this._queue.length,
+            totalWait: this.totalWait
+        };
+    }
+}
+
+const limiters = new Map();
+
+/**
+ * Interpreta uma especificação de limites
+ *
+ * @param {string} spec - Texto como 'rpm=500,tpm=90000,in_flight=8'
+ * @returns {Object} Limites { rpm, tpm, maxInFlight } presentes
+ */
+function parseLimits(spec) {
+    const limits = {};
+    for (const item of String(spec || '').split(',')) {
+        const [rawName, value = ''] = item.split('=');
+        const name = rawName.trim().toLowerCase().replace(/-/g, '_');
+        if (!value.trim()) {
+            continue;
+        }
+        if (name === 'rpm' || name === 'tpm') {
+            limits[name] = Number(value);
+        } else if (['in_flight', 'inflight', 'max_in_flight', 'concurrency'].includes(name)) {
+            limits.maxInFlight = parseInt(value, 10);
+        } else {
+            throw new Error(`Limite desconhecido: ${name}`);
+        }
+    }
+    return limits;
+}
+
+/**
+ * Define os limites de um provedor para todo o processo
+ *
+ * @param {string} provider - Provedor de IA (ex: 'openai', 'anthropic')
+ * @param {Object} limits - Limites { rpm, tpm, maxInFlight } (ausentes = sem limite)
+ * @returns {RateLimiter} Limitador do provedor
+ */
+function configureRateLimit(provider, limits = {}) {
+    const limiter = new RateLimiter(limits);
+    limiters.set(String(provider).toLowerCase(), limiter);
+    return limiter;
+}
+
+/**
+ * Obtém o limitador compartilhado de um provedor, criando-o no primeiro uso
+ *
+ * @param {string} provider - Provedor de IA
+ * @returns {RateLimiter} Limitador do provedor (sem limites se nada foi configurado)
+ */
+function getRateLimiter(provider) {
+    const key = String(provider).toLowerCase();
+    let limiter = limiters.get(key);
+    if (!limiter) {
+        const envName = 'N8NCODING_RATE_LIMIT_' + String(provider).toUpperCase().replace(/[^A-Z0-9]+/g, '_');
+        limiter = new RateLimiter(parseLimits(process.env[envName]));
+        limiters.set(key, limiter);
+    }
+    return limiter;
+}
+
+module.exports = {
+    RateLimiter,
+    TokenBucket,
+    configureRateLimit,
+    estimateTokens,
+    getRateLimiter,
+    parseLimits,
+    usageTokens
+};
@@ -0,0 +1,307 @@
+<?php
+
+/**
+ * Limite de taxa das chamadas de IA das classes geradas
+ *
+ * Mantém, por processo, um limitador por provedor de IA com requisições por
+ * minuto (RPM) e tokens por minuto (TPM, estimados a partir do prompt e de
+ * maxTokens). Chamadas acima do limite aguardam (usleep) em vez de falhar com
+ * HTTP 429, e o tempo de espera de cada chamada é devolvido ao chamador. O
+ * PHP executa uma chamada por vez em cada processo, então o limite de
+ * chamadas simultâneas é o número de processos (pm.max_children do PHP-FPM).
+ *
+ * Os limites vêm de RateLimiter::configure() ou da variável de ambiente
+ * N8NCODING_RATE_LIMIT_<PROVEDOR> (ex: N8NCODING_RATE_LIMIT_OPENAI="rpm=500,tpm=90000").
+ *
+ * @package Generated\Runtime
+ */
+
+/**
+ * Balde de tokens reabastecido continuamente a uma taxa por minuto
+ *
+ * @package Generated\Runtime
+ */
+class TokenBucket {
+
+    public float $available;
+
+    private float $rate;
+
+    private float $updated;
+
+    /**
+     * @param float $capacity Capacidade e taxa de reabastecimento por minuto
+     */
+    public function __construct(public readonly float $capacity)
+    {
+        $this->rate = $capacity / 60.0;
+        $this->available = $capacity;
+        $this->updated = hrtime(true) / 1e9;
+    }
+
+    /**
+     * Calcula quanto falta para o balde ter a quantidade pedida
+     *
+     * @param float $amount Quantidade pedida (limitada à capacidade)
+     * @return float Segundos até a quantidade estar disponível (0 se já está)
+     */
+    public function waitTime(float $amount): float
+    {
+        $now = hrtime(true) / 1e9;
+        $this->available = min($this->capacity, $this->available + ($now - $this->updated) * $this->rate);
+        $this->updated = $now;
+        $missing = min($amount, $this->capacity) - $this->available;
+        return $missing > 0 ? $missing / $this->rate : 0.0;
+    }
+
+    /**
+     * Retira (quantidade positiva) ou devolve (negativa) tokens do balde
+     *
+     * @param float $amount Quantidade
+     * @return void
+     */
+    public function take(float $amount): void
+    {
+        $this->available = min($this->capacity, $this->available - min($amount, $this->capacity));
+    }
+}
+
+/**
+ * Permissão de uma chamada obtida com RateLimiter::acquire()
+ *
+ * @package Generated\Runtime
+ */
+class RateLimitPermit {
+
+    private bool $released = false;
+
+    /**
+     * @param RateLimiter $limiter Limitador que emitiu a permissão
+     * @param int $tokens Tokens estimados da chamada
+     * @param float $wait Tempo de espera da chamada em segundos
+     */
+    public function __construct(
+        private RateLimiter $limiter,
+        public readonly int $tokens,
+        public readonly float $wait
+    ) {
+    }
+
+    /**
+     * Libera a chamada e corrige o TPM com os tokens consumidos
+     *
+     * @param array|null $usage Campo 'usage' da resposta (null mantém a estimativa)
+     * @return void
+     */
+    public function release(?array $usage = null): void
+    {
+        if (!$this->released) {
+            $this->released = true;
+            $this->limiter->settle($this->tokens, RateLimiter::usageTokens($usage));
+        }
+    }
+}
+
+/**
+ * Limitador de RPM e TPM de um provedor
+ *
+ * @package Generated\Runtime
+ */
+class RateLimiter {
+
+    /** @var array<string, RateLimiter> Limitadores por provedor */
+    private static array $limiters = [];
+
+    private ?TokenBucket $rpm;
+
+    private ?TokenBucket $tpm;
+
+    public int $calls = 0;
+
+    public float $totalWait = 0.0;
+
+    /**
+     * @param float|null $rpm Requisições por minuto (null = sem limite)
+     * @param float|null $tpm Tokens por minuto (null = sem limite)
+     */
+    public function __construct(?float $rpm = null, ?float $tpm = null)
+    {
+        $this->rpm = $rpm ? new TokenBucket($rpm) : null;
+        $this->tpm = $tpm ? new TokenBucket($tpm) : null;
+    }
+
+    /**
+     * Estima os tokens de uma chamada de IA (4 caracteres por token + maxTokens)
+     *
+     * @param array $texts Textos enviados (prompt, mensagem do sistema, ...)
+     * @param int $maxTokens Máximo de tokens da resposta
+     * @return int Tokens estimados
+     */
+    public static function estimateTokens(array $texts, int $maxTokens = 0): int
+    {
+        $characters = array_sum(array_map(fn($text) => mb_strlen((string)$text), array_filter($texts)));
+        return (int)ceil($characters / 4) + max($maxTokens, 0);
+    }
+
+    /**
+     * Obtém o total de tokens consumidos a partir do campo 'usage' da resposta
+     *
+     * @param array|null $usage Campo 'usage' (formatos OpenAI e Anthropic)
+     * @return int|null Total de tokens ou null se desconhecido
+     */
+    public static function usageTokens(?array $usage): ?int
+    {
+        if (empty($usage)) {
+            return null;
+        }
+        if (isset($usage['total_tokens'])) {
+            return (int)$usage['total_tokens'];
+        }
+        $parts = array_filter(
+            [$usage['prompt_tokens'] ?? null, $usage['completion_tokens'] ?? null,
+             $usage['input_tokens'] ?? null, $usage['output_tokens'] ?? null],
+            fn($part) => $part !== null
+        );
+        return $parts ? (int)array_sum($parts) : null;
+    }
+
+    /**
+     * Interpreta uma especificação de limites
+     *
+     * @param string $spec Texto como 'rpm=500,tpm=90000'
+     * @return array Limites ['rpm' => ..., 'tpm' => ...] presentes
+     * @throws \InvalidArgumentException Se um limite for desconhecido
+     */
+    public static function parseLimits(string $spec): array
+    {
+        $limits = [];
+        foreach (explode(',', $spec) as $item) {
+            $parts = explode('=', $item, 2);
+            $name = str_replace('-', '_', strtolower(trim($parts[0])));
+            $value = trim($parts[1] ?? '');
+            if ($value === '') {
+                continue;
+            }
+            if ($name === 'rpm' || $name === 'tpm') {
+                $limits[$name] = (float)$value;
+            } elseif (!in_array($name, ['in_flight', 'inflight', 'max_in_flight', 'concurrency'], true)) {
+                // Chamadas simultâneas são limitadas pelo número de processos do PHP
+                throw new \InvalidArgumentException("Limite desconhecido: {$name}");
+            }
+        }
+        return $limits;
+    }
+
+    /**
+     * Define os limites de um provedor para o processo
+     *
+     * @param string $provider Provedor de IA (ex: 'openai', 'anthropic')
+     * @param float|null $rpm Requisições por minuto (null = sem limite)
+     * @param float|null $tpm Tokens por minuto (null = sem limite)
+     * @return RateLimiter Limitador do provedor
+     */
+    public static function configure(string $provider, ?float $rpm = null, ?float $tpm = null): RateLimiter
+    {
+        return self::$limiters[strtolower($provider)] = new RateLimiter($rpm, $tpm);
+    }
+
+    /**
+     * Obtém o limitador de um provedor, criando-o no primeiro uso
+     *
+     * @param string $provider Provedor de IA
+     * @return RateLimiter Limitador do provedor (sem limites se nada foi configurado)
+     */
+    public static function forProvider(string $provider): RateLimiter
+    {
+        $key = strtolower($provider);
+        if (!isset(self::$limiters[$key])) {
+            $envName = 'N8NCODING_RATE_LIMIT_' . preg_replace('/[^A-Z0-9]+/', '_', strtoupper($provider));
+            $limits = self::parseLimits((string)getenv($envName));
+            self::$limiters[$key] = new RateLimiter($limits['rpm'] ?? null, $limits['tpm'] ?? null);
+        }
+        return self::$limiters[$key];
+    }
+
+    /**
+     * Aguarda até a chamada caber nos limites
+     *
+     * @param int $tokens Tokens estimados da chamada (ver estimateTokens())
+     * @param float $timeout Espera máxima em segundos, ex: o prazo restante da execução (0 = sem limite)
+     * @return RateLimitPermit Permissão; chame release($usage) ao fim da chamada
+     * @throws \RuntimeException Se a chamada não coube nos limites dentro do timeout
+     */
+    public function acquire(int $tokens = 0, float $timeout = 0): RateLimitPermit
+    {
+        $started = hrtime(true);
+        while (($wait = $this->waitTime($tokens)) > 0) {
+            if ($timeout > 0) {
+                $remaining = $timeout - (hrtime(true) - $started) / 1e9;
+                if ($remaining <= 0) {
+                    throw new \RuntimeException(
+                        sprintf('Tempo limite de %.3f s esgotado aguardando o limite de taxa', $timeout)
+                    );
+                }
+                $wait = min($wait, $remaining);
+            }
+            usleep((int)ceil($wait * 1e6));
+        }
+        return $this->take($tokens, (hrtime(true) - $started) / 1e9);
+    }
+
+    /**
+     * Obtém uma permissão somente se a chamada couber nos limites agora
+     *
+     * Usado pelas requisições de reserva (hedging), que não devem aguardar.
+     *
+     * @param int $tokens Tokens estimados da chamada (ver estimateTokens())
+     * @return RateLimitPermit|null Permissão ou null se a chamada teria que aguardar
+     */
+    public function tryAcquire(int $tokens = 0): ?RateLimitPermit
+    {
+        return $this->waitTime($tokens) > 0 ? null : $this->take($tokens, 0.0);
+    }
+
+    /**
+     * Tempo até a chamada caber nos limites
+     *
+     * @param int $tokens Tokens estimados da chamada
+     * @return float Espera em segundos (0 = pode sair agora)
+     */
+    private function waitTime(int $tokens): float
+    {
+        return max(
+            $this->rpm ? $this->rpm->waitTime(1) : 0.0,
+            $this->tpm ? $this->tpm->waitTime($tokens) : 0.0
+        );
+    }
+
+    /**
+     * Consome os limites de uma chamada liberada
+     *
+     * @param int $tokens Tokens estimados da chamada
+     * @param float $waited Tempo de espera da chamada em segundos
+     * @return RateLimitPermit Permissão da chamada
+     */
+    private function take(int $tokens, float $waited): RateLimitPermit
+    {
+        $this->rpm?->take(1);
+        $this->tpm?->take($tokens);
+        $this->calls++;
+        $this->totalWait += $waited;
+        return new RateLimitPermit($this, $tokens, $waited);
+    }
+
+    /**
+     * Corrige o TPM com o consumo real de uma chamada
+     *
+     * @param int $estimated Tokens estimados
+     * @param int|null $used Tokens consumidos (null mantém a estimativa)
+     * @return void
+     */
+    public function settle(int $estimated, ?int $used): void
+    {
+        if ($this->tpm !== null && $used !== null) {
+            $this->tpm->take($used - $estimated);
+        }
+    }
+}
@@ -0,0 +1,319 @@
+"""
+Limite de taxa das chamadas de IA das classes geradas
+
+Este módulo mantém, por processo, um limitador por provedor de IA com três
+limites opcionais: requisições por minuto (RPM), tokens por minuto (TPM,
+estimados a partir do prompt e de max_tokens) e chamadas simultâneas.
+Chamadas acima do limite aguardam a vez em uma fila FIFO em vez de falhar
+com HTTP 429; o tempo de espera de cada chamada é devolvido ao chamador.
+
+Os limites vêm de configure_rate_limit() ou da variável de ambiente
+N8NCODING_RATE_LIMIT_<PROVEDOR> (ex: N8NCODING_RATE_LIMIT_OPENAI="rpm=500,tpm=90000,in_flight=8").
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+
+def estimate_tokens(texts: Iterable[Any], max_tokens: int = 0) -> int:
+    """
+    Estima os tokens de uma chamada de IA.
+
+    Usa a aproximação de 4 caracteres por token para o prompt e soma os
+    tokens de saída pedidos (max_tokens).
+
+    Args:
+        texts: Textos enviados (prompt, mensagem do sistema, ...)
+        max_tokens: Máximo de tokens da resposta
+
+    Returns:
+        Tokens estimados
+    """
+    characters = sum(len(str(text)) for text in texts if text)
+    return (characters + 3) // 4 + max(int(max_tokens or 0), 0)
+
+
+def usage_tokens(usage: Any) -> Optional[int]:
+    """
+    Obtém o total de tokens consumidos a partir do campo 'usage' da resposta.
+
+    Args:
+        usage: Campo 'usage' (formatos OpenAI e Anthropic)
+
+    Returns:
+        Total de tokens ou None se desconhecido
+    """
+    if not isinstance(usage, dict):
+        return None
+    if usage.get('total_tokens') is not None:
+        return int(usage['total_tokens'])
+    parts = [usage.get(key) for key in ('prompt_tokens', 'completion_tokens', 'input_tokens', 'output_tokens')]
+    parts = [int(part) for part in parts if part is not None]
+    return sum(parts) if parts else None
+
+
+class TokenBucket:
+    """Balde de tokens reabastecido continuamente a uma taxa por minuto."""
+
+    def __init__(self, per_minute: float):
+        """
+        Inicializa o balde cheio.
+
+        Args:
+            per_minute: Capacidade e taxa de reabastecimento por minuto
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Calcula quanto falta para o balde ter a quantidade pedida.
+
+        Args:
+            amount: Quantidade pedida (limitada à capacidade)
+            now: Instante atual (time.monotonic())
+
+        Returns:
+            Segundos até a quantidade estar disponível (0 se já está)
+        """
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.available
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        """Retira uma quantidade do balde (o saldo pode ficar negativo)."""
+        self.available -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        """Devolve uma quantidade ao balde (sem passar da capacidade)."""
+        self.available = min(self.capacity, self.available + amount)
+
+
+class Permit:
+    """Permissão de uma chamada obtida com RateLimiter.acquire()."""
+
+    def __init__(self, limiter: 'RateLimiter', tokens: int, wait: float):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.wait = wait
+        self._released = False
+
+    def release(self, usage: Any = None) -> None:
+        """
+        Libera a vaga da chamada e corrige o TPM com os tokens consumidos.
+
+        Args:
+            usage: Campo 'usage' da resposta (None mantém a estimativa)
+        """
+        if not self._released:
+            self._released = True
+            self.limiter._release(self.tokens, usage_tokens(usage))
+
+
+class RateLimiter:
+    """Limitador de RPM, TPM e chamadas simultâneas com fila FIFO."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_in_flight: Optional[int] = None):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rpm: Requisições por minuto (None = sem limite)
+            tpm: Tokens por minuto (None = sem limite)
+            max_in_flight: Chamadas simultâneas (None = sem limite)
+        """
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.calls = 0
+        self.total_wait = 0.0
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+
+    def _wait_time(self, tokens: int) -> Optional[float]:
+        """Tempo até a chamada poder sair (None = aguardar uma vaga ser liberada)."""
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return None
+        now = time.monotonic()
+        waits = [0.0]
+        if self.rpm:
+            waits.append(self.rpm.wait_time(1, now))
+        if self.tpm:
+            waits.append(self.tpm.wait_time(tokens, now))
+        return max(waits)
+
+    def acquire(self, tokens: int = 0, timeout: Optional[float] = None) -> Permit:
+        """
+        Aguarda a vez de uma chamada, na ordem de chegada.
+
+        Args:
+            tokens: Tokens estimados da chamada (ver estimate_tokens())
+            timeout: Espera máxima em segundos, ex: o prazo restante da
+                execução (None = sem limite)
+
+        Returns:
+            Permissão; chame permit.release(usage) ao fim da chamada
+
+        Raises:
+            TimeoutError: Se a vez da chamada não chegou dentro do timeout
+        """
+        started = time.monotonic()
+        ticket = object()
+        with self._condition:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    # None = aguardar ser o primeiro da fila ou uma vaga ser liberada
+                    wait = self._wait_time(tokens) if self._queue[0] is ticket else None
+                    if wait == 0.0:
+                        break
+                    if timeout is not None:
+                        remaining = started + timeout - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f'Tempo limite de {timeout:.3f} s esgotado aguardando o limite de taxa')
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+            return self._take(tokens, time.monotonic() - started)
+
+    def try_acquire(self, tokens: int = 0) -> Optional[Permit]:
+        """
+        Obtém uma permissão somente se a chamada puder sair agora, sem fila.
+
+        Usado pelas requisições de reserva (hedging), que não devem aguardar
+        atrás das chamadas na fila nem ocupar uma vaga que a primeira tentativa
+        só libera ao terminar.
+
+        Args:
+            tokens: Tokens estimados da chamada (ver estimate_tokens())
+
+        Returns:
+            Permissão ou None se a chamada teria que aguardar
+        """
+        with self._condition:
+            if self._queue or self._wait_time(tokens) != 0.0:
+                return None
+            return self._take(tokens, 0.0)
+
+    def _take(self, tokens: int, waited: float) -> Permit:
+        """Consome os limites de uma chamada liberada (com a trava obtida)."""
+        if self.rpm:
+            self.rpm.take(1)
+        if self.tpm:
+            self.tpm.take(tokens)
+        self.in_flight += 1
+        self.calls += 1
+        self.total_wait += waited
+        return Permit(self, tokens, waited)
+
+    def _release(self, estimated: int, used: Optional[int]) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if self.tpm and used is not None and used < estimated:
+                # Estimativa maior que o consumo real: devolve a diferença
+                self.tpm.give(estimated - used)
+            elif self.tpm and used is not None:
+                self.tpm.take(used - estimated)
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Estatísticas do limitador.
+
+        Returns:
+            Dicionário com chamadas, chamadas em andamento, na fila e espera total
+        """
+        with self._condition:
+            return {
+                'calls': self.calls,
+                'in_flight': self.in_flight,
+                'queued': len(self._queue),
+                'total_wait': self.total_wait
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_name(provider: str) -> str:
+    return 'N8NCODING_RATE_LIMIT_' + re.sub(r'[^A-Z0-9]+', '_', provider.upper())
+
+
+def parse_limits(spec: str) -> Dict[str, float]:
+    """
+    Interpreta uma especificação de limites.
+
+    Args:
+        spec: Texto como 'rpm=500,tpm=90000,in_flight=8'
+
+    Returns:
+        Dicionário com as chaves 'rpm', 'tpm' e 'max_in_flight' presentes
+    """
+    limits: Dict[str, float] = {}
+    for item in spec.split(','):
+        name, _, value = item.partition('=')
+        name = name.strip().lower().replace('-', '_')
+        if not value.strip():
+            continue
+        if name in ('rpm', 'tpm'):
+            limits[name] = float(value)
+        elif name in ('in_flight', 'inflight', 'max_in_flight', 'concurrency'):
+            limits['max_in_flight'] = int(value)
+        else:
+            raise ValueError(f"Limite desconhecido: {name}")
+    return limits
+
+
+def configure_rate_limit(provider: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                         max_in_flight: Optional[int] = None) -> RateLimiter:
+    """
+    Define os limites de um provedor para todo o processo.
+
+    Args:
+        provider: Provedor de IA (ex: 'openai', 'anthropic')
+        rpm: Requisições por minuto (None = sem limite)
+        tpm: Tokens por minuto (None = sem limite)
+        max_in_flight: Chamadas simultâneas (None = sem limite)
+
+    Returns:
+        Limitador do provedor
+    """
+    limiter = RateLimiter(rpm, tpm, max_in_flight)
+    with _limiters_lock:
+        _limiters[provider.lower()] = limiter
+    return limiter
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Obtém o limitador compartilhado de um provedor, criando-o no primeiro uso.
+
+    Args:
+        provider: Provedor de IA
+
+    Returns:
+        Limitador do provedor (sem limites se nada foi configurado)
+    """
+    key = provider.lower()
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(**parse_limits(os.getenv(_env_name(provider), '')))
+                _limiters[key] = limiter
+    return limiter
@@ -0,0 +1,211 @@
+/**
+ * Cache de respostas para os nós HTTP Request e AI Agent
+ *
+ * Backends de cache plugáveis para as classes geradas: em memória (LRU com
+ * TTL) e arquivos. Todos os backends expõem a mesma interface
+ * get(key) / set(key, value, ttl) e armazenam valores serializáveis em JSON.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+
+/**
+ * Serializa um valor em JSON com as chaves dos objetos ordenadas
+ *
+ * @param {*} value - Valor a serializar
+ * @returns {string} JSON canônico
+ */
+function canonicalJson(value) {
+    if (Array.isArray(value)) {
+        return '[' + value.map(canonicalJson).join(',') + ']';
+    }
+    if (value && typeof value === 'object') {
+        const keys = Object.keys(value).sort();
+        return '{' + keys.map((key) => JSON.stringify(key) + ':' + canonicalJson(value[key])).join(',') + '}';
+    }
+    return JSON.stringify(value === undefined ? null : value);
+}
+
+/**
+ * Gera a chave de cache a partir dos componentes da requisição
+ *
+ * @param {string} namespace - Tipo da requisição (ex: 'http', 'ai')
+ * @param {Array} parts - Componentes que identificam a requisição
+ * @returns {string} Hash SHA-256 dos componentes
+ */
+function makeCacheKey(namespace, parts) {
+    return crypto.createHash('sha256').update(canonicalJson([namespace, parts])).digest('hex');
+}
+
+/**
+ * Cache em memória com política LRU e expiração (TTL)
+ */
+class MemoryCache {
+    /**
+     * Construtor
+     *
+     * @param {number} maxEntries - Quantidade máxima de entradas
+     * @param {number|null} ttl - Tempo de vida padrão em segundos (null = sem expiração)
+     */
+    constructor(maxEntries = 1024, ttl = null) {
+        this.maxEntries = maxEntries;
+        this.ttl = ttl;
+        this._entries = new Map();
+    }
+
+    /**
+     * Obtém um valor do cache
+     *
+     * @param {string} key - Chave do cache
+     * @returns {{hit: boolean, value: *}} Resultado da consulta
+     */
+    get(key) {
+        const entry = this._entries.get(key);
+        if (!entry) {
+            return { hit: false, value: null };
+        }
+
+        this._entries.delete(key);
+        if (entry.expiresAt !== null && entry.expiresAt <= Date.now()) {
+            return { hit: false, value: null };
+        }
+
+        // Reinsere no fim para manter a ordem de uso (LRU)
+        this._entries.set(key, entry);
+        return { hit: true, value: entry.value };
+    }
+
+    /**
+     * Armazena um valor no cache
+     *
+     * @param {string} key - Chave do cache
+     * @param {*} value - Valor a ser armazenado
+     * @param {number|null} ttl - Tempo de vida em segundos (usa o padrão se null)
+     */
+    set(key, value, ttl = null) {
+        const effectiveTtl = ttl !== null ? ttl : this.ttl;
+        this._entries.delete(key);
+        this._entries.set(key, {
+            expiresAt: effectiveTtl !== null ? Date.now() + effectiveTtl * 1000 : null,
+            value: value
+        });
+
+        while (this._entries.size > this.maxEntries) {
+            this._entries.delete(this._entries.keys().next().value);
+        }
+    }
+
+    /**
+     * Remove todas as entradas do cache
+     */
+    clear() {
+        this._entries.clear();
+    }
+}
+
+/**
+ * Cache persistente com um arquivo JSON por entrada
+ */
+class FileCache {
+    /**
+     * Construtor
+     *
+     * @param {string} directory - Diretório onde as entradas são gravadas
+     * @param {number|null} ttl - Tempo de vida padrão em segundos (null = sem expiração)
+     */
+    constructor(directory = '.n8ncoding_cache', ttl = null) {
+        this.directory = directory;
+        this.ttl = ttl;
+        fs.mkdirSync(directory, { recursive: true });
+    }
+
+    _path(key) {
+        return path.join(this.directory, `${key}.json`);
+    }
+
+    /**
+     * Obtém um valor do cache
+     *
+     * @param {string} key - Chave do cache
+     * @returns {{hit: boolean, value: *}} Resultado da consulta
+     */
+    get(key) {
+        let entry;
+        try {
+            entry = JSON.parse(fs.readFileSync(this._path(key), 'utf-8'));
+        } catch (e) {
+            return { hit: false, value: null };
+        }
+
+        if (entry.expiresAt !== null && entry.expiresAt <= Date.now()) {
+            fs.rmSync(this._path(key), { force: true });
+            return { hit: false, value: null };
+        }
+
+        return { hit: true, value: entry.value };
+    }
+
+    /**
+     * Armazena um valor no cache
+     *
+     * @param {string} key - Chave do cache
+     * @param {*} value - Valor serializável em JSON
+     * @param {number|null} ttl - Tempo de vida em segundos (usa o padrão se null)
+     */
+    set(key, value, ttl = null) {
+        const effectiveTtl = ttl !== null ? ttl : this.ttl;
+        const entry = {
+            expiresAt: effectiveTtl !== null ? Date.now() + effectiveTtl * 1000 : null,
+            value: value
+        };
+
+        // Grava em arquivo temporário e renomeia para evitar leituras parciais
+        const tempPath = `${this._path(key)}.${process.pid}.tmp`;
+        fs.writeFileSync(tempPath, JSON.stringify(entry));
+        fs.renameSync(tempPath, this._path(key));
+    }
+
+    /**
+     * Remove todas as entradas do cache
+     */
+    clear() {
+        for (const file of fs.readdirSync(this.directory)) {
+            if (file.endsWith('.json')) {
+                fs.rmSync(path.join(this.directory, file), { force: true });
+            }
+        }
+    }
+}
+
+/**
+ * Cria um backend de cache a partir de uma especificação textual
+ *
+ * Exemplos: 'memory', 'memory:5000', 'file:/tmp/cache'
+ *
+ * @param {string} spec - Tipo do backend e argumento opcional separados por ':'
+ * @param {number|null} ttl - Tempo de vida padrão das entradas em segundos
+ * @returns {MemoryCache|FileCache} Backend de cache
+ * @throws {Error} Se o backend for desconhecido
+ */
+function createCache(spec = 'memory', ttl = null) {
+    const separator = spec.indexOf(':');
+    const backend = separator === -1 ? spec : spec.slice(0, separator);
+    const argument = separator === -1 ? '' : spec.slice(separator + 1);
+
+    if (backend === 'memory') {
+        return new MemoryCache(argument ? parseInt(argument, 10) : 1024, ttl);
+    }
+    if (backend === 'file') {
+        return new FileCache(argument || '.n8ncoding_cache', ttl);
+    }
+
+    throw new Error(`Backend de cache desconhecido: ${backend}`);
+}
+
+module.exports = {
+    makeCacheKey,
+    MemoryCache,
+    FileCache,
+    createCache
+};
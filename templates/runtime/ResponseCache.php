@@ -0,0 +1,263 @@
+<?php
+
+/**
+ * Cache de respostas para os nós HTTP Request e AI Agent
+ *
+ * Backends de cache plugáveis para as classes geradas: em memória (LRU com
+ * TTL), SQLite (PDO) e arquivos. Todos os backends implementam
+ * ResponseCacheBackend e armazenam valores serializáveis em JSON.
+ *
+ * @package Generated\Runtime
+ */
+
+/**
+ * Interface comum dos backends de cache
+ *
+ * @package Generated\Runtime
+ */
+interface ResponseCacheBackend {
+
+    /**
+     * Obtém um valor do cache
+     *
+     * @param string $key Chave do cache
+     * @return array Par [encontrado, valor]
+     */
+    public function get(string $key): array;
+
+    /**
+     * Armazena um valor no cache
+     *
+     * @param string $key Chave do cache
+     * @param mixed $value Valor a ser armazenado
+     * @param float|null $ttl Tempo de vida em segundos (usa o padrão do backend se null)
+     * @return void
+     */
+    public function set(string $key, mixed $value, ?float $ttl = null): void;
+}
+
+/**
+ * Funções auxiliares do cache de respostas
+ *
+ * @package Generated\Runtime
+ */
+final class ResponseCache {
+
+    /**
+     * Gera a chave de cache a partir dos componentes da requisição
+     *
+     * @param string $namespace Tipo da requisição (ex: 'http', 'ai')
+     * @param array $parts Componentes que identificam a requisição
+     * @return string Hash SHA-256 dos componentes
+     */
+    public static function makeKey(string $namespace, array $parts): string
+    {
+        return hash('sha256', json_encode([$namespace, self::normalize($parts)], JSON_UNESCAPED_UNICODE));
+    }
+
+    /**
+     * Ordena recursivamente as chaves de arrays associativos
+     *
+     * @param mixed $value Valor a normalizar
+     * @return mixed Valor normalizado
+     */
+    private static function normalize(mixed $value): mixed
+    {
+        if (!is_array($value)) {
+            return $value;
+        }
+
+        $normalized = array_map([self::class, 'normalize'], $value);
+        if (!empty($normalized) && array_keys($normalized) !== range(0, count($normalized) - 1)) {
+            ksort($normalized);
+        }
+        return $normalized;
+    }
+
+    /**
+     * Cria um backend de cache a partir de uma especificação textual
+     *
+     * Exemplos: 'memory', 'memory:5000', 'sqlite:cache.db', 'file:/tmp/cache'
+     *
+     * @param string $spec Tipo do backend e argumento opcional separados por ':'
+     * @param float|null $ttl Tempo de vida padrão das entradas em segundos
+     * @return ResponseCacheBackend Backend de cache
+     * @throws \InvalidArgumentException Se o backend for desconhecido
+     */
+    public static function create(string $spec = 'memory', ?float $ttl = null): ResponseCacheBackend
+    {
+        [$backend, $argument] = array_pad(explode(':', $spec, 2), 2, '');
+
+        switch ($backend) {
+            case 'memory':
+                return new MemoryCache($argument !== '' ? (int)$argument : 1024, $ttl);
+            case 'sqlite':
+                return new SqliteCache($argument !== '' ? $argument : 'n8ncoding_cache.sqlite', $ttl);
+            case 'file':
+                return new FileCache($argument !== '' ? $argument : '.n8ncoding_cache', $ttl);
+        }
+
+        throw new \InvalidArgumentException("Backend de cache desconhecido: {$backend}");
+    }
+}
+
+/**
+ * Cache em memória (por processo) com política LRU e expiração (TTL)
+ *
+ * @package Generated\Runtime
+ */
+class MemoryCache implements ResponseCacheBackend {
+
+    private array $entries = [];
+
+    /**
+     * @param int $maxEntries Quantidade máxima de entradas
+     * @param float|null $ttl Tempo de vida padrão em segundos (null = sem expiração)
+     */
+    public function __construct(private int $maxEntries = 1024, private ?float $ttl = null)
+    {
+    }
+
+    public function get(string $key): array
+    {
+        if (!array_key_exists($key, $this->entries)) {
+            return [false, null];
+        }
+
+        [$expiresAt, $value] = $this->entries[$key];
+        unset($this->entries[$key]);
+
+        if ($expiresAt !== null && $expiresAt <= microtime(true)) {
+            return [false, null];
+        }
+
+        // Reinsere no fim para manter a ordem de uso (LRU)
+        $this->entries[$key] = [$expiresAt, $value];
+        return [true, $value];
+    }
+
+    public function set(string $key, mixed $value, ?float $ttl = null): void
+    {
+        $ttl = $ttl ?? $this->ttl;
+        unset($this->entries[$key]);
+        $this->entries[$key] = [$ttl !== null ? microtime(true) + $ttl : null, $value];
+
+        while (count($this->entries) > $this->maxEntries) {
+            unset($this->entries[array_key_first($this->entries)]);
+        }
+    }
+}
+
+/**
+ * Cache persistente em um banco SQLite local (PDO)
+ *
+ * @package Generated\Runtime
+ */
+class SqliteCache implements ResponseCacheBackend {
+
+    private \PDO $pdo;
+
+    /**
+     * @param string $path Caminho do arquivo do banco
+     * @param float|null $ttl Tempo de vida padrão em segundos (null = sem expiração)
+     */
+    public function __construct(string $path = 'n8ncoding_cache.sqlite', private ?float $ttl = null)
+    {
+        $this->pdo = new \PDO('sqlite:' . $path);
+        $this->pdo->setAttribute(\PDO::ATTR_ERRMODE, \PDO::ERRMODE_EXCEPTION);
+        $this->pdo->exec(
+            'CREATE TABLE IF NOT EXISTS response_cache (' .
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        );
+    }
+
+    public function get(string $key): array
+    {
+        $statement = $this->pdo->prepare('SELECT value, expires_at FROM response_cache WHERE key = ?');
+        $statement->execute([$key]);
+        $row = $statement->fetch(\PDO::FETCH_ASSOC);
+
+        if ($row === false) {
+            return [false, null];
+        }
+
+        if ($row['expires_at'] !== null && (float)$row['expires_at'] <= microtime(true)) {
+            $this->pdo->prepare('DELETE FROM response_cache WHERE key = ?')->execute([$key]);
+            return [false, null];
+        }
+
+        return [true, json_decode($row['value'], true)];
+    }
+
+    public function set(string $key, mixed $value, ?float $ttl = null): void
+    {
+        $ttl = $ttl ?? $this->ttl;
+        $this->pdo->prepare(
+            'INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)'
+        )->execute([
+            $key,
+            json_encode($value, JSON_UNESCAPED_UNICODE),
+            $ttl !== null ? microtime(true) + $ttl : null
+        ]);
+    }
+}
+
+/**
+ * Cache persistente com um arquivo JSON por entrada
+ *
+ * @package Generated\Runtime
+ */
+class FileCache implements ResponseCacheBackend {
+
+    /**
+     * @param string $directory Diretório onde as entradas são gravadas
+     * @param float|null $ttl Tempo de vida padrão em segundos (null = sem expiração)
+     */
+    public function __construct(private string $directory = '.n8ncoding_cache', private ?float $ttl = null)
+    {
+        if (!is_dir($this->directory)) {
+            mkdir($this->directory, 0777, true);
+        }
+    }
+
+    private function path(string $key): string
+    {
+        return rtrim($this->directory, '/') . '/' . $key . '.json';
+    }
+
+    public function get(string $key): array
+    {
+        $path = $this->path($key);
+        $contents = @file_get_contents($path);
+        if ($contents === false) {
+            return [false, null];
+        }
+
+        $entry = json_decode($contents, true);
+        if (!is_array($entry)) {
+            return [false, null];
+        }
+
+        if ($entry['expires_at'] !== null && $entry['expires_at'] <= microtime(true)) {
+            @unlink($path);
+            return [false, null];
+        }
+
+        return [true, $entry['value']];
+    }
+
+    public function set(string $key, mixed $value, ?float $ttl = null): void
+    {
+        $ttl = $ttl ?? $this->ttl;
+        $entry = [
+            'expires_at' => $ttl !== null ? microtime(true) + $ttl : null,
+            'value' => $value
+        ];
+
+        // Grava em arquivo temporário e renomeia para evitar leituras parciais
+        $path = $this->path($key);
+        $tempPath = $path . '.' . getmypid() . '.tmp';
+        file_put_contents($tempPath, json_encode($entry, JSON_UNESCAPED_UNICODE));
+        rename($tempPath, $path);
+    }
+}
@@ -0,0 +1,267 @@
+"""
+Cache de respostas para os nós HTTP Request e AI Agent
+
+Este módulo fornece backends de cache plugáveis para as classes geradas:
+em memória (LRU com TTL), SQLite e arquivos. Todos os backends expõem a
+mesma interface get(key) / set(key, value, ttl) e armazenam valores
+serializáveis em JSON.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+
+def make_cache_key(namespace: str, parts: Iterable[Any]) -> str:
+    """
+    Gera a chave de cache a partir dos componentes da requisição.
+
+    Args:
+        namespace: Tipo da requisição (ex: 'http', 'ai')
+        parts: Componentes que identificam a requisição
+            (ex: url, método, headers, body ou provedor, modelo, prompt...)
+
+    Returns:
+        Hash SHA-256 dos componentes
+    """
+    payload = json.dumps([namespace, list(parts)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryCache:
+    """Cache em memória com política LRU e expiração (TTL)."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        """
+        Inicializa o cache em memória.
+
+        Args:
+            max_entries: Quantidade máxima de entradas (as menos usadas são removidas)
+            ttl: Tempo de vida padrão das entradas em segundos (None = sem expiração)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[Optional[float], Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Obtém um valor do cache.
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena um valor no cache.
+
+        Args:
+            key: Chave do cache
+            value: Valor a ser armazenado
+            ttl: Tempo de vida em segundos (usa o padrão do cache se None)
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCache:
+    """Cache persistente em um banco SQLite local."""
+
+    def __init__(self, path: str = 'n8ncoding_cache.sqlite', ttl: Optional[float] = None):
+        """
+        Inicializa o cache SQLite.
+
+        Args:
+            path: Caminho do arquivo do banco
+            ttl: Tempo de vida padrão das entradas em segundos (None = sem expiração)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Obtém um valor do cache.
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, expires_at FROM response_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._connection.execute('DELETE FROM response_cache WHERE key = ?', (key,))
+                self._connection.commit()
+                return False, None
+
+            return True, json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena um valor no cache.
+
+        Args:
+            key: Chave do cache
+            value: Valor serializável em JSON
+            ttl: Tempo de vida em segundos (usa o padrão do cache se None)
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._connection.execute('DELETE FROM response_cache')
+            self._connection.commit()
+
+
+class FileCache:
+    """Cache persistente com um arquivo JSON por entrada."""
+
+    def __init__(self, directory: str = '.n8ncoding_cache', ttl: Optional[float] = None):
+        """
+        Inicializa o cache em arquivos.
+
+        Args:
+            directory: Diretório onde as entradas são gravadas
+            ttl: Tempo de vida padrão das entradas em segundos (None = sem expiração)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Obtém um valor do cache.
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        if entry.get('expires_at') is not None and entry['expires_at'] <= time.time():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return False, None
+
+        return True, entry.get('value')
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Armazena um valor no cache.
+
+        Args:
+            key: Chave do cache
+            value: Valor serializável em JSON
+            ttl: Tempo de vida em segundos (usa o padrão do cache se None)
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        entry = {
+            'expires_at': time.time() + ttl if ttl is not None else None,
+            'value': value
+        }
+
+        # Grava em arquivo temporário e renomeia para evitar leituras parciais
+        path = self._path(key)
+        temp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        for path in self.directory.glob('*.json'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def create_cache(spec: str = 'memory', ttl: Optional[float] = None):
+    """
+    Cria um backend de cache a partir de uma especificação textual.
+
+    Exemplos: 'memory', 'memory:5000', 'sqlite:cache.db', 'file:/tmp/cache'
+
+    Args:
+        spec: Tipo do backend e argumento opcional separados por ':'
+        ttl: Tempo de vida padrão das entradas em segundos
+
+    Returns:
+        Instância do backend de cache
+    """
+    backend, _, argument = spec.partition(':')
+
+    if backend == 'memory':
+        return MemoryCache(int(argument) if argument else 1024, ttl)
+    if backend == 'sqlite':
+        return SqliteCache(argument or 'n8ncoding_cache.sqlite', ttl)
+    if backend == 'file':
+        return FileCache(argument or '.n8ncoding_cache', ttl)
+
+    raise ValueError(f"Backend de cache desconhecido: {backend}")
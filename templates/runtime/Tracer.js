@@ -0,0 +1,238 @@
+/**
+ * Tracing das classes geradas
+ *
+ * Registra um span por nó (mais um span raiz por execução) e grava os spans
+ * em um arquivo JSON lines: cada linha é um ExportTraceServiceRequest do
+ * OTLP/JSON, o mesmo formato do file exporter do OpenTelemetry Collector.
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+
+const SPAN_KIND_INTERNAL = 1;
+const SPAN_KIND_CLIENT = 3;
+const STATUS_CODE_ERROR = 2;
+
+// Tipos de nó que fazem chamadas externas (spans do tipo CLIENT)
+const CLIENT_NODE_TYPES = new Set(['httpRequest', 'aiAgent']);
+
+// Referência para converter o relógio monotônico em nanossegundos Unix
+const EPOCH_OFFSET_NS = BigInt(Date.now()) * 1000000n - process.hrtime.bigint();
+
+/**
+ * Obtém o instante atual em nanossegundos desde a época Unix
+ *
+ * @returns {bigint} Nanossegundos
+ */
+function nowNanos() {
+    return EPOCH_OFFSET_NS + process.hrtime.bigint();
+}
+
+/**
+ * Gera um trace id aleatório (16 bytes em hexadecimal)
+ *
+ * @returns {string} Trace id
+ */
+function newTraceId() {
+    return crypto.randomBytes(16).toString('hex');
+}
+
+/**
+ * Gera um span id aleatório (8 bytes em hexadecimal)
+ *
+ * @returns {string} Span id
+ */
+function newSpanId() {
+    return crypto.randomBytes(8).toString('hex');
+}
+
+function attributeValue(value) {
+    if (typeof value === 'boolean') {
+        return { boolValue: value };
+    }
+    if (Number.isInteger(value)) {
+        return { intValue: String(value) };
+    }
+    if (typeof value === 'number') {
+        return { doubleValue: value };
+    }
+    return { stringValue: String(value) };
+}
+
+function toAttributes(values) {
+    return Object.entries(values)
+        .filter(([, value]) => value !== undefined && value !== null)
+        .map(([key, value]) => ({ key, value: attributeValue(value) }));
+}
+
+/**
+ * Extrai os atributos do span de um nó a partir da sua saída
+ *
+ * @param {string} node - Nome do método do nó
+ * @param {string} nodeType - Tipo do template do nó (ex: 'httpRequest', 'aiAgent')
+ * @param {*} output - Saída do nó no contexto
+ * @param {number|null} httpStatus - Status HTTP da última requisição feita pelo nó
+ * @returns {Object} Atributos seguindo as convenções semânticas do OpenTelemetry
+ */
+function nodeAttributes(node, nodeType, output, httpStatus = null) {
+    const attributes = { 'n8n.node.name': node, 'n8n.node.type': nodeType };
+
+    if (output && typeof output === 'object' && !Array.isArray(output)) {
+        httpStatus = httpStatus || output.http_code || output.status_code || null;
+        if (output.cached !== undefined && output.cached !== null) {
+            attributes['n8n.cache.hit'] = Boolean(output.cached);
+        }
+
+        if (nodeType === 'aiAgent') {
+            const usage = output.usage || {};
+            attributes['gen_ai.system'] = output.provider;
+            attributes['gen_ai.request.model'] = output.model;
+            attributes['gen_ai.usage.input_tokens'] = usage.prompt_tokens ?? usage.input_tokens;
+            attributes['gen_ai.usage.output_tokens'] = usage.completion_tokens ?? usage.output_tokens;
+            attributes['n8n.rate_limit.wait'] = output.rate_limit_wait;
+        }
+    }
+
+    if (httpStatus) {
+        attributes['http.response.status_code'] = Number(httpStatus);
+    }
+
+    return attributes;
+}
+
+/**
+ * Buffer de spans gravado como JSON lines compatível com OTLP
+ */
+class Tracer {
+    /**
+     * Construtor
+     *
+     * @param {string|null} path - Arquivo de saída (padrão: N8NCODING_TRACE_FILE ou 'n8ncoding_traces.jsonl')
+     * @param {string} serviceName - Valor do atributo de recurso service.name
+     * @param {Object} resourceAttributes - Atributos de recurso adicionais
+     * @param {number} bufferSize - Quantidade de spans que dispara uma gravação antecipada
+     */
+    constructor(path = null, serviceName = 'n8ncoding', resourceAttributes = {}, bufferSize = 256) {
+        this.path = path || process.env.N8NCODING_TRACE_FILE || 'n8ncoding_traces.jsonl';
+        this.bufferSize = bufferSize;
+        this.resource = {
+            attributes: toAttributes({ 'service.name': serviceName, ...resourceAttributes })
+        };
+        this._spans = [];
+    }
+
+    /**
+     * Adiciona um span finalizado ao buffer
+     *
+     * @param {Object} span - Dados do span
+     * @param {string} span.traceId - Id do trace
+     * @param {string} span.spanId - Id do span
+     * @param {string} span.name - Nome do span
+     * @param {bigint} span.start - Início em nanossegundos Unix
+     * @param {bigint} span.end - Fim em nanossegundos Unix
+     * @param {string|null} span.parentSpanId - Id do span pai (null para o span raiz)
+     * @param {number} span.kind - Tipo do span
+     * @param {Object} span.attributes - Atributos do span
+     * @param {string[]} span.links - Ids de outros spans do mesmo trace relacionados a este
+     * @param {Error|null} span.error - Exceção que encerrou o span, se houver
+     */
+    addSpan({ traceId, spanId, name, start, end, parentSpanId = null, kind = SPAN_KIND_INTERNAL,
+              attributes = {}, links = [], error = null }) {
+        const span = {
+            traceId,
+            spanId,
+            name,
+            kind,
+            startTimeUnixNano: String(start),
+            endTimeUnixNano: String(end),
+            attributes: toAttributes(attributes),
+            status: {}
+        };
+        if (parentSpanId) {
+            span.parentSpanId = parentSpanId;
+        }
+        if (links.length > 0) {
+            span.links = links.map((link) => ({ traceId, spanId: link }));
+        }
+        if (error) {
+            span.status = { code: STATUS_CODE_ERROR, message: String(error.message || error) };
+            span.events = [{
+                name: 'exception',
+                timeUnixNano: String(end),
+                attributes: toAttributes({
+                    'exception.type': error.name || 'Error',
+                    'exception.message': String(error.message || error)
+                })
+            }];
+        }
+
+        this._spans.push(span);
+        if (this._spans.length >= this.bufferSize) {
+            this.flush();
+        }
+    }
+
+    /**
+     * Adiciona o span de um nó, ligado aos spans dos nós anteriores no DAG
+     *
+     * O primeiro nó anterior executado é o pai do span; os demais viram
+     * links. Nós sem anteriores são filhos do span raiz da execução.
+     *
+     * @param {string} traceId - Id do trace
+     * @param {string} spanId - Id do span do nó
+     * @param {string} rootSpanId - Id do span raiz da execução
+     * @param {string[]} parentSpanIds - Ids dos spans dos nós anteriores
+     * @param {string} node - Nome do método do nó
+     * @param {string} nodeType - Tipo do template do nó
+     * @param {bigint} start - Início em nanossegundos Unix
+     * @param {bigint} end - Fim em nanossegundos Unix
+     * @param {*} output - Saída do nó no contexto
+     * @param {number|null} httpStatus - Status HTTP da última requisição feita pelo nó
+     * @param {Error|null} error - Exceção lançada pelo nó, se houver
+     */
+    addNodeSpan(traceId, spanId, rootSpanId, parentSpanIds, node, nodeType, start, end, output, httpStatus, error) {
+        this.addSpan({
+            traceId,
+            spanId,
+            name: node,
+            start,
+            end,
+            parentSpanId: parentSpanIds.length > 0 ? parentSpanIds[0] : rootSpanId,
+            kind: CLIENT_NODE_TYPES.has(nodeType) ? SPAN_KIND_CLIENT : SPAN_KIND_INTERNAL,
+            attributes: nodeAttributes(node, nodeType, output, httpStatus),
+            links: parentSpanIds.slice(1),
+            error
+        });
+    }
+
+    /**
+     * Grava os spans do buffer como uma linha OTLP/JSON no arquivo
+     */
+    flush() {
+        if (this._spans.length === 0) {
+            return;
+        }
+        const spans = this._spans;
+        this._spans = [];
+        const request = {
+            resourceSpans: [{
+                resource: this.resource,
+                scopeSpans: [{
+                    scope: { name: 'n8ncoding' },
+                    spans
+                }]
+            }]
+        };
+        fs.appendFileSync(this.path, JSON.stringify(request) + '\n');
+    }
+}
+
+module.exports = {
+    SPAN_KIND_INTERNAL,
+    SPAN_KIND_CLIENT,
+    nowNanos,
+    newTraceId,
+    newSpanId,
+    nodeAttributes,
+    Tracer
+};
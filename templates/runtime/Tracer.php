@@ -0,0 +1,270 @@
+<?php
+
+/**
+ * Tracing das classes geradas
+ *
+ * Registra um span por nó (mais um span raiz por execução) e grava os spans
+ * em um arquivo JSON lines: cada linha é um ExportTraceServiceRequest do
+ * OTLP/JSON, o mesmo formato do file exporter do OpenTelemetry Collector.
+ *
+ * @package Generated\Runtime
+ */
+class Tracer {
+
+    public const SPAN_KIND_INTERNAL = 1;
+    public const SPAN_KIND_CLIENT = 3;
+    public const STATUS_CODE_ERROR = 2;
+
+    /**
+     * Tipos de nó que fazem chamadas externas (spans do tipo CLIENT)
+     */
+    private const CLIENT_NODE_TYPES = ['httpRequest', 'aiAgent'];
+
+    private string $path;
+    private array $resource;
+    private array $spans = [];
+    private int $epochOffsetNs;
+
+    /**
+     * @param string|null $path Arquivo de saída (padrão: N8NCODING_TRACE_FILE ou 'n8ncoding_traces.jsonl')
+     * @param string $serviceName Valor do atributo de recurso service.name
+     * @param array $resourceAttributes Atributos de recurso adicionais
+     * @param int $bufferSize Quantidade de spans que dispara uma gravação antecipada
+     */
+    public function __construct(
+        ?string $path = null,
+        string $serviceName = 'n8ncoding',
+        array $resourceAttributes = [],
+        private int $bufferSize = 256
+    ) {
+        $this->path = $path ?: (getenv('N8NCODING_TRACE_FILE') ?: 'n8ncoding_traces.jsonl');
+        $this->resource = [
+            'attributes' => self::attributes(array_merge(['service.name' => $serviceName], $resourceAttributes))
+        ];
+        // Referência para converter o relógio monotônico em nanossegundos Unix
+        $this->epochOffsetNs = (int)(microtime(true) * 1e9) - hrtime(true);
+    }
+
+    /**
+     * Obtém o instante atual em nanossegundos desde a época Unix
+     *
+     * @return int Nanossegundos
+     */
+    public function now(): int
+    {
+        return $this->epochOffsetNs + hrtime(true);
+    }
+
+    /**
+     * Gera um trace id aleatório (16 bytes em hexadecimal)
+     *
+     * @return string Trace id
+     */
+    public static function newTraceId(): string
+    {
+        return bin2hex(random_bytes(16));
+    }
+
+    /**
+     * Gera um span id aleatório (8 bytes em hexadecimal)
+     *
+     * @return string Span id
+     */
+    public static function newSpanId(): string
+    {
+        return bin2hex(random_bytes(8));
+    }
+
+    /**
+     * Extrai os atributos do span de um nó a partir da sua saída
+     *
+     * @param string $node Nome do método do nó
+     * @param string $nodeType Tipo do template do nó (ex: 'httpRequest', 'aiAgent')
+     * @param mixed $output Saída do nó no contexto
+     * @param int|null $httpStatus Status HTTP da última requisição feita pelo nó
+     * @return array Atributos seguindo as convenções semânticas do OpenTelemetry
+     */
+    public static function nodeAttributes(string $node, string $nodeType, mixed $output, ?int $httpStatus = null): array
+    {
+        $attributes = ['n8n.node.name' => $node, 'n8n.node.type' => $nodeType];
+
+        if (is_array($output)) {
+            $httpStatus = $httpStatus ?: ($output['http_code'] ?? $output['status_code'] ?? null);
+            if (isset($output['cached'])) {
+                $attributes['n8n.cache.hit'] = (bool)$output['cached'];
+            }
+
+            if ($nodeType === 'aiAgent') {
+                $usage = is_array($output['usage'] ?? null) ? $output['usage'] : [];
+                $attributes['gen_ai.system'] = $output['provider'] ?? null;
+                $attributes['gen_ai.request.model'] = $output['model'] ?? null;
+                $attributes['gen_ai.usage.input_tokens'] = $usage['prompt_tokens'] ?? $usage['input_tokens'] ?? null;
+                $attributes['gen_ai.usage.output_tokens'] = $usage['completion_tokens'] ?? $usage['output_tokens'] ?? null;
+                $attributes['n8n.rate_limit.wait'] = $output['rate_limit_wait'] ?? null;
+            }
+        }
+
+        if ($httpStatus) {
+            $attributes['http.response.status_code'] = (int)$httpStatus;
+        }
+
+        return $attributes;
+    }
+
+    /**
+     * Adiciona um span finalizado ao buffer
+     *
+     * @param string $traceId Id do trace
+     * @param string $spanId Id do span
+     * @param string $name Nome do span
+     * @param int $startNs Início em nanossegundos Unix
+     * @param int $endNs Fim em nanossegundos Unix
+     * @param string|null $parentSpanId Id do span pai (null para o span raiz)
+     * @param int $kind Tipo do span
+     * @param array $attributes Atributos do span
+     * @param array $links Ids de outros spans do mesmo trace relacionados a este
+     * @param \Throwable|null $error Exceção que encerrou o span, se houver
+     * @return void
+     */
+    public function addSpan(
+        string $traceId,
+        string $spanId,
+        string $name,
+        int $startNs,
+        int $endNs,
+        ?string $parentSpanId = null,
+        int $kind = self::SPAN_KIND_INTERNAL,
+        array $attributes = [],
+        array $links = [],
+        ?\Throwable $error = null
+    ): void {
+        $span = [
+            'traceId' => $traceId,
+            'spanId' => $spanId,
+            'name' => $name,
+            'kind' => $kind,
+            'startTimeUnixNano' => (string)$startNs,
+            'endTimeUnixNano' => (string)$endNs,
+            'attributes' => self::attributes($attributes),
+            'status' => new \stdClass()
+        ];
+        if ($parentSpanId) {
+            $span['parentSpanId'] = $parentSpanId;
+        }
+        if (!empty($links)) {
+            $span['links'] = array_map(fn($link) => ['traceId' => $traceId, 'spanId' => $link], array_values($links));
+        }
+        if ($error !== null) {
+            $span['status'] = ['code' => self::STATUS_CODE_ERROR, 'message' => $error->getMessage()];
+            $span['events'] = [[
+                'name' => 'exception',
+                'timeUnixNano' => (string)$endNs,
+                'attributes' => self::attributes([
+                    'exception.type' => get_class($error),
+                    'exception.message' => $error->getMessage()
+                ])
+            ]];
+        }
+
+        $this->spans[] = $span;
+        if (count($this->spans) >= $this->bufferSize) {
+            $this->flush();
+        }
+    }
+
+    /**
+     * Adiciona o span de um nó, ligado aos spans dos nós anteriores no DAG
+     *
+     * O primeiro nó anterior executado é o pai do span; os demais viram
+     * links. Nós sem anteriores são filhos do span raiz da execução.
+     *
+     * @param string $traceId Id do trace
+     * @param string $spanId Id do span do nó
+     * @param string $rootSpanId Id do span raiz da execução
+     * @param array $parentSpanIds Ids dos spans dos nós anteriores
+     * @param string $node Nome do método do nó
+     * @param string $nodeType Tipo do template do nó
+     * @param int $startNs Início em nanossegundos Unix
+     * @param int $endNs Fim em nanossegundos Unix
+     * @param mixed $output Saída do nó no contexto
+     * @param int|null $httpStatus Status HTTP da última requisição feita pelo nó
+     * @param \Throwable|null $error Exceção lançada pelo nó, se houver
+     * @return void
+     */
+    public function addNodeSpan(
+        string $traceId,
+        string $spanId,
+        string $rootSpanId,
+        array $parentSpanIds,
+        string $node,
+        string $nodeType,
+        int $startNs,
+        int $endNs,
+        mixed $output = null,
+        ?int $httpStatus = null,
+        ?\Throwable $error = null
+    ): void {
+        $this->addSpan(
+            $traceId,
+            $spanId,
+            $node,
+            $startNs,
+            $endNs,
+            $parentSpanIds[0] ?? $rootSpanId,
+            in_array($nodeType, self::CLIENT_NODE_TYPES, true) ? self::SPAN_KIND_CLIENT : self::SPAN_KIND_INTERNAL,
+            self::nodeAttributes($node, $nodeType, $output, $httpStatus),
+            array_slice($parentSpanIds, 1),
+            $error
+        );
+    }
+
+    /**
+     * Grava os spans do buffer como uma linha OTLP/JSON no arquivo
+     *
+     * @return void
+     */
+    public function flush(): void
+    {
+        if (empty($this->spans)) {
+            return;
+        }
+
+        $request = [
+            'resourceSpans' => [[
+                'resource' => $this->resource,
+                'scopeSpans' => [[
+                    'scope' => ['name' => 'n8ncoding'],
+                    'spans' => $this->spans
+                ]]
+            ]]
+        ];
+        $this->spans = [];
+
+        file_put_contents(
+            $this->path,
+            json_encode($request, JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES | JSON_PARTIAL_OUTPUT_ON_ERROR) . "\n",
+            FILE_APPEND | LOCK_EX
+        );
+    }
+
+    private static function attributes(array $values): array
+    {
+        $attributes = [];
+        foreach ($values as $key => $value) {
+            if ($value === null) {
+                continue;
+            }
+            if (is_bool($value)) {
+                $typed = ['boolValue' => $value];
+            } elseif (is_int($value)) {
+                $typed = ['intValue' => (string)$value];
+            } elseif (is_float($value)) {
+                $typed = ['doubleValue' => $value];
+            } else {
+                $typed = ['stringValue' => (string)$value];
+            }
+            $attributes[] = ['key' => $key, 'value' => $typed];
+        }
+        return $attributes;
+    }
+}
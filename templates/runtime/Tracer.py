@@ -0,0 +1,202 @@
+"""
+Tracing das classes geradas
+
+Este módulo registra um span por nó (mais um span raiz por execução) e grava
+os spans em um arquivo JSON lines: cada linha é um ExportTraceServiceRequest
+do OTLP/JSON, o mesmo formato do file exporter do OpenTelemetry Collector.
+Não é necessário um collector para gerar os traces; o arquivo pode ser
+importado em visualizadores compatíveis com OTLP.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+STATUS_CODE_ERROR = 2
+
+# Tipos de nó que fazem chamadas externas (spans do tipo CLIENT)
+CLIENT_NODE_TYPES = {'httpRequest', 'aiAgent'}
+
+
+def new_trace_id() -> str:
+    """Gera um trace id aleatório (16 bytes em hexadecimal)."""
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    """Gera um span id aleatório (8 bytes em hexadecimal)."""
+    return os.urandom(8).hex()
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{'key': key, 'value': _attribute_value(value)} for key, value in values.items() if value is not None]
+
+
+def node_attributes(node: str, node_type: str, output: Any, http_status: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extrai os atributos do span de um nó a partir da sua saída.
+
+    Args:
+        node: Nome do método do nó
+        node_type: Tipo do template do nó (ex: 'httpRequest', 'aiAgent')
+        output: Saída do nó no contexto
+        http_status: Status HTTP da última requisição feita pelo nó
+
+    Returns:
+        Atributos seguindo as convenções semânticas do OpenTelemetry
+    """
+    attributes = {'n8n.node.name': node, 'n8n.node.type': node_type}
+
+    if isinstance(output, dict):
+        http_status = http_status or output.get('http_code') or output.get('status_code')
+        if output.get('cached') is not None:
+            attributes['n8n.cache.hit'] = bool(output['cached'])
+
+        if node_type == 'aiAgent':
+            attributes['gen_ai.system'] = output.get('provider')
+            attributes['gen_ai.request.model'] = output.get('model')
+            usage = output.get('usage') or {}
+            if isinstance(usage, dict):
+                attributes['gen_ai.usage.input_tokens'] = usage.get('prompt_tokens', usage.get('input_tokens'))
+                attributes['gen_ai.usage.output_tokens'] = usage.get('completion_tokens', usage.get('output_tokens'))
+            attributes['n8n.rate_limit.wait'] = output.get('rate_limit_wait')
+
+    if http_status:
+        attributes['http.response.status_code'] = int(http_status)
+
+    return attributes
+
+
+class Tracer:
+    """Buffer de spans gravado como JSON lines compatível com OTLP."""
+
+    def __init__(self, path: Optional[str] = None, service_name: str = 'n8ncoding',
+                 resource_attributes: Optional[Dict[str, Any]] = None, buffer_size: int = 256):
+        """
+        Inicializa o tracer.
+
+        Args:
+            path: Arquivo de saída (padrão: N8NCODING_TRACE_FILE ou 'n8ncoding_traces.jsonl')
+            service_name: Valor do atributo de recurso service.name
+            resource_attributes: Atributos de recurso adicionais
+            buffer_size: Quantidade de spans que dispara uma gravação antecipada
+        """
+        self.path = path or os.getenv('N8NCODING_TRACE_FILE', 'n8ncoding_traces.jsonl')
+        self.buffer_size = buffer_size
+        self.resource = {
+            'attributes': _attributes({'service.name': service_name, **(resource_attributes or {})})
+        }
+        self._spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, trace_id: str, span_id: str, name: str, start_ns: int, end_ns: int,
+                 parent_span_id: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None, links: Optional[List[str]] = None,
+                 error: Optional[BaseException] = None) -> None:
+        """
+        Adiciona um span finalizado ao buffer.
+
+        Args:
+            trace_id: Id do trace
+            span_id: Id do span
+            name: Nome do span
+            start_ns: Início em nanossegundos desde a época Unix
+            end_ns: Fim em nanossegundos desde a época Unix
+            parent_span_id: Id do span pai (None para o span raiz)
+            kind: Tipo do span (SPAN_KIND_INTERNAL ou SPAN_KIND_CLIENT)
+            attributes: Atributos do span
+            links: Ids de outros spans do mesmo trace relacionados a este
+            error: Exceção que encerrou o span, se houver
+        """
+        span = {
+            'traceId': trace_id,
+            'spanId': span_id,
+            'name': name,
+            'kind': kind,
+            'startTimeUnixNano': str(start_ns),
+            'endTimeUnixNano': str(end_ns),
+            'attributes': _attributes(attributes or {}),
+            'status': {}
+        }
+        if parent_span_id:
+            span['parentSpanId'] = parent_span_id
+        if links:
+            span['links'] = [{'traceId': trace_id, 'spanId': link} for link in links]
+        if error is not None:
+            span['status'] = {'code': STATUS_CODE_ERROR, 'message': str(error)}
+            span['events'] = [{
+                'name': 'exception',
+                'timeUnixNano': str(end_ns),
+                'attributes': _attributes({
+                    'exception.type': type(error).__name__,
+                    'exception.message': str(error)
+                })
+            }]
+
+        with self._lock:
+            self._spans.append(span)
+            should_flush = len(self._spans) >= self.buffer_size
+        if should_flush:
+            self.flush()
+
+    def add_node_span(self, trace_id: str, span_id: str, root_span_id: str, parent_span_ids: List[str],
+                      node: str, node_type: str, start_ns: int, end_ns: int, output: Any = None,
+                      http_status: Optional[int] = None, error: Optional[BaseException] = None) -> None:
+        """
+        Adiciona o span de um nó, ligado aos spans dos nós anteriores no DAG.
+
+        O primeiro nó anterior executado é o pai do span; os demais viram
+        links. Nós sem anteriores são filhos do span raiz da execução.
+
+        Args:
+            trace_id: Id do trace
+            span_id: Id do span do nó
+            root_span_id: Id do span raiz da execução
+            parent_span_ids: Ids dos spans dos nós anteriores
+            node: Nome do método do nó
+            node_type: Tipo do template do nó
+            start_ns: Início em nanossegundos desde a época Unix
+            end_ns: Fim em nanossegundos desde a época Unix
+            output: Saída do nó no contexto
+            http_status: Status HTTP da última requisição feita pelo nó
+            error: Exceção lançada pelo nó, se houver
+        """
+        self.add_span(
+            trace_id, span_id, node, start_ns, end_ns,
+            parent_span_id=parent_span_ids[0] if parent_span_ids else root_span_id,
+            kind=SPAN_KIND_CLIENT if node_type in CLIENT_NODE_TYPES else SPAN_KIND_INTERNAL,
+            attributes=node_attributes(node, node_type, output, http_status),
+            links=parent_span_ids[1:],
+            error=error
+        )
+
+    def flush(self) -> None:
+        """Grava os spans do buffer como uma linha OTLP/JSON no arquivo."""
+        with self._lock:
+            if not self._spans:
+                return
+            spans, self._spans = self._spans, []
+            request = {
+                'resourceSpans': [{
+                    'resource': self.resource,
+                    'scopeSpans': [{
+                        'scope': {'name': 'n8ncoding'},
+                        'spans': spans
+                    }]
+                }]
+            }
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(request, ensure_ascii=False, separators=(',', ':')) + '\n')
@@ -0,0 +1,191 @@
+/**
+ * Servidor HTTP dos workflows acionados por webhook
+ *
+ * Este módulo serve uma classe gerada com o módulo http do Node. As
+ * requisições são roteadas pelo caminho e método dos nós Webhook para um
+ * pool de instâncias aquecidas; quando todas estão ocupadas, até maxPending
+ * requisições aguardam e as demais recebem 503.
+ */
+const http = require('http');
+
+// Prefixos usados pelo n8n nas URLs dos webhooks
+const WEBHOOK_PREFIXES = ['webhook', 'webhook-test'];
+
+/**
+ * Normaliza o caminho de um webhook (sem barras nas pontas nem prefixo do n8n)
+ *
+ * @param {string} path - Caminho da requisição ou do nó Webhook
+ * @returns {string} Caminho normalizado (ex: '/webhook/pedidos/' -> 'pedidos')
+ */
+function normalizePath(path) {
+    path = String(path).split('?')[0].replace(/^\/+|\/+$/g, '');
+    const index = path.indexOf('/');
+    if (index > 0 && WEBHOOK_PREFIXES.includes(path.slice(0, index))) {
+        return path.slice(index + 1);
+    }
+    return path;
+}
+
+/**
+ * Decodifica o corpo da requisição conforme o Content-Type
+ *
+ * @param {Buffer} body - Corpo recebido
+ * @param {string} contentType - Valor do header Content-Type
+ * @returns {*} Objeto JSON, objeto do formulário, texto ou null se vazio
+ */
+function parseBody(body, contentType) {
+    if (!body.length) {
+        return null;
+    }
+    const text = body.toString('utf8');
+    if (contentType.includes('json')) {
+        try {
+            return JSON.parse(text);
+        } catch (error) {
+            return text;
+        }
+    }
+    if (contentType.includes('application/x-www-form-urlencoded')) {
+        return Object.fromEntries(new URLSearchParams(text));
+    }
+    return text;
+}
+
+/**
+ * Pool de instâncias aquecidas de uma classe gerada
+ */
+class InstancePool {
+    /**
+     * @param {Function} factory - Cria uma instância da classe gerada
+     * @param {number} size - Quantidade de instâncias
+     */
+    constructor(factory, size) {
+        this.size = Math.max(size, 1);
+        this.idle = Array.from({ length: this.size }, () => factory());
+        this.waiting = [];
+    }
+
+    /**
+     * Obtém uma instância livre, aguardando se todas estiverem ocupadas
+     *
+     * @returns {Promise<Object>} Instância da classe gerada
+     */
+    acquire() {
+        if (this.idle.length > 0) {
+            return Promise.resolve(this.idle.pop());
+        }
+        return new Promise(resolve => this.waiting.push(resolve));
+    }
+
+    /**
+     * Devolve uma instância ao pool
+     *
+     * @param {Object} instance - Instância obtida com acquire()
+     */
+    release(instance) {
+        const next = this.waiting.shift();
+        if (next) {
+            next(instance);
+        } else {
+            this.idle.push(instance);
+        }
+    }
+}
+
+/**
+ * Cria o servidor HTTP de uma classe gerada
+ *
+ * @param {Function} factory - Cria uma instância da classe gerada (ex: () => new Workflow())
+ * @param {Array<Object>} routes - Rotas dos nós Webhook ({ method, path, node, responseMode })
+ * @param {Object} options - Opções do servidor
+ * @param {number} options.poolSize - Quantidade de instâncias aquecidas (execuções simultâneas)
+ * @param {number} options.maxPending - Requisições que podem aguardar uma instância livre
+ * @param {string|null} options.responseKey - Chave do contexto devolvida na resposta (null = contexto inteiro)
+ * @returns {http.Server} Servidor (chame listen() para iniciar)
+ */
+function createWebhookServer(factory, routes, { poolSize = 4, maxPending = 64, responseKey = null } = {}) {
+    const pool = new InstancePool(factory, poolSize);
+    let inFlight = 0;
+
+    const execute = async params => {
+        const instance = await pool.acquire();
+        try {
+            return await instance.run(params);
+        } finally {
+            pool.release(instance);
+            inFlight--;
+        }
+    };
+
+    const handle = async (request, body) => {
+        const url = new URL(request.url, 'http://localhost');
+        const path = normalizePath(url.pathname);
+        if (request.method === 'GET' && path === 'healthz') {
+            return [200, { status: 'ok', poolSize: pool.size, inFlight }];
+        }
+
+        const candidates = routes.filter(route => normalizePath(route.path) === path);
+        const route = candidates.find(candidate => candidate.method.toUpperCase() === request.method);
+        if (!route) {
+            return candidates.length > 0 ? [405, { error: 'Method Not Allowed' }] : [404, { error: 'Not Found' }];
+        }
+
+        if (inFlight >= pool.size + maxPending) {
+            return [503, { error: 'Servidor ocupado, tente novamente' }];
+        }
+
+        const query = Object.fromEntries(url.searchParams);
+        const parsedBody = parseBody(body, request.headers['content-type'] || '');
+        const params = {
+            ...query,
+            ...(parsedBody && typeof parsedBody === 'object' && !Array.isArray(parsedBody) ? parsedBody : {}),
+            webhook: {
+                node: route.node,
+                method: request.method,
+                path: url.pathname,
+                headers: request.headers,
+                query,
+                body: parsedBody
+            }
+        };
+
+        inFlight++;
+        const execution = execute(params);
+        if ((route.responseMode || 'onReceived') === 'onReceived') {
+            // Igual ao n8n: responde assim que recebe e executa em segundo plano
+            execution.catch(() => {});
+            return [200, { message: 'Workflow was started' }];
+        }
+
+        let context;
+        try {
+            context = await execution;
+        } catch (error) {
+            return [500, { error: error.message, type: error.name }];
+        }
+        if (responseKey && context && responseKey in context) {
+            return [200, context[responseKey]];
+        }
+        return [200, context];
+    };
+
+    return http.createServer((request, response) => {
+        const chunks = [];
+        request.on('data', chunk => chunks.push(chunk));
+        request.on('end', async () => {
+            const [status, payload] = await handle(request, Buffer.concat(chunks));
+            const data = Buffer.from(JSON.stringify(payload === undefined ? null : payload));
+            const headers = {
+                'Content-Type': 'application/json; charset=utf-8',
+                'Content-Length': data.length
+            };
+            if (status === 503) {
+                headers['Retry-After'] = '1';
+            }
+            response.writeHead(status, headers);
+            response.end(data);
+        });
+    });
+}
+
+module.exports = { createWebhookServer, InstancePool, normalizePath, parseBody };
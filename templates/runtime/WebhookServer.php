@@ -0,0 +1,174 @@
+<?php
+
+/**
+ * Front controller dos workflows acionados por webhook
+ *
+ * Serve uma classe gerada atrás do PHP-FPM (ou do servidor embutido,
+ * php -S). Cada requisição é roteada pelo caminho e método dos nós Webhook.
+ * Cada processo do PHP-FPM atende uma requisição por vez e o PHP não mantém
+ * objetos entre requisições, então a instância é criada por requisição; o
+ * limite de execuções simultâneas é o pm.max_children do pool do PHP-FPM.
+ *
+ * @package Generated\Runtime
+ */
+class WebhookServer {
+
+    /**
+     * Prefixos usados pelo n8n nas URLs dos webhooks
+     */
+    private const WEBHOOK_PREFIXES = ['webhook', 'webhook-test'];
+
+    /** @var callable Cria uma instância da classe gerada */
+    private $factory;
+
+    /**
+     * @param callable $factory Cria uma instância da classe gerada (ex: fn() => new Workflow())
+     * @param array $routes Rotas dos nós Webhook (['method', 'path', 'node', 'response_mode'])
+     * @param string|null $responseKey Chave do contexto devolvida na resposta (null = contexto inteiro)
+     */
+    public function __construct(
+        callable $factory,
+        private array $routes,
+        private ?string $responseKey = null
+    ) {
+        $this->factory = $factory;
+    }
+
+    /**
+     * Normaliza o caminho de um webhook (sem barras nas pontas nem prefixo do n8n)
+     *
+     * @param string $path Caminho da requisição ou do nó Webhook
+     * @return string Caminho normalizado (ex: '/webhook/pedidos/' -> 'pedidos')
+     */
+    public static function normalizePath(string $path): string
+    {
+        $path = trim(explode('?', $path, 2)[0], '/');
+        $parts = explode('/', $path, 2);
+        if (count($parts) === 2 && in_array($parts[0], self::WEBHOOK_PREFIXES, true)) {
+            return $parts[1];
+        }
+        return $path;
+    }
+
+    /**
+     * Decodifica o corpo da requisição conforme o Content-Type
+     *
+     * @param string $body Corpo recebido
+     * @param string $contentType Valor do header Content-Type
+     * @return mixed Array JSON, array do formulário, texto ou null se vazio
+     */
+    public static function parseBody(string $body, string $contentType): mixed
+    {
+        if ($body === '') {
+            return null;
+        }
+        if (str_contains($contentType, 'json')) {
+            $decoded = json_decode($body, true);
+            return json_last_error() === JSON_ERROR_NONE ? $decoded : $body;
+        }
+        if (str_contains($contentType, 'application/x-www-form-urlencoded')) {
+            parse_str($body, $form);
+            return $form;
+        }
+        return $body;
+    }
+
+    /**
+     * Encontra a rota de uma requisição
+     *
+     * @param string $method Método HTTP
+     * @param string $path Caminho da requisição
+     * @return array Par [rota ou null, status]: 404 sem rota para o caminho e 405 sem rota para o método
+     */
+    public function match(string $method, string $path): array
+    {
+        $path = self::normalizePath($path);
+        $candidates = array_filter($this->routes, fn($route) => self::normalizePath($route['path']) === $path);
+        foreach ($candidates as $route) {
+            if (strtoupper($route['method']) === strtoupper($method)) {
+                return [$route, 200];
+            }
+        }
+        return [null, empty($candidates) ? 404 : 405];
+    }
+
+    /**
+     * Atende a requisição atual ($_SERVER, $_GET e php://input)
+     *
+     * @return void
+     */
+    public function handle(): void
+    {
+        $method = $_SERVER['REQUEST_METHOD'] ?? 'GET';
+        $path = parse_url($_SERVER['REQUEST_URI'] ?? '/', PHP_URL_PATH) ?: '/';
+
+        if ($method === 'GET' && self::normalizePath($path) === 'healthz') {
+            $this->respond(200, ['status' => 'ok']);
+            return;
+        }
+
+        [$route, $status] = $this->match($method, $path);
+        if ($route === null) {
+            $this->respond($status, ['error' => $status === 405 ? 'Method Not Allowed' : 'Not Found']);
+            return;
+        }
+
+        $headers = function_exists('getallheaders') ? getallheaders() : [];
+        $headers = array_change_key_case($headers ?: [], CASE_LOWER);
+        $query = $_GET;
+        $body = self::parseBody((string) file_get_contents('php://input'), $headers['content-type'] ?? '');
+        $params = array_merge($query, is_array($body) ? $body : [], [
+            'webhook' => [
+                'node' => $route['node'] ?? null,
+                'method' => $method,
+                'path' => $path,
+                'headers' => $headers,
+                'query' => $query,
+                'body' => $body
+            ]
+        ]);
+
+        if (($route['response_mode'] ?? 'onReceived') === 'onReceived') {
+            // Igual ao n8n: responde assim que recebe e executa depois de liberar o cliente
+            $this->respond(200, ['message' => 'Workflow was started']);
+            if (function_exists('fastcgi_finish_request')) {
+                fastcgi_finish_request();
+            }
+            try {
+                ($this->factory)()->run($params);
+            } catch (\Exception $e) {
+                error_log('Erro no webhook ' . $path . ': ' . $e->getMessage());
+            }
+            return;
+        }
+
+        try {
+            $context = ($this->factory)()->run($params);
+        } catch (\Exception $e) {
+            $this->respond(500, ['error' => $e->getMessage(), 'type' => get_class($e)]);
+            return;
+        }
+
+        if ($this->responseKey !== null && is_array($context) && array_key_exists($this->responseKey, $context)) {
+            $this->respond(200, $context[$this->responseKey]);
+            return;
+        }
+        $this->respond(200, $context);
+    }
+
+    /**
+     * Envia uma resposta JSON
+     *
+     * @param int $status Status HTTP
+     * @param mixed $payload Conteúdo da resposta
+     * @return void
+     */
+    private function respond(int $status, mixed $payload): void
+    {
+        $data = json_encode($payload, JSON_UNESCAPED_UNICODE | JSON_PARTIAL_OUTPUT_ON_ERROR);
+        http_response_code($status);
+        header('Content-Type: application/json; charset=utf-8');
+        header('Content-Length: ' . strlen($data));
+        echo $data;
+    }
+}
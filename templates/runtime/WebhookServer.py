@@ -0,0 +1,303 @@
+"""
+Servidor HTTP dos workflows acionados por webhook
+
+Este módulo expõe uma classe gerada como aplicação ASGI (WebhookApp) e inclui
+um servidor HTTP/1.1 mínimo em asyncio (serve) para rodar a aplicação sem
+dependências externas. As requisições são roteadas pelo caminho e método
+dos nós Webhook para um pool de instâncias aquecidas; quando todas estão
+ocupadas, até max_pending requisições aguardam e as demais recebem 503.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+# Prefixos usados pelo n8n nas URLs dos webhooks
+WEBHOOK_PREFIXES = ('webhook', 'webhook-test')
+
+
+def normalize_path(path: str) -> str:
+    """
+    Normaliza o caminho de um webhook (sem barras nas pontas nem prefixo do n8n).
+
+    Args:
+        path: Caminho da requisição ou do nó Webhook
+
+    Returns:
+        Caminho normalizado (ex: '/webhook/pedidos/' -> 'pedidos')
+    """
+    path = path.split('?', 1)[0].strip('/')
+    head, _, rest = path.partition('/')
+    if head in WEBHOOK_PREFIXES and rest:
+        return rest
+    return path
+
+
+def parse_body(body: bytes, content_type: str) -> Any:
+    """
+    Decodifica o corpo da requisição conforme o Content-Type.
+
+    Args:
+        body: Corpo recebido
+        content_type: Valor do header Content-Type
+
+    Returns:
+        Objeto JSON, dicionário do formulário, texto ou None se vazio
+    """
+    if not body:
+        return None
+    text = body.decode('utf-8', errors='replace')
+    if 'json' in content_type:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    if 'application/x-www-form-urlencoded' in content_type:
+        return dict(parse_qsl(text, keep_blank_values=True))
+    return text
+
+
+class WebhookApp:
+    """Aplicação ASGI que executa uma classe gerada a cada chamada de webhook."""
+
+    def __init__(self, factory: Callable[[], Any], routes: List[Dict[str, str]], pool_size: int = 4,
+                 max_pending: int = 64, response_key: Optional[str] = None):
+        """
+        Inicializa a aplicação e cria as instâncias do pool.
+
+        Args:
+            factory: Cria uma instância da classe gerada (ex: a própria classe)
+            routes: Rotas dos nós Webhook ({'method', 'path', 'node', 'response_mode'})
+            pool_size: Quantidade de instâncias aquecidas (execuções simultâneas)
+            max_pending: Requisições que podem aguardar uma instância livre
+            response_key: Chave do contexto devolvida na resposta (None = contexto inteiro)
+        """
+        self.routes = routes
+        self.pool_size = max(pool_size, 1)
+        self.max_pending = max(max_pending, 0)
+        self.response_key = response_key
+        self.in_flight = 0
+        self._instances = [factory() for _ in range(self.pool_size)]
+        self._idle: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='webhook')
+        self._background: set = set()
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Dict[str, str]], int]:
+        """
+        Encontra a rota de uma requisição.
+
+        Args:
+            method: Método HTTP
+            path: Caminho da requisição
+
+        Returns:
+            Tupla (rota, status): status 404 sem rota para o caminho e 405 sem rota para o método
+        """
+        path = normalize_path(path)
+        candidates = [route for route in self.routes if normalize_path(route['path']) == path]
+        for route in candidates:
+            if route['method'].upper() == method.upper():
+                return route, 200
+        return None, 405 if candidates else 404
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    self._executor.shutdown(wait=True)
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        status, payload = await self.handle(scope, body)
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        headers = [(b'content-type', b'application/json; charset=utf-8'),
+                   (b'content-length', str(len(data)).encode('latin-1'))]
+        if status == 503:
+            headers.append((b'retry-after', b'1'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': data})
+
+    async def handle(self, scope: Dict[str, Any], body: bytes) -> Tuple[int, Any]:
+        """
+        Executa o workflow para uma requisição HTTP.
+
+        Args:
+            scope: Escopo ASGI da requisição
+            body: Corpo da requisição
+
+        Returns:
+            Tupla (status HTTP, conteúdo JSON da resposta)
+        """
+        method = scope.get('method', 'GET')
+        path = scope.get('path', '/')
+        if method == 'GET' and normalize_path(path) == 'healthz':
+            return 200, {'status': 'ok', 'pool_size': self.pool_size, 'in_flight': self.in_flight}
+
+        route, status = self.match(method, path)
+        if route is None:
+            return status, {'error': HTTPStatus(status).phrase}
+
+        if self.in_flight >= self.pool_size + self.max_pending:
+            return 503, {'error': 'Servidor ocupado, tente novamente'}
+
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope.get('headers', [])}
+        query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+        parsed_body = parse_body(body, headers.get('content-type', ''))
+        params = {
+            **query,
+            **(parsed_body if isinstance(parsed_body, dict) else {}),
+            'webhook': {
+                'node': route.get('node'),
+                'method': method,
+                'path': path,
+                'headers': headers,
+                'query': query,
+                'body': parsed_body
+            }
+        }
+
+        self.in_flight += 1
+        execution = asyncio.ensure_future(self._execute(params))
+        if route.get('response_mode', 'onReceived') == 'onReceived':
+            # Igual ao n8n: responde assim que recebe e executa em segundo plano
+            self._background.add(execution)
+            execution.add_done_callback(self._background_done)
+            return 200, {'message': 'Workflow was started'}
+
+        try:
+            context = await execution
+        except Exception as e:
+            return 500, {'error': str(e), 'type': type(e).__name__}
+
+        if self.response_key and isinstance(context, dict) and self.response_key in context:
+            return 200, context[self.response_key]
+        return 200, context
+
+    def _background_done(self, execution: 'asyncio.Future') -> None:
+        """Descarta uma execução em segundo plano finalizada (o erro fica no contexto da instância)."""
+        self._background.discard(execution)
+        if not execution.cancelled():
+            execution.exception()
+
+    async def _execute(self, params: Dict[str, Any]) -> Any:
+        """
+        Executa o workflow em uma instância livre do pool.
+
+        Args:
+            params: Parâmetros adicionais de run()
+
+        Returns:
+            Contexto final da execução
+        """
+        try:
+            if self._idle is None:
+                self._idle = asyncio.Queue()
+                for instance in self._instances:
+                    self._idle.put_nowait(instance)
+
+            instance = await self._idle.get()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, instance.run, params)
+            finally:
+                self._idle.put_nowait(instance)
+        finally:
+            self.in_flight -= 1
+
+
+async def _handle_connection(app: Callable, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Atende uma conexão HTTP/1.1 (com keep-alive) repassando as requisições à aplicação ASGI."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode('latin-1').split()
+
+            headers = []
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers.append((name.strip().lower().encode('latin-1'), value.strip().encode('latin-1')))
+            header_map = dict(headers)
+
+            length = int(header_map.get(b'content-length', b'0'))
+            body = await reader.readexactly(length) if length else b''
+            path, _, query = target.partition('?')
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': version.split('/')[-1],
+                'method': method.upper(),
+                'path': path,
+                'query_string': query.encode('latin-1'),
+                'headers': headers
+            }
+
+            async def receive() -> Dict[str, Any]:
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+
+            response = {}
+
+            async def send(message: Dict[str, Any]) -> None:
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                    response['headers'] = message.get('headers', [])
+                else:
+                    response['body'] = response.get('body', b'') + message.get('body', b'')
+
+            await app(scope, receive, send)
+
+            keep_alive = version == 'HTTP/1.1' and header_map.get(b'connection', b'').lower() != b'close'
+            status = response.get('status', 500)
+            lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+            lines += [f'{name.decode("latin-1")}: {value.decode("latin-1")}' for name, value in response.get('headers', [])]
+            lines.append(f'Connection: {"keep-alive" if keep_alive else "close"}')
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + response.get('body', b''))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve(app: Callable, host: str = '127.0.0.1', port: int = 8080) -> None:
+    """
+    Executa a aplicação ASGI no servidor HTTP embutido até Ctrl+C.
+
+    Para produção, a mesma aplicação pode ser servida por qualquer servidor
+    ASGI (ex: uvicorn arquivo_server:app).
+
+    Args:
+        app: Aplicação ASGI
+        host: Endereço de escuta
+        port: Porta de escuta
+    """
+    async def main() -> None:
+        server = await asyncio.start_server(lambda r, w: _handle_connection(app, r, w), host, port)
+        print(f'Servindo em http://{host}:{port}')
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,196 @@
+"""
+Utilitários compartilhados pelos testes: fábricas de nós e workflows, servidores
+stub e o carregamento das classes Python geradas.
+"""
+import importlib.util
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+
+
+TOKENS = ['Olá', ', ', 'mundo', '!']
+
+
+def node(node_id, name, node_type, targets, parameters=None):
+    """Cria um nó com conexões para os nós indicados."""
+    return {
+        'id': node_id,
+        'name': name,
+        'type': node_type,
+        'parameters': parameters or {},
+        'connections': {'main': {'0': [[{'node': target} for target in targets]]}} if targets else {}
+    }
+
+
+def load_generated_class(workflow, output_dir, **generator_options):
+    """Gera, salva e importa a classe Python do workflow."""
+    generator = Generator(XMLLoader(), 'python', **generator_options)
+    generator.folder_structure = FolderStructure(output_dir)
+
+    code = generator.generate_class(workflow)
+    assert code, "Erro ao gerar código"
+    assert generator.save_generated_code(workflow, code)
+
+    path = generator.folder_structure.get_output_file_path(workflow, 'python')
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, generator._generate_class_name(workflow))
+
+
+class StubSSEHandler(BaseHTTPRequestHandler):
+    """Servidor stub que responde no formato chat.completion.chunk."""
+
+    requests_received = []
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        StubSSEHandler.requests_received.append(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+
+        self.wfile.write(b': keep-alive\n\n')
+        for token in TOKENS:
+            chunk = {
+                'id': 'chatcmpl-stub',
+                'model': body.get('model'),
+                'choices': [{'index': 0, 'delta': {'content': token}, 'finish_reason': None}]
+            }
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(0.05)
+
+        final = {'id': 'chatcmpl-stub', 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+        usage = {'id': 'chatcmpl-stub', 'choices': [], 'usage': {'total_tokens': len(TOKENS)}}
+        self.wfile.write(f'data: {json.dumps(final)}\n\n'.encode('utf-8'))
+        self.wfile.write(f'data: {json.dumps(usage)}\n\n'.encode('utf-8'))
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_streaming_workflow(base_url):
+    """Cria um workflow com um nó AI Agent apontando para o servidor stub."""
+    return {
+        'id': 'test-ai-streaming',
+        'name': 'Teste AI Streaming',
+        'nodes': [
+            {
+                'id': 'node-1',
+                'name': 'Start',
+                'type': 'n8n-nodes-base.start',
+                'parameters': {},
+                'connections': {'main': {'0': [[{'node': 'node-2'}]]}}
+            },
+            {
+                'id': 'node-2',
+                'name': 'AI Agent',
+                'type': '@n8n/n8n-nodes-langchain.agent',
+                'parameters': {
+                    'prompt': 'Diga olá',
+                    'model': 'gpt-4',
+                    'options': {'baseURL': base_url}
+                },
+                'connections': {}
+            }
+        ]
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Servidor stub que conta as requisições recebidas."""
+
+    hits = 0
+
+    def _respond(self):
+        StubHandler.hits += 1
+        payload = json.dumps({'path': self.path, 'count': StubHandler.hits}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_http_workflow(base_url):
+    """Cria um workflow com um GET e um POST para o servidor stub."""
+    return {
+        'id': 'test-response-cache',
+        'name': 'Teste Response Cache',
+        'nodes': [
+            {
+                'id': 'node-1',
+                'name': 'Buscar Dados',
+                'type': 'n8n-nodes-base.httpRequest',
+                'parameters': {'url': f'{base_url}/dados', 'method': 'GET'},
+                'connections': {'main': {'0': [[{'node': 'node-2'}]]}}
+            },
+            {
+                'id': 'node-2',
+                'name': 'Enviar Dados',
+                'type': 'n8n-nodes-base.httpRequest',
+                'parameters': {
+                    'url': f'{base_url}/enviar',
+                    'method': 'POST',
+                    'body': {'ativo': True, 'extra': None}
+                },
+                'connections': {}
+            }
+        ]
+    }
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Servidor stub que devolve o corpo JSON recebido."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        payload = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_plain_workflow():
+    """Cria um workflow com três nós sem dependências externas."""
+    names = ['Start', 'Preparar', 'Finalizar']
+    nodes = []
+    for index, name in enumerate(names):
+        next_id = f'node-{index + 2}' if index + 1 < len(names) else None
+        nodes.append({
+            'id': f'node-{index + 1}',
+            'name': name,
+            'type': 'n8n-nodes-base.noOp',
+            'parameters': {},
+            'connections': {'main': {'0': [[{'node': next_id}]]}} if next_id else {}
+        })
+    return {'id': 'test-instrumentation', 'name': 'Teste Instrumentacao', 'nodes': nodes}
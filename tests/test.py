@@ -23,7 +23,7 @@ def create_test_workflow():
             {
                 'id': 'node-1',
                 'name': 'Start',
-                'type': 'n8n-nodes-start',
+                'type': 'n8n-nodes-base.start',
                 'parameters': {},
                 'connections': {
                     'main': {
@@ -34,7 +34,7 @@ def create_test_workflow():
             {
                 'id': 'node-2',
                 'name': 'HTTP Request',
-                'type': 'n8n-nodes-httpRequest',
+                'type': 'n8n-nodes-base.httpRequest',
                 'parameters': {
                     'url': 'https://api.example.com/test',
                     'method': 'POST',
@@ -58,7 +58,7 @@ def create_test_workflow():
             {
                 'id': 'node-3',
                 'name': 'Processar Dados',
-                'type': 'n8n-nodes-function',
+                'type': 'n8n-nodes-base.function',
                 'parameters': {
                     'functionCode': 'const data = $input.item.json;\nreturn { processed: true, data: data };'
                 },
@@ -111,7 +111,7 @@ def test_node_mapper():
     test_node = {
         'id': 'test-node',
         'name': 'Test HTTP Request',
-        'type': 'n8n-nodes-httpRequest',
+        'type': 'n8n-nodes-base.httpRequest',
         'parameters': {
             'url': 'https://api.test.com',
             'method': 'GET'
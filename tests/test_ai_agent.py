@@ -20,7 +20,7 @@ def create_ai_agent_workflow():
             {
                 'id': 'node-1',
                 'name': 'Start',
-                'type': 'n8n-nodes-start',
+                'type': 'n8n-nodes-base.start',
                 'parameters': {},
                 'connections': {
                     'main': {
@@ -31,7 +31,7 @@ def create_ai_agent_workflow():
             {
                 'id': 'node-2',
                 'name': 'AI Agent',
-                'type': 'n8n-nodes-aiAgent',
+                'type': '@n8n/n8n-nodes-langchain.agent',
                 'parameters': {
                     'prompt': 'Analise este texto e extraia as informações principais',
                     'model': 'gpt-4',
@@ -76,7 +76,7 @@ def test_ai_agent_mapping():
     ai_node = {
         'id': 'node-ai',
         'name': 'AI Agent',
-        'type': 'n8n-nodes-aiAgent',
+        'type': '@n8n/n8n-nodes-langchain.agent',
         'parameters': {
             'prompt': 'Analise este texto',
             'model': 'gpt-4',
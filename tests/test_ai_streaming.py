@@ -0,0 +1,64 @@
+"""
+Teste do modo streaming (SSE) do nó AI Agent contra um servidor SSE local.
+"""
+import os
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from helpers import TOKENS, StubSSEHandler, create_streaming_workflow, load_generated_class
+
+
+def test_ai_streaming():
+    """Testa callback de tokens e run_stream() contra o servidor SSE local."""
+    print("=" * 60)
+    print("TESTE: AI Agent em modo streaming (SSE)")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous_key = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+
+    try:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_streaming_workflow(base_url), output_dir)
+            # O módulo de streaming é importado no topo da classe, não a cada chamada
+            source = Path(workflow_class.run.__code__.co_filename).read_text(encoding='utf-8')
+            assert '\nfrom AiStream import consume_stream\n' in source
+            assert source.count('import consume_stream') == 1
+
+            # Callback de tokens
+            received = []
+            workflow = workflow_class()
+            workflow.set_token_callback(lambda token, node: received.append((node, token)))
+            context = workflow.run()
+
+            output = context['aiAgent_output']
+            assert received == [('aiAgent_output', token) for token in TOKENS]
+            assert output['response'] == ''.join(TOKENS)
+            assert output['finish_reason'] == 'stop'
+            assert output['usage'] == {'total_tokens': len(TOKENS)}
+            assert StubSSEHandler.requests_received[-1]['stream'] is True
+            print(f"✓ Callback recebeu {len(received)} tokens: {output['response']}")
+
+            # Iteração com run_stream()
+            chunks = list(workflow_class().run_stream())
+            assert [chunk['token'] for chunk in chunks] == TOKENS
+            print(f"✓ run_stream() produziu {len(chunks)} chunks")
+    finally:
+        server.shutdown()
+        if previous_key is None:
+            os.environ.pop('OPENAI_API_KEY', None)
+        else:
+            os.environ['OPENAI_API_KEY'] = previous_key
+
+
+if __name__ == "__main__":
+    test_ai_streaming()
+    print("\n✓ TESTE PASSOU")
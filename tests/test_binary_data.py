@@ -0,0 +1,131 @@
+"""
+Teste das respostas binárias (formato "File") gravadas em arquivo pelo nó HTTP Request.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from node_mapper import NodeMapper
+from helpers import load_generated_class, node
+
+CONTENT = os.urandom(3 * 64 * 1024 + 123)
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """Servidor stub que entrega um PDF em blocos ou um erro JSON."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path != '/docs/relatorio.pdf':
+            body = json.dumps({'error': 'não encontrado'}).encode('utf-8')
+            self.send_response(404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Disposition', 'attachment; filename="relatorio-final.pdf"')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for start in range(0, len(CONTENT), 50000):
+            chunk = CONTENT[start:start + 50000]
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode('ascii') + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_workflow(url):
+    """Cria um workflow com um download em formato "File" (n8n HTTP Request v4)."""
+    parameters = {'url': url, 'method': 'GET', 'options': {'response': {'response': {'responseFormat': 'file'}}}}
+    return {
+        'id': 'test-binary-data',
+        'name': 'Teste Binary Data',
+        'nodes': [node('node-1', 'Baixar', 'n8n-nodes-base.httpRequest', [], parameters)]
+    }
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FileHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_response_format_generated():
+    """O formato de resposta é lido nas versões nova e antiga do nó e gerado nas três linguagens."""
+    mapper = NodeMapper(XMLLoader(), 'python')
+    assert mapper._parse_response_format(create_workflow('http://x')['nodes'][0]['parameters']) == 'file'
+    assert mapper._parse_response_format({'responseFormat': 'file'}) == 'file'
+    assert mapper._parse_response_format({}) == 'autodetect'
+
+    workflow = create_workflow('http://x/arquivo')
+    expected = {'python': ("response_format = 'file'", 'def _save_binary('),
+                'javascript': ('const responseFormat = "file";', '_saveBinary(response)'),
+                'php': ("$responseFormat = 'file';", 'function binaryWriter()')}
+    for language, snippets in expected.items():
+        code = Generator(XMLLoader(), language).generate_class(workflow)
+        for snippet in snippets:
+            assert snippet in code
+
+
+def test_binary_download_to_file(base_url):
+    """O corpo vai para um arquivo e o contexto recebe caminho, tamanho, tipo MIME e hash."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(f'{base_url}/docs/relatorio.pdf'), output_dir)
+        workflow = workflow_class()
+        workflow.binary_dir = os.path.join(output_dir, 'binarios')
+
+        handle = workflow.run()['baixar_output']
+        assert handle.to_dict() == {
+            'path': handle.path,
+            'size': len(CONTENT),
+            'mime_type': 'application/pdf',
+            'sha256': hashlib.sha256(CONTENT).hexdigest(),
+            'file_name': 'relatorio-final.pdf'
+        }
+        assert Path(handle.path).parent == Path(workflow.binary_dir)
+        assert handle.path.endswith('.pdf')
+
+        with handle.mmap() as view:
+            assert view[:100] == CONTENT[:100]
+            assert view[-10:] == CONTENT[-10:]
+            assert len(view) == len(CONTENT)
+
+        handle.delete()
+        assert not os.path.exists(handle.path)
+
+
+def test_binary_error_response_stays_json(base_url):
+    """Respostas de erro continuam no contexto como JSON, sem arquivo."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(f'{base_url}/inexistente'), output_dir)
+        workflow = workflow_class()
+        workflow.binary_dir = os.path.join(output_dir, 'binarios')
+
+        assert workflow.run()['baixar_output'] == {'error': 'não encontrado'}
+        assert not os.path.exists(workflow.binary_dir)
+
+
+if __name__ == "__main__":
+    test_response_format_generated()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,139 @@
+"""
+Teste da gravação e reprodução (record/replay) das chamadas HTTP e de IA.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from Cassette import Cassette, CassetteMissError, interaction_key
+from helpers import create_http_workflow, create_streaming_workflow, load_generated_class, StubHandler, StubSSEHandler, TOKENS
+
+
+def outputs(context):
+    """Saídas dos nós (sem os tempos da execução)."""
+    return {key: value for key, value in context.items() if key.endswith('_output')}
+
+
+def serve(handler):
+    """Inicia um servidor stub em uma porta livre."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_cassette_helper_generated():
+    """O helper de record/replay é gerado nas três linguagens."""
+    workflow = create_http_workflow('http://localhost')
+    expected = {'python': 'def set_cassette(', 'php': 'function setCassette(', 'javascript': 'setCassette('}
+    for language, signature in expected.items():
+        code = Generator(XMLLoader(), language).generate_class(workflow)
+        assert signature in code
+
+
+def test_interaction_key_ignores_json_formatting():
+    """A chave não depende da ordem das chaves nem da formatação do JSON."""
+    assert interaction_key('post', 'http://x/a', '{"b": 1, "a": [1, 2]}') == \
+        interaction_key('POST', 'http://x/a', b'{"a":[1,2],"b":1}')
+    assert interaction_key('GET', 'http://x/a', None) != interaction_key('GET', 'http://x/b', None)
+
+
+def test_record_and_replay_http():
+    """As respostas gravadas são reproduzidas sem rede, em ordem e com latência."""
+    server, base_url = serve(StubHandler)
+    StubHandler.hits = 0
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        path = os.path.join(output_dir, 'http.jsonl')
+        workflow_class = load_generated_class(create_http_workflow(base_url), output_dir)
+        try:
+            recorder = workflow_class()
+            recorder.set_cassette(path, 'record')
+            first = recorder.run()
+            second = recorder.run()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert StubHandler.hits == 4
+
+        lines = [json.loads(line) for line in Path(path).read_text(encoding='utf-8').splitlines()]
+        assert [line['request']['method'] for line in lines] == ['GET', 'POST', 'GET', 'POST']
+        assert all('headers' not in line['request'] for line in lines)
+
+        # Servidor parado: tudo vem do cassete, na ordem gravada
+        player = workflow_class()
+        player.set_cassette(path)
+        assert outputs(player.run()) == outputs(first)
+        assert outputs(player.run()) == outputs(second)
+        assert outputs(first) != outputs(second)
+        assert StubHandler.hits == 4
+
+        # Latência fixa simulada em cada resposta
+        player.set_cassette(Cassette(path, latency=0.05))
+        started = time.perf_counter()
+        player.run()
+        assert time.perf_counter() - started >= 0.1
+
+        # Requisição não gravada
+        lines[0]['request']['url'] += '?outra=1'
+        Path(path).write_text(json.dumps(lines[0]) + '\n', encoding='utf-8')
+        player.set_cassette(path)
+        with pytest.raises(CassetteMissError):
+            player.run()
+
+
+def test_record_and_replay_ai_streaming():
+    """Respostas SSE do AI Agent são reproduzidas com o callback de tokens."""
+    server, base_url = serve(StubSSEHandler)
+    previous_key = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, 'ai.jsonl')
+            workflow_class = load_generated_class(create_streaming_workflow(f'{base_url}/v1'), output_dir)
+            try:
+                recorder = workflow_class()
+                recorder.set_cassette(path, 'record')
+                recorded = recorder.run({'stream': True})
+            finally:
+                server.shutdown()
+                server.server_close()
+            requests_received = len(StubSSEHandler.requests_received)
+
+            received = []
+            player = workflow_class()
+            player.set_cassette(path, latency='recorded')
+            player.set_token_callback(lambda token, node: received.append(token))
+            started = time.perf_counter()
+            context = player.run()
+            assert time.perf_counter() - started >= 0.05 * len(TOKENS)
+            assert received == TOKENS
+            for key in ('response', 'usage', 'finish_reason', 'raw_response'):
+                assert context['aiAgent_output'][key] == recorded['aiAgent_output'][key]
+            assert len(StubSSEHandler.requests_received) == requests_received
+    finally:
+        if previous_key is None:
+            os.environ.pop('OPENAI_API_KEY', None)
+        else:
+            os.environ['OPENAI_API_KEY'] = previous_key
+
+
+if __name__ == "__main__":
+    test_cassette_helper_generated()
+    test_interaction_key_ignores_json_formatting()
+    test_record_and_replay_http()
+    test_record_and_replay_ai_streaming()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,139 @@
+"""
+Teste dos checkpoints e da retomada (resume) das classes geradas.
+"""
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from Checkpoint import FileCheckpointStore, SqliteCheckpointStore, create_checkpoint_store
+from helpers import load_generated_class, node, StubHandler
+
+
+def create_workflow(base_url):
+    """Cria o workflow start -> buscar (HTTP) -> preparar -> finalizar."""
+    return {
+        'id': 'test-checkpoint',
+        'name': 'Teste Checkpoint',
+        'nodes': [
+            node('node-1', 'Start', 'n8n-nodes-base.start', ['node-2']),
+            node('node-2', 'Buscar', 'n8n-nodes-base.httpRequest', ['node-3'],
+                 {'url': f'{base_url}/dados', 'method': 'GET'}),
+            node('node-3', 'Preparar', 'n8n-nodes-base.noOp', ['node-4']),
+            node('node-4', 'Finalizar', 'n8n-nodes-base.noOp', [],
+                 {'dados': '={{ $node["Buscar"].json.path }}'})
+        ]
+    }
+
+
+def test_checkpoint_disabled_generates_plain_calls():
+    """Sem checkpoints o código gerado não muda."""
+    workflow = create_workflow('http://localhost')
+    for language in ('python', 'php', 'javascript'):
+        code = Generator(XMLLoader(), language).generate_class(workflow)
+        assert 'checkpointed(' not in code
+        assert 'resume(' not in code
+
+        code = Generator(XMLLoader(), language, checkpoint=True).generate_class(workflow)
+        assert 'checkpointed(' in code
+        assert 'resume(' in code
+
+
+def test_checkpoint_stores():
+    """Os backends gravam, substituem e removem checkpoints por run id."""
+    with tempfile.TemporaryDirectory() as directory:
+        stores = [
+            create_checkpoint_store(f'file:{directory}/files'),
+            create_checkpoint_store(f'sqlite:{directory}/checkpoints.db')
+        ]
+        assert isinstance(stores[0], FileCheckpointStore)
+        assert isinstance(stores[1], SqliteCheckpointStore)
+
+        for store in stores:
+            for run_id in ('abc-123', '../fora do diretório'):
+                assert store.load(run_id) is None
+                store.save(run_id, {'completed': ['a'], 'context': {'x': 1}})
+                store.save(run_id, {'completed': ['a', 'b'], 'context': {'x': 2, 'y': object()}})
+                checkpoint = store.load(run_id)
+                assert checkpoint['completed'] == ['a', 'b']
+                assert checkpoint['context']['x'] == 2
+                store.delete(run_id)
+                assert store.load(run_id) is None
+
+        assert sorted(path.name for path in Path(directory, 'files').iterdir()) == []
+
+        with pytest.raises(ValueError):
+            create_checkpoint_store('redis')
+
+
+def test_resume_skips_completed_nodes():
+    """Uma execução retomada não repete os nós já concluídos."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_workflow(base_url), output_dir, checkpoint=True)
+
+            class Flaky(workflow_class):
+                failures = 1
+
+                def finalizar(self):
+                    if Flaky.failures:
+                        Flaky.failures -= 1
+                        raise RuntimeError('falha no último nó')
+                    super().finalizar()
+
+            for spec in (f'file:{output_dir}/checkpoints', f'sqlite:{output_dir}/checkpoints.db'):
+                Flaky.failures = 1
+                StubHandler.hits = 0
+                workflow = Flaky()
+                workflow.set_checkpoint_store(spec)
+
+                with pytest.raises(RuntimeError):
+                    workflow.run({'run_id': 'pedido-42'})
+                assert StubHandler.hits == 1
+
+                checkpoint = workflow._checkpoint_store.load('pedido-42')
+                assert checkpoint['completed'] == ['start', 'buscar', 'preparar']
+                assert 'start_output' not in checkpoint['context']  # liberada pelo liveness
+                assert checkpoint['context']['buscar_output'] == {'path': '/dados', 'count': 1}
+
+                # Retomada em outra instância: somente o nó que falhou é executado
+                resumed = Flaky()
+                resumed.set_checkpoint_store(spec)
+                context = resumed.resume('pedido-42')
+                assert StubHandler.hits == 1
+                assert context['run_id'] == 'pedido-42'
+                assert context['finalizar_output'] == {}
+                assert resumed._checkpoint_store.load('pedido-42') is None
+
+                with pytest.raises(KeyError):
+                    resumed.resume('pedido-42')
+
+            # Sem run id explícito um id é gerado; set_checkpoint_store(None) desativa
+            Flaky.failures = 0
+            workflow = Flaky()
+            workflow.set_checkpoint_store(f'file:{output_dir}/checkpoints')
+            assert len(workflow.run()['run_id']) == 32
+            workflow.set_checkpoint_store(None)
+            assert 'run_id' not in workflow.run()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_checkpoint_disabled_generates_plain_calls()
+    test_checkpoint_stores()
+    test_resume_skips_completed_nodes()
+    print("\n✓ TESTE PASSOU")
@@ -39,7 +39,7 @@ def create_test_workflow_with_expressions():
             {
                 'id': 'node-2',
                 'name': 'AI Agent',
-                'type': 'n8n-nodes-aiAgent',
+                'type': '@n8n/n8n-nodes-langchain.agent',
                 'parameters': {
                     'prompt': '={{ $json.body.msg }}',
                     'model': 'gpt-4',
@@ -0,0 +1,106 @@
+"""
+Teste do registro de credenciais usado pelos nós AI Agent.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'credentials'))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from Credentials import AnthropicCredentials, CredentialsRegistry, OpenAICredentials
+from helpers import create_streaming_workflow
+
+
+def test_generated_code_uses_hoisted_registry():
+    """O código gerado importa o registro no topo e não cria credenciais por chamada."""
+    workflow = create_streaming_workflow('http://localhost/v1')
+    expected = {
+        'python': 'from Credentials import OpenAICredentials, credentials_registry',
+        'javascript': "const { OpenAICredentials, credentialsRegistry } = require(",
+        'php': 'use CredentialsRegistry;'
+    }
+    for language, header in expected.items():
+        code = Generator(XMLLoader(), language).generate_class(workflow)
+        assert header in code
+        assert 'Credentials()' not in code
+        assert 'from Credentials import' not in code.split(header, 1)[1]
+
+
+def test_registry_resolves_once_and_rotates(monkeypatch):
+    """A chave é lida do ambiente uma vez; register() e rotate() trocam a chave."""
+    lookups = []
+    real_getenv = os.getenv
+
+    def counting_getenv(name, default=None):
+        lookups.append(name)
+        return real_getenv(name, default)
+
+    registry = CredentialsRegistry()
+    monkeypatch.setattr(os, 'getenv', counting_getenv)
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    # Chave ausente não fica guardada
+    assert registry.get('openai').get_api_key() == ''
+    monkeypatch.setenv('OPENAI_API_KEY', 'env-key')
+    lookups.clear()
+    for _ in range(5):
+        assert registry.get('OpenAI').get_api_key() == 'env-key'
+    assert lookups == ['OPENAI_API_KEY']
+
+    monkeypatch.setenv('OPENAI_API_KEY', 'env-key-2')
+    assert registry.get('openai').get_api_key() == 'env-key'
+    registry.rotate('openai')
+    assert registry.get('openai').get_api_key() == 'env-key-2'
+    registry.rotate('openai', 'rotated-key')
+    assert registry.get('openai').get_api_key() == 'rotated-key'
+
+    registry.register('claude', AnthropicCredentials('injected'))
+    assert isinstance(registry.get('anthropic-claude-3'), AnthropicCredentials)
+    assert registry.get('anthropic').get_api_key() == 'injected'
+    assert isinstance(registry.get('gpt'), OpenAICredentials)
+
+    registry.clear()
+    assert registry.get('openai').get_api_key() == 'env-key-2'
+
+
+def test_outdated_credentials_file_is_kept():
+    """Cópias antigas do módulo de credenciais não são alteradas: o template vai ao lado, com aviso."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        folder_structure = FolderStructure(output_dir)
+        path = folder_structure.get_credentials_path('python')
+        path.write_text('# credenciais antigas\n', encoding='utf-8')
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert not folder_structure.ensure_credentials_file('python')
+        new_path = path.with_name('Credentials.py.new')
+        assert path.read_text(encoding='utf-8') == '# credenciais antigas\n'
+        assert 'CredentialsRegistry' in new_path.read_text(encoding='utf-8')
+        assert not path.with_name('Credentials.py.bak').exists()
+        assert 'Aviso' in output.getvalue() and str(new_path) in output.getvalue()
+
+        # O aviso sai uma vez, não a cada workflow gerado
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert not FolderStructure(output_dir).ensure_credentials_file('python')
+        assert output.getvalue() == ''
+
+        # Depois da migração, nada muda nem é avisado
+        new_path.replace(path)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            assert folder_structure.ensure_credentials_file('python')
+        assert output.getvalue() == '' and not new_path.exists()
+
+
+if __name__ == "__main__":
+    test_generated_code_uses_hoisted_registry()
+    test_outdated_credentials_file_is_kept()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,183 @@
+"""
+Teste do daemon de geração com caches aquecidos (HTTP e socket Unix).
+"""
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from daemon import GenerationService, JobError, create_server
+from fake_n8n_server import FakeN8nServer
+from helpers import node
+
+CONFIG = {'output': {'language': 'python'}}
+
+
+def create_workflow():
+    """Cria um workflow simples com um nó Set e um HTTP Request."""
+    return {
+        'id': 'wf-daemon',
+        'name': 'Teste Daemon',
+        'nodes': [
+            node('node-1', 'Preparar', 'n8n-nodes-base.set', ['node-2'], {}),
+            node('node-2', 'Enviar', 'n8n-nodes-base.httpRequest', [], {'url': 'http://x', 'method': 'GET'})
+        ]
+    }
+
+
+@pytest.fixture
+def daemon():
+    service = GenerationService(CONFIG)
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield service, server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def post(port, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('POST', '/generate', json.dumps(body), {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_generate_over_http_reuses_warm_state(daemon):
+    """Jobs repetidos usam o mesmo Generator e não releem templates."""
+    service, port = daemon
+    workflow = create_workflow()
+
+    status, result = post(port, {'workflow': workflow})
+    assert status == 200
+    assert result['language'] == 'python'
+    assert result['code'] == Generator(XMLLoader(), 'python').generate_class(workflow)
+    loads = service.xml_loader.template_loads
+
+    for language in ('python', 'python', 'javascript', 'php'):
+        status, result = post(port, {'workflow': workflow, 'language': language})
+        assert status == 200 and result['language'] == language
+    assert service.health()['generators'] == 3
+    assert service.xml_loader.template_loads > loads  # novas linguagens
+
+    loads = service.xml_loader.template_loads
+    assert post(port, {'workflow': workflow, 'language': 'php'})[0] == 200
+    assert service.xml_loader.template_loads == loads
+
+    status, result = post(port, {'workflow': workflow, 'options': {'instrument': True}})
+    assert status == 200 and '_metrics' in result['code']
+    assert service.health()['generators'] == 4
+
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('GET', '/health')
+    health = json.loads(connection.getresponse().read())
+    assert health['status'] == 'ok' and health['jobs'] == 7 and health['errors'] == 0
+    assert health['render_cache']['hits'] > 0  # jobs repetidos não renderizam os nós de novo
+
+
+def test_job_errors(daemon):
+    """Jobs inválidos recebem 4xx com uma mensagem de erro."""
+    service, port = daemon
+    assert post(port, {'workflow': create_workflow(), 'language': 'cobol'})[0] == 400
+    assert post(port, {'workflow': create_workflow(), 'options': {'turbo': True}})[0] == 400
+    assert post(port, {})[0] == 400
+    assert post(port, {'workflow_id': 'wf1'})[0] == 503  # sem API Key
+    assert service.stats['errors'] == 4
+
+
+def test_option_types_are_validated(daemon):
+    """Opções com tipos inválidos recebem 400 (em vez de 500 ao montar a chave do cache)."""
+    service, port = daemon
+    for options in ({'trace': ['a']}, {'instrument': {'a': 1}}, {'server': 'sim'},
+                    {'resource_threshold': [100]}, {'resource_threshold': True}, ['trace']):
+        status, result = post(port, {'workflow': create_workflow(), 'options': options})
+        assert status == 400 and ('options' in result['error'] or 'Opção' in result['error'])
+    assert not service._generators
+
+    status, result = post(port, {'workflow': create_workflow(),
+                                 'options': {'trace': True, 'resource_threshold': None}})
+    assert status == 200 and result['code']
+
+
+def test_workflow_type_is_validated(daemon):
+    """Um workflow que não é um objeto (ou com nodes que não são lista) recebe 400 em vez de 500."""
+    service, port = daemon
+    for workflow in ([create_workflow()], 'wf-daemon', 42, {'name': 'x', 'nodes': 'a'}):
+        status, result = post(port, {'workflow': workflow})
+        assert status == 400 and 'workflow' in result['error']
+    assert service.stats['errors'] == 4
+
+
+def test_client_is_created_once(monkeypatch):
+    """Jobs simultâneos por id compartilham um único N8nClient."""
+    import n8n_client
+    created = []
+
+    class SlowClient:
+        def __init__(self, url, api_key):
+            created.append(self)
+            threading.Event().wait(0.05)
+
+    monkeypatch.setattr(n8n_client, 'N8nClient', SlowClient)
+    service = GenerationService({'n8n': {'url': 'http://n8n', 'api_key': 'chave'}, 'output': {}})
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(service.client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1 and all(client is created[0] for client in clients)
+
+
+def test_generate_by_id_with_pooled_client():
+    """Jobs por id buscam o workflow no n8n reaproveitando a sessão do N8nClient."""
+    workflow = create_workflow()
+    with FakeN8nServer([workflow]) as n8n:
+        service = GenerationService({'n8n': {'url': n8n.url, 'api_key': n8n.api_key}, 'output': {}})
+        first = service.generate({'workflow_id': 'wf-daemon', 'language': 'javascript'})
+        second = service.generate({'workflow_id': 'wf-daemon', 'language': 'javascript'})
+        assert first['code'] == second['code'] and first['workflow'] == 'Teste Daemon'
+        assert service.client().session is not None and service.stats['fetches'] == 2
+        with pytest.raises(JobError) as error:
+            service.generate({'workflow_id': 'inexistente'})
+        assert error.value.status == 404
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='socket Unix indisponível')
+def test_generate_over_unix_socket():
+    """O daemon atende o mesmo protocolo HTTP em um socket Unix."""
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'n8ncoding.sock')
+        server = create_server(GenerationService(CONFIG), socket_path=socket_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            body = json.dumps({'workflow': create_workflow(), 'language': 'php'}).encode('utf-8')
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+                client.sendall(b'POST /generate HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+                               + f'Content-Length: {len(body)}\r\n\r\n'.encode('ascii') + body)
+                response = b''
+                while chunk := client.recv(65536):
+                    response += chunk
+            head, _, payload = response.partition(b'\r\n\r\n')
+            assert head.startswith(b'HTTP/1.1 200')
+            assert json.loads(payload)['code'].startswith('<?php')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    test_generate_by_id_with_pooled_client()
+    print("\n✓ TESTE PASSOU")
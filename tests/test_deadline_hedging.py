@@ -0,0 +1,252 @@
+"""
+Teste do prazo da execução (deadline) e das requisições de reserva (hedging).
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from RateLimiter import RateLimiter
+from helpers import create_streaming_workflow, load_generated_class, node
+
+
+class SlowFirstHandler(BaseHTTPRequestHandler):
+    """Servidor stub em que a primeira requisição de cada caminho demora."""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.5
+    seen = {}
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        count = SlowFirstHandler.seen.get(self.path, 0) + 1
+        SlowFirstHandler.seen[self.path] = count
+        if count == 1 or self.path.startswith('/sempre-lento'):
+            time.sleep(SlowFirstHandler.delay)
+        payload = json.dumps({'path': self.path, 'attempt': count}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_workflow(base_url, path, method='GET'):
+    """Cria um workflow com uma única requisição HTTP."""
+    return {
+        'id': 'test-deadline-hedging',
+        'name': 'Teste Deadline Hedging',
+        'nodes': [node('node-1', 'Buscar', 'n8n-nodes-base.httpRequest', [], {'url': f'{base_url}{path}', 'method': method})]
+    }
+
+
+@pytest.fixture
+def base_url():
+    SlowFirstHandler.seen = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowFirstHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_deadline_and_hedging_generated():
+    """Prazo e reservas são gerados nas três linguagens."""
+    workflow = create_workflow('http://localhost', '/dados')
+    expected = {'python': ('_deadline_begin()', 'def set_hedging('),
+                'javascript': ('_deadlineBegin()', 'setHedging('),
+                'php': ('deadlineBegin()', 'function setHedging(')}
+    for language, snippets in expected.items():
+        code = Generator(XMLLoader(), language).generate_class(workflow)
+        for snippet in snippets:
+            assert snippet in code
+
+
+def test_hedged_get_returns_first_response(base_url):
+    """Um GET lento recebe uma reserva após o atraso e a resposta mais rápida vence."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(base_url, '/dados'), output_dir)
+        workflow = workflow_class()
+        workflow.set_hedging(delay=0.05)
+
+        started = time.perf_counter()
+        context = workflow.run()
+        assert time.perf_counter() - started < SlowFirstHandler.delay
+        assert context['buscar_output'] == {'path': '/dados', 'attempt': 2}
+        assert workflow.get_hedging_stats() == {'hedged': 1, 'backup_wins': 1}
+
+        # Respostas rápidas não geram reservas
+        workflow.run()
+        assert workflow.get_hedging_stats()['hedged'] == 1
+
+        # Métodos não idempotentes nunca são duplicados
+        post_class = load_generated_class(create_workflow(base_url, '/enviar', 'POST'), output_dir)
+        post = post_class()
+        post.set_hedging(delay=0.05)
+        assert post.run()['buscar_output'] == {'path': '/enviar', 'attempt': 1}
+        assert SlowFirstHandler.seen['/enviar'] == 1
+        assert post.get_hedging_stats()['hedged'] == 0
+
+
+def test_hedged_error_only_when_every_attempt_fails(base_url):
+    """A reserva com sucesso vence a primeira tentativa com erro; o erro só sobe se as duas falharem."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = load_generated_class(create_workflow(base_url, '/dados'), output_dir)()
+        workflow.set_hedging(delay=0.02)
+        primary_failing = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                time.sleep(0.1)
+                primary_failing.set()
+                raise ConnectionError('primeira')
+            # A reserva termina junto com a falha da primeira
+            primary_failing.wait(1)
+            return 'reserva'
+
+        assert workflow._hedged(send, 0.02) == 'reserva'
+        assert workflow.get_hedging_stats() == {'hedged': 1, 'backup_wins': 1}
+
+        def failing():
+            time.sleep(0.05)
+            raise ConnectionError('falhou')
+
+        with pytest.raises(ConnectionError):
+            workflow._hedged(failing, 0.01)
+        assert workflow.get_hedging_stats() == {'hedged': 2, 'backup_wins': 1}
+
+
+def test_hedge_loser_response_is_closed(base_url):
+    """A resposta da tentativa perdedora é fechada quando chega; a da vencedora, não."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = load_generated_class(create_workflow(base_url, '/dados'), output_dir)()
+        workflow.set_hedging(delay=0.02)
+        loser_closed = threading.Event()
+
+        class Response:
+            def __init__(self, name):
+                self.name, self.closed = name, False
+
+            def close(self):
+                self.closed = True
+                loser_closed.set()
+
+        calls = []
+
+        def send():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                time.sleep(0.1)
+                return Response('primeira')
+            return Response('reserva')
+
+        winner = workflow._hedged(send, 0.02)
+        assert winner.name == 'reserva' and not winner.closed
+        assert loser_closed.wait(1)
+        assert not winner.closed
+
+
+def test_hedging_counters_shared_by_threads(base_url):
+    """As cópias de run_many() contam as reservas no mesmo dicionário, sob a trava."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = load_generated_class(create_workflow(base_url, '/dados'), output_dir)()
+        workflow.set_hedging(delay=0.001)
+
+        def hedge_many():
+            for _ in range(20):
+                workflow._hedged(lambda: time.sleep(0.003), 0.001)
+
+        threads = [threading.Thread(target=hedge_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert workflow.get_hedging_stats()['hedged'] == 160
+
+
+def test_hedged_backup_takes_a_rate_limit_permit(base_url):
+    """A reserva de uma chamada de IA ocupa outra permissão do limitador e não sai sem vaga."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = load_generated_class(create_workflow(base_url, '/dados'), output_dir)()
+        workflow.set_hedging(delay=0.02)
+        slow = lambda: time.sleep(0.1) or 'ok'
+
+        limiter = RateLimiter(rpm=60)
+        primary = limiter.acquire()
+        assert workflow._hedged(slow, 0.02, lambda: limiter.try_acquire()) == 'ok'
+        assert limiter.stats()['calls'] == 2 and workflow.get_hedging_stats()['hedged'] == 1
+        assert limiter.stats()['in_flight'] == 1  # a vaga da reserva é liberada junto com a vencedora
+        primary.release()
+
+        # Sem vaga (uma chamada simultânea no máximo): só a primeira tentativa é enviada
+        limiter = RateLimiter(max_in_flight=1)
+        primary = limiter.acquire()
+        assert workflow._hedged(slow, 0.02, lambda: limiter.try_acquire()) == 'ok'
+        assert limiter.stats()['calls'] == 1 and workflow.get_hedging_stats()['hedged'] == 1
+        primary.release()
+
+    for language, snippet in {'python': 'backup_permit=lambda: rate_limiter.try_acquire(',
+                              'javascript': 'backupPermit: () => rateLimiter.tryAcquire(',
+                              'php': 'fn() => $rateLimiter->tryAcquire('}.items():
+        assert snippet in Generator(XMLLoader(), language).generate_class(create_streaming_workflow('http://localhost'))
+
+
+def test_hedge_delay_follows_latency_percentile(base_url):
+    """Sem atraso fixo, a reserva usa o percentil das latências recentes do nó."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(base_url, '/percentil'), output_dir)
+        workflow = workflow_class()
+        workflow.set_hedging(min_samples=3)
+        SlowFirstHandler.seen['/percentil'] = 1  # sem a primeira requisição lenta
+
+        for _ in range(2):
+            workflow.run()
+        assert workflow._hedge_delay('buscar') is None
+        workflow.run()
+        latencies = sorted(workflow._hedging['latencies']['buscar'])
+        assert workflow._hedge_delay('buscar') == latencies[-1]
+
+
+def test_deadline_limits_each_call(base_url):
+    """O prazo da execução vira o timeout das chamadas e esgotado impede novas chamadas."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(base_url, '/sempre-lento'), output_dir)
+        workflow = workflow_class()
+
+        started = time.perf_counter()
+        with pytest.raises(requests.exceptions.Timeout):
+            workflow.run({'deadline': 0.2})
+        assert time.perf_counter() - started < SlowFirstHandler.delay
+
+        workflow._deadline = time.monotonic() - 1
+        with pytest.raises(TimeoutError):
+            workflow._remaining_timeout(30)
+
+        assert workflow.run({'deadline': 5})['buscar_output']['path'] == '/sempre-lento'
+
+
+if __name__ == "__main__":
+    test_deadline_and_hedging_generated()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,53 @@
+"""
+Teste do servidor n8n local e do benchmark ponta a ponta de main().
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from fake_n8n_server import FakeN8nServer
+from bench_end_to_end import run_end_to_end, synthetic_fixtures
+
+
+def test_fake_server_api():
+    """A API local pagina por cursor, exige a API Key e injeta 429."""
+    with FakeN8nServer(synthetic_fixtures(5, 3), page_size=2, rate_limit_every=4) as server:
+        headers = {'X-N8N-API-KEY': server.api_key}
+        page = requests.get(f'{server.url}/api/v1/workflows', headers=headers).json()
+        assert [w['id'] for w in page['data']] == ['wf1', 'wf2'] and page['nextCursor'] == '2'
+        page = requests.get(f'{server.url}/api/v1/workflows?cursor=4', headers=headers).json()
+        assert [w['id'] for w in page['data']] == ['wf5'] and page['nextCursor'] is None
+        assert requests.get(f'{server.url}/api/v1/workflows/wf3').status_code == 401
+
+        limited = requests.get(f'{server.url}/api/v1/workflows/wf3', headers=headers)
+        assert limited.status_code == 429 and limited.headers['Retry-After'] == '1'
+        workflow = requests.get(f'{server.url}/api/v1/workflows/wf3', headers=headers).json()
+        assert workflow['name'] == 'Bench Workflow 3' and 'updatedAt' in workflow
+
+        assert server.stats['requests'] == 5
+        assert server.stats['rate_limited'] == 1 and server.stats['errors'] == 1
+        assert server.stats['bytes_sent'] > 0
+
+
+def test_end_to_end_conversion():
+    """main() converte todos os workflows listados e o relatório conta requisições e bytes."""
+    with FakeN8nServer(synthetic_fixtures(3, 4)) as server, tempfile.TemporaryDirectory() as work_dir:
+        report = run_end_to_end(server, ['php', 'python'], Path(work_dir))
+
+        assert report['workflows_listed'] == 3
+        assert report['workflows_converted'] == 3 and report['outputs_written'] == 6
+        assert report['server']['list_requests'] == 2  # test_connection() + get_workflows()
+        assert report['server']['get_requests'] == 3
+        assert report['server']['bytes_sent'] > 0 and report['workflows_per_second'] > 0
+        assert (Path(work_dir) / 'output' / 'python' / 'Bench_Workflow_1.py').exists()
+
+
+if __name__ == "__main__":
+    test_fake_server_api()
+    test_end_to_end_conversion()
+    print("\n✓ TESTE PASSOU")
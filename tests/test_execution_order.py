@@ -0,0 +1,120 @@
+"""
+Teste da ordem de execução dos nós (ordenação topológica de Kahn).
+
+legacy_execution_order() reproduz a ordem das versões anteriores (DFS em
+pré-ordem a partir dos nós iniciais, sem seguir as listas de conexão
+aninhadas [[{...}]]), para mostrar onde as duas ordens diferem.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from helpers import node
+
+
+def flat_node(node_id, targets, node_type='n8n-nodes-base.noOp'):
+    """Nó com conexões no formato plano ({'main': {'0': [{...}]}}), o único que a ordem antiga seguia."""
+    created = node(node_id, node_id, node_type, [])
+    if targets:
+        created['connections'] = {'main': {'0': [{'node': target} for target in targets]}}
+    return created
+
+
+def nested_node(node_id, targets, node_type='n8n-nodes-base.noOp'):
+    """Nó com conexões no formato do n8n ([[{...}]])."""
+    return node(node_id, node_id, node_type, targets)
+
+
+def legacy_execution_order(nodes):
+    """Ordem de execução anterior ao algoritmo de Kahn (referência para os testes)."""
+    def targets_of(node):
+        found = []
+        for output_connections in node.get('connections', {}).values():
+            lists = output_connections.values() if isinstance(output_connections, dict) else output_connections
+            for connection_list in lists:
+                for connection in connection_list if isinstance(connection_list, list) else [connection_list]:
+                    if isinstance(connection, dict):
+                        found.append(connection.get('node'))
+                    elif isinstance(connection, str):
+                        found.append(connection)
+        return found
+
+    nodes_by_id = {node['id']: node for node in nodes}
+    has_input = {target for node in nodes for target in targets_of(node)}
+    start_nodes = [node for node in nodes if node['type'].endswith('.start') or node['type'] == 'n8n-nodes-base.start'
+                   or node['id'] not in has_input] or nodes[:1]
+    ordered, visited = [], set()
+
+    def visit(node_id):
+        if node_id in visited or node_id not in nodes_by_id:
+            return
+        visited.add(node_id)
+        ordered.append(node_id)
+        for target in targets_of(nodes_by_id[node_id]):
+            visit(target)
+
+    for start in start_nodes:
+        visit(start['id'])
+    return ordered + [node['id'] for node in nodes if node['id'] not in visited]
+
+
+def execution_order(nodes):
+    return [node['id'] for node in Generator(XMLLoader(), 'python')._determine_execution_order(nodes)]
+
+
+# (descrição, nós, ordem antiga, ordem nova)
+CASES = [
+    ('cadeia', [flat_node('a', ['b']), flat_node('b', ['c']), flat_node('c', [])],
+     ['a', 'b', 'c'], ['a', 'b', 'c']),
+    # Fan-out: a ordem antiga descia o primeiro ramo inteiro; a nova executa os nós por nível
+    ('fan-out', [flat_node('a', ['b', 'c']), flat_node('b', ['d']), flat_node('c', []), flat_node('d', [])],
+     ['a', 'b', 'd', 'c'], ['a', 'b', 'c', 'd']),
+    # Fan-in: a ordem antiga executava o nó de junção 'd' antes da sua entrada 'c'
+    ('fan-in', [flat_node('a', ['b', 'c']), flat_node('b', ['d']), flat_node('c', ['d']), flat_node('d', [])],
+     ['a', 'b', 'd', 'c'], ['a', 'b', 'c', 'd']),
+    # Ciclo com entrada: os dois entram no ciclo pelo nó alcançado a partir de 'a'
+    ('ciclo', [flat_node('a', ['b']), flat_node('c', ['b']), flat_node('b', ['c'])],
+     ['a', 'b', 'c'], ['a', 'b', 'c']),
+    # Ciclo sem entrada: ordem do workflow
+    ('ciclo isolado', [flat_node('b', ['c']), flat_node('c', ['b'])],
+     ['b', 'c'], ['b', 'c']),
+    # Nós desconectados: a ordem antiga os deixava depois de todo o ramo do primeiro nó inicial
+    ('desconectados', [flat_node('a', ['b']), flat_node('x', []), flat_node('b', [])],
+     ['a', 'b', 'x'], ['a', 'x', 'b']),
+    # Nó Start vem primeiro entre os nós iniciais (nas duas ordens)
+    ('start', [flat_node('x', []), flat_node('s', ['y'], 'n8n-nodes-base.start'), flat_node('y', [])],
+     ['x', 's', 'y'], ['s', 'x', 'y']),
+    # Conexões aninhadas do n8n: a ordem antiga não as seguia e usava a ordem do workflow
+    ('conexões aninhadas', [nested_node('b', ['c']), nested_node('a', ['b']), nested_node('c', [])],
+     ['b', 'a', 'c'], ['a', 'b', 'c']),
+]
+
+
+@pytest.mark.parametrize('description, nodes, legacy, expected', CASES, ids=[case[0] for case in CASES])
+def test_execution_order(description, nodes, legacy, expected):
+    """Ordem nova e, para documentar a mudança, a ordem das versões anteriores."""
+    assert legacy_execution_order(nodes) == legacy
+    assert execution_order(nodes) == expected
+
+
+def test_every_node_runs_after_its_inputs():
+    """Em um DAG, cada nó vem depois de todos os nós que apontam para ele."""
+    nodes = [nested_node('f', []), nested_node('e', ['f']), nested_node('a', ['b', 'c', 'e']),
+             nested_node('c', ['d', 'e']), nested_node('b', ['d']), nested_node('d', ['f'])]
+    position = {node_id: index for index, node_id in enumerate(execution_order(nodes))}
+    for source in nodes:
+        for target in source['connections'].get('main', {}).get('0', [[]])[0]:
+            assert position[source['id']] < position[target['node']]
+
+
+if __name__ == "__main__":
+    for case in CASES:
+        test_execution_order(*case)
+    test_every_node_runs_after_its_inputs()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,117 @@
+"""
+Teste de sintaxe do código gerado (py_compile, node --check e php -l).
+
+Gera, com as principais combinações de opções, as classes e os servidores de
+webhook de workflows com todos os tipos de nó, além dos módulos de runtime,
+credenciais e NodeRuntime, e valida cada arquivo com o interpretador da
+linguagem. Os textos dos workflows têm aspas, '$', barras e quebras de linha.
+Os testes são ignorados quando o binário não está instalado, exceto na CI
+(variável CI definida), onde os três interpretadores são obrigatórios.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from synthetic_workflows import SyntheticWorkflowFactory
+
+# Linguagem -> (binário, comando de verificação, extensão)
+CHECKERS = {
+    'python': (sys.executable, [sys.executable, '-m', 'py_compile'], '.py'),
+    'javascript': ('node', ['node', '--check'], '.js'),
+    'php': ('php', ['php', '-l'], '.php')
+}
+
+# Texto que quebra literais montados sem escape em qualquer das linguagens
+TRICKY = 'Pedido "atual" d\'Ávila por $categoria {$id} \\ fim\nsegunda linha'
+
+OPTION_SETS = [
+    {},
+    {'instrument': True, 'trace': True, 'checkpoint': True, 'resource_threshold': 100},
+    {'shared_runtime': True}
+]
+
+
+def create_workflows():
+    """Workflows com todos os tipos de nó, um deles disparado por webhook."""
+    factory = SyntheticWorkflowFactory(branching=2, expression_density=0.5)
+    workflow = factory.create(24)
+    webhook = factory.create(6)
+    webhook['id'], webhook['name'] = 'syntax-webhook', 'Sintaxe d\'Ávila "Webhook"'
+    webhook['nodes'][0].update({'type': 'n8n-nodes-base.webhook', 'name': 'Receber Pedido',
+                                'parameters': {'path': 'pedidos', 'httpMethod': 'POST'}})
+    # Agente com tools (mantido inline mesmo com o runtime compartilhado)
+    workflow['nodes'][-1].update({'type': '@n8n/n8n-nodes-langchain.agent', 'parameters': {
+        'prompt': TRICKY, 'systemMessage': TRICKY, 'model': 'gpt-4o-mini',
+        'tools': [{'name': 'buscar', 'description': TRICKY}]}})
+    # Aspas, '$', barras e quebras de linha em todos os literais gerados
+    for item in workflow['nodes'] + webhook['nodes']:
+        kind = item['type'].split('.')[-1]
+        if kind == 'httpRequest':
+            item['parameters'].update({'url': '={{$json.body.url}}/it\'s/"$id"',
+                                       'options': {'headers': {'X-Nota': TRICKY}}})
+        elif kind == 'set':
+            item['parameters'] = {'values': {'string': [{'name': 'nota', 'value': TRICKY}]}}
+        elif kind == 'if':
+            item['parameters'] = {'conditions': {'combinator': 'or', 'conditions': [
+                {'leftValue': '={{ $json.body.nota }}', 'rightValue': TRICKY,
+                 'operator': {'type': 'string', 'operation': 'equals'}},
+                {'leftValue': "={{ $json.body['id'] }}", 'rightValue': '/^\\d+$/i',
+                 'operator': {'type': 'string', 'operation': 'regex'}}]}}
+    return [workflow, webhook]
+
+
+def generate_files(language, output_dir):
+    """Gera e salva classes, servidores e runtime; devolve os arquivos da linguagem."""
+    for index, options in enumerate(OPTION_SETS):
+        xml_loader = XMLLoader()
+        for workflow in create_workflows():
+            workflow = {**workflow, 'name': f"{workflow['name']} {index}"}
+            generator = Generator(xml_loader, language, **options)
+            generator.folder_structure = FolderStructure(output_dir)
+            assert generator.save_generated_code(workflow, generator.generate_class(workflow))
+            server = generator.generate_server(workflow)
+            if server:
+                assert generator.save_generated_server(workflow, server)
+    return sorted(Path(output_dir).rglob(f'*{CHECKERS[language][2]}'))
+
+
+@pytest.mark.parametrize('language', list(CHECKERS))
+def test_generated_code_is_valid(language):
+    """Cada arquivo gerado passa na verificação de sintaxe do interpretador."""
+    binary, command, _ = CHECKERS[language]
+    if shutil.which(binary) is None:
+        if os.environ.get('CI'):
+            pytest.fail(f'{binary} não está instalado na CI')
+        pytest.skip(f'{binary} não está instalado')
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        files = generate_files(language, output_dir)
+        names = {path.name for path in files}
+        # Classes, servidores, credenciais, runtime e NodeRuntime
+        assert any(name.endswith(f'Server{CHECKERS[language][2]}') for name in names)
+        assert {f'NodeRuntime{CHECKERS[language][2]}', f'Checkpoint{CHECKERS[language][2]}'} <= names
+
+        errors = []
+        for path in files:
+            result = subprocess.run(command + [str(path)], capture_output=True, text=True)
+            if result.returncode != 0:
+                errors.append(f'{path.relative_to(output_dir)}:\n{result.stdout}{result.stderr}')
+        assert not errors, '\n'.join(errors)
+
+
+if __name__ == "__main__":
+    for language in CHECKERS:
+        if shutil.which(CHECKERS[language][0]):
+            test_generated_code_is_valid(language)
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,157 @@
+"""
+Teste da conversão das condições do nó IF (formatos v1 e v2 do n8n).
+"""
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from helpers import load_generated_class, node
+
+# Saída do nó Carregar, lida pelos IFs via $json e $node["Carregar"]
+LOADED = {'total': 12, 'nome': 'Abacate', 'tags': ['a', 'b'], 'ativo': 'true', 'vazio': ''}
+# Dados de entrada do workflow (webhook)
+INPUT = {'body': {'status': 'OK'}}
+
+
+def condition(left, operation, right=None, kind='string'):
+    """Condição no formato v2 (conditions.conditions)."""
+    return {'leftValue': left, 'rightValue': right, 'operator': {'type': kind, 'operation': operation}}
+
+
+def v2(*conditions, combinator='and', case_sensitive=True):
+    return {'conditions': {'options': {'caseSensitive': case_sensitive}, 'combinator': combinator,
+                           'conditions': list(conditions)}}
+
+
+# Nome do IF -> (parâmetros, resultado esperado)
+CASES = {
+    'Status': (v2(condition('={{ $json.body.status }}', 'equals', 'ok'), case_sensitive=False), True),
+    'Total': ({'conditions': {'number': [{'value1': '={{ $node["Carregar"].json.total }}', 'operation': 'larger',
+                                          'value2': 20}]}}, False),
+    'Qualquer': ({'combineOperation': 'any', 'conditions': {
+        'string': [{'value1': '={{ $json.nome }}', 'operation': 'startsWith', 'value2': 'Aba'}],
+        'number': [{'value1': '={{ $json["total"] }}', 'value2': 0}]}}, True),
+    'Regex': (v2(condition("={{ $('Carregar').item.json.nome }}", 'regex', '/^abac/i'),
+                 condition('={{ $json.nome }}', 'notRegex', '^x')), True),
+    'Tags': (v2(condition('={{ $json.tags }}', 'lengthGte', 2, 'array'),
+                condition('={{ $json.tags }}', 'contains', 'b', 'array')), True),
+    'Ativo': (v2(condition('={{ $json.ativo }}', 'true', kind='boolean')), True),
+    'Ausente': (v2(condition('={{ $json.inexistente }}', 'exists')), False),
+    'Vazio': (v2(condition('={{ $json.vazio }}', 'empty'),
+                 condition('={{ $json.total }}', 'notEquals', '={{ 13 }}', 'number')), True),
+    'Maiusculas': (v2(condition('={{ $json.nome }}', 'equals', 'abacate')), False),
+}
+
+
+def create_workflow(cases=CASES):
+    """Cria o workflow start -> carregar -> um IF por caso."""
+    return {
+        'id': 'test-if-conditions',
+        'name': 'Teste IF Conditions',
+        'nodes': [
+            node('node-1', 'Start', 'n8n-nodes-base.start', ['node-2']),
+            node('node-2', 'Carregar', 'n8n-nodes-base.noOp', [f'if-{name}' for name in cases]),
+            *[node(f'if-{name}', name, 'n8n-nodes-base.if', [], parameters)
+              for name, (parameters, _) in cases.items()]
+        ]
+    }
+
+
+def expected_results():
+    return {f'{name.lower()}_output': {'passed': passed} for name, (_, passed) in CASES.items()}
+
+
+def test_conditions_parsed():
+    """v1 e v2 viram a mesma configuração; referências a dados viram caminhos no contexto."""
+    generator = Generator(XMLLoader(), 'python')
+    code = generator.generate_class(create_workflow())
+    assert 'TODO' not in code.split('def status(')[1].split('def ')[0]
+    assert 'self._if_conditions(conditions)' in code and 'def _if_conditions(' in code
+
+    mapper = generator.node_mapper
+    nodes = {item['name']: item for item in create_workflow()['nodes']}
+    assert mapper._parse_conditions(nodes['Total']) == {
+        'combinator': 'and', 'case_sensitive': True,
+        'conditions': [{'type': 'number', 'operation': 'gt',
+                        'left': {'paths': [['carregar_output', 'total']]}, 'right': {'value': 20}}]
+    }
+    status = mapper._parse_conditions(nodes['Status'])
+    assert status['case_sensitive'] is False
+    assert status['conditions'][0]['left'] == {
+        'paths': [['carregar_output', 'body', 'status'], ['body', 'status'], ['status']]}
+    assert mapper._parse_conditions(nodes['Qualquer'])['combinator'] == 'or'
+
+    for language, call in (('javascript', 'this._ifConditions(conditions)'), ('php', '$this->ifConditions($conditions)')):
+        code = Generator(XMLLoader(), language).generate_class(create_workflow())
+        assert call in code and 'TODO: Converter' not in code
+
+
+def test_unsupported_conditions_fail(capsys):
+    """Condições que não podem ser convertidas avisam na geração e falham ao executar."""
+    cases = {
+        'Data': (v2(condition('={{ $json.data }}', 'after', '2024-01-01', 'dateTime')), None),
+        'Metodo': (v2(condition('={{ $json.nome.toUpperCase() }}', 'equals', 'X')), None),
+        'Fantasma': (v2(condition('={{ $node["Fantasma 2"].json.x }}', 'exists')), None),
+    }
+    for name, (parameters, _) in cases.items():
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow = create_workflow({name: (parameters, None)})
+            workflow_class = load_generated_class(workflow, output_dir)
+            assert f"no nó '{name}'" in capsys.readouterr().out
+            with pytest.raises(NotImplementedError, match='condição do IF não suportada'):
+                workflow_class().run(INPUT)
+
+
+def test_conditions_runtime():
+    """As condições são avaliadas contra a saída do nó de entrada, os nós citados e a entrada do workflow."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(), output_dir)
+
+        class Loaded(workflow_class):
+            def carregar(self):
+                self.context['carregar_output'] = dict(LOADED)
+
+        context = Loaded().run(INPUT)
+        assert {key: context[key] for key in expected_results()} == expected_results()
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node não está instalado')
+def test_conditions_runtime_javascript():
+    """A classe JavaScript chega aos mesmos resultados que a Python."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = create_workflow()
+        generator = Generator(XMLLoader(), 'javascript')
+        generator.folder_structure = FolderStructure(output_dir)
+        assert generator.save_generated_code(workflow, generator.generate_class(workflow))
+        path = generator.folder_structure.get_output_file_path(workflow, 'javascript')
+
+        script = f"""
+            const Workflow = require({json.dumps(str(path))});
+            class Loaded extends Workflow {{
+                carregar() {{ this.context['carregar_output'] = {json.dumps(LOADED)}; }}
+            }}
+            new Loaded().run({json.dumps(INPUT)}).then(context => {{
+                const keys = {json.dumps(list(expected_results()))};
+                console.log(JSON.stringify(Object.fromEntries(keys.map(key => [key, context[key]]))));
+            }});
+        """
+        result = subprocess.run(['node', '-e', script], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == expected_results()
+
+
+if __name__ == "__main__":
+    test_conditions_parsed()
+    test_conditions_runtime()
+    print("\n✓ TESTE PASSOU")
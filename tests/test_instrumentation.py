@@ -0,0 +1,74 @@
+"""
+Teste do modo de instrumentação (métricas por nó) das classes geradas.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from helpers import create_plain_workflow, load_generated_class
+
+
+def test_instrumentation_disabled_generates_plain_calls():
+    """Sem instrumentação o código gerado não muda."""
+    for language in ('python', 'php', 'javascript'):
+        code = Generator(XMLLoader(), language).generate_class(create_plain_workflow())
+        assert 'nstrumented' not in code
+        assert 'NodeMetrics' not in code
+
+        instrumented = Generator(XMLLoader(), language, instrument=True).generate_class(create_plain_workflow())
+        assert 'NodeMetrics' in instrumented
+
+
+def test_instrumentation_metrics():
+    """Testa métricas por nó, contagem de erros e exportação Prometheus."""
+    print("=" * 60)
+    print("TESTE: Instrumentação por nó")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_plain_workflow(), output_dir, instrument=True)
+
+        workflow = workflow_class()
+        workflow.run()
+        workflow.run()
+
+        metrics = workflow.get_metrics()
+        assert list(metrics) == ['start', 'preparar', 'finalizar']
+        for stats in metrics.values():
+            assert stats['calls'] == 2
+            assert stats['errors'] == 0
+            assert stats['payload_bytes'] == 4  # '{}' serializado, duas vezes
+            assert 0 <= stats['min_seconds'] <= stats['avg_seconds'] <= stats['max_seconds']
+
+        # Erros são contados e a exceção é repassada
+        def fail():
+            raise RuntimeError('falha no nó')
+
+        workflow.preparar = fail
+        with pytest.raises(RuntimeError):
+            workflow.run()
+        metrics = workflow.get_metrics()
+        assert metrics['preparar']['errors'] == 1
+        assert metrics['finalizar']['calls'] == 2
+
+        text = workflow.get_metrics_prometheus()
+        assert '# TYPE n8ncoding_node_duration_seconds summary' in text
+        assert 'n8ncoding_node_errors_total{workflow="Teste Instrumentacao",node="preparar"} 1' in text
+        assert 'n8ncoding_node_duration_seconds_count{workflow="Teste Instrumentacao",node="start"} 3' in text
+        print(text)
+
+        workflow.reset_metrics()
+        assert workflow.get_metrics() == {}
+
+
+if __name__ == "__main__":
+    test_instrumentation_disabled_generates_plain_calls()
+    test_instrumentation_metrics()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,381 @@
+"""
+Teste de comportamento dos módulos de runtime JavaScript (templates/runtime/*.js).
+
+Cada teste executa um script no Node que usa o módulo e imprime os resultados
+em JSON; as verificações ficam do lado do Python, como nos testes dos
+runtimes Python. Os testes são ignorados quando o node não está instalado.
+"""
+import hashlib
+import json
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+RUNTIME_DIR = Path(__file__).parent.parent / 'templates' / 'runtime'
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node não está instalado')
+
+
+def run_node(script, cwd=None):
+    """
+    Executa um script no Node com runtime(nome) carregando templates/runtime/<nome>.js.
+
+    O script é o corpo de uma função async e devolve o resultado (serializado em JSON).
+    """
+    source = (f"const runtime = name => require({json.dumps(str(RUNTIME_DIR))} + '/' + name + '.js');\n"
+              f"(async () => {{\n{script}\n}})()"
+              ".then(result => { console.log(JSON.stringify(result)); process.exit(0); })"
+              ".catch(error => { console.error(error.stack || error); process.exit(1); });\n")
+    result = subprocess.run(['node', '-e', source], capture_output=True, text=True, cwd=cwd, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_ai_stream():
+    """Eventos SSE divididos em chunks arbitrários montam a resposta final dos dois formatos."""
+    result = run_node(r"""
+        const { consumeStream } = runtime('AiStream');
+        const split = (text, size) => (async function* () {
+            for (let i = 0; i < text.length; i += size) {
+                yield Buffer.from(text.slice(i, i + size));
+            }
+        })();
+        const openai = ': OPENROUTER PROCESSING\n\n'
+            + ['Olá', ', ', 'mundo'].map(token => 'data: ' + JSON.stringify(
+                { id: 'c1', model: 'gpt', choices: [{ delta: { content: token } }] }) + '\r\n\r\n').join('')
+            + 'data: ' + JSON.stringify({ choices: [{ delta: {}, finish_reason: 'stop' }],
+                                          usage: { total_tokens: 9 } }) + '\n\n'
+            + 'data: [DONE]\n\ndata: ignorado\n\n';
+        const tokens = [];
+        const response = await consumeStream(split(openai, 7), 'openai', token => tokens.push(token));
+
+        const anthropic = [
+            { type: 'message_start', message: { id: 'm1', model: 'claude', usage: { input_tokens: 5 } } },
+            { type: 'content_block_delta', delta: { text: 'Oi' } },
+            { type: 'message_delta', delta: { stop_reason: 'end_turn' }, usage: { output_tokens: 2 } },
+            { type: 'message_stop' }
+        ].map(event => 'data: ' + JSON.stringify(event) + '\n\n').join('');
+        const message = await consumeStream(split(anthropic, 5), 'anthropic');
+
+        let error = null;
+        try {
+            await consumeStream(['data: {"error": {"message": "limite"}}\n\n'], 'openai');
+        } catch (e) {
+            error = e.message;
+        }
+        return { tokens, response, message, error };
+    """)
+    assert result['tokens'] == ['Olá', ', ', 'mundo']
+    assert result['response']['choices'][0] == {'index': 0, 'message': {'role': 'assistant', 'content': 'Olá, mundo'},
+                                                'finish_reason': 'stop'}
+    assert result['response']['usage'] == {'total_tokens': 9} and result['response']['id'] == 'c1'
+    assert result['message']['content'] == [{'type': 'text', 'text': 'Oi'}]
+    assert result['message']['stop_reason'] == 'end_turn'
+    assert result['message']['usage'] == {'input_tokens': 5, 'output_tokens': 2}
+    assert 'limite' in result['error']
+
+
+def test_cassette():
+    """A gravação guarda as respostas e o replay as devolve em ordem, sem rede."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'cassete.jsonl')
+        result = run_node(f"""
+            const {{ Cassette, CassetteMissError }} = runtime('Cassette');
+            const path = {json.dumps(path)};
+            let calls = 0;
+            const fetchImpl = async (url, options) => new Response(
+                JSON.stringify({{ call: ++calls, body: JSON.parse(options.body) }}),
+                {{ status: 201, headers: {{ 'Content-Type': 'application/json' }} }});
+
+            const recorder = new Cassette(path, 'record');
+            for (const body of ['{{"a": 1, "b": 2}}', '{{"a": 1, "b": 2}}']) {{
+                await recorder.fetch('http://api/itens', {{ method: 'post', body }}, fetchImpl);
+            }}
+            const noContent = async () => new Response(null, {{ status: 204 }});
+            await recorder.fetch('http://api/vazio', {{ method: 'DELETE' }}, noContent);
+
+            // Replay: chaves do corpo em outra ordem, respostas em sequência e recomeçando
+            const player = new Cassette(path, 'replay');
+            const replayed = [];
+            for (let i = 0; i < 3; i++) {{
+                const response = await player.fetch('http://api/itens', {{ method: 'POST', body: '{{"b":2,"a":1}}' }});
+                replayed.push([response.status, (await response.json()).call]);
+            }}
+            const empty = await player.fetch('http://api/vazio', {{ method: 'DELETE' }});
+
+            let miss = null;
+            try {{
+                await player.fetch('http://api/outra', {{ method: 'GET' }});
+            }} catch (e) {{
+                miss = e instanceof CassetteMissError;
+            }}
+            return {{ calls, replayed, empty: empty.status, miss }};
+        """)
+        lines = [json.loads(line) for line in Path(path).read_text(encoding='utf-8').splitlines()]
+    assert result == {'calls': 2, 'replayed': [[201, 1], [201, 2], [201, 1]], 'empty': 204, 'miss': True}
+    assert [line['request']['method'] for line in lines] == ['POST', 'POST', 'DELETE']
+    assert json.loads(lines[0]['response']['body']) == {'call': 1, 'body': {'a': 1, 'b': 2}}
+
+
+def test_rate_limiter():
+    """A fila é FIFO, respeita as chamadas simultâneas, desiste no timeout e tryAcquire não espera."""
+    result = run_node("""
+        const { RateLimiter, estimateTokens, parseLimits, usageTokens } = runtime('RateLimiter');
+        const limiter = new RateLimiter({ maxInFlight: 1 });
+        const order = [];
+        const first = await limiter.acquire();
+        const waiting = [1, 2, 3].map(call => limiter.acquire().then(permit => {
+            order.push(call);
+            setTimeout(() => permit.release(), 10);
+        }));
+        const whileBusy = limiter.tryAcquire();
+        const queued = limiter.stats().queued;
+        // Com timeout: desiste no prazo e sai da fila
+        const timedOut = await limiter.acquire(0, 20).then(() => 'obtida', error => error.name);
+        const queuedAfterTimeout = limiter.stats().queued;
+        first.release();
+        first.release();
+        await Promise.all(waiting);
+        await new Promise(resolve => setTimeout(resolve, 30));
+        const idle = limiter.tryAcquire();
+
+        // Balde de 600 requisições por minuto: esvaziado sem espera, a próxima aguarda ~0,1 s
+        const rpm = new RateLimiter({ rpm: 600 });
+        let granted = 0;
+        while (rpm.tryAcquire() !== null) {
+            granted++;
+        }
+        const started = Date.now();
+        const second = await rpm.acquire();
+
+        const tpm = new RateLimiter({ tpm: 1000 });
+        (await tpm.acquire(500)).release({ total_tokens: 100 });
+        return {
+            order, whileBusy, queued, timedOut, queuedAfterTimeout, idle: idle !== null, stats: limiter.stats(),
+            rpmGranted: granted, rpmWait: second.wait, rpmElapsed: Date.now() - started,
+            tpmAvailable: tpm.tpm.available,
+            estimate: estimateTokens(['abcd'.repeat(10), null, 'xy'], 100),
+            usage: usageTokens({ input_tokens: 10, output_tokens: 5 }),
+            limits: parseLimits('rpm=500, tpm=90000,in_flight=8')
+        };
+    """)
+    assert result['order'] == [1, 2, 3]
+    assert result['whileBusy'] is None and result['queued'] == 3 and result['idle']
+    assert result['timedOut'] == 'TimeoutError' and result['queuedAfterTimeout'] == 3
+    assert result['stats']['calls'] == 5 and result['stats']['inFlight'] == 1
+    assert result['rpmGranted'] == 600 and result['rpmWait'] >= 0.05 and result['rpmElapsed'] >= 50
+    assert result['tpmAvailable'] == pytest.approx(900, abs=1)
+    assert (result['estimate'], result['usage']) == (111, 15)
+    assert result['limits'] == {'rpm': 500, 'tpm': 90000, 'maxInFlight': 8}
+
+
+def test_pagination():
+    """As páginas chegam sob demanda, com no máximo prefetch páginas à frente do consumo."""
+    result = run_node("""
+        const { PageStream } = runtime('Pagination');
+        const requested = [];
+        const pages = { 1: [1, 2], 2: [3], 3: [] };
+        const byParam = async url => {
+            requested.push(url);
+            return { status: 200, body: { data: pages[new URL(url).searchParams.get('page')] } };
+        };
+        const items = [];
+        for await (const item of new PageStream(byParam, 'http://api/itens?limite=2',
+                                                { mode: 'page_param', param: 'page' }, 1)) {
+            items.push(item);
+        }
+
+        const links = {
+            'http://api/a': { results: ['a'], next: '/b' },
+            'http://api/b': { results: ['b'], next: null }
+        };
+        const followed = [];
+        const stream = new PageStream(async url => ({ status: 200, body: links[url] }), 'http://api/a',
+                                      { mode: 'next_url', next_url: ['next'] }, 0);
+        for await (const item of stream) {
+            followed.push(item);
+        }
+
+        // Consumo parcial: a busca para no prefetch e close() interrompe o restante
+        const lazyRequests = [];
+        const endless = new PageStream(async url => {
+            lazyRequests.push(url);
+            return { status: 200, body: [url] };
+        }, 'http://api/lista', { mode: 'page_param', param: 'p', max_pages: 100 }, 2);
+        for await (const item of endless) {
+            break;
+        }
+        await new Promise(resolve => setTimeout(resolve, 20));
+
+        let error = null;
+        try {
+            for await (const item of new PageStream(async () => ({ status: 500, body: {} }), 'http://api/x',
+                                                    { mode: 'page_param', param: 'page' })) {
+            }
+        } catch (e) {
+            error = e.message;
+        }
+        return { items, requested, followed, pages: stream.pages, lazy: lazyRequests.length, error };
+    """)
+    assert result['items'] == [1, 2, 3]
+    assert result['requested'] == [f'http://api/itens?limite=2&page={page}' for page in (1, 2, 3)]
+    assert result['followed'] == ['a', 'b'] and result['pages'] == 2
+    assert result['lazy'] <= 3
+    assert result['error'].startswith('HTTP 500')
+
+
+def test_binary_data():
+    """O corpo é gravado em arquivo com tamanho, hash e nome derivados da resposta."""
+    chunks = [b'%PDF-1.4 ', b'\x00\x01' * 1000, b'fim']
+    with tempfile.TemporaryDirectory() as directory:
+        result = run_node(f"""
+            const {{ fileNameFrom, saveStream }} = runtime('BinaryData');
+            const chunks = {json.dumps([chunk.hex() for chunk in chunks])}.map(hex => Buffer.from(hex, 'hex'));
+            const file = await saveStream(chunks, {{ mimeType: 'application/pdf; charset=binary',
+                                                     fileName: null, directory: {json.dumps(directory)} }});
+            const content = await file.read();
+            const json = JSON.parse(JSON.stringify(file));
+            await file.delete();
+            return {{
+                json, length: content.length, exists: require('fs').existsSync(file.path),
+                names: [
+                    fileNameFrom('http://x/a.pdf', "attachment; filename*=UTF-8''relat%C3%B3rio.pdf"),
+                    fileNameFrom('http://x/a.pdf', 'attachment; filename="../nota.txt"'),
+                    fileNameFrom('http://x/docs/planilha%201.csv?v=2'),
+                    fileNameFrom('não é url')
+                ]
+            }};
+        """)
+    content = b''.join(chunks)
+    assert result['json']['size'] == result['length'] == len(content)
+    assert result['json']['sha256'] == hashlib.sha256(content).hexdigest()
+    assert result['json']['mimeType'] == 'application/pdf' and result['json']['path'].endswith('.pdf')
+    assert not result['exists']
+    assert result['names'] == ['relatório.pdf', 'nota.txt', 'planilha 1.csv', None]
+
+
+def test_checkpoint():
+    """Checkpoints são gravados, lidos e removidos por run id, inclusive ids inseguros."""
+    with tempfile.TemporaryDirectory() as directory:
+        result = run_node(f"""
+            const {{ createCheckpointStore }} = runtime('Checkpoint');
+            const store = createCheckpointStore('file:' + {json.dumps(directory)});
+            store.save('run-1', {{ completed: ['buscar'], context: {{ buscar_output: {{ ok: true }} }} }});
+            store.save('../fora', {{ completed: [] }});
+            const loaded = store.load('run-1');
+            const unsafe = store.load('../fora');
+            store.delete('run-1');
+            let error = null;
+            try {{
+                createCheckpointStore('redis');
+            }} catch (e) {{
+                error = e.message;
+            }}
+            return {{ loaded, unsafe, deleted: store.load('run-1'), missing: store.load('outro'), error,
+                      files: require('fs').readdirSync({json.dumps(directory)}) }};
+        """)
+    assert result['loaded']['completed'] == ['buscar']
+    assert result['loaded']['context'] == {'buscar_output': {'ok': True}} and result['loaded']['updatedAt'] > 0
+    assert result['unsafe']['completed'] == [] and result['deleted'] is None and result['missing'] is None
+    assert result['files'] == [hashlib.sha256(b'../fora').hexdigest() + '.json']
+    assert 'redis' in result['error']
+
+
+def test_response_cache():
+    """Cache em memória (LRU e TTL) e em arquivos, com chaves independentes da ordem."""
+    with tempfile.TemporaryDirectory() as directory:
+        result = run_node(f"""
+            const {{ createCache, makeCacheKey }} = runtime('ResponseCache');
+            const memory = createCache('memory:2');
+            memory.set('a', 1);
+            memory.set('b', 2);
+            memory.get('a');
+            memory.set('c', 3);
+            const lru = ['a', 'b', 'c'].map(key => memory.get(key).hit);
+            const ttl = createCache('memory');
+            ttl.set('curto', 1, 0.01);
+            ttl.set('longo', 2, 60);
+            await new Promise(resolve => setTimeout(resolve, 30));
+
+            const files = createCache('file:' + {json.dumps(directory)}, 60);
+            files.set('chave', {{ resposta: [1, 2] }});
+            files.set('expira', 'x', -1);
+            const reopened = createCache('file:' + {json.dumps(directory)});
+            return {{
+                lru,
+                ttl: ['curto', 'longo'].map(key => ttl.get(key).hit),
+                persisted: reopened.get('chave'),
+                expired: reopened.get('expira').hit,
+                sameKey: makeCacheKey('ai', [{{ a: 1, b: [1, {{ c: 2, d: 3 }}] }}])
+                    === makeCacheKey('ai', [{{ b: [1, {{ d: 3, c: 2 }}], a: 1 }}]),
+                otherNamespace: makeCacheKey('ai', [1]) === makeCacheKey('http', [1])
+            }};
+        """)
+    assert result['lru'] == [True, False, True] and result['ttl'] == [False, True]
+    assert result['persisted'] == {'hit': True, 'value': {'resposta': [1, 2]}}
+    assert not result['expired'] and result['sameKey'] and not result['otherNamespace']
+
+
+def test_webhook_server():
+    """Rotas, modos de resposta, erros e limite de requisições pendentes do servidor de webhooks."""
+    result = run_node("""
+        const { createWebhookServer } = runtime('WebhookServer');
+        let created = 0;
+        class Workflow {
+            constructor() { created++; }
+            async run(params) {
+                if (params.falhar) {
+                    throw new Error('falhou');
+                }
+                await new Promise(resolve => setTimeout(resolve, params.demora || 0));
+                return { pedido: params.id, resposta_output: { total: Number(params.total) }, webhook: params.webhook };
+            }
+        }
+        const routes = [
+            { method: 'POST', path: 'pedidos', node: 'receber', responseMode: 'lastNode' },
+            { method: 'GET', path: '/webhook/status/', node: 'status', responseMode: 'onReceived' }
+        ];
+        const server = createWebhookServer(() => new Workflow(), routes,
+                                           { poolSize: 1, maxPending: 1, responseKey: 'resposta_output' });
+        await new Promise(resolve => server.listen(0, '127.0.0.1', resolve));
+        const base = `http://127.0.0.1:${server.address().port}`;
+        const request = async (method, path, body = undefined, type = 'application/json') => {
+            const response = await fetch(base + path, { method, body, headers: { 'Content-Type': type } });
+            return [response.status, await response.json()];
+        };
+
+        const results = {
+            health: await request('GET', '/healthz'),
+            lastNode: await request('POST', '/webhook/pedidos?id=7', JSON.stringify({ total: '42' })),
+            form: await request('POST', '/webhook-test/pedidos/', 'total=5', 'application/x-www-form-urlencoded'),
+            onReceived: await request('GET', '/webhook/status'),
+            notFound: await request('GET', '/webhook/outro'),
+            notAllowed: await request('DELETE', '/webhook/pedidos'),
+            error: await request('POST', '/webhook/pedidos', JSON.stringify({ falhar: true }))
+        };
+        // Uma execução e uma pendente ocupam o pool; a terceira recebe 503
+        const slow = [1, 2].map(() => request('POST', '/webhook/pedidos', JSON.stringify({ demora: 200 })));
+        await new Promise(resolve => setTimeout(resolve, 50));
+        results.busy = await request('POST', '/webhook/pedidos', JSON.stringify({ total: 1 }));
+        results.slow = (await Promise.all(slow)).map(([status]) => status);
+        server.close();
+        return { ...results, created };
+    """)
+    assert result['health'] == [200, {'status': 'ok', 'poolSize': 1, 'inFlight': 0}]
+    assert result['lastNode'] == [200, {'total': 42}]
+    assert result['form'] == [200, {'total': 5}]
+    assert result['onReceived'] == [200, {'message': 'Workflow was started'}]
+    assert result['notFound'][0] == 404 and result['notAllowed'][0] == 405
+    assert result['error'] == [500, {'error': 'falhou', 'type': 'Error'}]
+    assert result['busy'][0] == 503 and result['slow'] == [200, 200]
+    assert result['created'] == 1
+
+
+if __name__ == "__main__":
+    if shutil.which('node'):
+        test_ai_stream()
+        test_rate_limiter()
+    print("\n✓ TESTE PASSOU")
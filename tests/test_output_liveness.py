@@ -0,0 +1,77 @@
+"""
+Teste da liberação das saídas dos nós após o último consumidor (liveness).
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from helpers import load_generated_class, node
+
+
+def create_workflow():
+    """Cria o workflow start -> carregar -> transformar -> salvar (+ referência a carregar)."""
+    return {
+        'id': 'test-liveness',
+        'name': 'Teste Liveness',
+        'nodes': [
+            node('node-1', 'Start', 'n8n-nodes-base.start', ['node-2']),
+            node('node-2', 'Carregar', 'n8n-nodes-base.noOp', ['node-3']),
+            node('node-3', 'Transformar', 'n8n-nodes-base.noOp', ['node-4']),
+            node('node-4', 'Salvar', 'n8n-nodes-base.noOp', [], {'dados': '={{ $node["Carregar"].json.itens }}'})
+        ]
+    }
+
+
+def test_output_releases_follow_last_consumer():
+    """Cada saída é liberada depois do último nó que a lê."""
+    generator = Generator(XMLLoader(), 'python')
+    releases = generator._determine_output_releases(
+        generator._determine_execution_order(create_workflow()['nodes'])
+    )
+    assert releases == {
+        'node-2': ['start_output'],
+        'node-4': ['carregar_output', 'transformar_output']
+    }
+
+    # Nós de código podem ler qualquer saída: nada é liberado antes deles
+    workflow = create_workflow()
+    workflow['nodes'][3]['type'] = 'n8n-nodes-base.code'
+    workflow['nodes'][3]['parameters'] = {}
+    releases = generator._determine_output_releases(generator._determine_execution_order(workflow['nodes']))
+    assert releases == {'node-4': ['start_output', 'carregar_output', 'transformar_output']}
+
+    for language, call in (('python', "self._release_outputs('start_output')"),
+                           ('javascript', "this._releaseOutputs('start_output');"),
+                           ('php', "$this->releaseOutputs('start_output');")):
+        assert call in Generator(XMLLoader(), language).generate_class(create_workflow())
+
+
+def test_output_liveness_runtime():
+    """Testa o contexto final com e sem retain_all."""
+    print("=" * 60)
+    print("TESTE: Liberação de saídas (liveness)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_workflow(), output_dir)
+
+        context = workflow_class().run()
+        outputs = sorted(key for key in context if key.endswith('_output'))
+        assert outputs == ['salvar_output']
+
+        debug = workflow_class()
+        debug.retain_all = True
+        outputs = sorted(key for key in debug.run() if key.endswith('_output'))
+        assert outputs == ['carregar_output', 'salvar_output', 'start_output', 'transformar_output']
+        print(f"✓ Contexto final: {outputs}")
+
+
+if __name__ == "__main__":
+    test_output_releases_follow_last_consumer()
+    test_output_liveness_runtime()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,223 @@
+"""
+Orçamentos de desempenho do conversor (gate de regressão).
+
+Os orçamentos ficam em tests/performance_budgets.json, versionado junto com o
+código. Cada orçamento tem um baseline gravado e um modo de comparação:
+
+- ratio: medido <= baseline * tolerância (tempos; absorve ruído da máquina)
+- delta: medido <= baseline + tolerância (inclinações log-log de escalabilidade)
+- max: medido <= baseline (limite fixo, não é regravado)
+
+Os orçamentos "ratio" são tempos absolutos, que dependem da máquina e da
+carga: só rodam com N8NCODING_PERF=1. Por padrão o pytest roda apenas as
+verificações estáveis (importação preguiçosa, inclinações e limites "max").
+
+A variável N8NCODING_PERF_TOLERANCE multiplica as tolerâncias dos orçamentos
+"ratio" (ex: 2 em máquinas de CI lentas). Para regravar os baselines depois
+de uma mudança intencional:
+
+    python tests/test_performance_budgets.py --record
+"""
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from synthetic_workflows import SyntheticWorkflowFactory
+from bench_generator import loglog_slope
+
+BUDGETS_FILE = Path(__file__).parent / 'performance_budgets.json'
+TEMPLATES_DIR = str(ROOT / 'templates')
+LANGUAGES = ['python', 'javascript', 'php']
+REPEAT = 3
+
+
+def best_seconds(function, *args) -> float:
+    """Melhor tempo de REPEAT execuções (a saída de avisos no stdout é descartada)."""
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            function(*args)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def scaling_slope(function, sizes) -> float:
+    """Inclinação log-log do tempo de function(workflow) em workflows sintéticos de vários tamanhos."""
+    factory = SyntheticWorkflowFactory()
+    points = [{'nodes': size, 'seconds': best_seconds(function, factory.create(size))} for size in sizes]
+    return loglog_slope(points)
+
+
+def generate_class_ms(language: str) -> float:
+    generator = Generator(XMLLoader(TEMPLATES_DIR), language)
+    return best_seconds(generator.generate_class, SyntheticWorkflowFactory().create(1000)) * 1000
+
+
+def generate_class_slope() -> float:
+    generator = Generator(XMLLoader(TEMPLATES_DIR), 'python')
+    return scaling_slope(generator.generate_class, [250, 500, 1000, 2000])
+
+
+def execution_order_slope() -> float:
+    generator = Generator(XMLLoader(TEMPLATES_DIR), 'python')
+    return scaling_slope(lambda workflow: generator._determine_execution_order(workflow['nodes']),
+                         [2000, 4000, 8000, 16000])
+
+
+def output_releases_slope() -> float:
+    generator = Generator(XMLLoader(TEMPLATES_DIR), 'python')
+    return scaling_slope(lambda workflow: generator._determine_output_releases(workflow['nodes']),
+                         [1000, 2000, 4000, 8000])
+
+
+def node_template_loads_per_type() -> float:
+    """Leituras de template de nó do disco por tipo de nó distinto (dois workflows, um XMLLoader)."""
+    loader = XMLLoader(TEMPLATES_DIR)
+    read_node_template = loader._read_node_template
+    reads = []
+    loader._read_node_template = lambda *args: reads.append(args) or read_node_template(*args)
+
+    generator = Generator(loader, 'python')
+    workflows = [SyntheticWorkflowFactory(seed=seed).create(200) for seed in (1, 2)]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for workflow in workflows:
+            generator.generate_class(workflow)
+    types = {generator.node_mapper.get_template_type(node) for workflow in workflows for node in workflow['nodes']}
+    return len(reads) / len(types)
+
+
+# Módulos que só devem ser importados quando o subsistema que os usa entra em ação
+LAZY_MODULES = ['requests', 'dotenv', 'xml.etree.ElementTree', 'sqlite3', 'n8n_client', 'generator', 'node_mapper',
+                'workflow_catalog']
+
+
+def import_times(module: str = 'main') -> dict:
+    """
+    Importa um módulo de src/ em um processo novo com python -X importtime.
+    
+    Returns:
+        Dicionário módulo importado -> tempo cumulativo em microssegundos
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT / 'src',
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_main_ms() -> float:
+    """Tempo cumulativo de importação de src/main.py (-X importtime, melhor de REPEAT)."""
+    return min(import_times()['main'] for _ in range(REPEAT)) / 1000
+
+
+# Nome do orçamento -> função que mede o valor atual
+MEASUREMENTS = {
+    **{f'generate_class_1000_nodes_ms.{language}': (lambda language=language: generate_class_ms(language))
+       for language in LANGUAGES},
+    'generate_class_scaling_slope': generate_class_slope,
+    'execution_order_scaling_slope': execution_order_slope,
+    'output_releases_scaling_slope': output_releases_slope,
+    'node_template_loads_per_type': node_template_loads_per_type,
+    'import_main_ms': import_main_ms
+}
+
+
+def load_budgets() -> dict:
+    return json.loads(BUDGETS_FILE.read_text(encoding='utf-8'))
+
+
+def check_budget(budget: dict, measured: float) -> bool:
+    """Compara um valor medido com o orçamento (modos ratio, delta e max)."""
+    mode = budget['mode']
+    if mode == 'ratio':
+        scale = float(os.getenv('N8NCODING_PERF_TOLERANCE', '1'))
+        return measured <= budget['baseline'] * budget['tolerance'] * scale
+    if mode == 'delta':
+        return measured <= budget['baseline'] + budget['tolerance']
+    return measured <= budget['baseline']
+
+
+def test_budgets_file_covers_measurements():
+    """Todo orçamento tem uma medição e vice-versa."""
+    budgets = load_budgets()
+    assert budgets['version'] == 1
+    assert set(budgets['budgets']) == set(MEASUREMENTS)
+
+
+def test_check_budget_modes():
+    """Os modos de comparação aplicam a tolerância como documentado."""
+    assert check_budget({'mode': 'ratio', 'baseline': 100, 'tolerance': 2}, 199)
+    assert not check_budget({'mode': 'ratio', 'baseline': 100, 'tolerance': 2}, 201)
+    assert check_budget({'mode': 'delta', 'baseline': 1.0, 'tolerance': 0.25}, 1.2)
+    assert not check_budget({'mode': 'delta', 'baseline': 1.0, 'tolerance': 0.25}, 2.0)
+    assert not check_budget({'mode': 'max', 'baseline': 1}, 1.5)
+
+
+def test_main_import_is_lazy():
+    """Importar a CLI não importa o cliente HTTP, o dotenv, o parser XML nem o gerador."""
+    imported = import_times()
+    assert 'main' in imported
+    assert [module for module in LAZY_MODULES if module in imported] == []
+
+
+# Orçamentos de tempo absoluto (modo ratio) rodam só quando pedidos
+PERF_ENABLED = os.getenv('N8NCODING_PERF') == '1'
+
+
+def budget_params():
+    """Parâmetros de test_performance_budget: os orçamentos ratio são pulados sem N8NCODING_PERF=1."""
+    budgets = load_budgets()['budgets']
+    skip_timing = pytest.mark.skipif(not PERF_ENABLED, reason='orçamento de tempo absoluto (use N8NCODING_PERF=1)')
+    return [pytest.param(name, marks=skip_timing) if budgets[name]['mode'] == 'ratio' else name
+            for name in sorted(MEASUREMENTS)]
+
+
+@pytest.mark.parametrize('name', budget_params())
+def test_performance_budget(name):
+    """O valor medido cabe no orçamento gravado."""
+    budget = load_budgets()['budgets'][name]
+    measured = MEASUREMENTS[name]()
+    assert check_budget(budget, measured), (
+        f"{name}: {measured:.3f} fora do orçamento ({budget['mode']}, baseline {budget['baseline']}, "
+        f"tolerância {budget.get('tolerance')}); {budget.get('description', '')}"
+    )
+
+
+def record_baselines() -> None:
+    """Regrava os baselines dos orçamentos ratio e delta com as medições desta máquina."""
+    budgets = load_budgets()
+    for name, budget in budgets['budgets'].items():
+        measured = MEASUREMENTS[name]()
+        if budget['mode'] != 'max':
+            budget['baseline'] = round(measured, 2)
+        print(f"{name}: {measured:.3f}")
+    BUDGETS_FILE.write_text(json.dumps(budgets, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+if __name__ == "__main__":
+    if '--record' in sys.argv:
+        record_baselines()
+    else:
+        test_budgets_file_covers_measurements()
+        test_check_budget_modes()
+        test_main_import_is_lazy()
+        for budget_name in sorted(MEASUREMENTS):
+            test_performance_budget(budget_name)
+        print("\n✓ TESTE PASSOU")
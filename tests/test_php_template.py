@@ -19,7 +19,7 @@ def create_test_workflow():
             {
                 'id': 'node-1',
                 'name': 'Start',
-                'type': 'n8n-nodes-start',
+                'type': 'n8n-nodes-base.start',
                 'parameters': {},
                 'connections': {
                     'main': {
@@ -30,7 +30,7 @@ def create_test_workflow():
             {
                 'id': 'node-2',
                 'name': 'HTTP Request',
-                'type': 'n8n-nodes-httpRequest',
+                'type': 'n8n-nodes-base.httpRequest',
                 'parameters': {
                     'url': 'https://api.example.com/test',
                     'method': 'GET'
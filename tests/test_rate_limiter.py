@@ -0,0 +1,179 @@
+"""
+Teste do limitador de taxa (RPM, TPM e chamadas simultâneas) dos nós AI Agent.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from RateLimiter import (RateLimiter, configure_rate_limit, estimate_tokens, get_rate_limiter, parse_limits,
+                         usage_tokens)
+from helpers import create_streaming_workflow, load_generated_class, StubSSEHandler
+
+
+def test_estimates_and_limits_spec():
+    """Estimativa de tokens, leitura do 'usage' e da especificação dos limites."""
+    assert estimate_tokens(['abcd' * 10, None, 'xy'], 100) == 111
+    assert usage_tokens({'total_tokens': 42}) == 42
+    assert usage_tokens({'input_tokens': 10, 'output_tokens': 5}) == 15
+    assert usage_tokens({}) is None
+    assert parse_limits('rpm=500, tpm=90000,in_flight=8') == {'rpm': 500.0, 'tpm': 90000.0, 'max_in_flight': 8}
+    assert parse_limits('') == {}
+    with pytest.raises(ValueError):
+        parse_limits('rps=1')
+
+
+def test_rpm_queue_is_fifo_and_reports_wait():
+    """Chamadas acima do RPM aguardam na ordem de chegada."""
+    limiter = RateLimiter(rpm=1200)  # uma chamada a cada 50 ms
+    limiter.rpm.available = 0
+    order, waits = [], {}
+
+    def call(index):
+        permit = limiter.acquire()
+        order.append(index)
+        waits[index] = permit.wait
+        permit.release()
+
+    threads = []
+    for index in range(4):
+        threads.append(threading.Thread(target=call, args=(index,)))
+        threads[-1].start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert order == [0, 1, 2, 3]
+    assert waits[3] >= 0.1
+    assert limiter.stats()['calls'] == 4
+    assert limiter.stats()['total_wait'] >= sum(waits.values()) - 1e-9
+
+
+def test_max_in_flight_and_tpm_correction():
+    """O limite de chamadas simultâneas é respeitado e o TPM usa o consumo real."""
+    limiter = RateLimiter(max_in_flight=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call():
+        permit = limiter.acquire()
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        permit.release()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    stats = limiter.stats()
+    assert (stats['calls'], stats['in_flight'], stats['queued']) == (6, 0, 0)
+
+    limiter = RateLimiter(tpm=1000)
+    permit = limiter.acquire(500)
+    permit.release({'total_tokens': 100})
+    permit.release({'total_tokens': 100})
+    assert limiter.tpm.available == pytest.approx(900, abs=1)
+
+
+def test_acquire_gives_up_at_timeout():
+    """Uma espera com timeout desiste no prazo e sai da fila sem travar as seguintes."""
+    limiter = RateLimiter(max_in_flight=1)
+    held = limiter.acquire()
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+    assert 0.05 <= time.monotonic() - started < 0.5
+    assert limiter.stats()['queued'] == 0
+    held.release()
+    limiter.acquire(timeout=0.05).release()
+
+    limiter = RateLimiter(rpm=60)  # uma chamada por segundo
+    limiter.rpm.available = 0
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+    assert time.monotonic() - started < 0.5
+
+
+def test_generated_ai_agent_waits_within_deadline():
+    """A espera do nó AI Agent pelo limitador termina junto com o prazo da execução."""
+    previous_key = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+    limiter = configure_rate_limit('openai', max_in_flight=1)
+    held = limiter.acquire()
+
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_streaming_workflow('http://127.0.0.1:9/v1'), output_dir)
+            started = time.monotonic()
+            with pytest.raises(TimeoutError):
+                workflow_class().run({'deadline': 0.1})
+            assert time.monotonic() - started < 1
+            assert limiter.stats()['calls'] == 1
+    finally:
+        held.release()
+        configure_rate_limit('openai')
+        if previous_key is None:
+            os.environ.pop('OPENAI_API_KEY', None)
+        else:
+            os.environ['OPENAI_API_KEY'] = previous_key
+
+
+def test_generated_ai_agent_waits_for_its_turn():
+    """Os nós AI Agent de instâncias paralelas compartilham o limitador do provedor."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubSSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous_key = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+    limiter = configure_rate_limit('openai', max_in_flight=1)
+
+    try:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_streaming_workflow(base_url), output_dir)
+            contexts = list(workflow_class().run_many([{'stream': True}] * 3, workers=3))
+
+        waits = sorted(context['aiAgent_output']['rate_limit_wait'] for context in contexts)
+        assert all(context['aiAgent_output']['success'] for context in contexts)
+        assert waits[1] >= 0.15 and waits[2] >= 2 * 0.15
+        assert limiter.stats()['calls'] == 3
+    finally:
+        configure_rate_limit('openai')
+        server.shutdown()
+        if previous_key is None:
+            os.environ.pop('OPENAI_API_KEY', None)
+        else:
+            os.environ['OPENAI_API_KEY'] = previous_key
+
+
+def test_limits_from_environment(monkeypatch):
+    """Provedores sem configuração explícita usam N8NCODING_RATE_LIMIT_<PROVEDOR>."""
+    monkeypatch.setenv('N8NCODING_RATE_LIMIT_MY_PROVIDER', 'rpm=60,in_flight=3')
+    limiter = get_rate_limiter('my-provider')
+    assert limiter.rpm.capacity == 60 and limiter.tpm is None and limiter.max_in_flight == 3
+    assert get_rate_limiter('MY-PROVIDER') is limiter
+
+
+if __name__ == "__main__":
+    test_estimates_and_limits_spec()
+    test_rpm_queue_is_fifo_and_reports_wait()
+    test_max_in_flight_and_tpm_correction()
+    test_acquire_gives_up_at_timeout()
+    test_generated_ai_agent_waits_within_deadline()
+    test_generated_ai_agent_waits_for_its_turn()
+    print("\n✓ TESTE PASSOU")
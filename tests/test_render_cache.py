@@ -0,0 +1,101 @@
+"""
+Teste do cache de renderização dos métodos dos nós (RenderCache).
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from node_mapper import NodeMapper
+from render_cache import RenderCache
+from helpers import node
+
+
+def create_catalogue(count):
+    """Workflows diferentes que repetem os mesmos nós (mesma API interna, mesmo agente)."""
+    return [{
+        'id': f'wf-{index}',
+        'name': f'Workflow {index}',
+        'nodes': [
+            node(f'{index}-1', 'Buscar Pedidos', 'n8n-nodes-base.httpRequest', [f'{index}-2'],
+                 {'url': 'http://api.interna/pedidos', 'method': 'GET', 'options': {'headers': {'X-Id': '1'}}}),
+            node(f'{index}-2', 'Resumir', '@n8n/n8n-nodes-langchain.agent', [f'{index}-3'],
+                 {'prompt': 'Resuma ' * 40, 'model': 'gpt-4'}),
+            node(f'{index}-3', f'Notificar {index}', 'n8n-nodes-base.httpRequest', [],
+                 {'url': 'http://api.interna/avisos', 'method': 'POST', 'body': {'workflow': index}})
+        ]
+    } for index in range(count)]
+
+
+def test_cached_rendering_matches_and_skips_work(monkeypatch):
+    """Nós repetidos saem do cache com código e recursos idênticos aos renderizados."""
+    renders = []
+    render_method = NodeMapper._render_method
+    monkeypatch.setattr(NodeMapper, '_render_method',
+                        lambda self, *args: renders.append(args[2]) or render_method(self, *args))
+
+    workflows = create_catalogue(10)
+    xml_loader = XMLLoader()
+    for language in ('php', 'python', 'javascript'):
+        for options in ({}, {'shared_runtime': True}, {'resource_threshold': 100}):
+            render_cache = RenderCache()
+            for workflow in workflows:
+                expected = Generator(xml_loader, language, **options)
+                expected_code = expected.generate_class(workflow)
+                cached = Generator(xml_loader, language, render_cache=render_cache, **options)
+                assert cached.generate_class(workflow) == expected_code
+                assert cached.resources == expected.resources
+                assert cached.node_mapper.uses_shared_runtime == expected.node_mapper.uses_shared_runtime
+
+            # 2 nós repetidos em 10 workflows: só o primeiro de cada é renderizado
+            assert render_cache.report() == {'hits': 18, 'misses': 12, 'evictions': 0,
+                                             'entries': 12, 'hit_rate': 0.6}
+    assert len(renders) == 3 * 3 * (30 + 12)
+
+    # Parâmetros na ordem inversa produzem a mesma chave
+    reordered = create_catalogue(1)[0]
+    parameters = reordered['nodes'][0]['parameters']
+    reordered['nodes'][0]['parameters'] = dict(reversed(list(parameters.items())))
+    Generator(xml_loader, 'javascript', render_cache=render_cache,
+              resource_threshold=100).generate_class(reordered)
+    assert render_cache.stats['hits'] == 18 + 3
+
+
+def test_lru_eviction_and_persistence():
+    """O cache descarta os menos usados e, persistido, é reaproveitado na próxima execução."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'render_cache.json'
+        render_cache = RenderCache(str(path), max_entries=2)
+        render_cache.put('a', {'code': 'A'})
+        render_cache.put('b', {'code': 'B'})
+        assert render_cache.get('a') == {'code': 'A'}
+        render_cache.put('c', {'code': 'C'})
+        assert render_cache.get('b') is None and render_cache.stats['evictions'] == 1
+        assert render_cache.save() and not render_cache.save()  # sem entradas novas
+
+        reloaded = RenderCache(str(path), max_entries=2)
+        assert len(reloaded) == 2 and reloaded.get('a') == {'code': 'A'}
+        reloaded.put('d', {'code': 'D'})
+        assert reloaded.get('c') is None  # 'a' foi usado depois de 'c'
+
+        # Execução seguinte de um lote: todos os nós vêm do arquivo
+        workflow = create_catalogue(1)[0]
+        first = RenderCache(str(path.with_name('lote.json')))
+        code = Generator(XMLLoader(), 'php', render_cache=first).generate_class(workflow)
+        first.save()
+        second = RenderCache(str(path.with_name('lote.json')))
+        assert Generator(XMLLoader(), 'php', render_cache=second).generate_class(workflow) == code
+        assert second.report()['hit_rate'] == 1.0
+
+        # Arquivo corrompido é ignorado
+        path.write_text('{', encoding='utf-8')
+        assert len(RenderCache(str(path))) == 0
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_persistence()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,99 @@
+"""
+Teste dos arquivos de recurso para literais grandes (corpos JSON e prompts).
+"""
+import json
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from helpers import EchoHandler, load_generated_class, node
+
+LARGE_BODY = {'itens': [{'id': i, 'descricao': f'Produto número {i}', 'ativo': i % 2 == 0} for i in range(300)]}
+LONG_PROMPT = 'Você é um assistente que resume relatórios financeiros. ' * 100
+
+
+def create_workflow(url, body):
+    """Cria um workflow com um POST de corpo estático e um AI Agent com prompt longo."""
+    return {
+        'id': 'test-resources',
+        'name': 'Teste Resources',
+        'nodes': [
+            node('node-1', 'Enviar', 'n8n-nodes-base.httpRequest', [], {'url': url, 'method': 'POST', 'body': body}),
+            node('node-2', 'Resumir', '@n8n/n8n-nodes-langchain.agent', [], {'prompt': LONG_PROMPT})
+        ]
+    }
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_large_literals_become_resources():
+    """Literais acima do limite saem do código nas três linguagens; os pequenos continuam inline."""
+    workflow = create_workflow('http://x', LARGE_BODY)
+    expected = {'python': ("self._resource('enviar.body.json')", "self._resource('resumir.prompt.txt')"),
+                'javascript': ("this._resource('enviar.body.json')", "this._resource('resumir.prompt.txt')"),
+                'php': ("$this->resource('enviar.body.json')", "$this->resource('resumir.prompt.txt')")}
+    for language, snippets in expected.items():
+        generator = Generator(XMLLoader(), language)
+        code = generator.generate_class(workflow)
+        for snippet in snippets:
+            assert snippet in code
+        assert 'Produto número 299' not in code and LONG_PROMPT not in code
+        assert generator.folder_structure.get_resources_dir(workflow, language).name in code
+        assert json.loads(generator.resources['enviar.body.json']) == LARGE_BODY
+        assert generator.resources['resumir.prompt.txt'] == LONG_PROMPT
+
+    small = create_workflow('http://x', {'id': 1, 'ativo': True, 'nome': "D'Ávila", 'tags': []})
+    small['nodes'] = small['nodes'][:1]
+    generator = Generator(XMLLoader(), 'python')
+    assert '_resource(' not in generator.generate_class(small)
+    assert generator.resources == {}
+    # Inline, o corpo é um literal válido da linguagem (array associativo em PHP)
+    assert "$body = ['id' => 1, 'ativo' => true, 'nome' => 'D\\'Ávila', 'tags' => []];" in \
+        Generator(XMLLoader(), 'php').generate_class(small)
+
+    disabled = Generator(XMLLoader(), 'python', resource_threshold=None)
+    assert '_resource(' not in disabled.generate_class(workflow)
+
+
+def test_resources_saved_and_loaded_once(base_url):
+    """Os recursos são gravados ao lado da classe, lidos no primeiro uso e removidos quando somem."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow = create_workflow(f'{base_url}/eco', LARGE_BODY)
+        workflow['nodes'] = workflow['nodes'][:1]
+        workflow_class = load_generated_class(workflow, output_dir)
+
+        resources_dir = FolderStructure(output_dir).get_resources_dir(workflow, 'python')
+        assert sorted(path.name for path in resources_dir.iterdir()) == ['enviar.body.json']
+
+        assert workflow_class._resources == {}
+        assert workflow_class().run()['enviar_output'] == LARGE_BODY
+        cached = workflow_class._resources['enviar.body.json']
+        assert workflow_class().run()['enviar_output'] == LARGE_BODY
+        assert workflow_class._resources['enviar.body.json'] is cached
+
+        # Regenerar sem literais grandes remove a pasta de recursos antiga
+        workflow['nodes'][0]['parameters']['body'] = {'id': 1}
+        load_generated_class(workflow, output_dir)
+        assert not resources_dir.exists()
+
+
+if __name__ == "__main__":
+    test_large_literals_become_resources()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,98 @@
+"""
+Teste do cache de respostas dos nós HTTP Request e AI Agent.
+"""
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ResponseCache import MemoryCache, SqliteCache, FileCache, create_cache, make_cache_key
+from helpers import StubHandler, create_http_workflow, load_generated_class
+
+
+def test_cache_backends():
+    """Testa TTL, LRU e persistência dos backends de cache."""
+    key = make_cache_key('http', ['url', 'GET', {'b': 1, 'a': 2}, None])
+    assert key == make_cache_key('http', ['url', 'GET', {'a': 2, 'b': 1}, None])
+    assert key != make_cache_key('http', ['url', 'POST', {'a': 2, 'b': 1}, None])
+
+    memory = MemoryCache(max_entries=2)
+    memory.set('a', 1)
+    memory.set('b', 2)
+    memory.get('a')
+    memory.set('c', 3)
+    assert memory.get('a') == (True, 1)
+    assert memory.get('b') == (False, None)
+
+    memory.set('ttl', 'x', ttl=0.05)
+    time.sleep(0.1)
+    assert memory.get('ttl') == (False, None)
+
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_cache = SqliteCache(str(Path(directory) / 'cache.db'))
+        sqlite_cache.set('k', {'resposta': [1, 2]})
+        assert SqliteCache(str(Path(directory) / 'cache.db')).get('k') == (True, {'resposta': [1, 2]})
+
+        file_cache = create_cache(f'file:{directory}/files', ttl=60)
+        assert isinstance(file_cache, FileCache)
+        file_cache.set('k', 'valor')
+        assert FileCache(f'{directory}/files').get('k') == (True, 'valor')
+        file_cache.set('expira', 'valor', ttl=-1)
+        assert file_cache.get('expira') == (False, None)
+
+
+def test_response_cache():
+    """Testa acertos, falhas e bypass do cache em uma classe gerada."""
+    print("=" * 60)
+    print("TESTE: Cache de respostas")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_http_workflow(base_url), output_dir)
+
+            # Sem cache configurado as requisições sempre são executadas
+            StubHandler.hits = 0
+            workflow_class().run()
+            assert StubHandler.hits == 2
+
+            cache = MemoryCache()
+            StubHandler.hits = 0
+            first = workflow_class()
+            first.retain_all = True  # mantém a saída intermediária para comparação
+            first.set_response_cache(cache)
+            context = first.run()
+            assert first.get_cache_stats() == {'hits': 0, 'misses': 1, 'bypass': 1}
+
+            second = workflow_class()
+            second.retain_all = True
+            second.set_response_cache(cache)
+            cached_context = second.run()
+            assert second.get_cache_stats() == {'hits': 1, 'misses': 0, 'bypass': 1}
+            assert cached_context['buscarDados_output'] == context['buscarDados_output']
+            assert StubHandler.hits == 3
+            print(f"✓ Cache: {second.get_cache_stats()}")
+
+            # Restrição por nó
+            third = workflow_class()
+            third.set_response_cache(MemoryCache(), nodes=['enviarDados'])
+            third.run()
+            assert third.get_cache_stats() == {'hits': 0, 'misses': 0, 'bypass': 1}
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_cache_backends()
+    test_response_cache()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,131 @@
+"""
+Teste da execução em lote (run_many) das classes geradas.
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from helpers import create_plain_workflow, load_generated_class
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Servidor stub lento que registra quantas requisições ficam simultâneas."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    ports = set()
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.active += 1
+            SlowHandler.max_active = max(SlowHandler.max_active, SlowHandler.active)
+            SlowHandler.ports.add(self.client_address[1])
+        time.sleep(0.05)
+        with SlowHandler.lock:
+            SlowHandler.active -= 1
+
+        payload = json.dumps({'ok': True}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_run_many_is_generated_for_every_language():
+    """Todas as linguagens expõem a execução em lote."""
+    expected = {'python': 'def run_many(', 'php': 'function runMany(', 'javascript': 'async *runMany('}
+    for language, signature in expected.items():
+        code = Generator(XMLLoader(), language).generate_class(create_plain_workflow())
+        assert signature in code
+        assert '{{shared_setup}}' not in code
+
+
+def test_run_many_order_and_concurrency():
+    """Resultados saem na ordem dos itens, com concorrência e conexões limitadas."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        workflow = {
+            'id': 'test-run-many',
+            'name': 'Teste Run Many',
+            'nodes': [{
+                'id': 'node-1',
+                'name': 'Buscar',
+                'type': 'n8n-nodes-base.httpRequest',
+                'parameters': {'url': f'http://127.0.0.1:{server.server_address[1]}/item', 'method': 'GET'},
+                'connections': {}
+            }]
+        }
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(workflow, output_dir, instrument=True)
+            instance = workflow_class()
+            instance.retain_all = True
+
+            read = []
+
+            def items():
+                for index in range(12):
+                    read.append(index)
+                    yield {'item': index}
+
+            results = instance.run_many(items(), batch_size=4, workers=3)
+            first = next(results)
+            assert first['item'] == 0
+            assert len(read) == 4  # somente a janela foi lida
+
+            contexts = [first, *results]
+            assert [context['item'] for context in contexts] == list(range(12))
+            assert all(context['buscar_output'] == {'ok': True} for context in contexts)
+            assert 1 < SlowHandler.max_active <= 3
+
+            # Cópias compartilham sessão HTTP (pool de conexões) e métricas
+            assert len(SlowHandler.ports) <= 3
+            assert instance.get_metrics()['buscar']['calls'] == 12
+    finally:
+        server.shutdown()
+
+
+def test_run_many_errors():
+    """Erros interrompem o lote ou são entregues no lugar do resultado."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        workflow_class = load_generated_class(create_plain_workflow(), output_dir)
+
+        class Failing(workflow_class):
+            def preparar(self):
+                if self.context.get('falhar'):
+                    raise ValueError(f"item {self.context['item']}")
+                super().preparar()
+
+        items = [{'item': 0}, {'item': 1, 'falhar': True}, {'item': 2}]
+
+        results = list(Failing().run_many(items, workers=2, return_exceptions=True))
+        assert [result['item'] for result in (results[0], results[2])] == [0, 2]
+        assert isinstance(results[1], ValueError)
+
+        with pytest.raises(ValueError, match='item 1'):
+            list(Failing().run_many(items, workers=1))
+
+
+if __name__ == "__main__":
+    test_run_many_is_generated_for_every_language()
+    test_run_many_order_and_concurrency()
+    test_run_many_errors()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,133 @@
+"""
+Teste do runtime compartilhado dos nós (output.shared_runtime).
+"""
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from helpers import EchoHandler, load_generated_class, node, StubSSEHandler, TOKENS
+
+# Linha do corpo de cada template de HTTP Request (só aparece quando o nó é gerado inline)
+INLINE_MARKERS = {
+    'python': "binary = response_format == 'file'",
+    'javascript': "const binary = responseFormat === 'file'",
+    'php': "$binary = $responseFormat === 'file'"
+}
+
+
+def create_workflow(count, url='http://x', ai_url='http://x/v1'):
+    """Cria um workflow com `count` nós HTTP Request em cadeia e um AI Agent no fim."""
+    nodes = [node(f'node-{index}', f'Enviar {index}', 'n8n-nodes-base.httpRequest', [f'node-{index + 1}'],
+                  {'url': url, 'method': 'POST', 'body': {'pedido': index}})
+             for index in range(count)]
+    nodes.append(node(f'node-{count}', 'Resumir', '@n8n/n8n-nodes-langchain.agent', [],
+                      {'prompt': 'Diga olá', 'model': 'gpt-4', 'options': {'baseURL': ai_url}}))
+    return {'id': 'test-shared-runtime', 'name': 'Teste Shared Runtime', 'nodes': nodes}
+
+
+def test_classes_keep_only_node_config():
+    """Com o runtime compartilhado a classe guarda só a configuração de cada nó."""
+    workflow = create_workflow(20)
+    for language, marker in INLINE_MARKERS.items():
+        inline = Generator(XMLLoader(), language).generate_class(workflow)
+        generator = Generator(XMLLoader(), language, shared_runtime=True)
+        shared = generator.generate_class(workflow)
+
+        assert inline.count(marker) == 20 and marker not in shared
+        assert 'NodeRuntime' in shared and len(shared) < len(inline) * 0.6
+        runtime = generator.shared_runtime_code()
+        assert runtime.count(marker) == 1 and '{{' not in runtime
+        assert generator.shared_runtime_code() is runtime  # renderizado uma vez
+
+    # Sem a opção nada muda; nós com tools continuam inline
+    assert 'NodeRuntime' not in Generator(XMLLoader(), 'python').generate_class(workflow)
+    workflow['nodes'][-1]['parameters']['tools'] = [{'name': 'buscar', 'description': 'Busca'}]
+    code = Generator(XMLLoader(), 'php', shared_runtime=True).generate_class(workflow)
+    assert '$this->ai_agent(' not in code and '$this->http_request(' in code
+
+
+def test_runtime_module_is_valid_and_saved_once():
+    """O runtime é gravado uma vez na pasta de runtime e compila em Python e JavaScript."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        for language in ('python', 'javascript', 'php'):
+            generator = Generator(XMLLoader(), language, shared_runtime=True)
+            generator.folder_structure = FolderStructure(output_dir)
+            workflow = create_workflow(2)
+            assert generator.save_generated_code(workflow, generator.generate_class(workflow))
+
+            runtime_path = generator.folder_structure.get_shared_runtime_path(language)
+            assert runtime_path.read_text(encoding='utf-8') == generator.shared_runtime_code()
+            modified = runtime_path.stat().st_mtime_ns
+            other = Generator(XMLLoader(), language, shared_runtime=True)
+            other.folder_structure = FolderStructure(output_dir)
+            assert other.save_generated_code(workflow, other.generate_class(workflow))
+            assert runtime_path.stat().st_mtime_ns == modified
+
+        runtime_dir = FolderStructure(output_dir).runtime_dir
+        py_compile.compile(str(runtime_dir / 'NodeRuntime.py'), doraise=True)
+        if shutil.which('node'):
+            for path in (runtime_dir / 'NodeRuntime.js', Path(output_dir) / 'javascript' / 'Teste_Shared_Runtime.js'):
+                assert subprocess.run(['node', '--check', str(path)]).returncode == 0
+
+
+@pytest.fixture
+def servers():
+    started = []
+    for handler in (EchoHandler, StubSSEHandler):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append(server)
+    previous_key = os.environ.get('OPENAI_API_KEY')
+    os.environ['OPENAI_API_KEY'] = 'test-key'
+    yield [f'http://127.0.0.1:{server.server_address[1]}' for server in started]
+    if previous_key is None:
+        os.environ.pop('OPENAI_API_KEY', None)
+    else:
+        os.environ['OPENAI_API_KEY'] = previous_key
+    for server in started:
+        server.shutdown()
+
+
+def test_shared_runtime_runs_like_inline(servers):
+    """A classe com runtime compartilhado produz o mesmo resultado que a inline."""
+    echo_url, ai_url = servers
+    workflow = create_workflow(3, f'{echo_url}/eco', f'{ai_url}/v1')
+    results = []
+    for shared_runtime in (False, True):
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(workflow, output_dir, shared_runtime=shared_runtime)
+            instance = workflow_class()
+            tokens = []
+            instance.set_token_callback(lambda token, output_key: tokens.append(token))
+            instance.retain_all = True
+            context = instance.run()
+            assert tokens == TOKENS
+            results.append({key: value for key, value in context.items() if key.endswith('_output')})
+
+    inline, shared = results
+    assert shared['enviar2_output'] == {'pedido': 2}
+    assert shared['resumir_output']['response'] == ''.join(TOKENS)
+    for output in (inline, shared):
+        output['resumir_output'].pop('rate_limit_wait')
+    assert shared == inline
+
+
+if __name__ == "__main__":
+    test_classes_keep_only_node_config()
+    test_runtime_module_is_valid_and_saved_once()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,114 @@
+"""
+Teste da tabela de símbolos dos workflows (nomes de métodos e chaves de saída).
+"""
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from node_mapper import NodeMapper
+from helpers import load_generated_class, node
+
+METHOD_PATTERNS = {
+    'python': re.compile(r'def (\w+)\(self\) -> None'),
+    'javascript': re.compile(r'^    (?:async )?(\w+)\(\) \{', re.MULTILINE),
+    'php': re.compile(r'private function (\w+)\(\): void')
+}
+
+
+def create_workflow(*names, node_type='n8n-nodes-base.set'):
+    """Cria um workflow com um nó por nome, em cadeia."""
+    return {
+        'id': 'test-symbols',
+        'name': 'Teste Simbolos',
+        'nodes': [node(f'node-{index}', name, node_type, [f'node-{index + 1}'] if index < len(names) - 1 else [], {})
+                  for index, name in enumerate(names)]
+    }
+
+
+def test_names_are_unique_and_legal():
+    """Nomes que viram o mesmo identificador recebem sufixos; reservados e membros da classe são evitados."""
+    workflow = create_workflow('Send Email', 'send-email', 'SEND EMAIL', 'sendEmail2', 'Run', 'lambda',
+                               'constructor', 'echo', 'Get Context')
+    generator = Generator(XMLLoader(), 'python')
+    symbols = generator._build_symbol_table(workflow['nodes'])
+    names = [symbols.method_name(node) for node in workflow['nodes']]
+    assert names == ['sendEmail', 'sendEmail2', 'sendEmail3', 'sendemail2', 'runNode', 'lambdaNode',
+                     'constructor', 'echo', 'getContext']
+    assert symbols.output_key(workflow['nodes'][1]) == 'sendEmail2_output'
+
+    # Palavras reservadas e membros da classe de cada linguagem
+    expected = {
+        'python': ['sendEmail', 'sendEmail2', 'sendEmail3', 'sendemail2', 'runNode', 'lambdaNode',
+                   'constructor', 'echo', 'getContext'],
+        'javascript': ['sendEmail', 'sendEmail2', 'sendEmail3', 'sendemail2', 'runNode', 'lambda',
+                       'constructorNode', 'echo', 'getContextNode'],
+        'php': ['sendEmail', 'sendEmail2', 'sendEmail3', 'sendemail2', 'runNode', 'lambda',
+                'constructor', 'echoNode', 'getContextNode']
+    }
+    for language, pattern in METHOD_PATTERNS.items():
+        xml_loader = XMLLoader()
+        code = Generator(xml_loader, language, instrument=True, trace=True).generate_class(workflow)
+        members = xml_loader.load_class_member_names(language)
+        assert [name for name in pattern.findall(code) if name not in members] == expected[language]
+        # Chamadas, métricas e spans usam os mesmos nomes
+        assert "'sendEmail3_output'" in code and "'sendemail2'" in code
+
+
+def test_colliding_nodes_keep_separate_outputs():
+    """Cada nó colidente grava a própria saída na classe gerada."""
+    workflow = create_workflow('Send Email', 'send-email', 'Run', node_type='n8n-nodes-base.noOp')
+    with tempfile.TemporaryDirectory() as output_dir:
+        instance = load_generated_class(workflow, output_dir)()
+        instance.retain_all = True
+        context = instance.run()
+    assert {'sendEmail_output', 'sendEmail2_output', 'runNode_output'} <= set(context)
+
+
+def test_duplicate_ids_keep_separate_names():
+    """Nós com o mesmo id (workflows colados) recebem nomes e saídas próprios."""
+    workflow = create_workflow('Send Email', 'Send Email', 'Run', node_type='n8n-nodes-base.noOp')
+    for duplicate in workflow['nodes'][1:]:
+        duplicate['id'] = 'node-0'
+    symbols = Generator(XMLLoader(), 'python')._build_symbol_table(workflow['nodes'])
+    assert [symbols.method_name(node) for node in workflow['nodes']] == ['sendEmail', 'sendEmail2', 'runNode']
+    # Uma cópia do nó não é confundida com os nós de id repetido
+    assert dict(workflow['nodes'][0]) not in symbols
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        instance = load_generated_class(workflow, output_dir)()
+        instance.retain_all = True
+        context = instance.run()
+    assert {'sendEmail_output', 'sendEmail2_output', 'runNode_output'} <= set(context)
+
+
+def test_names_are_computed_once_per_node(monkeypatch):
+    """generate_method_name roda uma vez por nó, em todas as etapas da geração."""
+    calls = []
+    generate_method_name = NodeMapper.generate_method_name
+    monkeypatch.setattr(NodeMapper, 'generate_method_name',
+                        lambda self, node: calls.append(node['id']) or generate_method_name(self, node))
+
+    workflow = create_workflow('Buscar', 'Resumir', 'Enviar', node_type='n8n-nodes-base.httpRequest')
+    workflow['nodes'][0]['type'] = 'n8n-nodes-base.webhook'
+    workflow['nodes'][0]['parameters'] = {}
+    generator = Generator(XMLLoader(), 'javascript', instrument=True, trace=True, checkpoint=True)
+    assert generator.generate_class(workflow)
+    assert calls == ['node-0', 'node-1', 'node-2']
+
+    calls.clear()
+    server = generator.generate_server(workflow)
+    assert "'buscar'" in server or '"buscar"' in server
+    assert '"enviar_output"' in server and calls == ['node-0', 'node-1', 'node-2']
+
+
+if __name__ == "__main__":
+    test_names_are_unique_and_legal()
+    test_colliding_nodes_keep_separate_outputs()
+    test_duplicate_ids_keep_separate_names()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,61 @@
+"""
+Teste da fábrica de workflows sintéticos e do benchmark de escalabilidade.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from synthetic_workflows import SyntheticWorkflowFactory, parse_node_mix
+from bench_generator import compare_to_baseline, loglog_slope, run_benchmark
+
+
+def test_factory_shape():
+    """A fábrica respeita quantidade de nós, ramificação, mistura de tipos e densidade de expressões."""
+    factory = SyntheticWorkflowFactory(branching=3, expression_density=1.0, node_mix={'set': 1})
+    workflow = factory.create(40)
+
+    assert len(workflow['nodes']) == 40
+    assert {node['type'] for node in workflow['nodes'][1:]} == {'n8n-nodes-base.set'}
+    assert all(node['parameters']['values']['string'][0]['value'].startswith('={{')
+               for node in workflow['nodes'][1:])
+    fanout = [len(node['connections'].get('main', {'0': [[]]})['0'][0]) for node in workflow['nodes']]
+    assert max(fanout) == 3 and sum(fanout) == 39
+
+    assert factory.create(40) == workflow
+    assert SyntheticWorkflowFactory(seed=7).create(40) != SyntheticWorkflowFactory(seed=8).create(40)
+
+    body = SyntheticWorkflowFactory(body_size=2048, node_mix={'httpRequest': 1}).create(2)['nodes'][1]['parameters']['body']
+    assert len(str(body)) >= 2048
+
+    assert parse_node_mix('httpRequest=4, aiAgent') == {'httpRequest': 4.0, 'aiAgent': 1.0}
+    with pytest.raises(ValueError):
+        parse_node_mix('desconhecido=1')
+
+
+def test_benchmark_and_baseline_comparison():
+    """O benchmark gera as três linguagens e a comparação acusa curvas quadráticas."""
+    report = run_benchmark([5, 20], ['python', 'javascript', 'php'], SyntheticWorkflowFactory(), repeat=1)
+    for points in report['results'].values():
+        assert [point['nodes'] for point in points] == [5, 20]
+        assert all(point['code_bytes'] > 0 and point['peak_bytes'] > 0 for point in points)
+
+    linear = [{'nodes': n, 'seconds': n * 1e-4, 'us_per_node': 100.0} for n in (10, 100, 1000)]
+    quadratic = [{'nodes': n, 'seconds': n * n * 1e-5, 'us_per_node': n * 10.0} for n in (10, 100, 1000)]
+    assert loglog_slope(linear) == pytest.approx(1.0)
+    assert loglog_slope(quadratic) == pytest.approx(2.0)
+
+    baseline = {'results': {'python': linear}}
+    assert compare_to_baseline({'results': {'python': linear}}, baseline) == []
+    regressions = compare_to_baseline({'results': {'python': quadratic}}, baseline)
+    assert any('inclinação' in regression for regression in regressions)
+    assert any('µs/nó' in regression for regression in regressions)
+
+
+if __name__ == "__main__":
+    test_factory_shape()
+    test_benchmark_and_baseline_comparison()
+    print("\n✓ TESTE PASSOU")
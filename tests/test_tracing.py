@@ -0,0 +1,130 @@
+"""
+Teste do tracing (spans por nó em JSON lines OTLP) das classes geradas.
+"""
+import json
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from helpers import load_generated_class, StubHandler
+
+
+def create_diamond_workflow(base_url):
+    """Cria um workflow em diamante: start -> (buscar, preparar) -> juntar."""
+    def node(node_id, name, node_type, targets, parameters=None):
+        return {
+            'id': node_id,
+            'name': name,
+            'type': node_type,
+            'parameters': parameters or {},
+            'connections': {'main': {'0': [[{'node': target} for target in targets]]}} if targets else {}
+        }
+
+    return {
+        'id': 'test-tracing',
+        'name': 'Teste Tracing',
+        'nodes': [
+            node('node-1', 'Start', 'n8n-nodes-base.start', ['node-2', 'node-3']),
+            node('node-2', 'Buscar', 'n8n-nodes-base.httpRequest', ['node-4'],
+                 {'url': f'{base_url}/dados', 'method': 'GET'}),
+            node('node-3', 'Preparar', 'n8n-nodes-base.noOp', ['node-4']),
+            node('node-4', 'Juntar', 'n8n-nodes-base.noOp', [])
+        ]
+    }
+
+
+def read_spans(path):
+    """Lê todos os spans gravados no arquivo JSON lines."""
+    spans = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        request = json.loads(line)
+        for resource_spans in request['resourceSpans']:
+            for scope_spans in resource_spans['scopeSpans']:
+                spans.extend(scope_spans['spans'])
+    return spans
+
+
+def attributes(span):
+    """Converte a lista de atributos OTLP de um span em dicionário."""
+    return {item['key']: next(iter(item['value'].values())) for item in span['attributes']}
+
+
+def test_tracing_step_calls_follow_dag():
+    """Os pais de cada nó no DAG são passados para _traced()."""
+    generator = Generator(XMLLoader(), 'python', trace=True, instrument=True)
+    code = generator.generate_class(create_diamond_workflow('http://localhost'))
+    assert "self._traced('juntar', 'juntar_output', 'noOp', ['buscar', 'preparar'], " \
+           "lambda: self._instrumented('juntar', 'juntar_output', self.juntar))" in code
+    assert '_traced' not in Generator(XMLLoader(), 'python').generate_class(create_diamond_workflow('x'))
+
+
+def test_tracing_spans():
+    """Testa spans, hierarquia, atributos e erros gravados no arquivo."""
+    print("=" * 60)
+    print("TESTE: Tracing por nó")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        with tempfile.TemporaryDirectory() as output_dir:
+            workflow_class = load_generated_class(create_diamond_workflow(base_url), output_dir, trace=True)
+            trace_file = Path(output_dir) / 'traces.jsonl'
+
+            workflow = workflow_class()
+            workflow.set_trace_file(str(trace_file))
+            context = workflow.run()
+
+            spans = {span['name']: span for span in read_spans(trace_file)}
+            assert set(spans) == {'Teste Tracing', 'start', 'buscar', 'preparar', 'juntar'}
+            root = spans['Teste Tracing']
+            assert 'parentSpanId' not in root
+            assert {span['traceId'] for span in spans.values()} == {context['trace_id']}
+
+            assert spans['start']['parentSpanId'] == root['spanId']
+            assert spans['buscar']['parentSpanId'] == spans['start']['spanId']
+            assert spans['juntar']['parentSpanId'] == spans['buscar']['spanId']
+            assert spans['juntar']['links'] == [{'traceId': context['trace_id'], 'spanId': spans['preparar']['spanId']}]
+
+            assert spans['buscar']['kind'] == 3
+            assert attributes(spans['buscar'])['http.response.status_code'] == '200'
+            assert attributes(spans['preparar'])['n8n.node.type'] == 'noOp'
+            assert int(root['endTimeUnixNano']) >= int(spans['juntar']['endTimeUnixNano'])
+            print(f"✓ {len(spans)} spans gravados em {trace_file.name}")
+
+            # Erro em um nó: span com status de erro e span raiz finalizado
+            def fail():
+                raise RuntimeError('falha no nó')
+
+            workflow.preparar = fail
+            with pytest.raises(RuntimeError):
+                workflow.run()
+            failed = [span for span in read_spans(trace_file) if span['status']]
+            assert [span['name'] for span in failed] == ['preparar', 'Teste Tracing']
+            assert failed[0]['status'] == {'code': 2, 'message': 'falha no nó'}
+
+            # Tracing desativado em tempo de execução
+            lines = len(trace_file.read_text(encoding='utf-8').splitlines())
+            disabled = workflow_class()
+            disabled.set_trace_file(None)
+            assert 'trace_id' not in disabled.run()
+            assert len(trace_file.read_text(encoding='utf-8').splitlines()) == lines
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_tracing_step_calls_follow_dag()
+    test_tracing_spans()
+    print("\n✓ TESTE PASSOU")
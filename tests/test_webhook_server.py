@@ -0,0 +1,175 @@
+"""
+Teste do servidor HTTP gerado para workflows acionados por webhook.
+"""
+import asyncio
+import importlib.util
+import json
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'templates' / 'runtime'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from xml_loader import XMLLoader
+from generator import Generator
+from folder_structure import FolderStructure
+from WebhookServer import WebhookApp, _handle_connection
+from helpers import create_plain_workflow
+
+
+def create_webhook_workflow(response_mode='lastNode'):
+    """Cria o workflow Webhook (POST /pedidos) -> Registrar."""
+    return {
+        'id': 'test-webhook-server',
+        'name': 'Teste Webhook Server',
+        'nodes': [
+            {
+                'id': 'node-1',
+                'name': 'Webhook',
+                'type': 'n8n-nodes-base.webhook',
+                'parameters': {'path': 'pedidos', 'httpMethod': 'POST', 'responseMode': response_mode},
+                'connections': {'main': {'0': [[{'node': 'node-2'}]]}}
+            },
+            {
+                'id': 'node-2',
+                'name': 'Registrar',
+                'type': 'n8n-nodes-base.noOp',
+                'parameters': {},
+                'connections': {}
+            }
+        ]
+    }
+
+
+def request(base_url, method, path, payload=None):
+    """Faz uma requisição JSON e devolve (status, corpo)."""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+async def call(app, method, path, payload=None):
+    """Executa uma requisição diretamente na aplicação ASGI."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+             'headers': [(b'content-type', b'application/json')]}
+    return await app.handle(scope, body)
+
+
+def test_generate_server_routes():
+    """Somente workflows com Webhook geram servidor, com as rotas dos nós."""
+    for language in ('python', 'php', 'javascript'):
+        generator = Generator(XMLLoader(), language)
+        assert generator.generate_server(create_plain_workflow()) is None
+
+        code = generator.generate_server(create_webhook_workflow())
+        assert 'pedidos' in code
+        assert 'registrar_output' in code
+        assert '{{' not in code
+
+    routes = Generator(XMLLoader(), 'python')._determine_webhook_routes(create_webhook_workflow()['nodes'])
+    assert routes == [{'method': 'POST', 'path': 'pedidos', 'node': 'Webhook', 'response_mode': 'lastNode'}]
+
+
+def test_generated_python_server():
+    """Serve a classe gerada pelo servidor embutido e roteia o webhook."""
+    workflow = create_webhook_workflow()
+    with tempfile.TemporaryDirectory() as output_dir:
+        generator = Generator(XMLLoader(), 'python')
+        generator.folder_structure = FolderStructure(output_dir)
+        assert generator.save_generated_code(workflow, generator.generate_class(workflow))
+        assert generator.save_generated_server(workflow, generator.generate_server(workflow))
+
+        path = generator.folder_structure.get_server_file_path(workflow, 'python')
+        assert path.name == 'Teste_Webhook_Server_server.py'
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        async def scenario():
+            server = await asyncio.start_server(lambda r, w: _handle_connection(module.app, r, w), '127.0.0.1', 0)
+            base_url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}'
+            loop = asyncio.get_running_loop()
+            try:
+                results = []
+                for method, route, payload in [('POST', '/webhook/pedidos', {'id': 7}),
+                                               ('GET', '/webhook/pedidos', None),
+                                               ('POST', '/outro', {}),
+                                               ('GET', '/healthz', None)]:
+                    results.append(await loop.run_in_executor(None, request, base_url, method, route, payload))
+                return results
+            finally:
+                server.close()
+
+        created, wrong_method, missing, health = asyncio.run(scenario())
+        assert created == (200, {})
+        assert wrong_method[0] == 405
+        assert missing[0] == 404
+        assert health == (200, {'status': 'ok', 'pool_size': 4, 'in_flight': 0})
+
+
+def test_pool_and_concurrency_limit():
+    """Instâncias são reaproveitadas e o excesso de requisições recebe 503."""
+    lock = threading.Lock()
+    state = {'instances': 0, 'active': 0, 'max_active': 0, 'params': []}
+
+    class SlowWorkflow:
+        def __init__(self):
+            with lock:
+                state['instances'] += 1
+
+        def run(self, params):
+            with lock:
+                state['active'] += 1
+                state['max_active'] = max(state['max_active'], state['active'])
+                state['params'].append(params)
+            time.sleep(0.1)
+            with lock:
+                state['active'] -= 1
+            return {'registrar_output': {'id': params.get('id')}}
+
+    routes = [{'method': 'POST', 'path': 'pedidos', 'node': 'Webhook', 'response_mode': 'lastNode'}]
+    app = WebhookApp(SlowWorkflow, routes, pool_size=2, max_pending=1, response_key='registrar_output')
+
+    async def scenario():
+        return await asyncio.gather(*[call(app, 'POST', '/pedidos', {'id': index}) for index in range(5)])
+
+    results = asyncio.run(scenario())
+    assert [status for status, _ in results] == [200, 200, 200, 503, 503]
+    assert [payload for _, payload in results[:3]] == [{'id': 0}, {'id': 1}, {'id': 2}]
+    assert state['instances'] == 2
+    assert state['max_active'] == 2
+    assert state['params'][0]['webhook']['body'] == {'id': 0}
+
+    # onReceived responde antes da execução terminar
+    background = WebhookApp(SlowWorkflow, [{**routes[0], 'response_mode': 'onReceived'}], pool_size=1)
+
+    async def received():
+        started = time.perf_counter()
+        result = await call(background, 'POST', '/pedidos', {'id': 9})
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.2)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(received())
+    assert result == (200, {'message': 'Workflow was started'})
+    assert elapsed < 0.1
+    assert state['params'][-1]['id'] == 9
+
+
+if __name__ == "__main__":
+    test_generate_server_routes()
+    test_generated_python_server()
+    test_pool_and_concurrency_limit()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,180 @@
+"""
+Teste do catálogo local (SQLite) de workflows.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from n8n_client import N8nClient
+from workflow_catalog import CatalogQueryError, WorkflowCatalog
+from workflow_selector import WorkflowSelector
+from fake_n8n_server import FakeN8nServer
+from helpers import node
+
+
+def create_workflow(workflow_id, name, tags, node_types, active=False, updated_at='2024-01-01T00:00:00.000Z'):
+    return {
+        'id': workflow_id,
+        'name': name,
+        'active': active,
+        'updatedAt': updated_at,
+        'tags': [{'id': tag, 'name': tag} for tag in tags],
+        'nodes': [node(f'{workflow_id}-{index}', f'Nó {index}', node_type, [], {'url': 'http://x'} if 'http' in node_type else {'text': 'oi'})
+                  for index, node_type in enumerate(node_types)]
+    }
+
+
+WORKFLOWS = [
+    create_workflow('1', 'Faturas mensais', ['billing'], ['@n8n/n8n-nodes-langchain.agent', 'n8n-nodes-base.httpRequest'], active=True),
+    create_workflow('2', 'Cobrança atrasada', ['billing', 'ops'], ['n8n-nodes-base.httpRequest', 'n8n-nodes-base.httpRequest']),
+    create_workflow('3', 'Suporte com IA', ['support'], ['@n8n/n8n-nodes-langchain.agent']),
+]
+
+
+def ids(matches):
+    return [match['id'] for match in matches]
+
+
+def test_query_fields():
+    """Tags, tipos de nó, parâmetros, nomes (FTS) e campos escalares."""
+    with WorkflowCatalog(':memory:') as catalog:
+        for workflow in WORKFLOWS:
+            catalog.add(workflow)
+
+        assert ids(catalog.query('node_type=aiAgent AND tag=billing')) == ['1']
+        assert ids(catalog.query('node_type=n8n-nodes-base.httpRequest')) == ['2', '1']
+        assert ids(catalog.query('node_type=httpRequest')) == ['2', '1']
+        assert ids(catalog.query('tag=BILLING AND tag!=ops')) == ['1']
+        assert ids(catalog.query('param=url')) == ['2', '1']
+        assert ids(catalog.query('name=fatur')) == ['1']
+        assert ids(catalog.query('name="suporte ia"')) == ['3']
+        assert ids(catalog.query("active=true")) == ['1']
+        assert ids(catalog.query('nodes>=2 and node_type!=aiAgent')) == ['2']
+        assert len(catalog.query('')) == 3
+
+        match = catalog.query('id=2')[0]
+        assert match == {'id': '2', 'name': 'Cobrança atrasada', 'active': False,
+                         'updatedAt': '2024-01-01T00:00:00.000Z', 'nodes': 2, 'tags': ['billing', 'ops']}
+
+        for invalid in ('tag', 'color=red', 'tag=a OR tag=b', 'tag>a', 'active=talvez', 'nodes>muitos'):
+            with pytest.raises(CatalogQueryError):
+                catalog.query(invalid)
+
+
+def test_selector_filters_with_catalog(monkeypatch, capsys):
+    """No menu, uma consulta filtra a lista e os índices passam a se referir à lista filtrada."""
+    answers = iter(['tag=nenhuma', 'tag=billing AND', 'tag=billing', '2'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    with WorkflowCatalog(':memory:') as catalog:
+        for workflow in WORKFLOWS:
+            catalog.add(workflow)
+        selected = WorkflowSelector.select_workflows(WORKFLOWS, catalog)
+    assert [workflow['id'] for workflow in selected] == ['2']
+    output = capsys.readouterr().out
+    assert 'Nenhum workflow corresponde à consulta.' in output
+
+    answers = iter(['node_type=aiAgent', 'todos'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    with WorkflowCatalog(':memory:') as catalog:
+        for workflow in WORKFLOWS:
+            catalog.add(workflow)
+        assert WorkflowSelector.select_workflows(WORKFLOWS, catalog) == [WORKFLOWS[0], WORKFLOWS[2]]
+
+
+def test_incremental_sync_and_speed():
+    """A sincronização reindexa só o que mudou e consultas em milhares de workflows levam milissegundos."""
+    with FakeN8nServer(WORKFLOWS) as server, tempfile.TemporaryDirectory() as directory:
+        client = N8nClient(server.url, server.api_key)
+        path = str(Path(directory) / 'catalogo.db')
+        with WorkflowCatalog(path) as catalog:
+            assert catalog.sync(client) == {'added': 3, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+            renamed = create_workflow('2', 'Cobrança vencida', ['billing'], ['n8n-nodes-base.set'],
+                                      updated_at='2024-03-01T00:00:00.000Z')
+            server.set_workflows([WORKFLOWS[0], renamed])
+            assert catalog.sync(client) == {'added': 0, 'updated': 1, 'deleted': 1, 'unchanged': 1}
+            assert ids(catalog.query('name=vencida AND node_type=set')) == ['2']
+            assert catalog.query('name=atrasada') == []
+            assert server.stats['get_requests'] == 0  # a listagem já traz os nós
+
+        # O catálogo persiste e responde sem o n8n
+        server.set_workflows([])
+        with WorkflowCatalog(path) as catalog:
+            assert len(catalog) == 2
+
+            tags = ['billing', 'ops', 'support', 'marketing']
+            types = ['@n8n/n8n-nodes-langchain.agent', 'n8n-nodes-base.httpRequest', 'n8n-nodes-base.set', 'n8n-nodes-base.if']
+            catalog.sync(client, [
+                create_workflow(f'bulk-{index}', f'Workflow {index}', [tags[index % 4]],
+                                [types[index % 4], types[(index + 1) % 4]] * 5)
+                for index in range(5000)
+            ])
+            started = time.perf_counter()
+            matches = catalog.query('node_type=aiAgent AND tag=billing')
+            elapsed = time.perf_counter() - started
+            assert len(matches) == 1250
+            assert elapsed < 0.5  # tipicamente poucos milissegundos
+
+
+def test_sync_waits_for_first_query(monkeypatch):
+    """Com a listagem sem nós, get_workflow() só é chamado quando uma consulta é feita."""
+    class CountingClient:
+        def __init__(self):
+            self.fetched = []
+
+        def get_workflow(self, workflow_id):
+            self.fetched.append(workflow_id)
+            return next(workflow for workflow in WORKFLOWS if workflow['id'] == workflow_id)
+
+    listing = [{key: workflow[key] for key in ('id', 'name', 'active', 'updatedAt', 'tags')} for workflow in WORKFLOWS]
+    client = CountingClient()
+    with WorkflowCatalog(':memory:') as catalog:
+        catalog.sync_on_query(client, listing)
+
+        # Seleção por índice no menu: nada é buscado nem indexado
+        monkeypatch.setattr('builtins.input', lambda prompt: '1')
+        assert WorkflowSelector.select_workflows(listing, catalog) == [listing[0]]
+        assert client.fetched == [] and len(catalog) == 0
+
+        # A primeira consulta sincroniza; as seguintes usam o catálogo
+        assert ids(catalog.query('node_type=aiAgent AND tag=billing')) == ['1']
+        assert ids(catalog.query('param=url')) == ['2', '1']
+        assert client.fetched == ['1', '2', '3']
+
+        # Consulta inválida não dispara a sincronização
+        catalog.sync_on_query(client, listing)
+        with pytest.raises(CatalogQueryError):
+            catalog.query('color=red')
+        assert client.fetched == ['1', '2', '3']
+
+
+
+def test_stale_template_types_are_reindexed():
+    """Catálogos gravados com o mapeamento antigo (base.httpRequest) são corrigidos ao abrir."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'catalog.db')
+        with WorkflowCatalog(path) as catalog:
+            for workflow in WORKFLOWS:
+                catalog.add(workflow)
+            with catalog.connection:
+                catalog.connection.execute("UPDATE workflow_nodes SET template_type = 'base.httpRequest' "
+                                           "WHERE template_type = 'httpRequest'")
+                catalog.connection.execute('PRAGMA user_version = 0')
+            assert ids(catalog.query('node_type=httpRequest')) == []
+
+        with WorkflowCatalog(path) as catalog:
+            assert ids(catalog.query('node_type=httpRequest')) == ['2', '1']
+            assert catalog.connection.execute('PRAGMA user_version').fetchone()[0] == WorkflowCatalog.DATA_VERSION
+
+if __name__ == "__main__":
+    test_query_fields()
+    test_incremental_sync_and_speed()
+    test_stale_template_types_are_reindexed()
+    print("\n✓ TESTE PASSOU")
@@ -0,0 +1,110 @@
+"""
+Teste do modo watch (polling do n8n com regeneração incremental).
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from n8n_client import N8nClient
+from workflow_watcher import WorkflowWatcher
+from fake_n8n_server import FakeN8nServer
+from helpers import node
+
+
+def create_workflow(workflow_id, name, updated_at):
+    return {
+        'id': workflow_id,
+        'name': name,
+        'updatedAt': updated_at,
+        'nodes': [node(f'{workflow_id}-1', 'Enviar', 'n8n-nodes-base.httpRequest', [], {'url': 'http://x', 'method': 'GET'})]
+    }
+
+
+def test_watch_regenerates_only_changes():
+    """Somente workflows novos ou alterados são buscados e regenerados; removidos são apagados."""
+    first = create_workflow('wf1', 'Pedidos', '2024-01-01T00:00:00.000Z')
+    second = create_workflow('wf2', 'Clientes', '2024-01-01T00:00:00.000Z')
+    with FakeN8nServer([first, second], page_size=1) as server, tempfile.TemporaryDirectory() as output_dir:
+        client = N8nClient(server.url, server.api_key)
+        watcher = WorkflowWatcher(client, ['php', 'python'], output_dir)
+        output = Path(output_dir)
+
+        assert watcher.poll_once() == {'added': ['wf1', 'wf2'], 'changed': [], 'deleted': [], 'failed': []}
+        assert (output / 'php' / 'Pedidos.php').exists() and (output / 'python' / 'Clientes.py').exists()
+        assert server.stats['list_requests'] == 2  # paginação: uma página por workflow
+        assert server.stats['get_requests'] == 2
+
+        # Sem alterações: só a listagem
+        server.reset_stats()
+        assert watcher.poll_once() == {'added': [], 'changed': [], 'deleted': [], 'failed': []}
+        assert server.stats['get_requests'] == 0
+
+        # wf1 alterado e renomeado: a saída antiga some, wf2 não é buscado
+        server.reset_stats()
+        server.set_workflows([create_workflow('wf1', 'Pedidos V2', '2024-02-01T00:00:00.000Z'), second])
+        assert watcher.poll_once()['changed'] == ['wf1']
+        assert server.stats['get_requests'] == 1
+        assert (output / 'php' / 'Pedidos_V2.php').exists() and not (output / 'php' / 'Pedidos.php').exists()
+
+        # Uma saída apagada à mão é regenerada
+        (output / 'python' / 'Clientes.py').unlink()
+        assert watcher.poll_once()['changed'] == ['wf2']
+        assert (output / 'python' / 'Clientes.py').exists()
+
+        # Listagem com erro (429) não apaga nada
+        server.rate_limit_every = 1
+        watcher.run(interval=0, iterations=1)
+        assert (output / 'php' / 'Clientes.php').exists()
+        server.rate_limit_every = 0
+
+        # wf2 removido do n8n: suas saídas são apagadas
+        server.set_workflows([create_workflow('wf1', 'Pedidos V2', '2024-02-01T00:00:00.000Z')])
+        assert watcher.poll_once()['deleted'] == ['wf2']
+        assert not (output / 'php' / 'Clientes.php').exists() and not (output / 'python' / 'Clientes.py').exists()
+
+        # O estado persiste: um novo watcher não regenera nada
+        restarted = WorkflowWatcher(client, ['php', 'python'], output_dir)
+        assert restarted.poll_once() == {'added': [], 'changed': [], 'deleted': [], 'failed': []}
+
+        # Uma linguagem nova regenera os workflows existentes
+        extended = WorkflowWatcher(client, ['php', 'python', 'javascript'], output_dir)
+        assert extended.poll_once()['changed'] == ['wf1']
+        assert (output / 'javascript' / 'Pedidos_V2.js').exists()
+
+
+def test_watch_keeps_same_named_workflows_apart():
+    """Workflows com o mesmo nome não sobrescrevem nem apagam as saídas um do outro."""
+    first = create_workflow('wf1', 'Pedidos', '2024-01-01T00:00:00.000Z')
+    twin = create_workflow('wf3', 'Pedidos', '2024-01-01T00:00:00.000Z')
+    twin['nodes'][0]['parameters']['url'] = 'http://gemeo'
+    with FakeN8nServer([first, twin]) as server, tempfile.TemporaryDirectory() as output_dir:
+        client = N8nClient(server.url, server.api_key)
+        watcher = WorkflowWatcher(client, ['python'], output_dir)
+        output = Path(output_dir) / 'python'
+
+        assert watcher.poll_once()['added'] == ['wf1', 'wf3']
+        assert 'http://x' in (output / 'Pedidos.py').read_text(encoding='utf-8')
+        assert 'http://gemeo' in (output / 'Pedidos_wf3.py').read_text(encoding='utf-8')
+        assert watcher.state['wf3']['outputs'] == [str(output / 'Pedidos_wf3.py')]
+
+        # Alterar o segundo mantém o nome com o id; um novo watcher também
+        twin['updatedAt'] = '2024-02-01T00:00:00.000Z'
+        server.set_workflows([first, twin])
+        assert WorkflowWatcher(client, ['python'], output_dir).poll_once()['changed'] == ['wf3']
+        assert 'http://x' in (output / 'Pedidos.py').read_text(encoding='utf-8')
+        assert (output / 'Pedidos_wf3.py').exists()
+
+        # Remover o segundo apaga só as saídas dele
+        server.set_workflows([first])
+        assert WorkflowWatcher(client, ['python'], output_dir).poll_once()['deleted'] == ['wf3']
+        assert (output / 'Pedidos.py').exists() and not (output / 'Pedidos_wf3.py').exists()
+
+
+if __name__ == "__main__":
+    test_watch_regenerates_only_changes()
+    test_watch_keeps_same_named_workflows_apart()
+    print("\n✓ TESTE PASSOU")